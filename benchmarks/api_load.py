@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Zátěžový test HTTP API kiosku
+
+Simuluje desítky kiosků a tabletů, které přes keep-alive spojení
+periodicky dotazují API s hlavičkou If-None-Match. Bez --port spustí
+vlastní server (kiosk-api) nad syntetickými daty v dočasném adresáři
+a během testu průběžně mění soubor se stavem, jako by zapisoval
+příkaz project-manager.
+
+Použití:
+    python benchmarks/api_load.py [--clients 50] [--duration 10]
+    python benchmarks/api_load.py --port 8090 --project "Weather Station IoT"
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from src.python.api_server import request  # noqa: E402
+
+
+def prepare_data(directory: str, projects: int, tasks: int) -> Dict[str, str]:
+    """
+    Vytvoření syntetického stavu a databáze meteostanice.
+
+    Returns:
+        Slovník s cestami ('data', 'weather', 'log')
+    """
+    from src.python.project_manager import ProjectManager
+    from src.python.weather_store import WeatherStore
+
+    paths = {name: os.path.join(directory, file) for name, file in (
+        ('data', 'state.json'), ('weather', 'weather.db'), ('log', 'pm.log'))}
+    pm = ProjectManager(paths['log'])
+    for p in range(projects):
+        pm.create_project(f"Projekt {p}", "Zátěžový test", ["Cíl"], "4 týdny")
+        for t in range(tasks):
+            pm.add_task(f"Projekt {p}", f"Úkol {t}", f"student{t % 25}", "2025-12-31",
+                        description="Popis úkolu " * 5)
+    pm.save_state(paths['data'])
+
+    store = WeatherStore(paths['weather'])
+    start = datetime.now() - timedelta(hours=1)
+    store.insert_many(
+        (start + timedelta(seconds=10 * i), 21.0 + i % 5, 45.0, 1013.0) for i in range(360)
+    )
+    store.close()
+    return paths
+
+
+def free_port() -> int:
+    """Volný TCP port na localhostu"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def wait_for_port(port: int, timeout: float = 10.0) -> None:
+    """Čekání na start serveru"""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"Server na portu {port} nenaběhl")
+            await asyncio.sleep(0.05)
+
+
+async def client(
+    port: int, paths: List[str], deadline: float, poll_interval: float,
+    latencies: List[float], statuses: Dict[int, int], received: List[int]
+) -> None:
+    """Jeden klient (kiosk/tablet) s jedním keep-alive spojením"""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    etags: Dict[str, str] = {}
+    try:
+        while time.monotonic() < deadline:
+            for path in paths:
+                headers = {'Accept-Encoding': 'gzip'}
+                if path in etags:
+                    headers['If-None-Match'] = etags[path]
+                started = time.perf_counter()
+                status, response_headers, body = await request(reader, writer, path, headers)
+                latencies.append((time.perf_counter() - started) * 1000)
+                statuses[status] = statuses.get(status, 0) + 1
+                received[0] += len(body)
+                if 'etag' in response_headers:
+                    etags[path] = response_headers['etag']
+            if poll_interval:
+                await asyncio.sleep(poll_interval)
+    finally:
+        writer.close()
+
+
+async def touch_state(data_file: str, interval: float, deadline: float) -> None:
+    """Periodická změna stavu (simulace zápisů z project-manager)"""
+    from src.python.project_manager import ProjectManager
+
+    pm = ProjectManager(os.path.join(os.path.dirname(data_file), 'pm.log'))
+    pm.load_state(data_file)
+    task_id = 1
+    while time.monotonic() < deadline:
+        await asyncio.sleep(interval)
+        pm.update_task_status(task_id, 'completed')
+        pm.save_state(data_file)
+        task_id = task_id % len(pm.tasks) + 1
+
+
+async def run(args: argparse.Namespace, port: int, data_file: Optional[str]) -> int:
+    await wait_for_port(port)
+    paths = [
+        f"/api/projects/{args.project.replace(' ', '%20')}/{action}"
+        for action in ('progress', 'stats', 'report')
+    ] + ['/api/projects', '/api/weather/latest?limit=60']
+
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    received = [0]
+    deadline = time.monotonic() + args.duration
+    jobs = [
+        client(port, paths, deadline, args.poll_interval, latencies, statuses, received)
+        for _ in range(args.clients)
+    ]
+    if data_file and args.update_interval:
+        jobs.append(touch_state(data_file, args.update_interval, deadline))
+    started = time.monotonic()
+    await asyncio.gather(*jobs)
+    elapsed = time.monotonic() - started
+
+    latencies.sort()
+    total = len(latencies)
+    print(f"Klienti: {args.clients}, doba: {elapsed:.1f} s, požadavků: {total} "
+          f"({total / elapsed:.0f}/s)")
+    print(f"Latence ms: p50 {statistics.median(latencies):.2f}  "
+          f"p95 {latencies[int(total * 0.95)]:.2f}  p99 {latencies[int(total * 0.99)]:.2f}")
+    print(f"Stavy: {dict(sorted(statuses.items()))}, přeneseno {received[0] / 1024:.0f} KiB "
+          f"({received[0] / total:.0f} B/požadavek)")
+    return 0 if set(statuses) <= {200, 304} else 1
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Zátěžový test HTTP API kiosku')
+    parser.add_argument('--port', type=int, help='Port běžícího serveru (jinak spustí vlastní)')
+    parser.add_argument('--project', default='Projekt 0', help='Dotazovaný projekt')
+    parser.add_argument('--clients', type=int, default=50)
+    parser.add_argument('--duration', type=float, default=10.0, help='Doba testu v sekundách')
+    parser.add_argument('--poll-interval', type=float, default=0.0,
+                        help='Pauza klienta mezi koly dotazů (0 = co nejrychleji)')
+    parser.add_argument('--update-interval', type=float, default=1.0,
+                        help='Jak často měnit stav vlastního serveru (0 = vůbec)')
+    parser.add_argument('--projects', type=int, default=5)
+    parser.add_argument('--tasks', type=int, default=100, help='Úkolů na projekt')
+    args = parser.parse_args()
+
+    if args.port:
+        return asyncio.run(run(args, args.port, None))
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        paths = prepare_data(temp_dir, args.projects, args.tasks)
+        port = free_port()
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'src.python.api_server', '--data', paths['data'],
+             '--weather-db', paths['weather'], '--log-file', paths['log'],
+             '--port', str(port)],
+            cwd=REPO_ROOT, stderr=subprocess.DEVNULL
+        )
+        try:
+            return asyncio.run(run(args, port, paths['data']))
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
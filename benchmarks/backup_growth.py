@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Růst záloh za simulovaný měsíc
+
+Nasimuluje provoz školy po zadaný počet dní (databáze už obsahuje
+měření za --history dní): každý den přibudou
+měření meteostanice (WeatherStore), změny stavu úkolů (ProjectManager
+se žurnálem) a uloží se stav projektů. Po každém dni proběhne noční
+záloha (BackupEngine) a vypíše se doba zálohy, počet nových bloků,
+zapsané bajty a velikost repozitáře v porovnání s denní úplnou
+zálohou tar.gz (původní src/scripts/backup.sh). Na konci se měří
+proudová obnova posledního snímku.
+
+Použití:
+    python benchmarks/backup_growth.py [--days 30] [--history 90] [--classes 4] [--interval 60]
+    python benchmarks/backup_growth.py --days 30 --json backup.json
+"""
+
+import argparse
+import io
+import json
+import logging
+import os
+import shutil
+import sys
+import tarfile
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from src.python.backup import BackupEngine  # noqa: E402
+from src.python.journal import Journal  # noqa: E402
+from src.python.project_manager import ProjectManager  # noqa: E402
+from src.python.student_registry import StudentRegistry  # noqa: E402
+from src.python.weather_store import WeatherStore  # noqa: E402
+from src.python.workload import WorkloadGenerator, populate  # noqa: E402
+
+
+def tar_size(paths: List[str]) -> int:
+    """Velikost úplné zálohy tar.gz zadaných cest"""
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode='w:gz', compresslevel=6) as archive:
+        for path in paths:
+            archive.add(path, arcname=os.path.basename(path))
+    return buffer.tell()
+
+
+def save_state(manager: ProjectManager, path: str) -> None:
+    """Uložení stavu jako Session.save (JSON s odsazením)"""
+    with open(f"{path}.tmp", 'w', encoding='utf-8') as f:
+        json.dump(manager.to_dict(), f, indent=2, ensure_ascii=False)
+    os.replace(f"{path}.tmp", path)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Růst záloh za simulovaný měsíc')
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--history', type=int, default=90,
+                        help='Počet dní měření v databázi před začátkem simulace')
+    parser.add_argument('--classes', type=int, default=4)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--interval', type=float, default=60.0,
+                        help='Rozestup měření meteostanice v sekundách')
+    parser.add_argument('--progress', type=float, default=1.5,
+                        help='Počet změn stavu za celé období jako násobek počtu úkolů')
+    parser.add_argument('--chunk-size', type=int, default=64 * 1024)
+    parser.add_argument('--json', default='', help='Uložit výsledky do JSON souboru')
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    generator = WorkloadGenerator(args.seed)
+    start = datetime(2025, 9, 1)
+    days: List[Dict[str, Any]] = []
+
+    with tempfile.TemporaryDirectory() as workdir:
+        config_dir = os.path.join(workdir, 'config')
+        shutil.copytree(os.path.join(REPO_ROOT, 'src', 'config'), config_dir)
+        data_file = os.path.join(workdir, 'project-manager.json')
+        journal_dir = os.path.join(workdir, 'journal')
+        db_path = os.path.join(workdir, 'weather_data.db')
+
+        scenario = generator.school(args.classes, 25, 3, 4)
+        registry = StudentRegistry(max_projects_per_student=3)
+        manager = ProjectManager(os.path.join(workdir, 'pm.log'), registry=registry)
+        journal = Journal(journal_dir).attach(manager)
+        tasks = populate(scenario, manager, registry, [])
+        save_state(manager, data_file)
+        events = generator.progress_events(tasks, int(len(tasks) * args.progress))
+        per_day_events = max(1, len(events) // args.days)
+        readings = int(86400 / args.interval)
+        stream = generator.sensor_stream(readings * (args.history + args.days), args.interval,
+                                         start - timedelta(days=args.history))
+        store = WeatherStore(db_path)
+        store.insert_many(next(stream) for _ in range(readings * args.history))
+
+        engine = BackupEngine(os.path.join(workdir, 'repository'), chunk_size=args.chunk_size)
+        sources = {'config': config_dir, 'projects': data_file, 'journal': journal_dir}
+        full_total = 0
+        print(f"{len(tasks)} úkolů, {readings} měření denně, {args.days} dní\n")
+        print(f"{'den':>3} {'data':>10} {'nové bloky':>11} {'zapsáno':>10} {'záloha':>9} "
+              f"{'repozitář':>10} {'tar.gz/den':>10} {'tar.gz celk.':>12}")
+        for day in range(args.days):
+            store.insert_many(next(stream) for _ in range(readings))
+            for task_id, status in events[day * per_day_events:(day + 1) * per_day_events]:
+                manager.update_task_status(task_id, status)
+            save_state(manager, data_file)
+
+            stats = engine.backup(sources, {'weather': db_path},
+                                  now=start + timedelta(days=day + 1, hours=2))
+            repository = engine.size()['bytes']
+            full = tar_size([config_dir, data_file, journal_dir, db_path])
+            full_total += full
+            days.append({
+                'day': day + 1,
+                'source_bytes': sum(entry['size'] for entry in engine.manifest()['files']),
+                'chunks': stats['chunks'],
+                'chunks_new': stats['chunks_new'],
+                'bytes_stored': stats['bytes_stored'],
+                'duration_ms': stats['duration_ms'],
+                'database_copy_ms': stats.get('database_copy_ms'),
+                'repository_bytes': repository,
+                'full_backup_bytes': full,
+                'full_backups_total': full_total,
+            })
+            row = days[-1]
+            print(f"{row['day']:>3} {row['source_bytes']:>10} "
+                  f"{row['chunks_new']:>5}/{row['chunks']:<5} {row['bytes_stored']:>10} "
+                  f"{row['duration_ms']:>6.0f} ms {repository:>10} {full:>10} {full_total:>12}")
+
+        store.close()
+        journal.close()
+        target = os.path.join(workdir, 'restore')
+        started = time.perf_counter()
+        restored = engine.restore(target)
+        restore_ms = (time.perf_counter() - started) * 1000
+
+    last = days[-1]
+    print(f"\nRepozitář po {args.days} dnech: {last['repository_bytes']} B, "
+          f"denní tar.gz celkem: {last['full_backups_total']} B "
+          f"({last['full_backups_total'] / last['repository_bytes']:.1f}×)")
+    print(f"Průměrná noční záloha: "
+          f"{sum(d['duration_ms'] for d in days[1:]) / max(len(days) - 1, 1):.0f} ms, "
+          f"obnova {restored['bytes']} B za {restore_ms:.0f} ms")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'days': days, 'restore_ms': round(restore_ms, 1)}, f, indent=2,
+                      ensure_ascii=False)
+        print(f"\nUloženo do {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
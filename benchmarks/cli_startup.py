@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark startu příkazu project-manager
+
+Měří dobu spuštění jednoduchých příkazů (reálný čas procesu) a pomocí
+``python -X importtime`` vypisuje nejdražší importy. Kontroluje, že se
+při jednoduchém příkazu nenačítají těžké moduly (yaml, numpy,
+matplotlib).
+
+Použití:
+    python benchmarks/cli_startup.py [--runs 20] [--budget-ms 100]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ('yaml', 'numpy', 'matplotlib', 'sqlite3', 'multiprocessing')
+
+
+def parse_importtime(stderr: str) -> Dict[str, Tuple[int, int]]:
+    """
+    Rozbor výstupu ``-X importtime``.
+
+    Args:
+        stderr: Chybový výstup procesu
+
+    Returns:
+        Slovník {modul: (vlastní čas us, kumulativní čas us)}
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def run_command(args: List[str], data_file: str, importtime: bool = False) -> Tuple[float, str]:
+    """
+    Spuštění příkazu project-manager v novém interpretu.
+
+    Returns:
+        Dvojice (doba běhu v ms, chybový výstup)
+    """
+    command = [sys.executable]
+    if importtime:
+        command += ['-X', 'importtime']
+    command += ['-m', 'src.python.cli', '--data', data_file, *args]
+    started = time.perf_counter()
+    result = subprocess.run(command, cwd=REPO_ROOT, capture_output=True, text=True)
+    elapsed = (time.perf_counter() - started) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(f"Příkaz {args} selhal: {result.stderr}")
+    return elapsed, result.stderr
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark startu project-manager')
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--budget-ms', type=float, default=100.0,
+                        help='Cílový medián doby startu')
+    parser.add_argument('--top', type=int, default=10, help='Počet vypsaných importů')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        data_file = os.path.join(temp_dir, 'state.json')
+        run_command(['student', 'add', '--name', 'Jan Novak', '--class', '8.A',
+                     '--username', 'jan.novak'], data_file)
+
+        baseline = []
+        for _ in range(args.runs):
+            started = time.perf_counter()
+            subprocess.run([sys.executable, '-c', 'pass'], check=True)
+            baseline.append((time.perf_counter() - started) * 1000)
+
+        scenarios = {
+            'student list': ['student', 'list'],
+            'project list': ['project', 'list'],
+        }
+        failed = False
+        for label, command in scenarios.items():
+            timings = [run_command(command, data_file)[0] for _ in range(args.runs)]
+            median = statistics.median(timings)
+            print(f"{label:<16} medián {median:7.1f} ms  "
+                  f"(holý interpret {statistics.median(baseline):.1f} ms)")
+            if median > args.budget_ms:
+                failed = True
+
+            _, stderr = run_command(command, data_file, importtime=True)
+            modules = parse_importtime(stderr)
+            heavy = sorted(m for m in modules if m.split('.')[0] in HEAVY_MODULES)
+            if heavy:
+                print(f"  těžké moduly: {', '.join(heavy)}")
+                failed = True
+            top = sorted(modules.items(), key=lambda item: -item[1][0])[:args.top]
+            for name, (self_us, cumulative_us) in top:
+                print(f"  {self_us / 1000:7.2f} ms  {cumulative_us / 1000:7.2f} ms  {name}")
+
+    if failed:
+        print(f"Překročen rozpočet {args.budget_ms} ms nebo načteny těžké moduly")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Historie pokroku za školní rok
+
+Nasimuluje školní rok (výchozí 300 dní končících dnes) pro zadaný počet
+projektů: na začátku projektu přibudou úkoly, během roku se úkoly
+průběžně přidávají a mění stav (včetně znovuotevření). Všechny změny
+jdou přes ProgressHistory stejně jako z ProjectManageru. Vypíše se
+doba zápisu jedné změny, velikost historie na projekt po kompakci
+a doba výpočtu burndownu s odhadem dokončení.
+
+Použití:
+    python benchmarks/progress_history.py [--projects 40] [--tasks 30] [--days 300]
+    python benchmarks/progress_history.py --changes 20 --json progress.json
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from src.python.progress_history import ProgressHistory  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Historie pokroku za školní rok')
+    parser.add_argument('--projects', type=int, default=40)
+    parser.add_argument('--tasks', type=int, default=30, help='Úkolů na začátku projektu')
+    parser.add_argument('--days', type=int, default=300)
+    parser.add_argument('--changes', type=int, default=10,
+                        help='Změn stavu na projekt za školní den')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', default='', help='Uložit výsledky do JSON souboru')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    now = datetime.now().replace(microsecond=0)
+    start = now - timedelta(days=args.days)
+    names = [f"Projekt {i + 1}" for i in range(args.projects)]
+    with tempfile.TemporaryDirectory() as directory:
+        history = ProgressHistory(directory)
+        open_tasks = dict.fromkeys(names, args.tasks)
+        done = dict.fromkeys(names, 0)
+        for name in names:
+            history.task_added(name, [{'status': 'assigned', 'created_at': start.isoformat()}]
+                               * args.tasks)
+        changes = 0
+        elapsed = 0.0
+        for day in range(args.days):
+            moment = start + timedelta(days=day, hours=8)
+            if moment.weekday() >= 5:
+                continue
+            for name in names:
+                for minute in sorted(rng.sample(range(480), args.changes)):
+                    at = moment + timedelta(minutes=minute)
+                    began = time.perf_counter()
+                    roll = rng.random()
+                    if roll < 0.05:
+                        history.task_added(name, [{'status': 'assigned',
+                                                   'created_at': at.isoformat()}])
+                        open_tasks[name] += 1
+                    elif roll < 0.15 and done[name]:
+                        history.status_changed(name, 'completed', 'in_progress', at)
+                        done[name] -= 1
+                        open_tasks[name] += 1
+                    elif open_tasks[name]:
+                        history.status_changed(name, 'in_progress', 'completed', at)
+                        done[name] += 1
+                        open_tasks[name] -= 1
+                    elapsed += time.perf_counter() - began
+                    changes += 1
+        history.compact(now=now)
+        size = history.size()
+
+        project = {'name': names[0], 'created_at': start.isoformat(), 'timeline': '10 měsíců'}
+        began = time.perf_counter()
+        burndown = history.burndown(project, now=now)
+        burndown_ms = (time.perf_counter() - began) * 1000
+        history.close()
+
+    results = {
+        'projects': args.projects,
+        'days': args.days,
+        'changes': changes,
+        'record_us': round(elapsed / max(changes, 1) * 1e6, 1),
+        'points': size['points'],
+        'bytes': size['bytes'],
+        'bytes_per_project': round(size['bytes'] / max(args.projects, 1)),
+        'bytes_per_point': round(size['bytes'] / max(size['points'], 1), 2),
+        'burndown_ms': round(burndown_ms, 2),
+        'burndown_days': len(burndown['days']),
+        'forecast': burndown['forecast'],
+    }
+    print(f"{args.projects} projektů, {args.days} dní, {changes} změn: "
+          f"{results['record_us']} µs na zápis změny")
+    print(f"Historie: {size['points']} bodů, {size['bytes']} B "
+          f"({results['bytes_per_project']} B na projekt, {results['bytes_per_point']} B na bod)")
+    print(f"Burndown za {len(burndown['days'])} dní: {results['burndown_ms']} ms, "
+          f"odhad {burndown['forecast']['forecast']}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"\nUloženo do {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
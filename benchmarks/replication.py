@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Replikace mezi kiosky na loopbacku
+
+Spustí několik uzlů (kiosků) jako samostatné procesy, každý s vlastním
+žurnálem a replikací (Replicator) na 127.0.0.1. První uzel nese stav
+školy, ostatní začínají prázdné a dorovnají se ze snímku. Potom všechny
+uzly současně mění stav náhodných úkolů (včetně souběžných změn téhož
+úkolu) a přidávají úkoly. Na konci se ověří, že se stav všech uzlů
+sešel, a vypíše se doba dorovnání, zpoždění replikace (p50/p95/max)
+a přenesené bajty na jednu změnu.
+
+Použití:
+    python benchmarks/replication.py [--nodes 3] [--updates 500] [--rate 50]
+    python benchmarks/replication.py --nodes 4 --json replication.json
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import random
+import socket
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from src.python.journal import Journal  # noqa: E402
+from src.python.project_manager import ProjectManager  # noqa: E402
+from src.python.replication import Replicator  # noqa: E402
+from src.python.workload import WorkloadGenerator, populate  # noqa: E402
+
+STATUSES = ('assigned', 'in_progress', 'completed', 'blocked')
+
+
+def free_port() -> int:
+    """Volný port na loopbacku"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def digest(manager: ProjectManager) -> str:
+    """Otisk stavu uzlu (pro kontrolu, že se stavy sešly)"""
+    state = json.dumps(manager.to_dict(), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(state.encode('utf-8')).hexdigest()[:16]
+
+
+def quiet(replicator: Replicator, seconds: float) -> bool:
+    """Všechny protějšky převzaty a nic nečeká"""
+    stats = replicator.stats()
+    return not stats['deferred'] and all(
+        peer['behind'] == 0 and peer['last_pull'] and time.time() - peer['last_pull'] < seconds
+        for peer in stats['peers'].values())
+
+
+def run_node(node: str, ports: Dict[str, int], workdir: str, args: argparse.Namespace,
+             ready: Any, go: Any, finished: Any, results: Any) -> None:
+    """Jeden kiosk: správce se žurnálem a replikací, náhodné změny"""
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger("ProjectManager").propagate = False
+    root = os.path.join(workdir, node)
+    os.makedirs(root)
+    manager = ProjectManager(os.path.join(root, 'pm.log'))
+    Journal(os.path.join(root, 'journal')).attach(manager)
+    first = node == min(ports)
+    if first:
+        scenario = WorkloadGenerator(args.seed).school(args.classes, 25, 3, 4)
+        populate(scenario, manager)
+    peers = {peer: f"http://127.0.0.1:{port}" for peer, port in ports.items() if peer != node}
+    replicator = Replicator(manager, node, peers, host='127.0.0.1', port=ports[node],
+                            batch=args.batch, poll_wait=2.0, interval=0.05)
+    started = time.perf_counter()
+    replicator.start()
+    while len(manager.tasks) == 0 or (
+            not first and replicator.stats()['peers'][min(ports)]['snapshots'] == 0):
+        time.sleep(0.01)
+    catch_up_ms = (time.perf_counter() - started) * 1000
+    ready.release()
+    go.wait()
+
+    rng = random.Random(f"{args.seed}-{node}")
+    project_names = sorted(manager.projects)
+    task_ids = [task['id'] for task in manager.tasks]
+    mutations = 0
+    pace = 1.0 / args.rate if args.rate else 0.0
+    begin = time.perf_counter()
+    for i in range(args.updates):
+        if args.adds and i % max(1, args.updates // args.adds) == 0:
+            manager.add_task(rng.choice(project_names), f"{node} úkol {i}", "student",
+                             "2026-06-30")
+        else:
+            manager.update_task_status(rng.choice(task_ids), rng.choice(STATUSES),
+                                       f"{node} #{i}")
+        mutations += 1
+        if pace:
+            time.sleep(max(0.0, begin + (i + 1) * pace - time.perf_counter()))
+
+    # Počkat na ostatní uzly a na ustálení replikace
+    finished.wait()
+    deadline = time.monotonic() + 60
+    stable_since = None
+    while time.monotonic() < deadline:
+        if quiet(replicator, 3.0):
+            stable_since = stable_since or time.monotonic()
+            if time.monotonic() - stable_since > 1.5:
+                break
+        else:
+            stable_since = None
+        time.sleep(0.05)
+    stats = replicator.stats()
+    replicator.stop()
+    manager.journal.close()
+    results.put({'node': node, 'mutations': mutations, 'catch_up_ms': round(catch_up_ms, 1),
+                 'tasks': len(manager.tasks), 'digest': digest(manager), 'stats': stats})
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Replikace mezi kiosky na loopbacku')
+    parser.add_argument('--nodes', type=int, default=3)
+    parser.add_argument('--classes', type=int, default=4)
+    parser.add_argument('--updates', type=int, default=500, help='Počet změn na každém uzlu')
+    parser.add_argument('--adds', type=int, default=20,
+                        help='Kolik z těchto změn přidá nový úkol')
+    parser.add_argument('--rate', type=float, default=50.0,
+                        help='Změn za sekundu na uzel (0 = co nejrychleji)')
+    parser.add_argument('--batch', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', default='', help='Uložit výsledky do JSON souboru')
+    args = parser.parse_args()
+
+    ports = {f"kiosk-{i + 1}": free_port() for i in range(args.nodes)}
+    ready = multiprocessing.Semaphore(0)
+    go = multiprocessing.Event()
+    finished = multiprocessing.Barrier(args.nodes)
+    results: Any = multiprocessing.Queue()
+    with tempfile.TemporaryDirectory() as workdir:
+        processes = [multiprocessing.Process(
+            target=run_node, args=(node, ports, workdir, args, ready, go, finished, results))
+            for node in ports]
+        for process in processes:
+            process.start()
+        for _ in processes:
+            ready.acquire()
+        started = time.perf_counter()
+        go.set()
+        nodes: List[Dict[str, Any]] = sorted((results.get(timeout=120) for _ in processes),
+                                             key=lambda r: r['node'])
+        elapsed = time.perf_counter() - started
+        for process in processes:
+            process.join()
+
+    print(f"{args.nodes} uzlů, {args.updates} změn na uzel ({args.rate:g}/s), "
+          f"{nodes[0]['tasks']} úkolů na konci, {elapsed:.1f} s\n")
+    print(f"{'uzel':<8} {'od':<8} {'záznamy':>8} {'bajty':>9} {'B/změna':>8} "
+          f"{'p50 ms':>7} {'p95 ms':>7} {'max ms':>7} {'snímky':>6}")
+    records = transferred = snapshots = 0
+    for result in nodes:
+        for peer, stats in sorted(result['stats']['peers'].items()):
+            records += stats['records']
+            transferred += stats['bytes'] - stats['snapshot_bytes']
+            snapshots += stats['snapshot_bytes']
+            print(f"{result['node']:<8} {peer:<8} {stats['records']:>8} {stats['bytes']:>9} "
+                  f"{stats['bytes_per_record'] or 0:>8} {stats['lag_ms_p50'] or 0:>7} "
+                  f"{stats['lag_ms_p95'] or 0:>7} {stats['lag_ms_max'] or 0:>7} "
+                  f"{stats['snapshots']:>6}")
+    converged = len({result['digest'] for result in nodes}) == 1
+    catch_up = ', '.join(f"{result['node']} {result['catch_up_ms']:.0f} ms"
+                         for result in nodes[1:])
+    print(f"\nDorovnání ze snímku: {catch_up} ({snapshots} B snímků)")
+    print(f"Přeneseno {transferred} B za {records} záznamů "
+          f"({transferred / max(records, 1):.0f} B na změnu bez snímků)")
+    print(f"Stav uzlů se sešel: {'ano' if converged else 'NE'}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'nodes': nodes, 'converged': converged, 'elapsed_s': round(elapsed, 2)},
+                      f, indent=2, ensure_ascii=False)
+        print(f"\nUloženo do {args.json}")
+    return 0 if converged else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Simulace škálování celé školy
+
+Pro každý krok (počet tříd) vygeneruje deterministický scénář
+(src/python/workload.py), nahraje ho do ProjectManageru s evidencí
+studentů, přehraje průběh plnění úkolů, reporty projektů, hodnocení
+odevzdaných prací v ProjectEvaluatoru a proud měření do WeatherStore.
+U každé fáze vypíše propustnost a percentily latence, u kroku špičku
+paměti (tracemalloc s --tracemalloc, jinak maximální RSS procesu).
+
+Použití:
+    python benchmarks/scale.py [--steps 1,4,16,64] [--seed 1]
+    python benchmarks/scale.py --steps 8 --rate 10 --readings 600 --json scale.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from src.python.project_evaluator import ProjectEvaluator  # noqa: E402
+from src.python.project_manager import ProjectManager  # noqa: E402
+from src.python.student_registry import StudentRegistry  # noqa: E402
+from src.python.weather_store import WeatherStore  # noqa: E402
+from src.python.workload import (  # noqa: E402
+    WorkloadGenerator, latency_summary, populate, replay
+)
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def max_rss_kb() -> int:
+    """Maximální RSS procesu v kB (0, pokud není k dispozici)"""
+    if resource is None:
+        return 0
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage // 1024 if sys.platform == 'darwin' else usage
+
+
+def timed(operation: Callable[[], Any], latencies: List[float]) -> Any:
+    """Volání operace se záznamem doby trvání"""
+    started = time.perf_counter()
+    result = operation()
+    latencies.append(time.perf_counter() - started)
+    return result
+
+
+def phase(name: str, latencies: List[float], seconds: float) -> Dict[str, Any]:
+    """Souhrn jedné fáze"""
+    summary = latency_summary(latencies)
+    summary['phase'] = name
+    summary['seconds'] = round(seconds, 4)
+    summary['throughput'] = round(len(latencies) / seconds, 1) if seconds > 0 else None
+    return summary
+
+
+def run_step(classes: int, args: argparse.Namespace, workdir: str) -> Dict[str, Any]:
+    """
+    Jeden krok simulace.
+
+    Returns:
+        Slovník s parametry kroku, fázemi a pamětí
+    """
+    generator = WorkloadGenerator(args.seed)
+    scenario = generator.school(classes, args.students, args.projects, args.tasks)
+    registry = StudentRegistry(max_projects_per_student=args.projects)
+    manager = ProjectManager(os.path.join(workdir, f'pm-{classes}.log'), registry=registry)
+    phases = []
+
+    latencies: List[float] = []
+    started = time.perf_counter()
+    tasks = populate(scenario, manager, registry, latencies)
+    phases.append(phase('add_task', latencies, time.perf_counter() - started))
+
+    events = generator.progress_events(tasks, int(len(tasks) * args.progress))
+    latencies = []
+    started = time.perf_counter()
+    for task_id, status in events:
+        timed(lambda: manager.update_task_status(task_id, status), latencies)
+    phases.append(phase('update_task_status', latencies, time.perf_counter() - started))
+
+    latencies = []
+    started = time.perf_counter()
+    for project in scenario['projects']:
+        timed(lambda: manager.generate_report(project['name']), latencies)
+    phases.append(phase('generate_report', latencies, time.perf_counter() - started))
+
+    latencies = []
+    started = time.perf_counter()
+    for project in scenario['projects']:
+        timed(lambda: registry.workload(project['class']), latencies)
+    phases.append(phase('class_workload', latencies, time.perf_counter() - started))
+
+    evaluator = ProjectEvaluator()
+    per_project = max(1, args.submissions // max(len(scenario['projects']), 1))
+    latencies = []
+    started = time.perf_counter()
+    for project in scenario['projects'][:args.submissions]:
+        for submission in generator.submissions(project, per_project):
+            timed(lambda: evaluator.evaluate_project(project, submission), latencies)
+    phases.append(phase('evaluate_project', latencies, time.perf_counter() - started))
+
+    store = WeatherStore(os.path.join(workdir, f'weather-{classes}.db'))
+    sensors = replay(store, generator.sensor_stream(args.readings), rate=args.rate,
+                     batch=args.batch)
+    store.close()
+    sensors['latency']['phase'] = 'sensor_replay'
+    sensors['latency']['seconds'] = sensors['seconds']
+    sensors['latency']['throughput'] = sensors['throughput']
+    phases.append(sensors['latency'])
+
+    for handler in list(manager.logger.handlers):
+        manager.logger.removeHandler(handler)
+        handler.close()
+    return {
+        'classes': classes,
+        'students': len(scenario['students']),
+        'projects': len(scenario['projects']),
+        'tasks': len(tasks),
+        'phases': phases,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Simulace škálování celé školy')
+    parser.add_argument('--steps', default='1,4,16', help='Počty tříd oddělené čárkou')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--students', type=int, default=25, help='Studentů na třídu')
+    parser.add_argument('--projects', type=int, default=3, help='Projektů na třídu')
+    parser.add_argument('--tasks', type=int, default=4, help='Úkolů studenta v projektu')
+    parser.add_argument('--progress', type=float, default=1.5,
+                        help='Počet změn stavu jako násobek počtu úkolů')
+    parser.add_argument('--submissions', type=int, default=50,
+                        help='Počet hodnocených prací v kroku')
+    parser.add_argument('--readings', type=int, default=2000, help='Počet měření')
+    parser.add_argument('--rate', type=float, default=0.0,
+                        help='Měření za sekundu (0 = co nejrychleji)')
+    parser.add_argument('--batch', type=int, default=1, help='Velikost dávky zápisu měření')
+    parser.add_argument('--tracemalloc', action='store_true',
+                        help='Měřit špičku alokací (zpomalí běh)')
+    parser.add_argument('--json', default='', help='Uložit výsledky do JSON souboru')
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    steps = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for classes in (int(step) for step in args.steps.split(',') if step):
+            if args.tracemalloc:
+                tracemalloc.start()
+            result = run_step(classes, args, workdir)
+            if args.tracemalloc:
+                result['peak_kb'] = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+                tracemalloc.stop()
+            result['max_rss_kb'] = max_rss_kb()
+            steps.append(result)
+
+            memory = (f"špička {result['peak_kb']:.0f} kB" if 'peak_kb' in result
+                      else f"max RSS {result['max_rss_kb']} kB")
+            print(f"\n{classes} tříd, {result['students']} studentů, "
+                  f"{result['projects']} projektů, {result['tasks']} úkolů ({memory})")
+            for item in result['phases']:
+                print(f"  {item['phase']:<20} {item['count']:>8}  "
+                      f"{item['throughput'] or 0:>10.0f} op/s  p50 {item['p50_ms'] or 0:8.3f}  "
+                      f"p95 {item['p95_ms'] or 0:8.3f}  p99 {item['p99_ms'] or 0:8.3f} ms")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'seed': args.seed, 'steps': steps}, f, indent=2, ensure_ascii=False)
+        print(f"\nUloženo do {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,588 @@
+#!/usr/bin/env python3
+"""
+Výkonnostní sada src/python a hlídání regresí
+
+Měří úkoly (přidání, změna stavu, vyhledání, filtry, fulltext) při 1k–1M úkolech,
+generate_report a get_project_stats, ConfigManager.get a load_config,
+propustnost logování a zápis a dotazy meteostanice. U každého případu
+zaznamená medián doby běhu a špičku alokované paměti (tracemalloc,
+měřeno ve zvláštním běhu, aby nezkreslovalo čas).
+
+Výsledky se připisují do JSON historie; příkaz compare porovná poslední
+běh se zvoleným základem a vrátí 1, pokud je některý případ pomalejší
+(nebo paměťově náročnější) o víc než zadaný práh.
+
+Použití:
+    python benchmarks/suite.py run [--sizes 1000,10000,100000] [--cases tasks,weather]
+    python benchmarks/suite.py run --sizes 1000000 --label rpi5 --compare
+    python benchmarks/suite.py compare [--baseline rpi5] [--threshold 15]
+"""
+
+import argparse
+import gc
+import json
+import logging
+import logging.handlers
+import os
+import platform
+import queue
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+DEFAULT_HISTORY = os.path.join(REPO_ROOT, 'benchmarks', 'history.json')
+DEFAULT_SIZES = (1000, 10000, 100000)
+STATUSES = ('in_progress', 'completed', 'blocked', 'assigned')
+PRIORITIES = ('low', 'normal', 'high', 'critical')
+STUDENTS = 25
+
+
+class Case:
+    """
+    Jeden měřený případ.
+
+    Attributes:
+        name (str): Název ve tvaru 'skupina.operace'
+        setup (Callable): Příprava stavu (velikost, adresář) -> kontext;
+            neměří se
+        run (Callable): Měřená operace (kontext) -> počet provedených operací
+        teardown (Callable): Úklid kontextu (volitelný)
+        max_size (int): Horní mez velikosti pro pomalé operace (volitelná)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        setup: Callable[[int, str], Dict[str, Any]],
+        run: Callable[[Dict[str, Any]], int],
+        teardown: Optional[Callable[[Dict[str, Any]], None]] = None,
+        max_size: Optional[int] = None
+    ):
+        self.name = name
+        self.setup = setup
+        self.run = run
+        self.teardown = teardown
+        self.max_size = max_size
+
+    def effective_size(self, size: int) -> int:
+        """Velikost po uplatnění horní meze"""
+        return min(size, self.max_size) if self.max_size else size
+
+
+# --- Úkoly a projekty --------------------------------------------------------
+
+def _manager(size: int, workdir: str, tasks: bool = True) -> Dict[str, Any]:
+    """Správce projektů s evidencí studentů a volitelně s úkoly"""
+    from src.python.project_manager import ProjectManager
+    from src.python.student_registry import StudentRegistry
+
+    registry = StudentRegistry(max_projects_per_student=1000)
+    for s in range(STUDENTS):
+        registry.add_student(f"student{s}", f"Student {s}", f"{8 + s % 2}.A")
+    pm = ProjectManager(os.path.join(workdir, 'pm.log'), registry=registry)
+    pm.create_project("Benchmark", "Výkonnostní test", ["Cíl"], "4 týdny")
+    context = {'pm': pm, 'registry': registry, 'size': size, 'ids': []}
+    if tasks:
+        context['ids'] = [_add(pm, i)['id'] for i in range(size)]
+        for i, task_id in enumerate(context['ids']):
+            if i % 3:
+                pm.update_task_status(task_id, STATUSES[i % len(STATUSES)])
+    return context
+
+
+def _add(pm: Any, i: int) -> Dict[str, Any]:
+    return pm.add_task("Benchmark", f"Úkol {i}", f"student{i % STUDENTS}", "2025-12-31",
+                       description="Popis úkolu", priority=PRIORITIES[i % len(PRIORITIES)])
+
+
+def _close_manager(context: Dict[str, Any]) -> None:
+    """Odpojení souborových handlerů, které si ProjectManager přidává"""
+    logger = context['pm'].logger
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+
+
+def _run_add(context: Dict[str, Any]) -> int:
+    pm = context['pm']
+    for i in range(context['size']):
+        _add(pm, i)
+    return context['size']
+
+
+def _run_update(context: Dict[str, Any]) -> int:
+    pm = context['pm']
+    for i, task_id in enumerate(context['ids']):
+        pm.update_task_status(task_id, STATUSES[(i + 1) % len(STATUSES)])
+    return len(context['ids'])
+
+
+def _run_lookup(context: Dict[str, Any]) -> int:
+    registry = context['registry']
+    lookups = 0
+    for _ in range(10):
+        for s in range(STUDENTS):
+            registry.student_tasks(f"student{s}", open_only=True)
+            lookups += 1
+    return lookups
+
+
+def _run_report(context: Dict[str, Any]) -> int:
+    for _ in range(5):
+        context['pm'].generate_report("Benchmark")
+    return 5
+
+
+def _run_stats(context: Dict[str, Any]) -> int:
+    for _ in range(5):
+        context['pm'].get_project_stats("Benchmark")
+    return 5
+
+
+TASK_QUERIES = (
+    {'status': 'blocked'},
+    {'assignee': 'student3', 'status': 'assigned'},
+    {'priority': 'critical', 'deadline_to': '2025-12-31', 'order_by': 'deadline'},
+    {'project': 'Benchmark', 'status': 'in_progress,completed'},
+)
+
+
+def _run_query(context: Dict[str, Any]) -> int:
+    pm = context['pm']
+    for _ in range(5):
+        for filters in TASK_QUERIES:
+            pm.query_tasks(limit=50, **filters)
+    return 5 * len(TASK_QUERIES)
+
+
+SEARCH_QUERIES = ('úkol 42', 'student7', 'stud', 'úkol student3')
+
+
+def _searchable(size: int, workdir: str) -> Dict[str, Any]:
+    """Správce s úkoly a připojeným fulltextovým indexem"""
+    from src.python.search_index import SearchIndex
+
+    context = _manager(size, workdir)
+    SearchIndex().attach(context['pm'])
+    return context
+
+
+def _run_search(context: Dict[str, Any]) -> int:
+    pm = context['pm']
+    for _ in range(10):
+        for query in SEARCH_QUERIES:
+            pm.search(query)
+    return 10 * len(SEARCH_QUERIES)
+
+
+# --- Konfigurace --------------------------------------------------------------
+
+CONFIG_KEYS = ('system.hostname', 'monitoring.enabled', 'monitoring.metrics_port',
+               'alerting.webhook_url', 'neexistuje.klic', 'network.interface')
+
+
+def _config(size: int, workdir: str) -> Dict[str, Any]:
+    from src.python.config_manager import ConfigManager
+
+    config_dir = os.path.join(workdir, 'config')
+    os.makedirs(config_dir, exist_ok=True)
+    shutil.copy(os.path.join(REPO_ROOT, 'src', 'config', 'main-config.yaml'), config_dir)
+    manager = ConfigManager(config_dir)
+    manager.logger.setLevel(logging.WARNING)
+    manager.load_config('main-config.yaml')
+    return {'config': manager, 'size': size}
+
+
+def _close_config(context: Dict[str, Any]) -> None:
+    logger = context['config'].logger
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+
+
+def _run_config_get(context: Dict[str, Any]) -> int:
+    get = context['config'].get
+    for i in range(context['size']):
+        get(CONFIG_KEYS[i % len(CONFIG_KEYS)], None)
+    return context['size']
+
+
+def _run_config_load(context: Dict[str, Any]) -> int:
+    for _ in range(context['size']):
+        context['config'].load_config('main-config.yaml')
+    return context['size']
+
+
+# --- Logování -----------------------------------------------------------------
+
+def _log_file(size: int, workdir: str) -> Dict[str, Any]:
+    logger = logging.getLogger('benchmark.file')
+    logger.propagate = False
+    handler = logging.FileHandler(os.path.join(workdir, 'file.log'))
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    return {'logger': logger, 'handler': handler, 'size': size}
+
+
+def _log_queue(size: int, workdir: str) -> Dict[str, Any]:
+    context = _log_file(size, workdir)
+    logger = context['logger']
+    logger.removeHandler(context['handler'])
+    records: queue.Queue = queue.Queue(-1)
+    context['listener'] = logging.handlers.QueueListener(records, context['handler'])
+    context['queue_handler'] = logging.handlers.QueueHandler(records)
+    logger.addHandler(context['queue_handler'])
+    context['listener'].start()
+    return context
+
+
+def _close_log(context: Dict[str, Any]) -> None:
+    """Vyprázdnění fronty a uzavření souboru (mimo měřený čas)"""
+    if 'listener' in context:
+        context['listener'].stop()
+    for handler in list(context['logger'].handlers):
+        context['logger'].removeHandler(handler)
+    context['handler'].close()
+
+
+def _run_log(context: Dict[str, Any]) -> int:
+    info = context['logger'].info
+    for i in range(context['size']):
+        info("Úkol %d: '%s' → '%s'", i, 'assigned', 'completed')
+    return context['size']
+
+
+# --- Meteostanice -------------------------------------------------------------
+
+def _readings(size: int) -> List[tuple]:
+    start = datetime(2025, 1, 1)
+    return [(start + timedelta(seconds=10 * i), 20.0 + i % 7, 45.0 + i % 11, 1013.0)
+            for i in range(size)]
+
+
+def _weather(size: int, workdir: str, filled: bool = True) -> Dict[str, Any]:
+    from src.python.weather_store import WeatherStore
+
+    path = os.path.join(workdir, f'weather-{time.perf_counter_ns()}.db')
+    store = WeatherStore(path)
+    readings = _readings(size)
+    if filled:
+        store.insert_many(readings)
+    return {'store': store, 'readings': readings, 'size': size,
+            'start': readings[0][0], 'end': readings[-1][0]}
+
+
+def _close_weather(context: Dict[str, Any]) -> None:
+    context['store'].close()
+
+
+def _run_insert_many(context: Dict[str, Any]) -> int:
+    return context['store'].insert_many(context['readings'])
+
+
+def _run_insert_reading(context: Dict[str, Any]) -> int:
+    insert = context['store'].insert_reading
+    for moment, temperature, humidity, pressure in context['readings']:
+        insert(temperature, humidity, pressure, timestamp=moment)
+    return context['size']
+
+
+def _run_latest(context: Dict[str, Any]) -> int:
+    for _ in range(100):
+        context['store'].latest(10)
+    return 100
+
+
+def _run_range(context: Dict[str, Any]) -> int:
+    start = context['start']
+    span = (context['end'] - start) / 10
+    for i in range(10):
+        context['store'].query_range(start + span * i, start + span * (i + 1))
+    return 10
+
+
+def _run_hourly(context: Dict[str, Any]) -> int:
+    context['store'].hourly(context['start'], context['end'])
+    return 1
+
+
+CASES = [
+    Case('tasks.add', lambda size, d: _manager(size, d, tasks=False), _run_add, _close_manager),
+    Case('tasks.update', _manager, _run_update, _close_manager),
+    Case('tasks.lookup', _manager, _run_lookup, _close_manager),
+    Case('tasks.report', _manager, _run_report, _close_manager),
+    Case('tasks.stats', _manager, _run_stats, _close_manager),
+    Case('tasks.query', _manager, _run_query, _close_manager),
+    Case('tasks.search', _searchable, _run_search, _close_manager),
+    Case('config.get', _config, _run_config_get, _close_config),
+    Case('config.load', _config, _run_config_load, _close_config, max_size=50),
+    Case('logging.file', _log_file, _run_log, _close_log),
+    Case('logging.queue', _log_queue, _run_log, _close_log),
+    Case('weather.insert_many', lambda size, d: _weather(size, d, filled=False),
+         _run_insert_many, _close_weather),
+    Case('weather.insert_reading', lambda size, d: _weather(size, d, filled=False),
+         _run_insert_reading, _close_weather, max_size=2000),
+    Case('weather.latest', _weather, _run_latest, _close_weather),
+    Case('weather.range', _weather, _run_range, _close_weather),
+    Case('weather.hourly', _weather, _run_hourly, _close_weather),
+]
+
+
+def measure(case: Case, size: int, repeat: int, workdir: str,
+            memory: bool = True) -> Dict[str, Any]:
+    """
+    Změření jednoho případu.
+
+    Každé opakování dostane čerstvý stav ze setup(); čas se měří jen
+    u run(). Špička paměti se měří v samostatném běhu navíc, protože
+    tracemalloc běh několikanásobně zpomalí.
+
+    Args:
+        case: Měřený případ
+        size: Požadovaná velikost (počet úkolů, záznamů, volání)
+        repeat: Počet měřených opakování
+        workdir: Adresář pro dočasné soubory
+        memory: Měřit špičku paměti
+
+    Returns:
+        Slovník s mediánem, minimem, počtem operací a špičkou paměti
+    """
+    size = case.effective_size(size)
+    timings = []
+    operations = 0
+    peak_kb = None
+    for attempt in range(repeat + (1 if memory else 0)):
+        context = case.setup(size, workdir)
+        gc.collect()
+        try:
+            if memory and attempt == 0:
+                tracemalloc.start()
+                case.run(context)
+                peak_kb = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+                tracemalloc.stop()
+                continue
+            started = time.perf_counter()
+            operations = case.run(context)
+            timings.append(time.perf_counter() - started)
+        finally:
+            if case.teardown:
+                case.teardown(context)
+    median = statistics.median(timings)
+    return {
+        'size': size,
+        'operations': operations,
+        'seconds': round(median, 6),
+        'min_seconds': round(min(timings), 6),
+        'ops_per_second': round(operations / median, 1) if median else None,
+        'peak_kb': peak_kb,
+    }
+
+
+def run_suite(sizes: List[int], groups: Optional[List[str]] = None, repeat: int = 5,
+              memory: bool = True, output: Callable[[str], None] = print) -> Dict[str, Dict]:
+    """
+    Spuštění vybraných případů pro všechny velikosti.
+
+    Returns:
+        Slovník {'případ@velikost': výsledek}
+    """
+    results: Dict[str, Dict] = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for case in CASES:
+            if groups and case.name.split('.')[0] not in groups and case.name not in groups:
+                continue
+            for size in sorted(set(case.effective_size(s) for s in sizes)):
+                result = measure(case, size, repeat, workdir, memory)
+                results[f"{case.name}@{size}"] = result
+                peak = f"{result['peak_kb']:>10.0f} kB" if result['peak_kb'] is not None else ''
+                output(f"{case.name:<24} {size:>8}  {result['seconds'] * 1000:10.2f} ms  "
+                       f"{result['ops_per_second'] or 0:>12.0f} op/s{peak}")
+    return results
+
+
+# --- Historie a porovnání -----------------------------------------------------
+
+def load_history(path: str) -> List[Dict[str, Any]]:
+    """Načtení historie běhů (prázdný seznam, pokud soubor neexistuje)"""
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def append_history(path: str, results: Dict[str, Dict], label: str = "") -> Dict[str, Any]:
+    """
+    Připsání běhu do historie.
+
+    Returns:
+        Uložený záznam běhu
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                                capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ''
+    entry = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'label': label,
+        'commit': commit,
+        'python': platform.python_version(),
+        'machine': f"{platform.node()} {platform.machine()}",
+        'results': results,
+    }
+    history = load_history(path)
+    history.append(entry)
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(history, f, indent=2, ensure_ascii=False)
+    os.replace(temp_path, path)
+    return entry
+
+
+def find_baseline(history: List[Dict[str, Any]], baseline: Optional[str]) -> Dict[str, Any]:
+    """
+    Výběr základu pro porovnání.
+
+    Args:
+        history: Historie běhů (poslední je porovnávaný)
+        baseline: Štítek, commit nebo index běhu; None = předposlední běh
+
+    Raises:
+        ValueError: Pokud základ neexistuje
+    """
+    if baseline is None:
+        if len(history) < 2:
+            raise ValueError("Historie obsahuje méně než dva běhy")
+        return history[-2]
+    for entry in reversed(history[:-1]):
+        if baseline in (entry.get('label'), entry.get('commit')):
+            return entry
+    try:
+        return history[int(baseline)]
+    except (ValueError, IndexError):
+        raise ValueError(f"Základ '{baseline}' nebyl v historii nalezen")
+
+
+def compare(base: Dict[str, Dict], current: Dict[str, Dict], threshold: float = 15.0,
+            memory_threshold: float = 20.0, min_seconds: float = 0.001) -> List[Dict[str, Any]]:
+    """
+    Porovnání dvou běhů.
+
+    Args:
+        base: Výsledky základu {'případ@velikost': výsledek}
+        current: Výsledky porovnávaného běhu
+        threshold: Povolené zpomalení v procentech
+        memory_threshold: Povolený nárůst špičky paměti v procentech
+        min_seconds: Případy rychlejší než tato mez se v čase neposuzují
+            (jsou pod úrovní šumu)
+
+    Returns:
+        Seznam řádků porovnání s klíčem 'regression'
+    """
+    rows = []
+    for key in sorted(set(base) & set(current)):
+        old, new = base[key], current[key]
+        time_change = (new['seconds'] / old['seconds'] - 1) * 100 if old['seconds'] else 0.0
+        memory_change = None
+        if old.get('peak_kb') and new.get('peak_kb') is not None:
+            memory_change = (new['peak_kb'] / old['peak_kb'] - 1) * 100
+        slow = time_change > threshold and max(old['seconds'], new['seconds']) >= min_seconds
+        heavy = memory_change is not None and memory_change > memory_threshold
+        rows.append({
+            'case': key,
+            'base_seconds': old['seconds'],
+            'seconds': new['seconds'],
+            'time_change': round(time_change, 1),
+            'memory_change': round(memory_change, 1) if memory_change is not None else None,
+            'regression': slow or heavy,
+        })
+    return rows
+
+
+def print_comparison(rows: List[Dict[str, Any]], output: Callable[[str], None] = print) -> None:
+    """Výpis tabulky porovnání"""
+    for row in rows:
+        memory = f"{row['memory_change']:+7.1f} %" if row['memory_change'] is not None else ''
+        flag = '  REGRESE' if row['regression'] else ''
+        output(f"{row['case']:<32} {row['base_seconds'] * 1000:10.2f} → "
+               f"{row['seconds'] * 1000:10.2f} ms  {row['time_change']:+7.1f} %  {memory}{flag}")
+
+
+def _compare_command(args: argparse.Namespace) -> int:
+    history = load_history(args.history)
+    if not history:
+        print(f"Historie {args.history} je prázdná")
+        return 1
+    try:
+        base = find_baseline(history, args.baseline)
+    except ValueError as e:
+        print(e)
+        return 1
+    rows = compare(base['results'], history[-1]['results'], args.threshold,
+                   args.memory_threshold, args.min_seconds)
+    print(f"Základ: {base['timestamp']} {base.get('label') or ''} {base.get('commit') or ''}")
+    print_comparison(rows)
+    regressions = [row['case'] for row in rows if row['regression']]
+    if regressions:
+        print(f"Regrese nad {args.threshold} % (paměť {args.memory_threshold} %): "
+              f"{', '.join(regressions)}")
+        return 1
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Výkonnostní sada a hlídání regresí')
+    parser.add_argument('--history', default=DEFAULT_HISTORY, help='JSON soubor s historií')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help='Spuštění měření a uložení do historie')
+    run.add_argument('--sizes', default=','.join(str(s) for s in DEFAULT_SIZES),
+                     help='Velikosti oddělené čárkou (např. 1000,1000000)')
+    run.add_argument('--cases', default='',
+                     help='Skupiny nebo případy oddělené čárkou (tasks, config.get, ...)')
+    run.add_argument('--repeat', type=int, default=5)
+    run.add_argument('--no-memory', action='store_true', help='Neměřit špičku paměti')
+    run.add_argument('--label', default='', help='Štítek běhu (např. rpi5-baseline)')
+    run.add_argument('--no-save', action='store_true', help='Neukládat do historie')
+    run.add_argument('--compare', action='store_true', help='Po běhu porovnat se základem')
+
+    check = commands.add_parser('compare', help='Porovnání posledního běhu se základem')
+    for command in (run, check):
+        command.add_argument('--baseline', default=None,
+                             help='Štítek, commit nebo index základu (výchozí: předchozí běh)')
+        command.add_argument('--threshold', type=float, default=15.0,
+                             help='Povolené zpomalení v procentech')
+        command.add_argument('--memory-threshold', type=float, default=20.0,
+                             help='Povolený nárůst špičky paměti v procentech')
+        command.add_argument('--min-seconds', type=float, default=0.001,
+                             help='Kratší případy se v čase neposuzují (šum)')
+    args = parser.parse_args()
+
+    if args.command == 'compare':
+        return _compare_command(args)
+
+    sizes = [int(size) for size in args.sizes.split(',') if size]
+    groups = [group for group in args.cases.split(',') if group] or None
+    results = run_suite(sizes, groups, args.repeat, memory=not args.no_memory)
+    if args.no_save:
+        return 0
+    append_history(args.history, results, args.label)
+    print(f"Uloženo do {args.history}")
+    if args.compare and len(load_history(args.history)) > 1:
+        return _compare_command(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Sloupcový archiv měření proti SQLite
+
+Naplní tabulku weather_data měřeními po sekundě za zadaný počet dní,
+převede je do sloupcového archivu (export_sqlite) a porovná: velikost
+na disku, dobu otevření archivu, průměr teploty přes všechna měření
+(memoryview nad mmap proti SELECT z SQLite) a výběr jednoho dne.
+S numpy se měří i průměr přes numpy.memmap.
+
+Použití:
+    python benchmarks/weather_archive.py [--days 7]
+    python benchmarks/weather_archive.py --days 30 --json archive.json
+"""
+
+import argparse
+import functools
+import json
+import math
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Sequence
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from src.python.weather_archive import WeatherArchive, export_sqlite  # noqa: E402
+from src.python.weather_store import WeatherStore  # noqa: E402
+
+
+def timed(function: Any) -> tuple:
+    """Výsledek a doba běhu v milisekundách"""
+    started = time.perf_counter()
+    result = function()
+    return result, round((time.perf_counter() - started) * 1000, 2)
+
+
+def mean_mmap(columns: Sequence[Any], count: int) -> float:
+    """Průměr přes memoryview segmentů"""
+    return sum(sum(column) for column in columns) / count
+
+
+def mean_numpy(arrays: Sequence[Any], count: int) -> float:
+    """Průměr přes numpy.memmap segmentů"""
+    return sum(float(values.sum()) for values in arrays) / count
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Sloupcový archiv měření proti SQLite')
+    parser.add_argument('--days', type=int, default=7, help='Dní měření po sekundě')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', default='', help='Uložit výsledky do JSON souboru')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    start = datetime(2025, 9, 1)
+    rows = args.days * 86400
+    results: Dict[str, Any] = {'days': args.days, 'rows': rows}
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, 'weather.db')
+        store = WeatherStore(db_path)
+        for day in range(args.days):
+            store.insert_many(
+                (start + timedelta(days=day, seconds=second),
+                 round(15 + 8 * math.sin(second / 13750) + rng.random(), 2),
+                 round(50 + rng.random() * 20, 1), round(1013 + rng.random(), 2))
+                for second in range(86400))
+        store.close()
+
+        archive = WeatherArchive(os.path.join(directory, 'archive'))
+        count, results['export_ms'] = timed(lambda: export_sqlite(db_path, archive))
+        archive.close()
+        results['sqlite_bytes'] = os.path.getsize(db_path)
+        results['archive_bytes'] = sum(segment.size() for segment in archive.segments)
+
+        archive, results['open_ms'] = timed(
+            lambda: WeatherArchive(os.path.join(directory, 'archive')))
+        columns, results['map_ms'] = timed(lambda: archive.column('temperature'))
+        average, results['mean_mmap_ms'] = timed(functools.partial(mean_mmap, columns, count))
+        connection = sqlite3.connect(db_path)
+        _, results['mean_sqlite_ms'] = timed(lambda: connection.execute(
+            "SELECT AVG(temperature) FROM weather_data").fetchone()[0])
+        day_start = start + timedelta(days=args.days // 2)
+        day_end = day_start + timedelta(days=1)
+        _, results['day_archive_ms'] = timed(lambda: sum(
+            len(values) for values in archive.select('temperature', day_start, day_end)))
+        _, results['day_sqlite_ms'] = timed(lambda: len(connection.execute(
+            "SELECT temperature FROM weather_data WHERE timestamp >= ? AND timestamp < ?",
+            (str(day_start), str(day_end))).fetchall()))
+        connection.close()
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            results['mean_numpy_ms'] = None
+        else:
+            arrays = archive.memmap('temperature')
+            _, results['mean_numpy_ms'] = timed(
+                functools.partial(mean_numpy, arrays, count))
+            del arrays
+        del columns
+        archive.close()
+
+    print(f"{rows} měření ({args.days} dní po sekundě), průměr teploty {average:.3f} °C")
+    print(f"Export z SQLite: {results['export_ms'] / 1000:.1f} s")
+    print(f"Velikost: SQLite {results['sqlite_bytes'] / 1e6:.1f} MB, "
+          f"archiv {results['archive_bytes'] / 1e6:.1f} MB")
+    print(f"Otevření archivu {results['open_ms']} ms, mapování kanálu {results['map_ms']} ms")
+    numpy_ms = results['mean_numpy_ms']
+    print(f"Průměr přes vše: mmap {results['mean_mmap_ms']} ms, "
+          f"SQLite {results['mean_sqlite_ms']} ms, "
+          f"numpy {f'{numpy_ms} ms' if numpy_ms is not None else 'není nainstalováno'}")
+    print(f"Jeden den: archiv {results['day_archive_ms']} ms, "
+          f"SQLite {results['day_sqlite_ms']} ms")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"\nUloženo do {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
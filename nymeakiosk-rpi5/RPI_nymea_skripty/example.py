@@ -1,5 +1,6 @@
 # Ukázka vytvoření projektové šablony v Pythonu
-from education_templates import ProjectTemplate
+# (spouštět z kořene repozitáře; šablona se uloží do /app/config/templates)
+from src.python.education_templates import ProjectTemplate
 
 python_project = ProjectTemplate(
     name="Weather Station IoT",
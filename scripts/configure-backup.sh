@@ -1,2 +1,47 @@
 #!/bin/bash
-echo 'Backup config placeholder'
\ No newline at end of file
+################################################################################
+# Nastavení zálohování - kiosk-backup z cronu
+# Plán a retence se berou ze sekce security hlavní konfigurace
+# (backup_schedule, backup_retention_days, backup_location).
+#
+# Použití: configure-backup.sh [--frequency=daily|weekly] [--retention=DNY]
+#          [--config=SOUBOR] [--weather-db=SOUBOR]
+################################################################################
+
+set -euo pipefail
+
+CONFIG="${PROJECT_MANAGER_CONFIG:-/etc/nymea/main-config.yaml}"
+WEATHER_DB=""
+FREQUENCY=""
+RETENTION=""
+CRON_FILE="/etc/cron.d/nymea-backup"
+
+for arg in "$@"; do
+    case "$arg" in
+        --frequency=*) FREQUENCY="${arg#*=}" ;;
+        --retention=*) RETENTION="${arg#*=}" ;;
+        --config=*) CONFIG="${arg#*=}" ;;
+        --weather-db=*) WEATHER_DB="${arg#*=}" ;;
+        *) echo "✗ Neznámý parametr: $arg" >&2; exit 1 ;;
+    esac
+done
+
+BACKUP=(kiosk-backup)
+command -v kiosk-backup >/dev/null || BACKUP=(python3 -m src.python.backup)
+[ -f "$CONFIG" ] && BACKUP+=(--config "$CONFIG")
+
+case "$FREQUENCY" in
+    daily) SCHEDULE="0 2 * * *" ;;
+    weekly) SCHEDULE="0 2 * * 0" ;;
+    "") SCHEDULE="$("${BACKUP[@]}" schedule)" ;;
+    *) echo "✗ Neznámá frekvence: $FREQUENCY" >&2; exit 1 ;;
+esac
+
+COMMAND="${BACKUP[*]}"
+[ -n "$RETENTION" ] && COMMAND+=" --retention-days $RETENTION"
+COMMAND+=" run --prune"
+[ -n "$WEATHER_DB" ] && COMMAND+=" --weather-db $WEATHER_DB"
+
+echo "$SCHEDULE root cd $(pwd) && $COMMAND >> /var/log/nymea-kiosk/backup.log 2>&1" \
+    | sudo tee "$CRON_FILE" >/dev/null
+echo "✓ Zálohování naplánováno ($SCHEDULE): $CRON_FILE"
@@ -1,2 +1,35 @@
 #!/bin/bash
-echo 'Restore backup placeholder'
\ No newline at end of file
+################################################################################
+# Obnova zálohy - kiosk-backup restore
+# Obnoví snímek do cílového adresáře (bez přepsání živých dat); soubory
+# se pak ručně přesunou na místo při zastavených službách.
+#
+# Použití: restore-backup.sh [--snapshot=ID] [--target=ADRESÁŘ] [--include=PREFIX]
+#          restore-backup.sh --list
+################################################################################
+
+set -euo pipefail
+
+CONFIG="${PROJECT_MANAGER_CONFIG:-/etc/nymea/main-config.yaml}"
+TARGET="/home/nymea/restore-$(date +%Y%m%d_%H%M%S)"
+SNAPSHOT=()
+INCLUDE=()
+
+BACKUP=(kiosk-backup)
+command -v kiosk-backup >/dev/null || BACKUP=(python3 -m src.python.backup)
+[ -f "$CONFIG" ] && BACKUP+=(--config "$CONFIG")
+
+for arg in "$@"; do
+    case "$arg" in
+        --list) exec "${BACKUP[@]}" list ;;
+        --snapshot=*) SNAPSHOT=(--snapshot "${arg#*=}") ;;
+        --target=*) TARGET="${arg#*=}" ;;
+        --include=*) INCLUDE+=(--include "${arg#*=}") ;;
+        *) echo "✗ Neznámý parametr: $arg" >&2; exit 1 ;;
+    esac
+done
+
+"${BACKUP[@]}" verify ${SNAPSHOT[@]+"${SNAPSHOT[@]}"}
+"${BACKUP[@]}" restore --target "$TARGET" ${SNAPSHOT[@]+"${SNAPSHOT[@]}"} \
+    ${INCLUDE[@]+"${INCLUDE[@]}"}
+echo "✓ Záloha obnovena do $TARGET"
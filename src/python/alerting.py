@@ -0,0 +1,509 @@
+"""
+Vyhodnocování upozornění - Alerting Rules Engine
+
+Modul s deklarativními pravidly (prahové hodnoty a rychlost změny) nad
+metrikami meteostanice, systému a projektů. Pravidla se zkompilují
+jednou při načtení konfigurace a vyhodnocují se průběžně s každým novým
+vzorkem (bez dotazů do historie): prahová pravidla drží jen čítač
+po sobě jdoucích překročení, pravidla rychlosti změny jen krátké okno
+posledních hodnot. Upozornění se odesílají jen při změně stavu
+(deduplikace), návrat do normálu používá hysterezi a oznamovače jsou
+zaměnitelné (log, sběrnice událostí, webhook, lokální pro testy).
+Spuštěný engine předává upozornění oznamovačům z vlastního vlákna, takže
+pomalý webhook nebrzdí EventBus.publish (a zámek správce projektů).
+"""
+
+import bisect
+import json
+import logging
+import queue
+import threading
+import time
+import urllib.request
+from collections import deque
+from datetime import date
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from .metrics import get_registry
+from .profiling import traced
+
+
+SEVERITIES = ('info', 'warning', 'critical')
+OPEN_STATUSES = ('assigned', 'in_progress', 'blocked')
+
+# Výchozí pravidla (sekce alerting.rules v hlavní konfiguraci je přepíše)
+DEFAULT_RULES: List[Dict[str, Any]] = [
+    {'name': 'cpu_hot', 'metric': 'system.cpu_temperature', 'above': 80, 'clear': 75,
+     'for': 3, 'severity': 'warning', 'message': "Teplota CPU {value:.1f} °C"},
+    {'name': 'throttled', 'metric': 'system.throttled', 'above': 0,
+     'severity': 'critical', 'message': "Raspberry Pi je škrceno (příznaky {value:.0f})"},
+    {'name': 'temperature_spike', 'metric': 'weather.temperature', 'rate_above': 5,
+     'window': 600, 'severity': 'warning',
+     'message': "Teplota se změnila o {value:+.1f} °C za 10 minut"},
+    {'name': 'overdue_tasks', 'metric': 'projects.overdue_tasks', 'above': 0,
+     'severity': 'info', 'message': "Úkoly po termínu: {value:.0f}"},
+]
+
+_FIRED = get_registry().counter(
+    'alerts_fired_total', 'Počet spuštěných upozornění', ['rule', 'severity'])
+
+
+class Rule:
+    """
+    Zkompilované pravidlo.
+
+    Attributes:
+        name (str): Název pravidla
+        metric (str): Sledovaná metrika (např. 'system.cpu_temperature')
+        severity (str): Závažnost (info, warning, critical)
+        threshold (float): Práh spuštění
+        clear (float): Práh návratu do normálu (hystereze)
+        above (bool): True pro překročení nahoru, False pro pokles pod práh
+        window (Optional[float]): Okno rychlosti změny v sekundách (None = práh hodnoty)
+        consecutive (int): Počet po sobě jdoucích překročení před spuštěním
+        repeat (Optional[float]): Interval opakovaného oznámení (None = jen jednou)
+        message (str): Šablona zprávy ({value}, {rule}, {key}, {metric})
+    """
+
+    def __init__(self, spec: Dict[str, Any]):
+        """
+        Kompilace pravidla z konfigurace.
+
+        Args:
+            spec: Slovník s klíči name, metric a právě jedním z above, below,
+                rate_above, rate_below (rate_* vyžaduje window); volitelně
+                clear, for, severity, repeat a message
+
+        Raises:
+            ValueError: Pokud pravidlo není platné
+        """
+        name = spec.get('name')
+        if not name or not spec.get('metric'):
+            raise ValueError(f"Pravidlo musí mít název a metriku: {spec}")
+        conditions = [key for key in ('above', 'below', 'rate_above', 'rate_below') if key in spec]
+        if len(conditions) != 1:
+            raise ValueError(
+                f"Pravidlo '{name}' musí mít právě jednu podmínku "
+                "(above, below, rate_above, rate_below)"
+            )
+        condition = conditions[0]
+        severity = spec.get('severity', 'warning')
+        if severity not in SEVERITIES:
+            raise ValueError(f"Pravidlo '{name}': neznámá závažnost '{severity}'")
+
+        self.name = name
+        self.metric = spec['metric']
+        self.severity = severity
+        self.threshold = float(spec[condition])
+        self.above = condition.endswith('above')
+        self.clear = float(spec.get('clear', self.threshold))
+        if (self.above and self.clear > self.threshold) or \
+                (not self.above and self.clear < self.threshold):
+            raise ValueError(f"Pravidlo '{name}': práh clear musí být na opačné straně prahu")
+        self.window: Optional[float] = None
+        if condition.startswith('rate'):
+            if 'window' not in spec or float(spec['window']) <= 0:
+                raise ValueError(f"Pravidlo '{name}': rychlost změny vyžaduje kladné window")
+            self.window = float(spec['window'])
+        self.consecutive = max(1, int(spec.get('for', 1)))
+        self.repeat = float(spec['repeat']) if spec.get('repeat') else None
+        self.message = spec.get('message', f"{name}: {{value}}")
+
+    def breached(self, value: float) -> bool:
+        """Překročení prahu spuštění"""
+        return value > self.threshold if self.above else value < self.threshold
+
+    def cleared(self, value: float) -> bool:
+        """Návrat pod práh clear (hystereze)"""
+        return value <= self.clear if self.above else value >= self.clear
+
+    def format(self, value: float, key: str) -> str:
+        """Text upozornění"""
+        try:
+            return self.message.format(value=value, rule=self.name, key=key, metric=self.metric)
+        except (KeyError, IndexError, ValueError):
+            return f"{self.name}: {value}"
+
+
+class _State:
+    """Stav pravidla pro jednu řadu (metrika + klíč)"""
+
+    __slots__ = ('pending', 'firing', 'since', 'notified_at', 'value', 'window')
+
+    def __init__(self, rule: Rule):
+        self.pending = 0
+        self.firing = False
+        self.since = 0.0
+        self.notified_at = 0.0
+        self.value = 0.0
+        self.window: Optional[Deque[Tuple[float, float]]] = deque() if rule.window else None
+
+
+class Notifier:
+    """Rozhraní oznamovače upozornění"""
+
+    def notify(self, alert: Dict[str, Any]) -> None:
+        """
+        Odeslání upozornění.
+
+        Args:
+            alert: Slovník s klíči rule, metric, key, state (firing/resolved),
+                severity, value, message, time a since
+        """
+        raise NotImplementedError
+
+
+class LocalNotifier(Notifier):
+    """Oznamovač, který upozornění jen ukládá (testy, ladění)"""
+
+    def __init__(self):
+        self.alerts: List[Dict[str, Any]] = []
+
+    def notify(self, alert: Dict[str, Any]) -> None:
+        self.alerts.append(alert)
+
+
+class LogNotifier(Notifier):
+    """Oznamovač zapisující upozornění do logu"""
+
+    def __init__(self):
+        self.logger = logging.getLogger("Alerting")
+
+    def notify(self, alert: Dict[str, Any]) -> None:
+        if alert['state'] == 'resolved':
+            self.logger.info(f"Vyřešeno: {alert['message']}")
+        elif alert['severity'] == 'critical':
+            self.logger.error(alert['message'])
+        else:
+            self.logger.warning(alert['message'])
+
+
+class EventBusNotifier(Notifier):
+    """Oznamovač publikující upozornění do sběrnice (SSE, kiosk)"""
+
+    def __init__(self, event_bus: Any):
+        self.event_bus = event_bus
+
+    def notify(self, alert: Dict[str, Any]) -> None:
+        self.event_bus.publish(f"alert.{alert['state']}", alert,
+                               key=f"alert:{alert['rule']}:{alert['key']}")
+
+
+class WebhookNotifier(Notifier):
+    """
+    Oznamovač odesílající upozornění jako JSON POST (např. na webhook
+    nymea nebo Node-RED, který je předá push, e-mail nebo Telegram pluginu).
+    """
+
+    def __init__(self, url: str, timeout: float = 5.0):
+        self.url = url
+        self.timeout = timeout
+
+    def notify(self, alert: Dict[str, Any]) -> None:
+        request = urllib.request.Request(
+            self.url, data=json.dumps(alert, ensure_ascii=False).encode('utf-8'),
+            headers={'Content-Type': 'application/json'}, method='POST'
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            pass
+
+
+class OverdueTracker:
+    """
+    Průběžný počet otevřených úkolů po termínu.
+
+    Termíny otevřených úkolů se drží seřazené, takže počet úkolů po termínu
+    je jedno binární vyhledání a změna úkolu jedno vložení/odebrání.
+    Třída není vláknově bezpečná; AlertEngine ji používá pod svým zámkem.
+    """
+
+    def __init__(self):
+        self._deadlines: List[str] = []
+        self._open: Dict[int, str] = {}
+
+    def rebuild(self, tasks: Iterable[Dict[str, Any]]) -> None:
+        """Sestavení z úplného seznamu úkolů"""
+        self._open = {
+            task['id']: task['deadline'] for task in list(tasks)
+            if task['status'] in OPEN_STATUSES and task.get('deadline')
+        }
+        self._deadlines = sorted(self._open.values())
+
+    def update(self, task_id: int, status: str, deadline: Optional[str]) -> None:
+        """Započtení nového nebo změněného úkolu"""
+        old = self._open.pop(task_id, None)
+        if old is not None:
+            del self._deadlines[bisect.bisect_left(self._deadlines, old)]
+        if status in OPEN_STATUSES and deadline:
+            self._open[task_id] = deadline
+            bisect.insort(self._deadlines, deadline)
+
+    def overdue(self, today: Optional[date] = None) -> int:
+        """Počet otevřených úkolů s termínem před dneškem"""
+        return bisect.bisect_left(self._deadlines, (today or date.today()).isoformat())
+
+
+class AlertEngine:
+    """
+    Vyhodnocování pravidel upozornění.
+
+    Attributes:
+        rules (List[Rule]): Zkompilovaná pravidla
+        notifiers (List[Notifier]): Oznamovače
+        overdue (OverdueTracker): Počet úkolů po termínu
+        logger (logging.Logger): Logger pro auditování
+    """
+
+    def __init__(
+        self,
+        rules: Iterable[Dict[str, Any]] = DEFAULT_RULES,
+        notifiers: Optional[List[Notifier]] = None,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Inicializace a kompilace pravidel.
+
+        Args:
+            rules: Pravidla ve tvaru slovníků (viz Rule)
+            notifiers: Oznamovače (výchozí: LogNotifier)
+            clock: Zdroj času pro vzorky bez časové značky
+
+        Raises:
+            ValueError: Pokud je některé pravidlo neplatné nebo se název opakuje
+        """
+        self.rules = [Rule(spec) for spec in rules]
+        names = [rule.name for rule in self.rules]
+        if len(set(names)) != len(names):
+            raise ValueError("Názvy pravidel se nesmí opakovat")
+        self.notifiers = notifiers if notifiers is not None else [LogNotifier()]
+        self.overdue = OverdueTracker()
+        self.logger = logging.getLogger("AlertEngine")
+        self._clock = clock
+        self._by_metric: Dict[str, List[Rule]] = {}
+        for rule in self.rules:
+            self._by_metric.setdefault(rule.metric, []).append(rule)
+        self._states: Dict[Tuple[str, str], _State] = {}
+        self._lock = threading.Lock()
+        self._manager: Optional[Any] = None
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._outbox: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        self._dispatcher: Optional[threading.Thread] = None
+        get_registry().gauge('alerts_firing', 'Počet aktivních upozornění',
+                             callback=lambda: len(self.firing()))
+
+    @classmethod
+    def from_config(cls, config: Any, **kwargs: Any) -> Optional["AlertEngine"]:
+        """
+        Vytvoření podle ``monitoring.alerting_enabled`` a sekce ``alerting``.
+
+        Args:
+            config: ConfigManager (nebo cokoliv s metodou ``get``)
+            **kwargs: Další parametry konstruktoru
+
+        Returns:
+            Engine, nebo None pokud je alerting vypnutý
+        """
+        if not config.get('monitoring.alerting_enabled', False):
+            return None
+        kwargs.setdefault('rules', config.get('alerting.rules', DEFAULT_RULES))
+        if 'notifiers' not in kwargs:
+            notifiers: List[Notifier] = [LogNotifier()]
+            url = config.get('alerting.webhook_url')
+            if url:
+                notifiers.append(WebhookNotifier(url))
+            kwargs['notifiers'] = notifiers
+        return cls(**kwargs)
+
+    @traced()
+    def observe(
+        self, metric: str, value: Optional[float], timestamp: Optional[float] = None,
+        key: str = ''
+    ) -> None:
+        """
+        Vyhodnocení nového vzorku metriky.
+
+        Args:
+            metric: Název metriky
+            value: Hodnota (None se ignoruje)
+            timestamp: Čas vzorku v sekundách (výchozí: teď)
+            key: Rozlišení řady (např. název projektu)
+        """
+        rules = self._by_metric.get(metric)
+        if not rules or value is None:
+            return
+        now = timestamp if timestamp is not None else self._clock()
+        alerts = []
+        with self._lock:
+            for rule in rules:
+                alert = self._evaluate(rule, key, float(value), now)
+                if alert is not None:
+                    alerts.append(alert)
+        for alert in alerts:
+            self._notify(alert)
+
+    def firing(self) -> List[Dict[str, Any]]:
+        """
+        Aktivní upozornění.
+
+        Returns:
+            Seznam slovníků s klíči rule, key, value a since
+        """
+        with self._lock:
+            return [
+                {'rule': rule, 'key': key, 'value': state.value, 'since': state.since}
+                for (rule, key), state in self._states.items() if state.firing
+            ]
+
+    def attach(self, event_bus: Any, manager: Optional[Any] = None) -> None:
+        """
+        Napojení na sběrnici událostí (meteostanice, systém, projekty).
+
+        Args:
+            event_bus: Sběrnice událostí (EventBus)
+            manager: ProjectManager pro počáteční stav úkolů po termínu
+        """
+        self._manager = manager
+        if manager is not None:
+            with self._lock:
+                self.overdue.rebuild(manager.tasks)
+        event_bus.subscribe(self._on_event)
+
+    def tick(self, now: Optional[float] = None) -> None:
+        """Periodické vyhodnocení metrik závislých jen na čase (úkoly po termínu)"""
+        with self._lock:
+            overdue = self.overdue.overdue()
+        self.observe('projects.overdue_tasks', overdue, now)
+
+    def start(self, interval: float = 60.0) -> None:
+        """
+        Spuštění periodického vyhodnocení a odesílání upozornění na pozadí.
+
+        Bez spuštění se oznamovače volají přímo z observe().
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._dispatcher = threading.Thread(
+            target=self._dispatch_loop, name="AlertNotifier", daemon=True)
+        self._dispatcher.start()
+        self._thread = threading.Thread(
+            target=self._run_loop, args=(interval,), name="AlertEngine", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Zastavení periodického vyhodnocení a odeslání upozornění z fronty"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._dispatcher is not None:
+            self._outbox.put(None)
+            self._dispatcher.join(timeout)
+            self._dispatcher = None
+
+    def _run_loop(self, interval: float) -> None:
+        while not self._stop_event.is_set():
+            try:
+                self.tick()
+            except Exception as e:
+                self.logger.error(f"Chyba při vyhodnocení upozornění: {e}")
+            self._stop_event.wait(interval)
+
+    def _evaluate(self, rule: Rule, key: str, value: float, now: float) -> Optional[Dict[str, Any]]:
+        """Posun stavu pravidla o jeden vzorek (volá se se zámkem)"""
+        state = self._states.get((rule.name, key))
+        if state is None:
+            state = self._states[(rule.name, key)] = _State(rule)
+
+        if state.window is not None:
+            window = state.window
+            window.append((now, value))
+            # Ponechá se jeden vzorek starší než okno jako výchozí bod
+            while len(window) > 1 and window[1][0] <= now - rule.window:
+                window.popleft()
+            if len(window) < 2:
+                return None
+            value = value - window[0][1]
+        state.value = value
+
+        if not state.firing:
+            state.pending = state.pending + 1 if rule.breached(value) else 0
+            if state.pending < rule.consecutive:
+                return None
+            state.firing, state.since, state.notified_at = True, now, now
+            _FIRED.labels(rule.name, rule.severity).inc()
+            return self._alert(rule, key, state, 'firing', now)
+
+        if rule.cleared(value):
+            state.firing, state.pending = False, 0
+            return self._alert(rule, key, state, 'resolved', now)
+        if rule.repeat is not None and now - state.notified_at >= rule.repeat:
+            state.notified_at = now
+            return self._alert(rule, key, state, 'firing', now)
+        return None
+
+    def _alert(
+        self, rule: Rule, key: str, state: _State, status: str, now: float
+    ) -> Dict[str, Any]:
+        return {
+            'rule': rule.name,
+            'metric': rule.metric,
+            'key': key,
+            'state': status,
+            'severity': rule.severity,
+            'value': state.value,
+            'message': rule.format(state.value, key),
+            'time': now,
+            'since': state.since,
+        }
+
+    def _dispatch_loop(self) -> None:
+        """Odesílání upozornění z fronty (do značky None ze stop)"""
+        while True:
+            alert = self._outbox.get()
+            if alert is None:
+                return
+            self._deliver(alert)
+
+    def _notify(self, alert: Dict[str, Any]) -> None:
+        """Předání upozornění vláknu oznamovačů (nebo přímo, pokud neběží)"""
+        if self._dispatcher is not None:
+            self._outbox.put(alert)
+        else:
+            self._deliver(alert)
+
+    def _deliver(self, alert: Dict[str, Any]) -> None:
+        for notifier in self.notifiers:
+            try:
+                notifier.notify(alert)
+            except Exception as e:
+                self.logger.error(
+                    f"Oznamovač {type(notifier).__name__} selhal pro '{alert['rule']}': {e}")
+
+    def _on_event(self, event: Dict[str, Any]) -> None:
+        """Převod událostí sběrnice na vzorky metrik"""
+        topic, data = event['topic'], event['data']
+        if topic == 'weather.reading':
+            for channel in ('temperature', 'humidity', 'pressure'):
+                self.observe(f'weather.{channel}', data.get(channel), event['time'])
+        elif topic == 'system.sample':
+            for name, value in data.items():
+                if isinstance(value, (int, float)):
+                    self.observe(f'system.{name}', value, event['time'])
+        elif topic in ('task.added', 'task.status'):
+            with self._lock:
+                self.overdue.update(data['task_id'], data['status'], data.get('deadline'))
+                overdue = self.overdue.overdue()
+            self.observe('projects.overdue_tasks', overdue, event['time'])
+        elif topic == 'tasks.added':
+            with self._lock:
+                for task in data['tasks']:
+                    self.overdue.update(task['task_id'], task['status'], task.get('deadline'))
+                overdue = self.overdue.overdue()
+            self.observe('projects.overdue_tasks', overdue, event['time'])
+        elif topic == 'projects.reloaded' and self._manager is not None:
+            with self._lock:
+                self.overdue.rebuild(self._manager.tasks)
+                overdue = self.overdue.overdue()
+            self.observe('projects.overdue_tasks', overdue, event['time'])
@@ -0,0 +1,844 @@
+"""
+HTTP API kiosku - Kiosk HTTP API
+
+Lokální asyncio HTTP/1.1 server s JSON API nad ProjectManagerem
+a WeatherStore pro kiosk a tablety učitelů. Spojení zůstávají otevřená
+(keep-alive), odpovědi nesou ETag odvozený z čítačů verzí dat, takže
+opakované dotazování bez změny dat vrací jen 304 Not Modified, a větší
+odpovědi se posílají komprimované gzipem. Serializovaná a komprimovaná
+těla se drží v mezipaměti, dokud se verze dat nezmění. Místo dotazování
+mohou klienti odebírat změny přes Server-Sent Events (/api/events).
+
+Endpointy:
+    GET /api/health
+    GET /api/projects
+    GET /api/projects/<název>/report
+    GET /api/projects/<název>/stats
+    GET /api/projects/<název>/progress
+    GET /api/projects/<název>/burndown?weeks=N
+    GET /api/weather/latest?limit=N
+    GET /api/tasks?status=&priority=&assignee=&project=&deadline_from=&deadline_to=
+        &order_by=id|deadline|priority&offset=N&limit=N&explain=1
+    GET /api/search?q=text&limit=N&type=task|project&project=název
+    GET /api/events?topics=task,weather  (text/event-stream)
+    GET /api/debug/spans?enable=1|0      (jen s debug=True)
+    GET /api/debug/profile?mode=stack|memory|cpu|spans&seconds=N&span=název
+"""
+
+import argparse
+import asyncio
+import gzip
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import time
+import uuid
+from http import HTTPStatus
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from .event_bus import EventBus, Subscription
+from .metrics import MetricsServer, get_registry, instrument_logging
+from .profiling import DEFAULT_OUTPUT_DIR, capture, enable_spans, install_signal_handlers, span
+from .search_index import SearchIndex
+from .task_query import MAX_LIMIT, TaskQuery
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8090
+GZIP_MIN_SIZE = 256
+MAX_HEADER_SIZE = 16384
+MAX_WEATHER_LIMIT = 1000
+MAX_SEARCH_LIMIT = 100
+MAX_PROFILE_SECONDS = 60.0
+SSE_HEARTBEAT = 15.0
+SSE_RETRY_MS = 2000
+
+# (klíč mezipaměti, verze dat nebo None, funkce vracející data)
+Route = Tuple[str, Optional[int], Callable[[], Any]]
+
+_RENDER_SECONDS = get_registry().histogram(
+    'api_render_seconds', 'Doba přípravy těla odpovědi (data, JSON, gzip)', ['endpoint'])
+
+
+class HttpError(Exception):
+    """Chyba požadavku, která se vrátí klientovi jako JSON"""
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class ApiServer:
+    """
+    Asyncio HTTP server s JSON API.
+
+    Attributes:
+        manager (ProjectManager): Správce projektů
+        store (WeatherStore): Úložiště meteorologických dat (volitelné)
+        event_bus (EventBus): Sběrnice událostí pro /api/events (volitelná)
+        host (str): Adresa pro naslouchání
+        port (int): Port (0 = libovolný volný, skutečný port po start())
+        keepalive_timeout (float): Doba nečinnosti, po které se spojení zavře
+        stats (Dict[str, int]): Počítadla požadavků
+        logger (logging.Logger): Logger pro auditování
+    """
+
+    def __init__(
+        self,
+        manager: Any,
+        store: Optional[Any] = None,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        keepalive_timeout: float = 15.0,
+        state_file: Optional[str] = None,
+        reload_interval: float = 1.0,
+        event_bus: Optional[Any] = None,
+        sse_heartbeat: float = SSE_HEARTBEAT,
+        weather_watch_interval: float = 0.0,
+        debug: bool = False,
+        profile_dir: Optional[str] = None
+    ):
+        """
+        Inicializace serveru.
+
+        Args:
+            manager: ProjectManager
+            store: WeatherStore (volitelné)
+            host: Adresa pro naslouchání
+            port: Port
+            keepalive_timeout: Doba nečinnosti spojení v sekundách
+            state_file: Soubor se stavem, který se při změně znovu načte
+                (stav zapisuje příkaz project-manager)
+            reload_interval: Jak často kontrolovat změnu souboru se stavem
+            event_bus: Sběrnice událostí (EventBus) pro /api/events
+            sse_heartbeat: Interval komentáře udržujícího SSE spojení
+            weather_watch_interval: Jak často hledat měření zapsaná jiným
+                procesem (0 = nehledat, meteostanice zapisuje ve stejném procesu)
+            debug: Zpřístupnit ladicí endpointy /api/debug/* (profilování)
+            profile_dir: Adresář pro soubory profilů z /api/debug/profile
+        """
+        self.manager = manager
+        self.store = store
+        self.event_bus = event_bus
+        self.sse_heartbeat = sse_heartbeat
+        self.weather_watch_interval = weather_watch_interval
+        self.debug = debug
+        self.profile_dir = profile_dir
+        self.host = host
+        self.port = port
+        self.keepalive_timeout = keepalive_timeout
+        self.state_file = state_file
+        self.reload_interval = reload_interval
+        self.stats = {
+            'requests': 0, 'not_modified': 0, 'gzip': 0, 'cache_hits': 0, 'streams': 0
+        }
+        self.logger = logging.getLogger("ApiServer")
+
+        # ETag obsahuje identifikátor běhu, aby se po restartu serveru
+        # (čítače verzí začínají znovu) neshodoval se starými ETagy klientů
+        self._boot_id = uuid.uuid4().hex[:8]
+        self._cache: Dict[str, Tuple[str, bytes, Optional[bytes]]] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Set[asyncio.Task] = set()
+        self._watcher: Optional[asyncio.Task] = None
+        self._state_mtime: Optional[float] = None
+        self._next_reload_check = 0.0
+        self._reload: Optional[asyncio.Future] = None
+        if state_file and os.path.exists(state_file):
+            self._state_mtime = os.stat(state_file).st_mtime
+
+    @classmethod
+    def from_config(
+        cls, config: Any, manager: Any, store: Optional[Any] = None, **kwargs: Any
+    ) -> "ApiServer":
+        """
+        Vytvoření serveru podle hlavní konfigurace (sekce ``api``).
+
+        Args:
+            config: ConfigManager (nebo cokoliv s metodou ``get``)
+            manager: ProjectManager
+            store: WeatherStore (volitelné)
+            **kwargs: Další argumenty konstruktoru
+
+        Returns:
+            Nový server
+        """
+        return cls(
+            manager,
+            store,
+            host=config.get('api.host', DEFAULT_HOST),
+            port=int(config.get('api.port', DEFAULT_PORT)),
+            keepalive_timeout=float(config.get('api.keepalive_timeout', 15.0)),
+            **kwargs
+        )
+
+    async def start(self) -> int:
+        """
+        Spuštění naslouchání.
+
+        Returns:
+            Skutečné číslo portu
+        """
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port, limit=MAX_HEADER_SIZE
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        if self.store is not None and self.weather_watch_interval > 0:
+            self._watcher = asyncio.ensure_future(self._watch_weather())
+        self.logger.info(f"API naslouchá na http://{self.host}:{self.port}")
+        return self.port
+
+    async def stop(self) -> None:
+        """Ukončení naslouchání a otevřených spojení"""
+        if self._watcher is not None:
+            self._watcher.cancel()
+            self._watcher = None
+        if self._server is not None:
+            self._server.close()
+            for task in list(self._connections):
+                task.cancel()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def serve_forever(self) -> None:
+        """Spuštění a běh až do přerušení"""
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def _watch_weather(self) -> None:
+        """Periodická kontrola nových měření z jiného procesu"""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.weather_watch_interval)
+            try:
+                await loop.run_in_executor(None, self.store.refresh)
+            except Exception as e:
+                self.logger.error(f"Chyba při kontrole nových měření: {e}")
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Obsluha jednoho (keep-alive) spojení"""
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(
+                        reader.readuntil(b'\r\n\r\n'), self.keepalive_timeout
+                    )
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError,
+                        asyncio.LimitOverrunError, ConnectionError):
+                    break
+
+                try:
+                    method, target, version, headers = _parse_head(head)
+                except ValueError:
+                    writer.write(self._encode(HTTPStatus.BAD_REQUEST, {}, b'', False))
+                    break
+                try:
+                    length = int(headers.get('content-length', 0) or 0)
+                    if length < 0:
+                        raise ValueError(length)
+                except ValueError:
+                    # Bez platné délky těla nelze najít začátek dalšího požadavku
+                    status, extra, body = self._error(
+                        HTTPStatus.BAD_REQUEST, "Neplatná hlavička Content-Length")
+                    writer.write(self._encode(status, extra, body, False))
+                    break
+                if length:
+                    await reader.readexactly(length)
+
+                connection = headers.get('connection', '').lower()
+                keep_alive = (
+                    connection != 'close' if version == 'HTTP/1.1'
+                    else connection == 'keep-alive'
+                )
+                if method == 'GET' and urlsplit(target).path == '/api/events':
+                    await self._stream_events(reader, writer, target)
+                    break
+                status, extra, body = await self._respond(method, target, headers)
+                writer.write(self._encode(status, extra, body, keep_alive, method == 'HEAD'))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+    async def _stream_events(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, target: str
+    ) -> None:
+        """
+        Odběr událostí přes Server-Sent Events.
+
+        Klient nejdřív dostane událost 'hello' s aktuálními verzemi dat,
+        potom změny. Pomalý klient se nečeká: dokud se jeho spojení
+        nevyprázdní (drain), události se mu slučují podle klíče.
+        """
+        if self.event_bus is None:
+            status, extra, body = self._error(HTTPStatus.NOT_FOUND, "Události nejsou dostupné")
+            writer.write(self._encode(status, extra, body, False))
+            await writer.drain()
+            return
+
+        query = parse_qs(urlsplit(target).query)
+        topics = [t for t in ','.join(query.get('topics', [])).split(',') if t]
+        subscription = Subscription(self.event_bus, topics)
+        self.stats['streams'] += 1
+        # Konec spojení ze strany klienta (SSE klient po požadavku už nic neposílá)
+        disconnected = asyncio.ensure_future(reader.read(1))
+        try:
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream; charset=utf-8\r\n"
+                b"Cache-Control: no-cache\r\nConnection: keep-alive\r\n"
+                b"X-Accel-Buffering: no\r\n\r\n"
+                + f"retry: {SSE_RETRY_MS}\n\n".encode()
+                + _sse_event({'id': None, 'topic': 'hello', 'data': self._health()})
+            )
+            await writer.drain()
+            while not disconnected.done():
+                waiting = asyncio.ensure_future(subscription.get(self.sse_heartbeat))
+                await asyncio.wait({waiting, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+                if not waiting.done():
+                    waiting.cancel()
+                    break
+                events = waiting.result()
+                writer.write(b''.join(_sse_event(e) for e in events) if events else b": ping\n\n")
+                await writer.drain()
+        finally:
+            disconnected.cancel()
+            subscription.close()
+            self.stats['streams'] -= 1
+
+    async def _respond(
+        self, method: str, target: str, headers: Dict[str, str]
+    ) -> Tuple[HTTPStatus, Dict[str, str], bytes]:
+        """
+        Zpracování jednoho požadavku.
+
+        Tělo se vrací i pro HEAD; vynechá ho až ``_encode``, aby
+        Content-Length odpovídal GET.
+
+        Returns:
+            Trojice (stav, hlavičky, tělo)
+        """
+        self.stats['requests'] += 1
+        if method not in ('GET', 'HEAD'):
+            return self._error(HTTPStatus.METHOD_NOT_ALLOWED, "Podporováno je jen GET",
+                               {'Allow': 'GET, HEAD'})
+
+        try:
+            self._maybe_reload()
+            key, version, produce = self._route(target)
+        except HttpError as e:
+            return self._error(e.status, str(e))
+
+        loop = asyncio.get_running_loop()
+        if version is None:
+            body = _dump(await loop.run_in_executor(None, produce))
+            return HTTPStatus.OK, {}, body
+
+        # Komprimovaná a nekomprimovaná podoba jsou různé reprezentace,
+        # silný ETag se proto liší příponou kódování
+        etag = f'"{self._boot_id}-{version}"'
+        gzip_etag = f'"{self._boot_id}-{version}-gzip"'
+        extra = {'ETag': etag, 'Cache-Control': 'no-cache', 'Vary': 'Accept-Encoding'}
+        if_none_match = headers.get('if-none-match', '')
+        tags = {t.strip() for t in if_none_match.split(',')}
+        if if_none_match == '*' or etag in tags or gzip_etag in tags:
+            self.stats['not_modified'] += 1
+            if gzip_etag in tags:
+                extra['ETag'] = gzip_etag
+            return HTTPStatus.NOT_MODIFIED, extra, b''
+
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] == etag:
+            self.stats['cache_hits'] += 1
+            _, body, compressed = cached
+        else:
+            # Verze se čte před výpočtem, takže data nejsou nikdy starší než ETag
+            started = time.perf_counter()
+            data = await loop.run_in_executor(None, produce)
+            with span(f'api_server.render.{_endpoint(key)}'):
+                body = _dump(data)
+                compressed = gzip.compress(body, 6) if len(body) >= GZIP_MIN_SIZE else None
+            self._cache[key] = (etag, body, compressed)
+            _RENDER_SECONDS.labels(_endpoint(key)).observe(time.perf_counter() - started)
+
+        if compressed is not None and 'gzip' in headers.get('accept-encoding', ''):
+            self.stats['gzip'] += 1
+            extra['Content-Encoding'] = 'gzip'
+            extra['ETag'] = gzip_etag
+            body = compressed
+        return HTTPStatus.OK, extra, body
+
+    def _route(self, target: str) -> Route:
+        """
+        Nalezení endpointu.
+
+        Raises:
+            HttpError: Pokud endpoint nebo projekt neexistuje
+        """
+        url = urlsplit(target)
+        parts = [unquote(part) for part in url.path.strip('/').split('/')]
+        if parts[:1] != ['api']:
+            raise HttpError(HTTPStatus.NOT_FOUND, f"Neznámá cesta '{url.path}'")
+        parts = parts[1:]
+
+        if parts == ['health']:
+            return 'health', None, self._health
+        if parts == ['projects']:
+            return 'projects', self.manager.version, self._project_list
+        if len(parts) == 3 and parts[:1] + parts[2:] == ['projects', 'burndown']:
+            return self._burndown_route(parts[1], parse_qs(url.query))
+        if len(parts) == 3 and parts[0] == 'projects':
+            name, action = parts[1], parts[2]
+            producers = {
+                'report': lambda: self.manager.generate_report(name),
+                'stats': lambda: self.manager.get_project_stats(name),
+                'progress': lambda: {
+                    'project': name, 'progress': self.manager.track_progress(name)
+                },
+            }
+            version = self.manager.project_version(name)
+            if action not in producers:
+                raise HttpError(HTTPStatus.NOT_FOUND, f"Neznámá akce '{action}'")
+            if version is None:
+                raise HttpError(HTTPStatus.NOT_FOUND, f"Projekt '{name}' neexistuje")
+            return f'project:{name}:{action}', version, producers[action]
+        if parts == ['weather', 'latest']:
+            if self.store is None:
+                raise HttpError(HTTPStatus.NOT_FOUND, "Meteostanice není připojena")
+            try:
+                limit = int(parse_qs(url.query).get('limit', ['1'])[0])
+            except ValueError:
+                raise HttpError(HTTPStatus.BAD_REQUEST, "Parametr limit musí být číslo")
+            limit = max(1, min(limit, MAX_WEATHER_LIMIT))
+            return f'weather:{limit}', self.store.version, lambda: self.store.latest(limit)
+        if parts == ['tasks']:
+            return self._tasks_route(parse_qs(url.query))
+        if parts == ['search']:
+            return self._search_route(parse_qs(url.query))
+        if self.debug and parts[:1] == ['debug'] and len(parts) == 2:
+            return self._debug_route(parts[1], parse_qs(url.query))
+        raise HttpError(HTTPStatus.NOT_FOUND, f"Neznámá cesta '{url.path}'")
+
+    def _tasks_route(self, query: Dict[str, List[str]]) -> Route:
+        """
+        Filtrované úkoly se stránkováním (bez mezipaměti, kombinací filtrů je mnoho).
+
+        Raises:
+            HttpError: Pokud projekt neexistuje nebo parametry nejsou platné
+        """
+        try:
+            task_query = TaskQuery.from_params(query)
+            offset = int(query.get('offset', ['0'])[0])
+            limit = int(query.get('limit', ['50'])[0])
+        except ValueError as e:
+            raise HttpError(HTTPStatus.BAD_REQUEST, str(e))
+        if task_query.project is not None and task_query.project not in self.manager.projects:
+            raise HttpError(HTTPStatus.NOT_FOUND, f"Projekt '{task_query.project}' neexistuje")
+        if offset < 0 or not 1 <= limit <= MAX_LIMIT:
+            raise HttpError(HTTPStatus.BAD_REQUEST,
+                            f"Parametr limit musí být 1 až {MAX_LIMIT}, offset nezáporný")
+        explain = query.get('explain', ['0'])[0] not in ('0', 'false')
+        return 'tasks', None, lambda: self.manager.query_tasks(
+            task_query, offset=offset, limit=limit, explain=explain)
+
+    def _burndown_route(self, name: str, query: Dict[str, List[str]]) -> Route:
+        """
+        Burndown, rychlost a odhad dokončení (bez mezipaměti: závisí i na dnešním datu).
+
+        Raises:
+            HttpError: Pokud historie není zapnuta, projekt neexistuje nebo parametry nejsou platné
+        """
+        history = getattr(self.manager, 'progress_history', None)
+        if history is None:
+            raise HttpError(HTTPStatus.NOT_FOUND, "Historie pokroku není zapnuta")
+        project = self.manager.projects.get(name)
+        if project is None:
+            raise HttpError(HTTPStatus.NOT_FOUND, f"Projekt '{name}' neexistuje")
+        try:
+            weeks = int(query.get('weeks', ['3'])[0])
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Parametr weeks musí být číslo")
+        return 'burndown', None, lambda: history.burndown(project, weeks=max(1, weeks))
+
+    def _search_route(self, query: Dict[str, List[str]]) -> Route:
+        """
+        Fulltextové vyhledávání (bez mezipaměti: každý dotaz našeptávače je jiný).
+
+        Raises:
+            HttpError: Pokud index není nastaven nebo parametry nejsou platné
+        """
+        if getattr(self.manager, 'search_index', None) is None:
+            raise HttpError(HTTPStatus.NOT_FOUND, "Vyhledávání není zapnuto")
+        text = query.get('q', [''])[0]
+        kind = query.get('type', [None])[0]
+        project = query.get('project', [None])[0]
+        if kind not in (None, 'task', 'project'):
+            raise HttpError(HTTPStatus.BAD_REQUEST, f"Neznámý typ '{kind}'")
+        try:
+            limit = int(query.get('limit', ['20'])[0])
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Parametr limit musí být číslo")
+        limit = max(1, min(limit, MAX_SEARCH_LIMIT))
+        return 'search', None, lambda: {
+            'query': text,
+            'results': self.manager.search(text, limit, kind=kind, project=project),
+        }
+
+    def _debug_route(self, action: str, query: Dict[str, List[str]]) -> Route:
+        """
+        Ladicí endpointy (profilování za běhu).
+
+        Raises:
+            HttpError: Pokud endpoint neexistuje nebo jsou parametry neplatné
+        """
+        if action == 'spans':
+            if 'enable' in query:
+                enable_spans(query['enable'][0] not in ('0', 'false'))
+            return 'debug', None, lambda: capture('spans', 0)
+        if action == 'profile':
+            mode = query.get('mode', ['stack'])[0]
+            try:
+                seconds = min(float(query.get('seconds', ['5'])[0]), MAX_PROFILE_SECONDS)
+            except ValueError:
+                raise HttpError(HTTPStatus.BAD_REQUEST, "Parametr seconds musí být číslo")
+            if mode not in ('stack', 'memory', 'cpu', 'spans'):
+                raise HttpError(HTTPStatus.BAD_REQUEST, f"Neznámý režim '{mode}'")
+            span_name = query.get('span', [None])[0]
+            if mode == 'cpu' and not span_name:
+                raise HttpError(HTTPStatus.BAD_REQUEST, "Režim cpu vyžaduje parametr span")
+            return 'debug', None, lambda: capture(mode, seconds, self.profile_dir, span_name)
+        raise HttpError(HTTPStatus.NOT_FOUND, f"Neznámý ladicí endpoint '{action}'")
+
+    def _project_list(self) -> List[Dict[str, Any]]:
+        """Přehled projektů"""
+        projects = []
+        for name in sorted(list(self.manager.projects)):
+            project = self.manager.projects[name]
+            projects.append({
+                'name': name,
+                'status': project['status'],
+                'tasks': len(project['tasks']),
+                'progress': self.manager.track_progress(name),
+            })
+        return projects
+
+    def _health(self) -> Dict[str, Any]:
+        """Stav serveru a verze dat"""
+        return {
+            'status': 'ok',
+            'projects_version': self.manager.version,
+            'weather_version': self.store.version if self.store is not None else None,
+            'stats': dict(self.stats),
+        }
+
+    def _maybe_reload(self) -> None:
+        """
+        Kontrola změny souboru se stavem v executoru (nejvýš jedna naráz).
+
+        Požadavky na reload nečekají: obsluhují se z dosavadního stavu,
+        dokud ho ProjectManager.restore pod svým zámkem nenahradí novým.
+        """
+        if not self.state_file or (self._reload is not None and not self._reload.done()):
+            return
+        now = time.monotonic()
+        if now < self._next_reload_check:
+            return
+        self._next_reload_check = now + self.reload_interval
+        self._reload = asyncio.get_running_loop().run_in_executor(
+            None, self._reload_state, self.state_file)
+
+    def _reload_state(self, path: str) -> None:
+        """Znovunačtení souboru se stavem, pokud se od posledně změnil (mimo smyčku)"""
+        try:
+            mtime = os.stat(path).st_mtime
+            if mtime == self._state_mtime:
+                return
+            self._state_mtime = mtime
+            with open(path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.error(f"Stav ze souboru '{path}' nelze načíst: {e}")
+            return
+        self.manager.restore(state)
+        self.logger.info(f"Stav znovu načten ze souboru '{path}'")
+
+    def _error(
+        self, status: HTTPStatus, message: str, extra: Optional[Dict[str, str]] = None
+    ) -> Tuple[HTTPStatus, Dict[str, str], bytes]:
+        """Chybová odpověď"""
+        return status, extra or {}, _dump({'error': message})
+
+    def _encode(
+        self,
+        status: HTTPStatus,
+        extra: Dict[str, str],
+        body: bytes,
+        keep_alive: bool,
+        head: bool = False
+    ) -> bytes:
+        """Sestavení HTTP odpovědi (pro HEAD bez těla, ale s jeho délkou)"""
+        lines = [f"HTTP/1.1 {status.value} {status.phrase}"]
+        if status != HTTPStatus.NOT_MODIFIED:
+            lines.append("Content-Type: application/json; charset=utf-8")
+            lines.append(f"Content-Length: {len(body)}")
+        lines.extend(f"{name}: {value}" for name, value in extra.items())
+        if keep_alive:
+            lines.append("Connection: keep-alive")
+            lines.append(f"Keep-Alive: timeout={int(self.keepalive_timeout)}")
+        else:
+            lines.append("Connection: close")
+        return ("\r\n".join(lines) + "\r\n\r\n").encode('latin-1') + (b'' if head else body)
+
+
+def _endpoint(key: str) -> str:
+    """Název endpointu pro metriky (bez názvu projektu a parametrů)"""
+    if key.startswith('project:'):
+        return 'project_' + key.rsplit(':', 1)[-1]
+    return key.split(':', 1)[0]
+
+
+def _parse_head(head: bytes) -> Tuple[str, str, str, Dict[str, str]]:
+    """
+    Rozbor řádku požadavku a hlaviček.
+
+    Raises:
+        ValueError: Pokud požadavek není platný HTTP/1.x
+    """
+    lines = head.decode('latin-1').split('\r\n')
+    method, target, version = lines[0].split(' ')
+    if not version.startswith('HTTP/1.'):
+        raise ValueError(f"Nepodporovaná verze {version}")
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+    return method, target, version, headers
+
+
+def _sse_event(event: Dict[str, Any]) -> bytes:
+    """Zakódování události do formátu text/event-stream"""
+    lines = [] if event['id'] is None else [f"id: {event['id']}"]
+    lines.append(f"event: {event['topic']}")
+    lines.append(f"data: {json.dumps(event['data'], ensure_ascii=False)}")
+    return ("\n".join(lines) + "\n\n").encode('utf-8')
+
+
+def _dump(data: Any) -> bytes:
+    """Serializace do JSON"""
+    return json.dumps(data, ensure_ascii=False).encode('utf-8')
+
+
+async def request(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    path: str,
+    headers: Optional[Dict[str, str]] = None,
+    method: str = 'GET'
+) -> Tuple[int, Dict[str, str], bytes]:
+    """
+    Jednoduchý keep-alive klient (testy a zátěžový skript).
+
+    Args:
+        reader: Čtecí proud otevřeného spojení
+        writer: Zapisovací proud otevřeného spojení
+        path: Cesta včetně query
+        headers: Další hlavičky požadavku
+        method: HTTP metoda
+
+    Returns:
+        Trojice (stav, hlavičky s malými písmeny, tělo)
+    """
+    lines = [f"{method} {path} HTTP/1.1", "Host: localhost"]
+    lines.extend(f"{name}: {value}" for name, value in (headers or {}).items())
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode('latin-1'))
+    await writer.drain()
+
+    head = (await reader.readuntil(b'\r\n\r\n')).decode('latin-1').split('\r\n')
+    status = int(head[0].split(' ')[1])
+    response_headers = {}
+    for line in head[1:]:
+        if line:
+            name, _, value = line.partition(':')
+            response_headers[name.strip().lower()] = value.strip()
+    length = int(response_headers.get('content-length', 0))
+    body = await reader.readexactly(length) if length and method != 'HEAD' else b''
+    return status, response_headers, body
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Vstupní bod příkazu ``kiosk-api``.
+
+    Args:
+        argv: Argumenty příkazové řádky (výchozí: sys.argv)
+
+    Returns:
+        Návratový kód procesu
+    """
+    from .cli import DEFAULT_DATA_FILE, Session
+
+    parser = argparse.ArgumentParser(prog='kiosk-api', description='HTTP API kiosku')
+    parser.add_argument('--data', help='Soubor se stavem project-manager',
+                        default=os.environ.get('PROJECT_MANAGER_DATA', DEFAULT_DATA_FILE))
+    parser.add_argument('--weather-db', help='SQLite databáze meteostanice')
+    parser.add_argument('--config', default=os.environ.get('PROJECT_MANAGER_CONFIG'),
+                        help='Hlavní konfigurace (sekce api)')
+    parser.add_argument('--log-file', help='Log soubor ProjectManageru')
+    parser.add_argument('--host')
+    parser.add_argument('--port', type=int)
+    parser.add_argument('--mqtt', action='store_true',
+                        help='Publikovat nová měření do MQTT brokeru (sekce mqtt)')
+    parser.add_argument('--sample-system', action='store_true',
+                        help='Vzorkovat systémové prostředky do databáze meteostanice')
+    parser.add_argument('--debug', action='store_true',
+                        help='Ladicí endpointy /api/debug/* a profilování signály '
+                             'SIGUSR1/SIGUSR2')
+    parser.add_argument('--profile-dir', default=DEFAULT_OUTPUT_DIR,
+                        help='Adresář pro soubory profilů')
+    parser.add_argument('--journal', default=os.environ.get('PROJECT_MANAGER_JOURNAL'),
+                        help='Adresář žurnálu změn (výchozí journal.directory z konfigurace)')
+    parser.add_argument('--metrics-port', type=int,
+                        help='Port endpointu /metrics (výchozí: monitoring.metrics_port, '
+                             '0 = vypnuto)')
+    args = parser.parse_args(argv)
+
+    # Zápis logu mimo smyčku událostí (fronta + vlákno s handlerem)
+    log_queue: queue.Queue = queue.Queue()
+    logging.basicConfig(level=logging.INFO, handlers=[logging.handlers.QueueHandler(log_queue)])
+    log_listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler())
+    log_listener.start()
+    registry = get_registry()
+    instrument_logging(registry)
+    event_bus = EventBus()
+    session = Session(args.data, args.log_file, args.config, args.journal)
+    session.manager.event_bus = event_bus
+    SearchIndex().attach(session.manager)
+    if session.journal is not None:
+        # Souběžné zápisy sdílejí jeden fsync (group commit)
+        session.journal.start()
+    store = None
+    if args.weather_db:
+        from .weather_store import WeatherStore
+
+        store = WeatherStore(args.weather_db, event_bus=event_bus)
+
+    # Meteostanice zapisuje do databáze ve vlastním procesu
+    options: Dict[str, Any] = {
+        'state_file': args.data, 'event_bus': event_bus, 'weather_watch_interval': 1.0
+    }
+    config = None
+    if args.config:
+        from .config_manager import ConfigManager
+
+        config = ConfigManager(os.path.dirname(os.path.abspath(args.config)))
+        config.load_config(os.path.basename(args.config))
+        server = ApiServer.from_config(config, session.manager, store, **options)
+    else:
+        server = ApiServer(session.manager, store, **options)
+    replicator = None
+    if config is not None and config.get('replication.node_id'):
+        from .replication import Replicator
+
+        try:
+            replicator = Replicator.from_config(config, session.manager)
+            replicator.start()
+        except ValueError as e:
+            logging.getLogger("ApiServer").error(f"Replikace nespuštěna: {e}")
+            replicator = None
+    publisher = None
+    if args.mqtt:
+        from .mqtt_publisher import MqttPublisher
+
+        publisher = MqttPublisher.from_config(config or {})
+        publisher.attach(event_bus)
+        publisher.start()
+        registry.gauge('mqtt_queue_depth', 'Počet zpráv čekajících na odeslání do MQTT',
+                       callback=lambda: publisher.metrics()['queue_depth'])
+        registry.gauge('mqtt_spool_bytes', 'Velikost spoolu MQTT na disku',
+                       callback=lambda: publisher.metrics()['spool_bytes'])
+    metrics_server = None
+    if args.metrics_port != 0:
+        if args.metrics_port is not None:
+            metrics_server = MetricsServer(registry, port=args.metrics_port)
+        elif config is not None:
+            metrics_server = MetricsServer.from_config(config, registry)
+    if metrics_server is not None:
+        metrics_server.start()
+    sampler = None
+    if args.sample_system and args.weather_db:
+        from .system_sampler import SystemSampler
+
+        sampler = (SystemSampler.from_config(config, args.weather_db, event_bus=event_bus)
+                   if config is not None else
+                   SystemSampler(args.weather_db, event_bus=event_bus))
+        sampler.start()
+    retention = None
+    if args.weather_db:
+        from .retention import DEFAULT_INTERVAL, RetentionCompactor
+
+        # Promazání starých měření, souhrny a inkrementální VACUUM (0 = vypnuto)
+        interval = float(config.get('monitoring.retention_interval', DEFAULT_INTERVAL)
+                         if config is not None else DEFAULT_INTERVAL)
+        if interval > 0:
+            retention = (RetentionCompactor.from_config(config, args.weather_db)
+                         if config is not None else RetentionCompactor(args.weather_db))
+            retention.start(interval)
+    alerts = None
+    if config is not None:
+        from .alerting import AlertEngine, EventBusNotifier
+
+        alerts = AlertEngine.from_config(config)
+        if alerts is not None:
+            alerts.notifiers.append(EventBusNotifier(event_bus))
+            alerts.attach(event_bus, session.manager)
+            alerts.start()
+    if args.debug:
+        server.debug = True
+        server.profile_dir = args.profile_dir
+        # Zachycení profilu bez restartu: kill -USR2 <pid>
+        install_signal_handlers(args.profile_dir)
+    if args.host:
+        server.host = args.host
+    if args.port is not None:
+        server.port = args.port
+
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if replicator is not None:
+            replicator.stop()
+        if alerts is not None:
+            alerts.stop()
+        if retention is not None:
+            retention.stop()
+        if sampler is not None:
+            sampler.close()
+        if metrics_server is not None:
+            metrics_server.stop()
+        if publisher is not None:
+            publisher.stop()
+        if store is not None:
+            store.close()
+        if session.journal is not None:
+            session.journal.close()
+        log_listener.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
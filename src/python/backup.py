@@ -0,0 +1,712 @@
+"""
+Zálohování - Backup Engine
+
+Inkrementální zálohy konfigurace (YAML), dat projektů (stav a žurnál)
+a SQLite databáze meteostanice do repozitáře s deduplikací po blocích.
+Každý blok je uložen jednou pod svým SHA-256 a komprimovaný zlibem;
+záloha (snímek) je jen manifest se seznamem bloků souborů. Noční běh
+tak zapíše pouze změněné bloky a nezměněné soubory (velikost a čas
+změny) ani nečte.
+
+Textové soubory se dělí na hranicích řádků podle obsahu, takže vložený
+řádek změní jen okolní blok. Binární soubory a databáze se dělí na bloky
+pevné velikosti (násobek stránky SQLite). Databáze se kopíruje online
+backup API za běhu zápisu měření.
+
+Repozitář:
+    chunks/ab/ab12...ef        blok (1 B hlavička 'z'/'r' + data)
+    snapshots/20251019T020000.json   manifest snímku
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import zlib
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, BinaryIO, Deque, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+
+DEFAULT_REPOSITORY = "/home/nymea/backups/repository"
+DEFAULT_SCHEDULE = "0 2 * * *"
+DEFAULT_RETENTION_DAYS = 30
+# Násobek stránky SQLite (4 KiB), nezměněné stránky dávají stejné bloky
+DEFAULT_CHUNK_SIZE = 64 * 1024
+# Textové bloky: řez tam, kde CRC posledních WINDOW_LINES řádků je dělitelné
+# LINE_CUT, nejdříve po MIN_TEXT_CHUNK
+MIN_TEXT_CHUNK = 4 * 1024
+LINE_CUT = 128
+WINDOW_LINES = 4
+TEXT_SUFFIXES = ('.yaml', '.yml', '.json', '.jsonl', '.csv', '.txt', '.log', '.md')
+SNAPSHOT_FORMAT = "%Y%m%dT%H%M%S"
+
+_COMPRESSED = b'z'
+_RAW = b'r'
+
+
+def fixed_chunks(stream: BinaryIO, size: int) -> Iterator[bytes]:
+    """
+    Bloky pevné velikosti.
+
+    Args:
+        stream: Binární proud
+        size: Velikost bloku
+
+    Yields:
+        Bloky dat (poslední může být kratší)
+    """
+    while True:
+        block = stream.read(size)
+        if not block:
+            return
+        yield block
+
+
+def text_chunks(stream: BinaryIO, max_size: int) -> Iterator[bytes]:
+    """
+    Bloky textu s hranicemi určenými obsahem řádků.
+
+    Hranice leží za řádkem, u kterého je CRC32 okna posledních
+    WINDOW_LINES řádků dělitelné LINE_CUT, takže po vložení nebo smazání
+    řádku se hranice dál v souboru nemění. Okno místo jediného řádku
+    brání tomu, aby se hranicí stal řádek opakovaný v každém záznamu
+    (``"notes": ""``) – hranice by pak byly periodické a po změně délky
+    by se posunuly všechny následující. Dlouhé řádky (minifikovaný JSON)
+    se dělí po max_size.
+
+    Args:
+        stream: Binární proud
+        max_size: Maximální velikost bloku
+
+    Yields:
+        Bloky dat
+    """
+    parts: List[bytes] = []
+    window: Deque[bytes] = deque(maxlen=WINDOW_LINES)
+    size = 0
+    for line in stream:
+        window.append(line)
+        while len(line) > max_size - size:
+            cut = max_size - size
+            parts.append(line[:cut])
+            yield b''.join(parts)
+            parts, size, line = [], 0, line[cut:]
+        parts.append(line)
+        size += len(line)
+        if size >= MIN_TEXT_CHUNK and zlib.crc32(b''.join(window)) % LINE_CUT == 0:
+            yield b''.join(parts)
+            parts, size = [], 0
+    if parts:
+        yield b''.join(parts)
+
+
+class BackupEngine:
+    """
+    Repozitář deduplikovaných záloh.
+
+    Zdroje se předávají jako slovník název → cesta; adresáře se
+    procházejí rekurzivně a soubory v manifestu nesou cestu relativní
+    k názvu zdroje (``config/main-config.yaml``).
+
+    Attributes:
+        repository (str): Adresář repozitáře
+        chunk_size (int): Velikost bloku (u textu maximální)
+        compression_level (int): Úroveň komprese zlib (0 = bez komprese)
+        retention_days (int): Stáří snímků, které prune maže
+        stats (Dict): Statistiky posledního běhu
+        logger (logging.Logger): Logger pro auditování
+    """
+
+    def __init__(
+        self,
+        repository: str = DEFAULT_REPOSITORY,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        compression_level: int = 6,
+        retention_days: int = DEFAULT_RETENTION_DAYS
+    ):
+        """
+        Inicializace repozitáře (adresáře se vytvoří, pokud neexistují).
+
+        Args:
+            repository: Adresář repozitáře
+            chunk_size: Velikost bloku (u textu maximální)
+            compression_level: Úroveň komprese zlib (0-9)
+            retention_days: Stáří snímků, které prune maže
+
+        Raises:
+            ValueError: Při neplatné velikosti bloku, kompresi nebo retenci
+        """
+        if chunk_size < MIN_TEXT_CHUNK:
+            raise ValueError(f"Velikost bloku musí být alespoň {MIN_TEXT_CHUNK} B")
+        if not 0 <= compression_level <= 9:
+            raise ValueError("Úroveň komprese musí být 0-9")
+        if retention_days < 1:
+            raise ValueError("Retence musí být alespoň 1 den")
+
+        self.repository = repository
+        self.chunk_size = chunk_size
+        self.compression_level = compression_level
+        self.retention_days = retention_days
+        self.stats: Dict[str, Any] = {}
+        self.logger = logging.getLogger("BackupEngine")
+        self._chunk_dir = os.path.join(repository, 'chunks')
+        self._snapshot_dir = os.path.join(repository, 'snapshots')
+        self._temp_dir = os.path.join(repository, 'tmp')
+        for directory in (self._chunk_dir, self._snapshot_dir, self._temp_dir):
+            os.makedirs(directory, exist_ok=True)
+
+    @classmethod
+    def from_config(
+        cls,
+        config: Any,
+        repository: Optional[str] = None,
+        **kwargs: Any
+    ) -> "BackupEngine":
+        """
+        Repozitář podle sekce ``security`` hlavní konfigurace.
+
+        Args:
+            config: ConfigManager (nebo cokoliv s metodou ``get``)
+            repository: Adresář repozitáře (výchozí security.backup_location)
+            **kwargs: Další parametry konstruktoru
+
+        Returns:
+            Nakonfigurovaný repozitář
+        """
+        kwargs.setdefault(
+            'retention_days',
+            int(config.get('security.backup_retention_days', DEFAULT_RETENTION_DAYS))
+        )
+        return cls(repository or config.get('security.backup_location', DEFAULT_REPOSITORY),
+                   **kwargs)
+
+    def backup(
+        self,
+        files: Optional[Dict[str, str]] = None,
+        databases: Optional[Dict[str, str]] = None,
+        now: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """
+        Vytvoření snímku.
+
+        Soubory, jejichž velikost a čas změny odpovídá předchozímu
+        snímku, se nečtou a převezmou jeho bloky. Chybějící zdroje se
+        přeskočí s varováním.
+
+        Args:
+            files: Soubory nebo adresáře (název → cesta)
+            databases: SQLite databáze (název → cesta), kopírované online
+            now: Čas snímku (výchozí: teď)
+
+        Returns:
+            Statistiky běhu včetně ID snímku
+        """
+        now = now or datetime.now()
+        started = time.perf_counter()
+        stats: Dict[str, Any] = {
+            'files': 0, 'files_unchanged': 0, 'missing': [], 'chunks': 0, 'chunks_new': 0,
+            'bytes_read': 0, 'bytes_new': 0, 'bytes_stored': 0,
+        }
+        previous = self._latest_files()
+        entries: List[Dict[str, Any]] = []
+
+        for source, path in (files or {}).items():
+            if not os.path.exists(path):
+                self.logger.warning(f"Zdroj '{source}' ({path}) neexistuje, přeskočen")
+                stats['missing'].append(source)
+                continue
+            for name, file_path in self._walk(source, path):
+                info = os.stat(file_path)
+                cached = previous.get(name)
+                if (cached is not None and cached['size'] == info.st_size
+                        and cached['mtime_ns'] == info.st_mtime_ns):
+                    entries.append(cached)
+                    stats['files_unchanged'] += 1
+                    stats['chunks'] += len(cached['chunks'])
+                    continue
+                with open(file_path, 'rb') as stream:
+                    entries.append(self._store_file(
+                        name, stream, file_path.endswith(TEXT_SUFFIXES), stats,
+                        size=info.st_size, mtime_ns=info.st_mtime_ns, mode=info.st_mode))
+
+        for source, path in (databases or {}).items():
+            if not os.path.exists(path):
+                self.logger.warning(f"Databáze '{source}' ({path}) neexistuje, přeskočena")
+                stats['missing'].append(source)
+                continue
+            capture_started = time.perf_counter()
+            copy_path = self._capture_database(path)
+            stats['database_copy_ms'] = round(
+                stats.get('database_copy_ms', 0) + (time.perf_counter() - capture_started) * 1000,
+                1)
+            try:
+                with open(copy_path, 'rb') as stream:
+                    entries.append(self._store_file(
+                        f"{source}/{os.path.basename(path)}", stream, False, stats,
+                        size=os.path.getsize(copy_path), mtime_ns=0, mode=0o100644))
+            finally:
+                os.remove(copy_path)
+
+        stats['files'] = len(entries)
+        stats['duration_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        snapshot_id = self._write_manifest(now, entries, stats)
+        stats['snapshot'] = snapshot_id
+        self.stats = stats
+        self.logger.info(
+            f"Snímek {snapshot_id}: {stats['files']} souborů ({stats['files_unchanged']} "
+            f"beze změny), {stats['chunks_new']}/{stats['chunks']} nových bloků, "
+            f"zapsáno {stats['bytes_stored']} B za {stats['duration_ms']:.0f} ms"
+        )
+        return stats
+
+    def snapshots(self) -> List[Dict[str, Any]]:
+        """
+        Seznam snímků od nejstaršího.
+
+        Returns:
+            Seznam slovníků s klíči id, created_at, files, size a stats
+        """
+        result = []
+        for snapshot_id in self._snapshot_ids():
+            manifest = self.manifest(snapshot_id)
+            result.append({
+                'id': snapshot_id,
+                'created_at': manifest['created_at'],
+                'files': len(manifest['files']),
+                'size': sum(entry['size'] for entry in manifest['files']),
+                'stats': manifest.get('stats', {}),
+            })
+        return result
+
+    def manifest(self, snapshot_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Manifest snímku.
+
+        Args:
+            snapshot_id: ID snímku (výchozí: nejnovější)
+
+        Returns:
+            Manifest (id, created_at, files, stats)
+
+        Raises:
+            ValueError: Pokud snímek neexistuje
+        """
+        if snapshot_id is None:
+            ids = self._snapshot_ids()
+            if not ids:
+                raise ValueError("Repozitář neobsahuje žádný snímek")
+            snapshot_id = ids[-1]
+        path = os.path.join(self._snapshot_dir, f"{snapshot_id}.json")
+        if not os.path.exists(path):
+            raise ValueError(f"Snímek '{snapshot_id}' neexistuje")
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def read(self, name: str, snapshot_id: Optional[str] = None) -> Iterator[bytes]:
+        """
+        Proud obsahu jednoho souboru ze snímku (blok po bloku).
+
+        Args:
+            name: Název souboru v manifestu
+            snapshot_id: ID snímku (výchozí: nejnovější)
+
+        Yields:
+            Rozbalené bloky
+
+        Raises:
+            ValueError: Pokud soubor ve snímku není
+        """
+        for entry in self.manifest(snapshot_id)['files']:
+            if entry['name'] == name:
+                for digest, _ in entry['chunks']:
+                    yield self._load_chunk(digest)
+                return
+        raise ValueError(f"Soubor '{name}' ve snímku není")
+
+    def restore(
+        self,
+        target: str,
+        snapshot_id: Optional[str] = None,
+        include: Optional[Iterable[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Obnova snímku do adresáře.
+
+        Soubory se zapisují proudově po blocích do dočasného souboru,
+        který se po kontrole SHA-256 přejmenuje.
+
+        Args:
+            target: Cílový adresář
+            snapshot_id: ID snímku (výchozí: nejnovější)
+            include: Prefixy názvů k obnově (výchozí: vše)
+
+        Returns:
+            Statistiky obnovy (files, bytes, duration_ms)
+
+        Raises:
+            ValueError: Pokud snímek neexistuje nebo obnovený soubor nesouhlasí
+        """
+        started = time.perf_counter()
+        manifest = self.manifest(snapshot_id)
+        prefixes = tuple(include) if include else None
+        restored = 0
+        written = 0
+        for entry in manifest['files']:
+            if prefixes and not entry['name'].startswith(prefixes):
+                continue
+            path = os.path.join(target, *entry['name'].split('/'))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            digest = hashlib.sha256()
+            temp_path = f"{path}.restore"
+            with open(temp_path, 'wb') as f:
+                for chunk_digest, _ in entry['chunks']:
+                    data = self._load_chunk(chunk_digest)
+                    digest.update(data)
+                    f.write(data)
+            if digest.hexdigest() != entry['sha256']:
+                os.remove(temp_path)
+                self.logger.error(f"Obnovený soubor '{entry['name']}' nesouhlasí")
+                raise ValueError(f"Obnovený soubor '{entry['name']}' nesouhlasí se snímkem")
+            if entry.get('mode'):
+                os.chmod(temp_path, entry['mode'] & 0o7777)
+            os.replace(temp_path, path)
+            restored += 1
+            written += entry['size']
+
+        stats = {
+            'snapshot': manifest['id'],
+            'files': restored,
+            'bytes': written,
+            'duration_ms': round((time.perf_counter() - started) * 1000, 1),
+        }
+        self.logger.info(f"Snímek {manifest['id']} obnoven do '{target}': {restored} souborů")
+        return stats
+
+    def verify(self, snapshot_id: Optional[str] = None) -> List[str]:
+        """
+        Kontrola, že všechny bloky snímku existují a odpovídají svému SHA-256.
+
+        Args:
+            snapshot_id: ID snímku (výchozí: nejnovější)
+
+        Returns:
+            Seznam chyb (prázdný, pokud je snímek v pořádku)
+        """
+        errors = []
+        checked: Set[str] = set()
+        for entry in self.manifest(snapshot_id)['files']:
+            for digest, _ in entry['chunks']:
+                if digest in checked:
+                    continue
+                checked.add(digest)
+                try:
+                    data = self._load_chunk(digest)
+                except (OSError, zlib.error) as e:
+                    errors.append(f"{entry['name']}: blok {digest[:12]} nelze načíst ({e})")
+                    continue
+                if hashlib.sha256(data).hexdigest() != digest:
+                    errors.append(f"{entry['name']}: blok {digest[:12]} je poškozený")
+        return errors
+
+    def prune(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Smazání snímků starších než retence a bloků, na které nic neodkazuje.
+
+        Nejnovější snímek se nemaže nikdy.
+
+        Args:
+            now: Referenční čas (výchozí: teď)
+
+        Returns:
+            Statistiky (snapshots_removed, chunks_removed, bytes_freed)
+        """
+        now = now or datetime.now()
+        cutoff = (now - timedelta(days=self.retention_days)).strftime(SNAPSHOT_FORMAT)
+        ids = self._snapshot_ids()
+        removed = [snapshot_id for snapshot_id in ids[:-1] if snapshot_id < cutoff]
+        for snapshot_id in removed:
+            os.remove(os.path.join(self._snapshot_dir, f"{snapshot_id}.json"))
+
+        stats = {'snapshots_removed': len(removed), 'chunks_removed': 0, 'bytes_freed': 0}
+        if removed:
+            referenced: Set[str] = set()
+            for snapshot_id in self._snapshot_ids():
+                for entry in self.manifest(snapshot_id)['files']:
+                    referenced.update(digest for digest, _ in entry['chunks'])
+            for digest, path in self._chunk_files():
+                if digest not in referenced:
+                    stats['bytes_freed'] += os.path.getsize(path)
+                    os.remove(path)
+                    stats['chunks_removed'] += 1
+        self.logger.info(
+            f"Smazáno {stats['snapshots_removed']} snímků a {stats['chunks_removed']} bloků "
+            f"({stats['bytes_freed']} B)"
+        )
+        return stats
+
+    def size(self) -> Dict[str, int]:
+        """Velikost repozitáře (počet bloků a bajty na disku)"""
+        chunks = 0
+        total = 0
+        for _, path in self._chunk_files():
+            chunks += 1
+            total += os.path.getsize(path)
+        for name in os.listdir(self._snapshot_dir):
+            total += os.path.getsize(os.path.join(self._snapshot_dir, name))
+        return {'chunks': chunks, 'bytes': total}
+
+    def _walk(self, source: str, path: str) -> Iterator[Tuple[str, str]]:
+        """Soubory zdroje jako dvojice (název v manifestu, cesta)"""
+        if os.path.isfile(path):
+            yield f"{source}/{os.path.basename(path)}", path
+            return
+        for root, directories, names in os.walk(path):
+            directories.sort()
+            for name in sorted(names):
+                file_path = os.path.join(root, name)
+                if name.endswith('.tmp') or not os.path.isfile(file_path):
+                    continue
+                relative = os.path.relpath(file_path, path).replace(os.sep, '/')
+                yield f"{source}/{relative}", file_path
+
+    def _store_file(
+        self,
+        name: str,
+        stream: BinaryIO,
+        text: bool,
+        stats: Dict[str, Any],
+        **info: Any
+    ) -> Dict[str, Any]:
+        """Rozdělení proudu na bloky a uložení nových bloků"""
+        digest = hashlib.sha256()
+        chunks = []
+        size = 0
+        blocks = (text_chunks(stream, self.chunk_size) if text
+                  else fixed_chunks(stream, self.chunk_size))
+        for block in blocks:
+            digest.update(block)
+            chunk_digest = hashlib.sha256(block).hexdigest()
+            chunks.append([chunk_digest, len(block)])
+            size += len(block)
+            stored = self._save_chunk(chunk_digest, block)
+            if stored:
+                stats['chunks_new'] += 1
+                stats['bytes_new'] += len(block)
+                stats['bytes_stored'] += stored
+        stats['chunks'] += len(chunks)
+        stats['bytes_read'] += size
+        entry = {'name': name, 'sha256': digest.hexdigest(), 'chunks': chunks}
+        entry.update(info)
+        entry['size'] = size
+        return entry
+
+    def _chunk_path(self, digest: str) -> str:
+        return os.path.join(self._chunk_dir, digest[:2], digest)
+
+    def _save_chunk(self, digest: str, data: bytes) -> int:
+        """
+        Uložení bloku, pokud v repozitáři ještě není.
+
+        Returns:
+            Počet zapsaných bajtů (0 = blok už existoval)
+        """
+        path = self._chunk_path(digest)
+        if os.path.exists(path):
+            return 0
+        payload = _RAW + data
+        if self.compression_level:
+            compressed = zlib.compress(data, self.compression_level)
+            if len(compressed) < len(data):
+                payload = _COMPRESSED + compressed
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(payload)
+        os.replace(temp_path, path)
+        return len(payload)
+
+    def _load_chunk(self, digest: str) -> bytes:
+        """Načtení a rozbalení bloku"""
+        with open(self._chunk_path(digest), 'rb') as f:
+            payload = f.read()
+        if payload[:1] == _COMPRESSED:
+            return zlib.decompress(payload[1:])
+        return payload[1:]
+
+    def _chunk_files(self) -> Iterator[Tuple[str, str]]:
+        """Všechny bloky repozitáře jako dvojice (SHA-256, cesta)"""
+        for prefix in sorted(os.listdir(self._chunk_dir)):
+            directory = os.path.join(self._chunk_dir, prefix)
+            for name in os.listdir(directory):
+                if not name.endswith('.tmp'):
+                    yield name, os.path.join(directory, name)
+
+    def _capture_database(self, path: str) -> str:
+        """
+        Konzistentní kopie SQLite databáze přes online backup API.
+
+        Kopie proběhne v jednom kroku v rámci čtecí transakce; ve WAL
+        režimu ta neblokuje zápis nových měření, a protože se v průběhu
+        nerestartuje, doběhne i při nepřetržitém zápisu.
+
+        Returns:
+            Cesta k dočasné kopii (smaže volající)
+        """
+        handle, copy_path = tempfile.mkstemp(suffix='.db', dir=self._temp_dir)
+        os.close(handle)
+        source = sqlite3.connect(f"file:{path}?mode=ro", uri=True, timeout=30)
+        target = sqlite3.connect(copy_path)
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
+        return copy_path
+
+    def _snapshot_ids(self) -> List[str]:
+        return sorted(name[:-len('.json')] for name in os.listdir(self._snapshot_dir)
+                      if name.endswith('.json'))
+
+    def _latest_files(self) -> Dict[str, Dict[str, Any]]:
+        """Soubory nejnovějšího snímku podle názvu (pro přeskočení nezměněných)"""
+        ids = self._snapshot_ids()
+        if not ids:
+            return {}
+        return {entry['name']: entry for entry in self.manifest(ids[-1])['files']}
+
+    def _write_manifest(
+        self,
+        now: datetime,
+        entries: List[Dict[str, Any]],
+        stats: Dict[str, Any]
+    ) -> str:
+        """Atomický zápis manifestu; bloky musí být na disku dřív než manifest"""
+        snapshot_id = now.strftime(SNAPSHOT_FORMAT)
+        existing = set(self._snapshot_ids())
+        suffix = 1
+        while snapshot_id in existing:
+            suffix += 1
+            snapshot_id = f"{now.strftime(SNAPSHOT_FORMAT)}-{suffix}"
+        if hasattr(os, 'sync'):
+            os.sync()
+        path = os.path.join(self._snapshot_dir, f"{snapshot_id}.json")
+        with open(f"{path}.tmp", 'w', encoding='utf-8') as f:
+            json.dump({'id': snapshot_id, 'created_at': now.isoformat(), 'files': entries,
+                       'stats': stats}, f, ensure_ascii=False, separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(f"{path}.tmp", path)
+        return snapshot_id
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Vstupní bod příkazu ``kiosk-backup``.
+
+    Args:
+        argv: Argumenty příkazové řádky (výchozí: sys.argv)
+
+    Returns:
+        Návratový kód procesu
+    """
+    from .cli import DEFAULT_DATA_FILE
+
+    parser = argparse.ArgumentParser(prog='kiosk-backup',
+                                     description='Deduplikované zálohy konfigurace a dat')
+    parser.add_argument('--config', default=os.environ.get('PROJECT_MANAGER_CONFIG'),
+                        help='Hlavní konfigurace (sekce security, journal)')
+    parser.add_argument('--repository', help='Adresář repozitáře '
+                        '(výchozí: security.backup_location)')
+    parser.add_argument('--retention-days', type=int,
+                        help='Stáří mazaných snímků (výchozí: security.backup_retention_days)')
+    commands = parser.add_subparsers(dest='command', metavar='příkaz')
+    commands.required = True
+
+    run = commands.add_parser('run', help='Vytvoření snímku')
+    run.add_argument('--data', default=os.environ.get('PROJECT_MANAGER_DATA', DEFAULT_DATA_FILE),
+                     help='Soubor se stavem projektů')
+    run.add_argument('--journal', default=os.environ.get('PROJECT_MANAGER_JOURNAL'),
+                     help='Adresář žurnálu (výchozí: journal.directory)')
+    run.add_argument('--weather-db', help='SQLite databáze meteostanice')
+    run.add_argument('--prune', action='store_true', help='Po záloze smazat staré snímky')
+    commands.add_parser('list', help='Seznam snímků')
+    restore = commands.add_parser('restore', help='Obnova snímku do adresáře')
+    restore.add_argument('--snapshot', help='ID snímku (výchozí: nejnovější)')
+    restore.add_argument('--target', required=True)
+    restore.add_argument('--include', action='append', help='Jen soubory s tímto prefixem')
+    verify = commands.add_parser('verify', help='Kontrola bloků snímku')
+    verify.add_argument('--snapshot')
+    commands.add_parser('prune', help='Smazání snímků starších než retence')
+    commands.add_parser('schedule', help='Plán záloh (cron) ze security.backup_schedule')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    config = None
+    if args.config:
+        from .config_manager import ConfigManager
+
+        config = ConfigManager(os.path.dirname(os.path.abspath(args.config)))
+        config.load_config(os.path.basename(args.config))
+
+    if args.command == 'schedule':
+        print(config.get('security.backup_schedule', DEFAULT_SCHEDULE) if config is not None
+              else DEFAULT_SCHEDULE)
+        return 0
+
+    options: Dict[str, Any] = {}
+    if args.retention_days is not None:
+        options['retention_days'] = args.retention_days
+    try:
+        engine = (BackupEngine.from_config(config, args.repository, **options)
+                  if config is not None
+                  else BackupEngine(args.repository or DEFAULT_REPOSITORY, **options))
+    except ValueError as e:
+        print(f"Chyba: {e}", file=sys.stderr)
+        return 1
+    try:
+        if args.command == 'run':
+            files = {'projects': args.data}
+            if args.config:
+                files['config'] = os.path.dirname(os.path.abspath(args.config))
+            journal = args.journal or (config.get('journal.directory') if config else None)
+            if journal:
+                files['journal'] = journal
+            databases = {'weather': args.weather_db} if args.weather_db else {}
+            stats = engine.backup(files, databases)
+            print(f"Snímek {stats['snapshot']}: {stats['files']} souborů, "
+                  f"{stats['chunks_new']} nových bloků, zapsáno {stats['bytes_stored']} B")
+            if args.prune:
+                engine.prune()
+        elif args.command == 'list':
+            for snapshot in engine.snapshots():
+                print(f"{snapshot['id']}  {snapshot['files']:>5} souborů  "
+                      f"{snapshot['size']:>12} B  "
+                      f"nově {snapshot['stats'].get('bytes_stored', 0)} B")
+        elif args.command == 'restore':
+            stats = engine.restore(args.target, args.snapshot, args.include)
+            print(f"Obnoveno {stats['files']} souborů ({stats['bytes']} B) ze snímku "
+                  f"{stats['snapshot']}")
+        elif args.command == 'verify':
+            errors = engine.verify(args.snapshot)
+            for error in errors:
+                print(error, file=sys.stderr)
+            print("Snímek je v pořádku" if not errors else f"{len(errors)} chyb")
+            return 1 if errors else 0
+        elif args.command == 'prune':
+            stats = engine.prune()
+            print(f"Smazáno {stats['snapshots_removed']} snímků, uvolněno "
+                  f"{stats['bytes_freed']} B")
+    except ValueError as e:
+        print(f"Chyba: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
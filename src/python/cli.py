@@ -0,0 +1,695 @@
+"""
+Příkazová řádka správce projektů - project-manager
+
+Vstupní bod pro skripty v ``sprava/`` (přidání studenta, vytvoření
+a přiřazení projektu, úkoly, hodnocení). Stav se mezi spuštěními drží
+v JSON souboru. Modul na úrovni importu načítá jen standardní knihovnu;
+ProjectManager, Gradebook a další moduly se importují až v příkazech,
+které je potřebují, aby jednoduchý příkaz startoval rychle i na RPi.
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import Any, Callable, Dict, List, Optional
+
+
+DEFAULT_DATA_FILE = "/home/education-system/projects/project-manager.json"
+DEFAULT_LOG_FILE = "/var/log/project-manager.log"
+
+
+class CommandError(Exception):
+    """Chyba příkazu, která se vypíše uživateli bez tracebacku"""
+
+
+class Session:
+    """
+    Stav jednoho spuštění příkazu (správce projektů a evidence studentů).
+
+    Attributes:
+        data_file (str): Cesta k souboru se stavem
+        log_file (str): Cesta k log souboru ProjectManageru
+        config_file (str): Hlavní konfigurace (limit projektů na studenta)
+        journal_dir (str): Adresář žurnálu změn (volitelný)
+        history_dir (str): Adresář historie pokroku (výchozí projects.history_dir
+            z konfigurace nebo ``progress`` vedle datového souboru)
+        read_only (bool): Příkaz jen čte; žurnál se otevře bez zámku zapisovatele
+    """
+
+    def __init__(
+        self,
+        data_file: str,
+        log_file: Optional[str] = None,
+        config_file: Optional[str] = None,
+        journal_dir: Optional[str] = None,
+        history_dir: Optional[str] = None,
+        read_only: bool = False
+    ):
+        """
+        Inicializace relace.
+
+        Args:
+            data_file: Cesta k souboru se stavem
+            log_file: Cesta k log souboru (výchozí: /var/log nebo vedle dat)
+            config_file: Cesta k main-config.yaml (volitelné)
+            journal_dir: Adresář žurnálu (výchozí journal.directory z konfigurace);
+                projekty a úkoly se pak obnovují ze žurnálu
+            history_dir: Adresář historie pokroku projektů
+            read_only: Příkaz jen čte (lze ho spustit i za běhu kiosk-api,
+                které drží zámek žurnálu)
+        """
+        self.data_file = data_file
+        self.log_file = log_file or self._default_log_file()
+        self.config_file = config_file
+        self.journal_dir = journal_dir
+        self.history_dir = history_dir
+        self.read_only = read_only
+        self._manager = None
+        self._journal: Any = None
+        self._progress_history: Any = None
+        self._registry = None
+        self._config: Any = None
+        self._state: Dict[str, Any] = {}
+        if os.path.exists(data_file):
+            with open(data_file, 'r', encoding='utf-8') as f:
+                try:
+                    self._state = json.load(f)
+                except ValueError as e:
+                    raise CommandError(f"Soubor se stavem '{data_file}' není platný JSON: {e}")
+
+    @property
+    def config(self) -> Any:
+        """ConfigManager s hlavní konfigurací nebo None bez --config"""
+        if self._config is None and self.config_file:
+            from .config_manager import ConfigManager
+
+            config = ConfigManager(os.path.dirname(os.path.abspath(self.config_file)))
+            if config.load_config(os.path.basename(self.config_file)) is None:
+                raise CommandError(f"Konfiguraci '{self.config_file}' nelze načíst")
+            self._config = config
+        return self._config
+
+    @property
+    def registry(self) -> Any:
+        """StudentRegistry (vytvoří se a naplní až při prvním použití)"""
+        if self._registry is None:
+            from .student_registry import StudentRegistry
+
+            if self.config is not None:
+                self._registry = StudentRegistry.from_config(self.config)
+            else:
+                self._registry = StudentRegistry()
+            self._registry.restore(self._state)
+        return self._registry
+
+    @property
+    def manager(self) -> Any:
+        """ProjectManager (vytvoří se a naplní až při prvním použití)"""
+        if self._manager is None:
+            from .project_manager import ProjectManager
+
+            self._manager = ProjectManager(self.log_file, registry=self.registry,
+                                           progress_history=self.progress_history)
+            if self.journal is not None:
+                self.journal.attach(self._manager, initial=self._state)
+            else:
+                self._manager.restore(self._state)
+        return self._manager
+
+    @property
+    def journal(self) -> Any:
+        """Journal (--journal nebo journal.directory) nebo None"""
+        if self._journal is None:
+            from .journal import Journal
+
+            try:
+                if self.journal_dir:
+                    self._journal = Journal(self.journal_dir, read_only=self.read_only)
+                elif self.config is not None:
+                    self._journal = Journal.from_config(self.config, read_only=self.read_only)
+            except ValueError as e:
+                raise CommandError(str(e))
+        return self._journal
+
+    @property
+    def progress_history(self) -> Any:
+        """ProgressHistory (history_dir, projects.history_dir nebo adresář vedle dat)"""
+        if self._progress_history is None:
+            from .progress_history import ProgressHistory
+
+            default = os.path.join(os.path.dirname(os.path.abspath(self.data_file)), 'progress')
+            if self.history_dir:
+                self._progress_history = ProgressHistory(self.history_dir)
+            elif self.config is not None:
+                self._progress_history = ProgressHistory.from_config(self.config, default)
+            else:
+                self._progress_history = ProgressHistory(default)
+        return self._progress_history
+
+    def save(self) -> None:
+        """Atomické uložení stavu"""
+        state = dict(self._state)
+        if self._manager is not None:
+            state.update(self._manager.to_dict())
+        if self._registry is not None:
+            state.update(self._registry.to_dict())
+
+        directory = os.path.dirname(self.data_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.data_file}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2, ensure_ascii=False)
+        os.replace(temp_path, self.data_file)
+
+    def close(self) -> None:
+        """Uzavření žurnálu a historie pokroku (uvolní jejich zámky)"""
+        if self._journal is not None:
+            self._journal.close()
+        if self._progress_history is not None:
+            self._progress_history.close()
+
+    def project(self, name: str) -> Dict[str, Any]:
+        """
+        Projekt podle názvu.
+
+        Raises:
+            CommandError: Pokud projekt neexistuje
+        """
+        project = self.manager.projects.get(name)
+        if project is None:
+            raise CommandError(f"Projekt '{name}' neexistuje")
+        return project
+
+    def _default_log_file(self) -> str:
+        """Log do /var/log, pokud je zapisovatelný, jinak vedle datového souboru"""
+        if os.access(os.path.dirname(DEFAULT_LOG_FILE), os.W_OK):
+            return DEFAULT_LOG_FILE
+        return os.path.join(
+            os.path.dirname(os.path.abspath(self.data_file)), 'project-manager.log'
+        )
+
+
+def _print(args: argparse.Namespace, data: Any, text: str) -> None:
+    """Výpis výsledku jako JSON (--json) nebo jako text"""
+    if args.json:
+        print(json.dumps(data, indent=2, ensure_ascii=False))
+    else:
+        print(text)
+
+
+def cmd_create(args: argparse.Namespace, session: Session) -> None:
+    """Vytvoření nového projektu"""
+    try:
+        project = session.manager.create_project(
+            name=args.name,
+            description=args.description,
+            objectives=args.objective or [],
+            timeline=args.timeline,
+            created_by=args.created_by
+        )
+        session.manager.update_project(args.name, category=args.category,
+                                       difficulty=args.difficulty)
+    except ValueError as e:
+        raise CommandError(str(e))
+    session.save()
+    _print(args, project, f"Projekt '{args.name}' vytvořen")
+
+
+def cmd_project_list(args: argparse.Namespace, session: Session) -> None:
+    """Výpis projektů"""
+    projects = [
+        {
+            'name': name,
+            'status': project['status'],
+            'category': project.get('category'),
+            'tasks': len(project['tasks']),
+        }
+        for name, project in sorted(session.manager.projects.items())
+    ]
+    _print(args, projects, "\n".join(
+        f"{p['name']:<32} {p['status']:<10} {p['tasks']:>4} úkolů" for p in projects
+    ) or "Žádné projekty")
+
+
+def cmd_project_assign(args: argparse.Namespace, session: Session) -> None:
+    """Přiřazení projektu studentovi"""
+    session.project(args.project)
+    try:
+        assigned = session.manager.assign_student(args.project, args.student)
+    except ValueError as e:
+        raise CommandError(str(e))
+    session.save()
+    _print(args, assigned, f"Projekt '{args.project}' přiřazen studentovi '{args.student}'")
+
+
+def cmd_project_report(args: argparse.Namespace, session: Session) -> None:
+    """Report projektu"""
+    session.project(args.project)
+    report = session.manager.generate_report(args.project)
+    _print(args, report, (
+        f"{report['project_name']}: {report['progress']}% hotovo "
+        f"({report['completed_tasks_count']}/{report['total_tasks']} úkolů)"
+    ))
+
+
+def cmd_project_stats(args: argparse.Namespace, session: Session) -> None:
+    """Statistiky projektu"""
+    session.project(args.project)
+    stats = session.manager.get_project_stats(args.project)
+    _print(args, stats, "\n".join(
+        f"{key}: {value}" for key, value in stats.items() if key != 'by_priority'
+    ))
+
+
+def cmd_project_burndown(args: argparse.Namespace, session: Session) -> None:
+    """Burndown projektu s odhadem dokončení"""
+    project = session.project(args.project)
+    burndown = session.progress_history.burndown(project, weeks=args.weeks)
+    forecast = burndown['forecast']
+    lines = [f"{day['date']}  {day['remaining']:>4} zbývá  {day['completed']:>4}/{day['total']:<4}"
+             + (f"  ideál {day['ideal']:g}" if 'ideal' in day else '')
+             for day in burndown['days'][-args.days:]]
+    lines.append(f"Rychlost: {forecast['per_week']:g} úkolů/týden, "
+                 f"odhad dokončení: {forecast['forecast'] or 'nelze určit'}")
+    if forecast['deadline']:
+        lines.append(f"Termín {forecast['deadline']}: " + (
+            "stihne se" if forecast['on_track'] else
+            f"zpoždění {forecast['days_late']} dní" if forecast['days_late'] else "nestihne se"))
+    _print(args, burndown, "\n".join(lines))
+
+
+def cmd_student_add(args: argparse.Namespace, session: Session) -> None:
+    """Přidání studenta"""
+    try:
+        student = session.registry.add_student(args.username, args.name, args.class_name)
+    except ValueError as e:
+        raise CommandError(str(e))
+    session.save()
+    _print(args, student, f"Student '{args.username}' přidán do třídy {args.class_name}")
+
+
+def cmd_student_list(args: argparse.Namespace, session: Session) -> None:
+    """Výpis studentů"""
+    registry = session.registry
+    if args.class_name:
+        students = registry.class_members(args.class_name)
+    else:
+        students = [s for _, s in sorted(registry.students.items())]
+    _print(args, students, "\n".join(
+        f"{s['username']:<24} {s['name']:<32} {s['class']}" for s in students
+    ) or "Žádní studenti")
+
+
+def cmd_student_tasks(args: argparse.Namespace, session: Session) -> None:
+    """Úkoly studenta nebo třídy"""
+    registry = session.manager.registry
+    if args.username:
+        if args.username not in registry:
+            raise CommandError(f"Student '{args.username}' neexistuje")
+        tasks = registry.student_tasks(args.username, open_only=args.open)
+    elif args.class_name:
+        tasks = registry.class_tasks(args.class_name, open_only=args.open)
+    else:
+        raise CommandError("Zadejte --username nebo --class")
+    _print(args, tasks, "\n".join(
+        f"{t['id']:>5} {t['status']:<12} {t['deadline']:<11} {t['assignee']:<24} {t['name']}"
+        for t in tasks
+    ) or "Žádné úkoly")
+
+
+def cmd_student_workload(args: argparse.Namespace, session: Session) -> None:
+    """Vytížení studentů"""
+    workload = session.manager.registry.workload(args.class_name)
+    _print(args, workload, "\n".join(
+        f"{username:<24} {w['open']:>4} otevřených {w['completed']:>4} hotových "
+        f"{w['projects']:>3} projektů"
+        for username, w in workload.items()
+    ) or "Žádní studenti")
+
+
+def cmd_task_add(args: argparse.Namespace, session: Session) -> None:
+    """Přidání úkolu"""
+    session.project(args.project)
+    task = session.manager.add_task(
+        project_name=args.project,
+        task_name=args.name,
+        assignee=args.assignee,
+        deadline=args.deadline,
+        description=args.description,
+        priority=args.priority
+    )
+    session.save()
+    _print(args, task, f"Úkol {task['id']} '{args.name}' přidán")
+
+
+def cmd_task_status(args: argparse.Namespace, session: Session) -> None:
+    """Změna stavu úkolu"""
+    if not session.manager.update_task_status(args.id, args.status, args.notes):
+        raise CommandError(f"Úkol s ID {args.id} nebyl nalezen")
+    session.save()
+    _print(args, {'id': args.id, 'status': args.status}, f"Úkol {args.id}: {args.status}")
+
+
+def cmd_task_list(args: argparse.Namespace, session: Session) -> None:
+    """Výpis úkolů s filtry a stránkováním"""
+    if args.project:
+        session.project(args.project)
+    try:
+        result = session.manager.query_tasks(
+            status=args.status, priority=args.priority, assignee=args.assignee,
+            project=args.project, deadline_from=args.deadline_from,
+            deadline_to=args.deadline_to, order_by=args.order_by,
+            offset=args.offset, limit=args.limit, explain=args.explain
+        )
+    except ValueError as e:
+        raise CommandError(str(e))
+    tasks = result['tasks']
+    text = "\n".join(
+        f"{t['id']:>5} {t['status']:<12} {t['deadline']:<11} {t['assignee']:<24} {t['name']}"
+        for t in tasks
+    ) or "Žádné úkoly"
+    if result['next_offset'] is not None:
+        text += (f"\n{args.offset + 1}–{args.offset + len(tasks)} z {result['total']}, "
+                 f"další stránka: --offset {result['next_offset']}")
+    if args.explain:
+        text += "\n" + json.dumps(result['explain'], ensure_ascii=False)
+    _print(args, result if args.explain else tasks, text)
+
+
+def cmd_task_search(args: argparse.Namespace, session: Session) -> None:
+    """Fulltextové vyhledání úkolů a projektů"""
+    from .search_index import SearchIndex
+
+    SearchIndex().attach(session.manager)
+    kind = None if args.all else 'task'
+    results = session.manager.search(args.query, args.limit, kind=kind, project=args.project)
+    _print(args, results, "\n".join(
+        f"{r['task']['id']:>5} {r['task']['status']:<12} {r['project']:<30} {r['task']['name']}"
+        if r['type'] == 'task' else f"{'':>5} {'projekt':<12} {r['project']}"
+        for r in results
+    ) or "Nic nenalezeno")
+
+
+def _journal(session: Session) -> Any:
+    """Žurnál napojený na správce projektů"""
+    if session.journal is None:
+        raise CommandError("Žurnál není nastaven (--journal nebo journal.directory)")
+    session.manager
+    return session.journal
+
+
+def cmd_journal_log(args: argparse.Namespace, session: Session) -> None:
+    """Auditní stopa změn ze žurnálu"""
+    records = [
+        record for record in _journal(session).records(after=args.after)
+        if args.project is None
+        or args.project in (record['data'].get('project'), record['data'].get('name'))
+        or (record['op'] == 'create_project' and record['data']['project']['name'] == args.project)
+    ][-args.limit:]
+
+    def describe(record: Dict[str, Any]) -> str:
+        data = record['data']
+        if record['op'] == 'create_project':
+            return data['project']['name']
+        if record['op'] == 'update_project':
+            return f"{data['name']}: {', '.join(data['fields'])}"
+        if record['op'] == 'add_task':
+            return f"{data['project']}: {data['task']['id']} {data['task']['name']}"
+        if record['op'] == 'add_tasks':
+            return f"{data['project']}: {len(data['tasks'])} úkolů"
+        if record['op'] == 'update_task_status':
+            return f"{data['project']}: {data['task_id']} → {data['status']} {data['notes']}"
+        return f"{data.get('project')}: {data.get('username', '')}"
+
+    _print(args, records, "\n".join(
+        f"{r['seq']:>7} {r['ts'][:19]} {r['op']:<19} {describe(r)}" for r in records
+    ) or "Žádné záznamy")
+
+
+def cmd_journal_snapshot(args: argparse.Namespace, session: Session) -> None:
+    """Uložení snímku stavu do žurnálu"""
+    seq = _journal(session).snapshot()
+    _print(args, {'seq': seq}, f"Snímek {seq} uložen")
+
+
+def _catalog(args: argparse.Namespace, session: Session) -> Any:
+    """Katalog šablon (--dir, education.templates_path nebo výchozí adresář)"""
+    from .education_templates import DEFAULT_TEMPLATES_DIR, TemplateCatalog
+
+    if args.dir:
+        directory = args.dir
+    elif session.config is not None:
+        directory = session.config.get('education.templates_path', DEFAULT_TEMPLATES_DIR)
+    else:
+        directory = DEFAULT_TEMPLATES_DIR
+    catalog = TemplateCatalog(directory)
+    catalog.load()
+    return catalog
+
+
+def cmd_template_list(args: argparse.Namespace, session: Session) -> None:
+    """Výpis a vyhledání šablon"""
+    templates = _catalog(args, session).search(args.category, args.difficulty, args.subject)
+    rows = [
+        {'id': t.id, 'name': t.name, 'category': t.category, 'difficulty': t.difficulty,
+         'subjects': t.subjects, 'duration_weeks': t.duration_weeks, 'tasks': len(t.plan)}
+        for t in templates
+    ]
+    _print(args, rows, "\n".join(
+        f"{r['id']:<20} {r['category']:<12} {r['difficulty']:<13} {r['duration_weeks']:>2} týd. "
+        f"{r['name']}" for r in rows
+    ) or "Žádné šablony")
+
+
+def cmd_template_show(args: argparse.Namespace, session: Session) -> None:
+    """Detail šablony"""
+    template = _catalog(args, session).get(args.id)
+    if template is None:
+        raise CommandError(f"Šablona '{args.id}' neexistuje")
+    lines = [f"{template.name} ({template.id}), {template.category}, {template.difficulty}"]
+    lines += [f"  milník: {m['name']}" for m in template.milestones]
+    lines += [f"  úkol:   {item['name']}" for item in template.plan]
+    _print(args, template.to_dict(), "\n".join(lines))
+
+
+def cmd_template_create(args: argparse.Namespace, session: Session) -> None:
+    """Vytvoření projektu ze šablony pro celou třídu"""
+    from datetime import date
+
+    catalog = _catalog(args, session)
+    try:
+        start = date.fromisoformat(args.start) if args.start else None
+        project = catalog.instantiate(args.template, args.class_name, session.manager,
+                                      session.registry, start=start, project_name=args.name,
+                                      created_by=args.created_by)
+    except ValueError as e:
+        raise CommandError(str(e))
+    session.save()
+    _print(args, project, f"Projekt '{project['name']}' vytvořen ze šablony "
+                          f"'{args.template}' ({len(project['tasks'])} úkolů)")
+
+
+def cmd_grades(args: argparse.Namespace, session: Optional[Session]) -> int:
+    """Hodnocení (deleguje na příkaz project-grades, pokrok bere z --data)"""
+    from .gradebook import main as grades_main
+
+    # Pozdější --state v argumentech příkazu má přednost
+    return grades_main(['--state', args.data, *args.grades_args])
+
+
+# Příkazy, které stav jen čtou: žurnál otevřou bez zámku zapisovatele
+READ_ONLY_COMMANDS = (
+    cmd_project_list, cmd_project_report, cmd_project_stats, cmd_project_burndown,
+    cmd_student_list, cmd_student_tasks, cmd_student_workload, cmd_task_list,
+    cmd_task_search, cmd_journal_log, cmd_template_list, cmd_template_show,
+)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Sestavení parseru argumentů.
+
+    Returns:
+        Parser se všemi podpříkazy
+    """
+    parser = argparse.ArgumentParser(
+        prog='project-manager', description='Správa studentských projektů'
+    )
+    parser.add_argument('--data', help='Soubor se stavem',
+                        default=os.environ.get('PROJECT_MANAGER_DATA', DEFAULT_DATA_FILE))
+    parser.add_argument('--log-file', help='Log soubor ProjectManageru')
+    parser.add_argument('--config', default=os.environ.get('PROJECT_MANAGER_CONFIG'),
+                        help='Hlavní konfigurace (education.max_projects_per_student)')
+    parser.add_argument('--journal', default=os.environ.get('PROJECT_MANAGER_JOURNAL'),
+                        help='Adresář žurnálu změn (výchozí journal.directory z konfigurace)')
+    parser.add_argument('--json', action='store_true', help='Výstup ve formátu JSON')
+    commands = parser.add_subparsers(dest='command', metavar='příkaz')
+    commands.required = True
+
+    def command(
+        subparsers: Any, name: str, handler: Callable[..., Any], help_text: str
+    ) -> argparse.ArgumentParser:
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.set_defaults(handler=handler)
+        return sub
+
+    create = command(commands, 'create', cmd_create, 'Vytvoření projektu')
+    _add_create_arguments(create)
+
+    project = commands.add_parser('project', help='Projekty').add_subparsers(
+        dest='action', metavar='akce')
+    project.required = True
+    _add_create_arguments(command(project, 'create', cmd_create, 'Vytvoření projektu'))
+    command(project, 'list', cmd_project_list, 'Výpis projektů')
+    assign = command(project, 'assign', cmd_project_assign, 'Přiřazení projektu studentovi')
+    assign.add_argument('--project', required=True)
+    assign.add_argument('--student', required=True, help='Uživatelské jméno studenta')
+    for name, handler, help_text in (
+        ('report', cmd_project_report, 'Report projektu'),
+        ('stats', cmd_project_stats, 'Statistiky projektu'),
+    ):
+        command(project, name, handler, help_text).add_argument('--project', required=True)
+    burndown = command(project, 'burndown', cmd_project_burndown,
+                       'Burndown, rychlost a odhad dokončení projektu')
+    burndown.add_argument('--project', required=True)
+    burndown.add_argument('--days', type=int, default=14, help='Počet vypsaných dní')
+    burndown.add_argument('--weeks', type=int, default=3,
+                          help='Počet týdnů pro průměrnou rychlost')
+
+    student = commands.add_parser('student', help='Studenti').add_subparsers(
+        dest='action', metavar='akce')
+    student.required = True
+    add = command(student, 'add', cmd_student_add, 'Přidání studenta')
+    add.add_argument('--name', required=True)
+    add.add_argument('--class', dest='class_name', required=True)
+    add.add_argument('--username', required=True)
+    listing = command(student, 'list', cmd_student_list, 'Výpis studentů')
+    listing.add_argument('--class', dest='class_name')
+    tasks = command(student, 'tasks', cmd_student_tasks, 'Úkoly studenta nebo třídy')
+    tasks.add_argument('--username')
+    tasks.add_argument('--class', dest='class_name')
+    tasks.add_argument('--open', action='store_true', help='Jen nedokončené úkoly')
+    workload = command(student, 'workload', cmd_student_workload, 'Vytížení studentů')
+    workload.add_argument('--class', dest='class_name')
+
+    task = commands.add_parser('task', help='Úkoly').add_subparsers(
+        dest='action', metavar='akce')
+    task.required = True
+    add = command(task, 'add', cmd_task_add, 'Přidání úkolu')
+    add.add_argument('--project', required=True)
+    add.add_argument('--name', required=True)
+    add.add_argument('--assignee', required=True)
+    add.add_argument('--deadline', required=True, help='YYYY-MM-DD')
+    add.add_argument('--description', default='')
+    add.add_argument('--priority', default='normal',
+                     choices=['low', 'normal', 'high', 'critical'])
+    status = command(task, 'status', cmd_task_status, 'Změna stavu úkolu')
+    status.add_argument('--id', type=int, required=True)
+    status.add_argument('--status', required=True,
+                        choices=['assigned', 'in_progress', 'completed', 'blocked'])
+    status.add_argument('--notes', default='')
+    listing = command(task, 'list', cmd_task_list, 'Výpis a filtrování úkolů')
+    listing.add_argument('--project')
+    listing.add_argument('--status', help='Stav nebo stavy oddělené čárkou')
+    listing.add_argument('--priority', help='Priorita nebo priority oddělené čárkou')
+    listing.add_argument('--assignee', help='Řešitel nebo řešitelé oddělení čárkou')
+    listing.add_argument('--from', dest='deadline_from', help='Deadline od YYYY-MM-DD')
+    listing.add_argument('--to', dest='deadline_to', help='Deadline do YYYY-MM-DD')
+    listing.add_argument('--order-by', default='id', choices=['id', 'deadline', 'priority'])
+    listing.add_argument('--offset', type=int, default=0)
+    listing.add_argument('--limit', type=int, default=1000)
+    listing.add_argument('--explain', action='store_true', help='Vypsat plán dotazu')
+    search = command(task, 'search', cmd_task_search, 'Fulltextové vyhledání úkolů')
+    search.add_argument('query', help='Hledaný text (bez ohledu na diakritiku)')
+    search.add_argument('--project', help='Jen v daném projektu')
+    search.add_argument('--limit', type=int, default=20)
+    search.add_argument('--all', action='store_true', help='Hledat i v projektech')
+
+    template = commands.add_parser('template', help='Šablony projektů').add_subparsers(
+        dest='action', metavar='akce')
+    template.required = True
+    listing = command(template, 'list', cmd_template_list, 'Výpis a vyhledání šablon')
+    listing.add_argument('--category')
+    listing.add_argument('--difficulty', choices=['beginner', 'intermediate', 'advanced'])
+    listing.add_argument('--subject')
+    show = command(template, 'show', cmd_template_show, 'Detail šablony')
+    show.add_argument('--id', required=True)
+    create = command(template, 'create', cmd_template_create,
+                     'Vytvoření projektu ze šablony pro třídu')
+    create.add_argument('--template', required=True, help='ID šablony')
+    create.add_argument('--class', dest='class_name', required=True)
+    create.add_argument('--start', help='Začátek projektu YYYY-MM-DD (výchozí dnes)')
+    create.add_argument('--name', help='Název projektu (výchozí "<šablona> <třída>")')
+    create.add_argument('--created-by', default='teacher')
+    for sub in (listing, show, create):
+        sub.add_argument('--dir', help='Adresář šablon (výchozí education.templates_path)')
+
+    journal = commands.add_parser('journal', help='Žurnál změn').add_subparsers(
+        dest='action', metavar='akce')
+    journal.required = True
+    log = command(journal, 'log', cmd_journal_log, 'Auditní stopa změn')
+    log.add_argument('--project')
+    log.add_argument('--after', type=int, default=0, help='Jen záznamy za tímto seq')
+    log.add_argument('--limit', type=int, default=50)
+    command(journal, 'snapshot', cmd_journal_snapshot, 'Uložení snímku stavu')
+
+    grades = command(commands, 'grades', cmd_grades, 'Hodnocení (viz project-grades --help)')
+    grades.add_argument('grades_args', nargs=argparse.REMAINDER)
+
+    return parser
+
+
+def _add_create_arguments(parser: argparse.ArgumentParser) -> None:
+    """Argumenty pro vytvoření projektu"""
+    parser.add_argument('--name', required=True)
+    parser.add_argument('--description', default='')
+    parser.add_argument('--category', default='programming')
+    parser.add_argument('--difficulty', default='beginner',
+                        choices=['beginner', 'intermediate', 'advanced'])
+    parser.add_argument('--timeline', default='4 týdny')
+    parser.add_argument('--objective', action='append', help='Cíl projektu (lze opakovat)')
+    parser.add_argument('--created-by', default='teacher')
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Vstupní bod příkazu ``project-manager``.
+
+    Args:
+        argv: Argumenty příkazové řádky (výchozí: sys.argv)
+
+    Returns:
+        Návratový kód procesu
+    """
+    parser = build_parser()
+    # Argumenty za "grades" patří příkazu project-grades; REMAINDER sám nebere
+    # volby před prvním pozičním argumentem, ty zůstanou mezi neznámými
+    args, unknown = parser.parse_known_args(argv)
+    if args.handler is cmd_grades:
+        forwarded = unknown + args.grades_args
+        args.grades_args = forwarded[1:] if forwarded[:1] == ['--'] else forwarded
+        return cmd_grades(args, None)
+    if unknown:
+        parser.error(f"unrecognized arguments: {' '.join(unknown)}")
+
+    session = None
+    try:
+        session = Session(args.data, args.log_file, args.config, args.journal,
+                          read_only=args.handler in READ_ONLY_COMMANDS)
+        args.handler(args, session)
+    except CommandError as e:
+        print(f"Chyba: {e}", file=sys.stderr)
+        return 1
+    except OSError as e:
+        print(f"Chyba při práci se souborem '{e.filename or args.data}': {e}", file=sys.stderr)
+        return 1
+    finally:
+        if session is not None:
+            session.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,362 @@
+"""
+Statická analýza kódu - Code Analyzer
+
+Modul pro hodnocení kvality studentského Python kódu. Jedním průchodem
+AST stromu měří cyklomatickou složitost, délku funkcí, dodržování
+konvencí pojmenování a pokrytí docstringy. Výsledky i rozparsované
+stromy se ukládají do cache podle otisku souboru, takže při opakovaném
+hodnocení třídy se analyzují jen změněné soubory.
+"""
+
+import ast
+import hashlib
+import json
+import logging
+import re
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+
+SNAKE_CASE = re.compile(r'^_{0,2}[a-z][a-z0-9_]*_{0,2}$')
+CAP_WORDS = re.compile(r'^_?[A-Z][A-Za-z0-9]*$')
+CONSTANT = re.compile(r'^_?[A-Z][A-Z0-9_]*$')
+
+# Hranice pro plný a nulový počet bodů
+COMPLEXITY_OK, COMPLEXITY_MAX = 10, 20
+LENGTH_OK, LENGTH_MAX = 50, 100
+
+# Váhy dílčích metrik ve výsledném skóre
+SCORE_WEIGHTS = {
+    'complexity': 0.3,
+    'length': 0.2,
+    'naming': 0.2,
+    'docstrings': 0.3,
+}
+
+_DECISION_NODES = (
+    ast.If, ast.For, ast.AsyncFor, ast.While, ast.IfExp,
+    ast.ExceptHandler, ast.Assert,
+)
+
+
+def source_hash(source: str) -> str:
+    """
+    Otisk zdrojového kódu (SHA-256).
+
+    Args:
+        source: Zdrojový kód
+
+    Returns:
+        Hexadecimální otisk
+    """
+    return hashlib.sha256(source.encode('utf-8')).hexdigest()
+
+
+def _linear_score(value: float, ok: float, maximum: float) -> float:
+    """Plný počet bodů do ``ok``, lineárně klesá k nule v ``maximum``"""
+    if value <= ok:
+        return 1.0
+    if value >= maximum:
+        return 0.0
+    return (maximum - value) / (maximum - ok)
+
+
+class _MetricsVisitor(ast.NodeVisitor):
+    """Jeden průchod stromem, který sbírá všechny metriky najednou"""
+
+    def __init__(self) -> None:
+        self.functions: List[Dict[str, Any]] = []
+        self.classes = 0
+        self.documented = 0
+        self.names_checked = 0
+        self.naming_violations: List[str] = []
+        self._stack: List[Dict[str, Any]] = []
+        self._seen_names: set = set()
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        self._visit_function(node)
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
+        self._visit_function(node)
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        self.classes += 1
+        self._check_name(node.name, CAP_WORDS, 'třída')
+        if ast.get_docstring(node):
+            self.documented += 1
+        self.generic_visit(node)
+
+    def visit_Name(self, node: ast.Name) -> None:
+        if isinstance(node.ctx, ast.Store) and node.id not in self._seen_names:
+            self._seen_names.add(node.id)
+            # Na úrovni modulu jsou povoleny i konstanty VELKÝMI_PÍSMENY
+            if self._stack or not CONSTANT.match(node.id):
+                self._check_name(node.id, SNAKE_CASE, 'proměnná')
+
+    def generic_visit(self, node: ast.AST) -> None:
+        if self._stack:
+            current = self._stack[-1]
+            if isinstance(node, _DECISION_NODES):
+                current['complexity'] += 1
+            elif isinstance(node, ast.BoolOp):
+                current['complexity'] += len(node.values) - 1
+            elif isinstance(node, ast.comprehension):
+                current['complexity'] += 1 + len(node.ifs)
+        super().generic_visit(node)
+
+    def _visit_function(self, node: Union[ast.FunctionDef, ast.AsyncFunctionDef]) -> None:
+        self._check_name(node.name, SNAKE_CASE, 'funkce')
+        for arg in node.args.args + node.args.kwonlyargs:
+            if arg.arg not in ('self', 'cls'):
+                self._check_name(arg.arg, SNAKE_CASE, 'parametr')
+        has_docstring = bool(ast.get_docstring(node))
+        if has_docstring:
+            self.documented += 1
+
+        metrics = {
+            'name': node.name,
+            'lineno': node.lineno,
+            'length': getattr(node, 'end_lineno', node.lineno) - node.lineno + 1,
+            'complexity': 1,
+            'has_docstring': has_docstring,
+        }
+        self._stack.append(metrics)
+        self.generic_visit(node)
+        self._stack.pop()
+        self.functions.append(metrics)
+
+    def _check_name(self, name: str, pattern: 're.Pattern', kind: str) -> None:
+        self.names_checked += 1
+        if not pattern.match(name):
+            self.naming_violations.append(f"{kind} '{name}'")
+
+
+class CodeAnalyzer:
+    """
+    Analyzátor kvality Python kódu s cache podle otisku souboru.
+
+    Attributes:
+        cache_size (int): Maximální počet metrik v paměťové cache
+        ast_cache_size (int): Maximální počet stromů v paměťové cache
+        cache_dir (Optional[Path]): Adresář pro sdílenou cache metrik (JSON)
+        hits (int): Počet souborů vzatých z cache
+        misses (int): Počet skutečně analyzovaných souborů
+        logger (logging.Logger): Logger pro auditování
+    """
+
+    def __init__(
+        self,
+        cache_size: int = 4096,
+        ast_cache_size: int = 256,
+        cache_dir: Optional[str] = None
+    ):
+        """
+        Inicializace analyzátoru.
+
+        Args:
+            cache_size: Maximální počet metrik v paměťové cache
+            ast_cache_size: Maximální počet stromů v paměťové cache
+            cache_dir: Adresář pro cache metrik sdílenou mezi procesy (volitelné)
+        """
+        self.cache_size = cache_size
+        self.ast_cache_size = ast_cache_size
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.hits = 0
+        self.misses = 0
+        self.logger = logging.getLogger("CodeAnalyzer")
+        self._metrics_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._ast_cache: "OrderedDict[str, ast.AST]" = OrderedDict()
+
+    def parse(self, source: str, filename: str = '<submission>') -> ast.AST:
+        """
+        Rozparsování zdrojového kódu s cache podle otisku.
+
+        Args:
+            source: Zdrojový kód
+            filename: Jméno souboru (pro chybová hlášení)
+
+        Returns:
+            AST strom
+
+        Raises:
+            SyntaxError: Pokud kód není syntakticky správně
+        """
+        key = source_hash(source)
+        tree = self._ast_cache.get(key)
+        if tree is None:
+            tree = ast.parse(source, filename=filename)
+            self._remember(self._ast_cache, key, tree, self.ast_cache_size)
+        else:
+            self._ast_cache.move_to_end(key)
+        return tree
+
+    def analyze_source(self, source: str, filename: str = '<submission>') -> Dict[str, Any]:
+        """
+        Analýza jednoho souboru.
+
+        Args:
+            source: Zdrojový kód
+            filename: Jméno souboru
+
+        Returns:
+            Slovník s metrikami a skóre (0-100)
+        """
+        key = source_hash(source)
+        metrics = self._cached_metrics(key)
+        if metrics is not None:
+            self.hits += 1
+            return metrics
+
+        self.misses += 1
+        metrics = self._measure(source, filename)
+        self._remember(self._metrics_cache, key, metrics, self.cache_size)
+        if self.cache_dir:
+            self._write_disk_cache(key, metrics)
+        return metrics
+
+    def analyze_submission(self, code: Union[str, Dict[str, str]]) -> Dict[str, Any]:
+        """
+        Analýza celé odevzdané práce (jeden nebo více souborů).
+
+        Args:
+            code: Zdrojový kód nebo slovník {jméno souboru: zdrojový kód}
+
+        Returns:
+            Slovník s metrikami souborů ('files'), výsledným skóre
+            ('score', vážené počtem řádků) a počty 'analyzed' a 'cached'
+        """
+        files = code if isinstance(code, dict) else {'<submission>': code or ''}
+        hits_before, misses_before = self.hits, self.misses
+
+        results = {
+            filename: self.analyze_source(source, filename)
+            for filename, source in sorted(files.items())
+        }
+        total_lines = sum(max(m['lines'], 1) for m in results.values())
+        score = (
+            sum(m['score'] * max(m['lines'], 1) for m in results.values()) / total_lines
+            if results else 0.0
+        )
+        return {
+            'files': results,
+            'score': round(score, 2),
+            'analyzed': self.misses - misses_before,
+            'cached': self.hits - hits_before,
+        }
+
+    def clear_cache(self) -> None:
+        """Vyprázdnění paměťových cache"""
+        self._metrics_cache.clear()
+        self._ast_cache.clear()
+
+    def _measure(self, source: str, filename: str) -> Dict[str, Any]:
+        """Změření metrik jednoho souboru"""
+        lines = len(source.splitlines())
+        if not source.strip():
+            return {'lines': 0, 'score': 0.0, 'syntax_error': None, 'functions': []}
+        try:
+            tree = self.parse(source, filename)
+        except SyntaxError as e:
+            return {
+                'lines': lines,
+                'score': 0.0,
+                'syntax_error': f"{e.msg} (řádek {e.lineno})",
+                'functions': [],
+            }
+
+        visitor = _MetricsVisitor()
+        if ast.get_docstring(tree):
+            visitor.documented += 1
+        visitor.visit(tree)
+
+        functions = visitor.functions
+        documentable = len(functions) + visitor.classes + 1
+        components = {
+            'complexity': (
+                sum(_linear_score(f['complexity'], COMPLEXITY_OK, COMPLEXITY_MAX)
+                    for f in functions) / len(functions) if functions else 1.0
+            ),
+            'length': (
+                sum(_linear_score(f['length'], LENGTH_OK, LENGTH_MAX)
+                    for f in functions) / len(functions) if functions else 1.0
+            ),
+            'naming': (
+                1.0 - len(visitor.naming_violations) / visitor.names_checked
+                if visitor.names_checked else 1.0
+            ),
+            'docstrings': visitor.documented / documentable,
+        }
+        score = 100.0 * sum(components[name] * w for name, w in SCORE_WEIGHTS.items())
+
+        return {
+            'lines': lines,
+            'score': round(score, 2),
+            'syntax_error': None,
+            'functions': functions,
+            'classes': visitor.classes,
+            'max_complexity': max((f['complexity'] for f in functions), default=0),
+            'max_function_length': max((f['length'] for f in functions), default=0),
+            'naming_violations': visitor.naming_violations,
+            'docstring_coverage': round(visitor.documented / documentable, 3),
+            'components': {name: round(value, 3) for name, value in components.items()},
+        }
+
+    def _cached_metrics(self, key: str) -> Optional[Dict[str, Any]]:
+        """Hledání metrik v paměťové a diskové cache"""
+        metrics = self._metrics_cache.get(key)
+        if metrics is not None:
+            self._metrics_cache.move_to_end(key)
+            return metrics
+        if not self.cache_dir:
+            return None
+
+        path = self.cache_dir / f"{key}.json"
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                metrics = json.load(f)
+        except (IOError, ValueError):
+            return None
+        self._remember(self._metrics_cache, key, metrics, self.cache_size)
+        return metrics
+
+    def _write_disk_cache(self, key: str, metrics: Dict[str, Any]) -> None:
+        """Zápis metrik do diskové cache (atomicky přes dočasný soubor)"""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            temp_path = self.cache_dir / f"{key}.json.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(metrics, f, ensure_ascii=False)
+            temp_path.replace(self.cache_dir / f"{key}.json")
+        except IOError as e:
+            self.logger.warning(f"Metriky nelze uložit do cache: {e}")
+
+    @staticmethod
+    def _remember(cache: "OrderedDict[str, Any]", key: str, value: Any, limit: int) -> None:
+        """Vložení do LRU cache s omezenou velikostí"""
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > limit:
+            cache.popitem(last=False)
+
+
+_analyzers: Dict[Optional[str], CodeAnalyzer] = {}
+
+
+def get_analyzer(cache_dir: Optional[str] = None) -> CodeAnalyzer:
+    """
+    Sdílený analyzátor pro aktuální proces.
+
+    Pracovní procesy dávkového hodnocení tak využívají cache napříč
+    jednotlivými úlohami.
+
+    Args:
+        cache_dir: Adresář pro diskovou cache (volitelné)
+
+    Returns:
+        Instance CodeAnalyzer
+    """
+    analyzer = _analyzers.get(cache_dir)
+    if analyzer is None:
+        analyzer = _analyzers[cache_dir] = CodeAnalyzer(cache_dir=cache_dir)
+    return analyzer
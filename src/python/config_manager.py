@@ -7,9 +7,25 @@ Modul pro správu YAML konfigurací, validaci a aplikaci nastavení.
 import yaml
 import logging
 import os
+import time
 from typing import Dict, Any, Optional
 from pathlib import Path
 
+from .metrics import get_registry
+from .profiling import traced
+
+
+_OPERATIONS = get_registry().counter(
+    'config_operations_total', 'Počet načtení a uložení konfigurace', ['operation', 'result'])
+_DURATION = get_registry().histogram(
+    'config_operation_seconds', 'Doba načtení a uložení konfigurace', ['operation'])
+
+
+def _observe(operation: str, started: float, ok: bool) -> None:
+    """Zaznamenání operace s konfigurací do metrik"""
+    _OPERATIONS.labels(operation, 'ok' if ok else 'error').inc()
+    _DURATION.labels(operation).observe(time.perf_counter() - started)
+
 
 class ConfigManager:
     """
@@ -21,22 +37,25 @@ class ConfigManager:
         config_dir (Path): Adresář s konfiguracemi
         logger (logging.Logger): Logger pro auditování
         config (Dict): Načtená konfigurace
+        event_bus (EventBus): Sběrnice pro publikování změn (volitelná)
     """
     
     REQUIRED_SECTIONS = [
         'system', 'network', 'security', 'education', 'monitoring'
     ]
     
-    def __init__(self, config_dir: str = "/app/config"):
+    def __init__(self, config_dir: str = "/app/config", event_bus: Optional[Any] = None):
         """
         Inicializace správce konfigurace.
         
         Args:
             config_dir: Cesta k adresáři s konfiguracemi
+            event_bus: Sběrnice událostí (EventBus) pro změny hodnot
         """
         self.config_dir = Path(config_dir)
         self.logger = self._setup_logging()
         self.config: Dict[str, Any] = {}
+        self.event_bus = event_bus
     
     def _setup_logging(self) -> logging.Logger:
         """Nastavení loggingu"""
@@ -50,6 +69,7 @@ class ConfigManager:
         logger.setLevel(logging.INFO)
         return logger
     
+    @traced()
     def load_config(self, filename: str) -> Optional[Dict[str, Any]]:
         """
         Načtení konfigurace z YAML souboru.
@@ -60,6 +80,13 @@ class ConfigManager:
         Returns:
             Slovník s konfigurací nebo None
         """
+        started = time.perf_counter()
+        config = self._read_config(filename)
+        _observe('load', started, config is not None)
+        return config
+    
+    def _read_config(self, filename: str) -> Optional[Dict[str, Any]]:
+        """Načtení a validace YAML souboru (bez metrik)"""
         config_path = self.config_dir / filename
         
         if not config_path.exists():
@@ -154,8 +181,13 @@ class ConfigManager:
         
         config[keys[-1]] = value
         self.logger.info(f"Konfigurace '{key}' nastavena na '{value}'")
+        if self.event_bus is not None:
+            self.event_bus.publish(
+                'config.changed', {'key': key, 'value': value}, key=f"config:{key}"
+            )
         return True
     
+    @traced()
     def save_config(self, filename: str) -> bool:
         """
         Uložení konfigurace do YAML souboru.
@@ -166,6 +198,7 @@ class ConfigManager:
         Returns:
             True pokud bylo uložení úspěšné
         """
+        started = time.perf_counter()
         config_path = self.config_dir / filename
         
         try:
@@ -174,9 +207,11 @@ class ConfigManager:
                 yaml.dump(self.config, f, default_flow_style=False, 
                          allow_unicode=True)
             self.logger.info(f"Konfigurace uložena do '{config_path}'")
+            _observe('save', started, True)
             return True
         except IOError as e:
             self.logger.error(f"Chyba při zápisu konfigurace: {e}")
+            _observe('save', started, False)
             return False
     
     def get_all(self) -> Dict[str, Any]:
@@ -0,0 +1,541 @@
+"""
+Katalog projektových šablon - Education Templates
+
+Načte všechny YAML šablony z adresáře jednou do indexované paměťové
+podoby (podle kategorie, obtížnosti a předmětu). Zkompilovaný katalog
+se ukládá do JSON cache podle času změny souborů, takže další spuštění
+YAML vůbec neparsuje. Šablonu lze vytvořit pro celou třídu najednou:
+projekt, milníky a úkoly všech studentů přes hromadnou cestu
+ProjectManager.add_tasks.
+"""
+
+import json
+import logging
+import os
+import re
+import unicodedata
+from datetime import date, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+
+DEFAULT_TEMPLATES_DIR = "/app/config/templates"
+CACHE_FILE = ".catalog-cache.json"
+CACHE_VERSION = 1
+DIFFICULTIES = ('beginner', 'intermediate', 'advanced')
+PRIORITIES = ('low', 'normal', 'high', 'critical')
+
+
+def _slug(text: str) -> str:
+    """Identifikátor šablony z názvu"""
+    ascii_text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^a-z0-9]+', '-', ascii_text.lower()).strip('-')
+
+
+def _timeline(weeks: int) -> str:
+    """Časový plán v češtině (1 týden, 2 týdny, 5 týdnů)"""
+    if weeks == 1:
+        return "1 týden"
+    return f"{weeks} týdny" if 2 <= weeks <= 4 else f"{weeks} týdnů"
+
+
+def _percent(value: Any) -> float:
+    """Váha kritéria ('40%' nebo 40) jako číslo v procentech"""
+    if isinstance(value, str):
+        value = value.strip().rstrip('%')
+    return float(value)
+
+
+class ProjectTemplate:
+    """
+    Projektová šablona.
+
+    Při vytvoření se zkompiluje plán úkolů jednoho studenta (posun
+    termínu ve dnech nebo pevné datum, milník, závislosti jako indexy),
+    takže vytvoření projektu pro třídu už jen dosazuje data.
+
+    Attributes:
+        id (str): Identifikátor šablony
+        name (str): Název projektu
+        category (str): Kategorie (programming, robotics, iot, ...)
+        difficulty (str): Obtížnost (beginner, intermediate, advanced)
+        subjects (List[str]): Předměty
+        duration_weeks (int): Délka projektu v týdnech
+        milestones (List[Dict]): Milníky ('name' a 'week' nebo 'deadline')
+        tasks (List[Dict]): Úkoly studenta (prázdné = úkol za každý milník)
+        plan (List[Dict]): Zkompilovaný plán úkolů jednoho studenta
+    """
+
+    def __init__(
+        self,
+        name: str,
+        difficulty: str = "beginner",
+        subjects: Optional[List[str]] = None,
+        learning_objectives: Union[List[str], Dict[str, str], None] = None,
+        estimated_duration: Union[str, int, None] = None,
+        resources: Optional[List[str]] = None,
+        category: str = "programming",
+        description: str = "",
+        template_id: Optional[str] = None,
+        team_size: int = 1,
+        milestones: Optional[List[Dict[str, Any]]] = None,
+        tasks: Optional[List[Dict[str, Any]]] = None,
+        hardware_requirements: Optional[List[str]] = None,
+        software_requirements: Optional[List[str]] = None,
+        assessment_criteria: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Inicializace a kompilace šablony.
+
+        Args:
+            name: Název projektu
+            difficulty: Obtížnost (beginner, intermediate, advanced)
+            subjects: Předměty
+            learning_objectives: Cíle (seznam nebo {předmět: cíl})
+            estimated_duration: Délka ("4 weeks", "4 týdny" nebo počet týdnů)
+            resources: Potřebné pomůcky
+            category: Kategorie projektu
+            description: Popis projektu
+            template_id: Identifikátor (výchozí: odvozený z názvu)
+            team_size: Velikost týmu
+            milestones: Milníky ('name' a 'week' nebo 'deadline')
+            tasks: Úkoly studenta ('name', volitelně 'milestone', 'week',
+                'deadline', 'priority', 'description', 'depends_on' s názvy)
+            hardware_requirements: Potřebný hardware
+            software_requirements: Potřebný software
+            assessment_criteria: Váhy hodnocení ({kritérium: '40%'})
+
+        Raises:
+            ValueError: Pokud je šablona neplatná
+        """
+        if not name:
+            raise ValueError("Šablona musí mít název")
+        if difficulty not in DIFFICULTIES:
+            raise ValueError(f"Neznámá obtížnost '{difficulty}' šablony '{name}'")
+        self.name = name
+        self.id = template_id or _slug(name)
+        self.difficulty = difficulty
+        self.category = category
+        self.description = description
+        self.subjects = list(subjects or [])
+        self.learning_objectives = learning_objectives or []
+        self.resources = list(resources or [])
+        self.team_size = int(team_size)
+        self.hardware_requirements = list(hardware_requirements or [])
+        self.software_requirements = list(software_requirements or [])
+        self.assessment_criteria = {
+            criterion: _percent(weight) for criterion, weight in (assessment_criteria or {}).items()
+        }
+        if isinstance(estimated_duration, str):
+            match = re.search(r'\d+', estimated_duration)
+            estimated_duration = int(match.group()) if match else None
+        self.milestones = [dict(milestone) for milestone in milestones or []]
+        self.duration_weeks = int(estimated_duration or max(
+            [m.get('week', 0) for m in self.milestones] or [4]))
+        self.tasks = [dict(task) for task in tasks or []]
+        self.plan = self._compile()
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ProjectTemplate":
+        """
+        Vytvoření šablony ze slovníku (obsah YAML souboru).
+
+        Přijímá plochý tvar i tvar souboru ``Konfigurace projektu.yaml``
+        s blokem ``project:`` (id, name, category, difficulty,
+        duration_weeks, team_size).
+
+        Raises:
+            ValueError: Pokud je šablona neplatná
+        """
+        if not isinstance(data, dict):
+            raise ValueError("Šablona musí být slovník")
+        data = dict(data)
+        data.update(data.pop('project', None) or {})
+        return cls(
+            name=data.get('name', ''),
+            difficulty=data.get('difficulty', 'beginner'),
+            subjects=data.get('subjects'),
+            learning_objectives=data.get('learning_objectives'),
+            estimated_duration=data.get('duration_weeks', data.get('estimated_duration')),
+            resources=data.get('resources'),
+            category=data.get('category', 'programming'),
+            description=data.get('description', ''),
+            template_id=data.get('id'),
+            team_size=data.get('team_size', 1),
+            milestones=data.get('milestones'),
+            tasks=data.get('tasks'),
+            hardware_requirements=data.get('hardware_requirements'),
+            software_requirements=data.get('software_requirements'),
+            assessment_criteria=data.get('assessment_criteria'),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Slovník ve tvaru YAML šablony"""
+        return {
+            'project': {
+                'id': self.id,
+                'name': self.name,
+                'category': self.category,
+                'difficulty': self.difficulty,
+                'duration_weeks': self.duration_weeks,
+                'team_size': self.team_size,
+            },
+            'description': self.description,
+            'subjects': self.subjects,
+            'learning_objectives': self.learning_objectives,
+            'resources': self.resources,
+            'hardware_requirements': self.hardware_requirements,
+            'software_requirements': self.software_requirements,
+            'milestones': self.milestones,
+            'tasks': self.tasks,
+            'assessment_criteria': {
+                criterion: f"{weight:g}%" for criterion, weight in self.assessment_criteria.items()
+            },
+        }
+
+    def objectives(self) -> List[str]:
+        """Cíle projektu jako seznam textů"""
+        if isinstance(self.learning_objectives, dict):
+            return [f"{subject}: {text}" for subject, text in self.learning_objectives.items()]
+        return list(self.learning_objectives)
+
+    def save_template(self, directory: Optional[str] = None) -> str:
+        """
+        Uložení šablony do YAML souboru ``<id>.yaml``.
+
+        Args:
+            directory: Adresář katalogu (výchozí DEFAULT_TEMPLATES_DIR)
+
+        Returns:
+            Cesta k uloženému souboru
+        """
+        import yaml
+
+        directory = directory or DEFAULT_TEMPLATES_DIR
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{self.id}.yaml")
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            yaml.safe_dump(self.to_dict(), f, allow_unicode=True, sort_keys=False)
+        os.replace(temp_path, path)
+        return path
+
+    def _compile(self) -> List[Dict[str, Any]]:
+        """Plán úkolů jednoho studenta s vyřešenými termíny a závislostmi"""
+        milestones = {}
+        for milestone in self.milestones:
+            if 'name' not in milestone:
+                raise ValueError(f"Milník šablony '{self.name}' nemá název")
+            milestones[milestone['name']] = self._due(milestone)
+
+        if not self.tasks:
+            return [
+                {'name': name, 'description': '', 'milestone': name, 'due': due,
+                 'priority': 'normal', 'depends_on': [index - 1] if index else []}
+                for index, (name, due) in enumerate(milestones.items())
+            ]
+
+        plan: List[Dict[str, Any]] = []
+        positions: Dict[str, int] = {}
+        for task in self.tasks:
+            name = task.get('name')
+            milestone = task.get('milestone')
+            if not name:
+                raise ValueError(f"Úkol šablony '{self.name}' nemá název")
+            if milestone is not None and milestone not in milestones:
+                raise ValueError(f"Úkol '{name}' odkazuje na neznámý milník '{milestone}'")
+            if task.get('priority', 'normal') not in PRIORITIES:
+                raise ValueError(f"Neznámá priorita úkolu '{name}'")
+            unknown = [d for d in task.get('depends_on') or () if d not in positions]
+            if unknown:
+                raise ValueError(f"Úkol '{name}' závisí na neznámých úkolech {unknown}")
+            if 'week' in task or 'deadline' in task:
+                due = self._due(task)
+            elif milestone is not None:
+                due = milestones[milestone]
+            else:
+                due = self.duration_weeks * 7
+            positions[name] = len(plan)
+            plan.append({
+                'name': name,
+                'description': task.get('description', ''),
+                'milestone': milestone,
+                'due': due,
+                'priority': task.get('priority', 'normal'),
+                'depends_on': [positions[d] for d in task.get('depends_on') or ()],
+            })
+        return plan
+
+    def _due(self, item: Dict[str, Any]) -> Union[int, str]:
+        """Termín jako posun ve dnech od začátku ('week') nebo pevné datum"""
+        if 'deadline' in item:
+            return str(item['deadline'])
+        if 'week' in item:
+            return int(item['week']) * 7
+        raise ValueError(f"Položka '{item.get('name')}' šablony '{self.name}' nemá termín")
+
+
+def _deadline(due: Union[int, str], start: date) -> str:
+    """Termín z plánu (posun ve dnech nebo pevné datum)"""
+    if isinstance(due, int):
+        return (start + timedelta(days=due)).isoformat()
+    return due
+
+
+class TemplateCatalog:
+    """
+    Katalog šablon s indexy podle kategorie, obtížnosti a předmětu.
+
+    Attributes:
+        directory (str): Adresář s YAML šablonami
+        cache_path (str): JSON cache zkompilovaného katalogu
+        templates (Dict[str, ProjectTemplate]): Šablony podle ID
+        logger (logging.Logger): Logger
+    """
+
+    def __init__(self, directory: str = DEFAULT_TEMPLATES_DIR, cache_path: Optional[str] = None):
+        """
+        Inicializace katalogu (šablony se načtou metodou load).
+
+        Args:
+            directory: Adresář s YAML šablonami
+            cache_path: Cesta ke cache (výchozí: .catalog-cache.json v adresáři)
+        """
+        self.directory = directory
+        self.cache_path = cache_path or os.path.join(directory, CACHE_FILE)
+        self.templates: Dict[str, ProjectTemplate] = {}
+        self.logger = logging.getLogger("TemplateCatalog")
+        self._indexes: Dict[str, Dict[str, List[str]]] = {
+            'category': {}, 'difficulty': {}, 'subject': {}
+        }
+
+    @classmethod
+    def from_config(cls, config: Any) -> "TemplateCatalog":
+        """
+        Vytvoření a načtení katalogu podle ``education.templates_path``.
+
+        Args:
+            config: ConfigManager s načtenou konfigurací
+        """
+        catalog = cls(config.get('education.templates_path', DEFAULT_TEMPLATES_DIR))
+        catalog.load()
+        return catalog
+
+    def __len__(self) -> int:
+        return len(self.templates)
+
+    def __iter__(self) -> Iterator[ProjectTemplate]:
+        return iter(self.templates.values())
+
+    def __contains__(self, template_id: object) -> bool:
+        return template_id in self.templates
+
+    def load(self) -> int:
+        """
+        Načtení katalogu z cache, nebo (při změně souborů) z YAML.
+
+        Neplatné šablony se zalogují a přeskočí.
+
+        Returns:
+            Počet načtených šablon
+        """
+        signature = self._signature()
+        templates = self._load_cache(signature)
+        if templates is None:
+            templates = self._parse(signature)
+            self._save_cache(signature, templates)
+        self.templates = {}
+        for data in templates:
+            template = ProjectTemplate.from_dict(data)
+            self.templates[template.id] = template
+        self._build_indexes()
+        self.logger.info(f"Načteno {len(self.templates)} šablon z '{self.directory}'")
+        return len(self.templates)
+
+    def get(self, template_id: str) -> Optional[ProjectTemplate]:
+        """Šablona podle ID"""
+        return self.templates.get(template_id)
+
+    def add(self, template: ProjectTemplate) -> None:
+        """Přidání šablony do paměťového katalogu (bez uložení)"""
+        self.templates[template.id] = template
+        self._build_indexes()
+
+    def search(
+        self,
+        category: Optional[str] = None,
+        difficulty: Optional[str] = None,
+        subject: Optional[str] = None
+    ) -> List[ProjectTemplate]:
+        """
+        Vyhledání šablon (průnik indexů, bez procházení všech šablon).
+
+        Args:
+            category: Kategorie
+            difficulty: Obtížnost
+            subject: Předmět
+
+        Returns:
+            Šablony seřazené podle ID
+        """
+        selected = None
+        for index, value in (('category', category), ('difficulty', difficulty),
+                             ('subject', subject)):
+            if value is None:
+                continue
+            ids = set(self._indexes[index].get(value, ()))
+            selected = ids if selected is None else selected & ids
+        ids = sorted(self.templates) if selected is None else sorted(selected)
+        return [self.templates[template_id] for template_id in ids]
+
+    def facets(self) -> Dict[str, Dict[str, int]]:
+        """Počty šablon podle kategorie, obtížnosti a předmětu"""
+        return {
+            index: {value: len(ids) for value, ids in sorted(values.items())}
+            for index, values in self._indexes.items()
+        }
+
+    def instantiate(
+        self,
+        template: Union[str, ProjectTemplate],
+        class_name: str,
+        manager: Any,
+        registry: Any,
+        start: Optional[date] = None,
+        project_name: Optional[str] = None,
+        created_by: str = "teacher"
+    ) -> Dict[str, Any]:
+        """
+        Vytvoření projektu ze šablony pro celou třídu.
+
+        Projekt dostane milníky s termíny od data začátku; každý student
+        třídy dostane úkoly podle plánu šablony (včetně závislostí).
+        Úkoly se vloží jedním voláním ProjectManager.add_tasks.
+
+        Args:
+            template: Šablona nebo její ID
+            class_name: Třída (studenti z evidence)
+            manager: ProjectManager
+            registry: StudentRegistry
+            start: Začátek projektu (výchozí dnes)
+            project_name: Název projektu (výchozí "<šablona> <třída>")
+            created_by: Vytvořil
+
+        Returns:
+            Vytvořený projekt
+
+        Raises:
+            ValueError: Pokud šablona neexistuje, třída je prázdná, projekt
+                už existuje nebo by student překročil limit projektů
+        """
+        if isinstance(template, str):
+            found = self.templates.get(template)
+            if found is None:
+                raise ValueError(f"Šablona '{template}' neexistuje")
+            template = found
+        members = sorted(student['username'] for student in registry.class_members(class_name))
+        if not members:
+            raise ValueError(f"Třída '{class_name}' nemá žádné studenty")
+        limit = registry.max_projects_per_student
+        full = [u for u in members if len(registry.get(u)['projects']) >= limit]
+        if full:
+            raise ValueError(f"Studenti {full} již mají maximální počet projektů ({limit})")
+
+        start = start or date.today()
+        name = project_name or f"{template.name} {class_name}"
+        project = manager.create_project(name, template.description or template.name,
+                                         template.objectives(),
+                                         _timeline(template.duration_weeks), created_by)
+        manager.update_project(
+            name,
+            category=template.category,
+            difficulty=template.difficulty,
+            template=template.id,
+            **{'class': class_name},
+            milestones=[
+                {'name': m['name'], 'deadline': _deadline(template._due(m), start),
+                 'completed': False}
+                for m in template.milestones
+            ]
+        )
+
+        specs = []
+        for username in members:
+            offset = len(specs)
+            for item in template.plan:
+                specs.append({
+                    'name': item['name'],
+                    'assignee': username,
+                    'deadline': _deadline(item['due'], start),
+                    'description': item['description'],
+                    'priority': item['priority'],
+                    'milestone': item['milestone'],
+                    'depends_on': [offset + d for d in item['depends_on']],
+                })
+        manager.add_tasks(name, specs)
+        for username in members:
+            manager.assign_student(name, username)
+        self.logger.info(
+            f"Projekt '{name}' ze šablony '{template.id}' vytvořen pro třídu "
+            f"{class_name} ({len(members)} studentů, {len(specs)} úkolů)"
+        )
+        return project
+
+    def _signature(self) -> List[List[Any]]:
+        """Seznam (soubor, čas změny, velikost) YAML šablon"""
+        if not os.path.isdir(self.directory):
+            return []
+        signature = []
+        for entry in sorted(os.scandir(self.directory), key=lambda e: e.name):
+            if entry.is_file() and entry.name.endswith(('.yaml', '.yml')):
+                stat = entry.stat()
+                signature.append([entry.name, stat.st_mtime_ns, stat.st_size])
+        return signature
+
+    def _load_cache(self, signature: List[List[Any]]) -> Optional[List[Dict[str, Any]]]:
+        """Zkompilovaný katalog z cache, pokud odpovídá souborům"""
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (IOError, ValueError):
+            return None
+        if cache.get('version') != CACHE_VERSION or cache.get('signature') != signature:
+            return None
+        return cache['templates']
+
+    def _parse(self, signature: List[List[Any]]) -> List[Dict[str, Any]]:
+        """Načtení a kompilace YAML šablon (neplatné se přeskočí)"""
+        import yaml
+
+        templates = []
+        for name, _, _ in signature:
+            path = os.path.join(self.directory, name)
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    template = ProjectTemplate.from_dict(yaml.safe_load(f))
+            except (IOError, ValueError, yaml.YAMLError) as e:
+                self.logger.error(f"Šablonu '{path}' nelze načíst: {e}")
+                continue
+            templates.append(template.to_dict())
+        return templates
+
+    def _save_cache(self, signature: List[List[Any]], templates: List[Dict[str, Any]]) -> None:
+        """Atomické uložení cache (v adresáři jen pro čtení se přeskočí)"""
+        temp_path = f"{self.cache_path}.tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': CACHE_VERSION, 'signature': signature,
+                           'templates': templates}, f, ensure_ascii=False)
+            os.replace(temp_path, self.cache_path)
+        except IOError as e:
+            self.logger.debug(f"Cache katalogu nelze uložit: {e}")
+
+    def _build_indexes(self) -> None:
+        """Přestavba indexů podle kategorie, obtížnosti a předmětu"""
+        indexes: Dict[str, Dict[str, List[str]]] = {'category': {}, 'difficulty': {}, 'subject': {}}
+        for template_id in sorted(self.templates):
+            template = self.templates[template_id]
+            indexes['category'].setdefault(template.category, []).append(template_id)
+            indexes['difficulty'].setdefault(template.difficulty, []).append(template_id)
+            for subject in template.subjects:
+                indexes['subject'].setdefault(subject, []).append(template_id)
+        self._indexes = indexes
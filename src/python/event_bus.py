@@ -0,0 +1,198 @@
+"""
+Sběrnice událostí - Event Bus
+
+Modul pro doručování změn (stav úkolu, konfigurace, nová měření)
+uvnitř procesu. Publikovat lze z libovolného vlákna; odběratelé jsou
+jednoduché funkce. Pro klienty dashboardu slouží Subscription, která
+události předává do asyncio smyčky, slučuje je podle klíče (pomalý
+klient dostane jen nejnovější stav každého projektu) a drží omezenou
+frontu, takže pomalý klient nezdržuje publikující vlákna.
+"""
+
+import asyncio
+import itertools
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+
+Event = Dict[str, Any]
+
+DEFAULT_MAX_PENDING = 256
+
+
+class EventBus:
+    """
+    Sběrnice událostí v rámci procesu.
+
+    Attributes:
+        published (int): Počet publikovaných událostí
+        logger (logging.Logger): Logger pro auditování
+    """
+
+    def __init__(self):
+        """Inicializace sběrnice"""
+        self.published = 0
+        self.logger = logging.getLogger("EventBus")
+        # Seznam se při změně nahrazuje kopií, publikování tak nepotřebuje zámek
+        self._subscribers: List[Callable[[Event], None]] = []
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def subscribe(self, callback: Callable[[Event], None]) -> Callable[[Event], None]:
+        """
+        Přihlášení odběratele.
+
+        Args:
+            callback: Funkce volaná s každou událostí (musí být rychlá)
+
+        Returns:
+            Předaná funkce (pro pozdější odhlášení)
+        """
+        with self._lock:
+            self._subscribers = self._subscribers + [callback]
+        return callback
+
+    def unsubscribe(self, callback: Callable[[Event], None]) -> None:
+        """Odhlášení odběratele"""
+        with self._lock:
+            self._subscribers = [s for s in self._subscribers if s != callback]
+
+    @property
+    def subscriber_count(self) -> int:
+        """Počet odběratelů"""
+        return len(self._subscribers)
+
+    def publish(self, topic: str, data: Dict[str, Any], key: Optional[str] = None) -> Event:
+        """
+        Publikování události.
+
+        Args:
+            topic: Téma (např. 'task.status', 'weather.reading')
+            data: Data události (serializovatelná do JSON)
+            key: Klíč pro slučování (výchozí: téma); novější událost se
+                stejným klíčem nahradí dosud nedoručenou starší
+
+        Returns:
+            Publikovaná událost
+        """
+        event = {
+            'id': next(self._ids),
+            'topic': topic,
+            'key': key or topic,
+            'time': time.time(),
+            'data': data,
+        }
+        self.published += 1
+        for callback in self._subscribers:
+            try:
+                callback(event)
+            except Exception as e:
+                self.logger.error(f"Chyba odběratele události '{topic}': {e}")
+        return event
+
+
+class Subscription:
+    """
+    Odběr událostí pro jednoho klienta v asyncio smyčce.
+
+    Nedoručené události se drží v mapě podle klíče: nová událost se
+    stejným klíčem starší nahradí (coalescing). Počet různých klíčů je
+    omezen; při přetečení se zahodí nejstarší a klient dostane událost
+    'resync', aby si stav načetl znovu.
+
+    Attributes:
+        topics (Sequence[str]): Prefixy odebíraných témat (prázdné = vše)
+        max_pending (int): Maximální počet nedoručených událostí
+        coalesced (int): Počet sloučených událostí
+        dropped (int): Počet zahozených událostí
+    """
+
+    def __init__(
+        self,
+        bus: EventBus,
+        topics: Sequence[str] = (),
+        max_pending: int = DEFAULT_MAX_PENDING,
+        loop: Optional[asyncio.AbstractEventLoop] = None
+    ):
+        """
+        Inicializace odběru (volat z asyncio smyčky, do které se doručuje).
+
+        Args:
+            bus: Sběrnice událostí
+            topics: Prefixy odebíraných témat
+            max_pending: Maximální počet nedoručených událostí
+            loop: Smyčka pro doručení (výchozí: běžící smyčka)
+        """
+        self.topics = tuple(topics)
+        self.max_pending = max_pending
+        self.coalesced = 0
+        self.dropped = 0
+        self._bus = bus
+        self._loop = loop or asyncio.get_running_loop()
+        self._ready = asyncio.Event()
+        self._pending: "OrderedDict[str, Event]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._scheduled = False
+        self._overflow = False
+        self._closed = False
+        bus.subscribe(self.push)
+
+    def push(self, event: Event) -> None:
+        """Přijetí události (volá sběrnice z publikujícího vlákna)"""
+        if self.topics and not event['topic'].startswith(self.topics):
+            return
+        with self._lock:
+            if self._closed:
+                return
+            if self._pending.pop(event['key'], None) is not None:
+                self.coalesced += 1
+            elif len(self._pending) >= self.max_pending:
+                self._pending.popitem(last=False)
+                self.dropped += 1
+                self._overflow = True
+            self._pending[event['key']] = event
+            if self._scheduled:
+                return
+            self._scheduled = True
+        try:
+            self._loop.call_soon_threadsafe(self._ready.set)
+        except RuntimeError:
+            # Smyčka už neběží
+            self.close()
+
+    async def get(self, timeout: Optional[float] = None) -> List[Event]:
+        """
+        Čekání na události.
+
+        Args:
+            timeout: Maximální doba čekání v sekundách
+
+        Returns:
+            Nedoručené události seřazené podle ID (prázdný seznam po timeoutu)
+        """
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return []
+        self._ready.clear()
+        with self._lock:
+            events = sorted(self._pending.values(), key=lambda event: event['id'])
+            self._pending.clear()
+            self._scheduled = False
+            overflow, self._overflow = self._overflow, False
+        if overflow:
+            events.insert(0, {
+                'id': None, 'topic': 'resync', 'key': 'resync',
+                'time': time.time(), 'data': {'dropped': self.dropped},
+            })
+        return events
+
+    def close(self) -> None:
+        """Ukončení odběru"""
+        with self._lock:
+            self._closed = True
+            self._pending.clear()
+        self._bus.unsubscribe(self.push)
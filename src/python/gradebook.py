@@ -0,0 +1,525 @@
+"""
+Klasifikace - Gradebook
+
+Modul pro agregaci hodnocení studentů napříč projekty. Body za kritéria
+jsou uložena po sloupcích (jedno pole ``array('d')`` na kritérium),
+průměry, percentily a pořadí se počítají jedním průchodem a při změně
+jednoho hodnocení se souhrny aktualizují přírůstkově. Výsledky lze
+propojit s pokrokem z ProjectManageru a exportovat do CSV pro školní
+systém.
+"""
+
+import argparse
+import bisect
+import csv
+import json
+import logging
+import math
+import os
+import sys
+from array import array
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+DEFAULT_CRITERIA = {
+    'functionality': 0.3,
+    'code_quality': 0.2,
+    'documentation': 0.15,
+    'creativity': 0.15,
+    'presentation': 0.2
+}
+
+DEFAULT_GRADEBOOK_PATH = "/home/education-system/projects/gradebook.json"
+
+MISSING = float('nan')
+
+
+class Gradebook:
+    """
+    Sloupcová klasifikace studentů v projektech.
+
+    Každý řádek odpovídá dvojici (student, projekt). Pro každý projekt
+    se průběžně udržuje součet celkových skóre, součty kritérií
+    a seřazený seznam skóre pro percentily a pořadí.
+
+    Attributes:
+        criteria (Dict[str, float]): Váhy kritérií
+        progress (Dict[str, float]): Pokrok projektů (%) z ProjectManageru
+        logger (logging.Logger): Logger pro auditování
+    """
+
+    def __init__(self, criteria: Optional[Dict[str, float]] = None):
+        """
+        Inicializace klasifikace.
+
+        Args:
+            criteria: Váhy kritérií (výchozí: váhy ProjectEvaluatoru)
+        """
+        self.criteria = dict(criteria or DEFAULT_CRITERIA)
+        self.progress: Dict[str, float] = {}
+        self.logger = logging.getLogger("Gradebook")
+
+        self._rows: Dict[Tuple[str, str], int] = {}
+        self._students: List[str] = []
+        self._projects: List[str] = []
+        self._columns: Dict[str, array] = {name: array('d') for name in self.criteria}
+        self._totals = array('d')
+        self._project_rows: Dict[str, List[int]] = {}
+
+        # Přírůstkově udržované souhrny po projektech
+        self._sorted_totals: Dict[str, List[float]] = {}
+        self._criterion_sums: Dict[str, Dict[str, List[float]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._totals)
+
+    def record_evaluation(
+        self,
+        student: str,
+        project: str,
+        scores: Dict[str, float]
+    ) -> float:
+        """
+        Uložení hodnocení (např. výsledku ProjectEvaluator.evaluate_project).
+
+        Args:
+            student: Uživatelské jméno studenta
+            project: Název projektu
+            scores: Body za kritéria (0-100)
+
+        Returns:
+            Nové celkové skóre
+
+        Raises:
+            ValueError: Pokud je kritérium neznámé nebo body mimo rozsah
+        """
+        # Kontrola všech kritérií před zápisem, aby chyba nenechala řádek napůl
+        values = self._validate(scores)
+        row = self._row(student, project)
+        for criterion, value in values.items():
+            self._set_cell(row, project, criterion, value)
+        return self._update_total(row, project)
+
+    def set_score(self, student: str, project: str, criterion: str, value: float) -> float:
+        """
+        Změna jednoho hodnocení s přírůstkovou aktualizací souhrnů.
+
+        Args:
+            student: Uživatelské jméno studenta
+            project: Název projektu
+            criterion: Kritérium
+            value: Body (0-100)
+
+        Returns:
+            Nové celkové skóre
+
+        Raises:
+            ValueError: Pokud je kritérium neznámé nebo body mimo rozsah
+        """
+        return self.record_evaluation(student, project, {criterion: value})
+
+    def get_scores(self, student: str, project: str) -> Optional[Dict[str, Any]]:
+        """
+        Hodnocení studenta v projektu.
+
+        Args:
+            student: Uživatelské jméno studenta
+            project: Název projektu
+
+        Returns:
+            Slovník s body za kritéria a celkovým skóre nebo None
+        """
+        row = self._rows.get((student, project))
+        if row is None:
+            return None
+        scores = {
+            name: column[row] for name, column in self._columns.items()
+            if not math.isnan(column[row])
+        }
+        return {'scores': scores, 'total': self._totals[row]}
+
+    def sync_progress(self, project_manager: Any) -> None:
+        """
+        Převzetí pokroku všech projektů z ProjectManageru.
+
+        Args:
+            project_manager: Instance ProjectManager
+        """
+        for name in list(project_manager.projects):
+            progress = project_manager.track_progress(name)
+            if progress is not None:
+                self.progress[name] = progress
+
+    def statistics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Souhrnné statistiky všech projektů.
+
+        Průměry kritérií jsou udržovány přírůstkově, percentily se čtou
+        přímo ze seřazených skóre, takže výpočet nevyžaduje průchod
+        přes jednotlivé řádky.
+
+        Returns:
+            Slovník {projekt: statistiky}
+        """
+        stats = {}
+        for project, totals in self._sorted_totals.items():
+            count = len(totals)
+            if not count:
+                continue
+            stats[project] = {
+                'students': count,
+                'average': round(math.fsum(totals) / count, 2),
+                'min': totals[0],
+                'max': totals[-1],
+                'median': _percentile(totals, 50),
+                'p25': _percentile(totals, 25),
+                'p75': _percentile(totals, 75),
+                'criteria_averages': {
+                    name: round(total / n, 2) if n else None
+                    for name, (total, n) in self._criterion_sums[project].items()
+                },
+                'progress': self.progress.get(project),
+            }
+        return stats
+
+    def rankings(self, project: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Pořadí studentů (v rámci projektu nebo podle průměru napříč projekty).
+
+        Stejné skóre znamená stejné pořadí (1, 2, 2, 4).
+
+        Args:
+            project: Název projektu (None = průměr přes všechny projekty)
+
+        Returns:
+            Seznam záznamů seřazený podle pořadí
+        """
+        if project is not None:
+            entries = [
+                (self._students[row], self._totals[row])
+                for row in self._project_rows.get(project, [])
+            ]
+        else:
+            sums: Dict[str, List[float]] = {}
+            for (student, _), row in self._rows.items():
+                acc = sums.setdefault(student, [0.0, 0])
+                acc[0] += self._totals[row]
+                acc[1] += 1
+            entries = [(student, round(s / n, 2)) for student, (s, n) in sums.items()]
+
+        ordered = sorted(entries, key=lambda entry: (-entry[1], entry[0]))
+        ascending = sorted(total for _, total in entries)
+        count = len(ascending)
+        rankings = []
+        for student, total in ordered:
+            below = bisect.bisect_left(ascending, total)
+            equal = bisect.bisect_right(ascending, total) - below
+            rankings.append({
+                'rank': count - below - equal + 1,
+                'student': student,
+                'total': total,
+                'percentile': round(100.0 * (below + 0.5 * equal) / count, 1),
+            })
+        return rankings
+
+    def rank_of(self, student: str, project: str) -> Optional[int]:
+        """
+        Pořadí jednoho studenta v projektu (O(log n)).
+
+        Args:
+            student: Uživatelské jméno studenta
+            project: Název projektu
+
+        Returns:
+            Pořadí (1 = nejlepší) nebo None
+        """
+        row = self._rows.get((student, project))
+        if row is None:
+            return None
+        totals = self._sorted_totals[project]
+        return len(totals) - bisect.bisect_right(totals, self._totals[row]) + 1
+
+    def export_csv(self, filepath: str, project: Optional[str] = None) -> bool:
+        """
+        Export hodnocení do CSV (středník jako oddělovač, UTF-8 s BOM pro Excel).
+
+        Args:
+            filepath: Cesta k souboru
+            project: Název projektu (None = všechny projekty)
+
+        Returns:
+            True pokud byl export úspěšný
+        """
+        criteria = list(self.criteria)
+        try:
+            with open(filepath, 'w', encoding='utf-8-sig', newline='') as f:
+                writer = csv.writer(f, delimiter=';')
+                writer.writerow(['student', 'project', *criteria, 'total', 'rank', 'progress'])
+                for (student, row_project), row in sorted(self._rows.items()):
+                    if project is not None and row_project != project:
+                        continue
+                    cells = [self._columns[name][row] for name in criteria]
+                    writer.writerow([
+                        student, row_project,
+                        *('' if math.isnan(value) else value for value in cells),
+                        self._totals[row],
+                        self.rank_of(student, row_project),
+                        self.progress.get(row_project, ''),
+                    ])
+            self.logger.info(f"Klasifikace exportována do '{filepath}'")
+            return True
+        except IOError as e:
+            self.logger.error(f"Chyba při exportu klasifikace: {e}")
+            return False
+
+    def save(self, filepath: str) -> bool:
+        """
+        Uložení klasifikace do JSON souboru.
+
+        Args:
+            filepath: Cesta k souboru
+
+        Returns:
+            True pokud bylo uložení úspěšné
+        """
+        data = {
+            'criteria': self.criteria,
+            'progress': self.progress,
+            'rows': [
+                {'student': student, 'project': project, **self.get_scores(student, project)}
+                for student, project in self._rows
+            ],
+        }
+        try:
+            directory = os.path.dirname(filepath)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temp_path = f"{filepath}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            os.replace(temp_path, filepath)
+            return True
+        except IOError as e:
+            self.logger.error(f"Chyba při ukládání klasifikace: {e}")
+            return False
+
+    @classmethod
+    def load(cls, filepath: str) -> "Gradebook":
+        """
+        Načtení klasifikace z JSON souboru.
+
+        Args:
+            filepath: Cesta k souboru
+
+        Returns:
+            Instance Gradebook
+
+        Raises:
+            IOError: Pokud soubor nelze přečíst
+        """
+        with open(filepath, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        gradebook = cls(data.get('criteria'))
+        gradebook.progress = data.get('progress', {})
+        for entry in data.get('rows', []):
+            gradebook.record_evaluation(entry['student'], entry['project'], entry['scores'])
+        return gradebook
+
+    def _row(self, student: str, project: str) -> int:
+        """Index řádku (student, projekt); chybějící řádek se založí"""
+        row = self._rows.get((student, project))
+        if row is not None:
+            return row
+        row = len(self._totals)
+        self._rows[(student, project)] = row
+        self._students.append(student)
+        self._projects.append(project)
+        self._project_rows.setdefault(project, []).append(row)
+        for column in self._columns.values():
+            column.append(MISSING)
+        self._totals.append(0.0)
+        bisect.insort(self._sorted_totals.setdefault(project, []), 0.0)
+        self._criterion_sums.setdefault(project, {name: [0.0, 0] for name in self.criteria})
+        return row
+
+    def _validate(self, scores: Dict[str, float]) -> Dict[str, float]:
+        """Kontrola kritérií a rozsahu bodů; vrací body převedené na float"""
+        values = {}
+        for criterion, value in scores.items():
+            if criterion not in self._columns:
+                raise ValueError(f"Neznámé kritérium '{criterion}'")
+            value = float(value)
+            if not 0.0 <= value <= 100.0:
+                raise ValueError(f"Body musí být v rozsahu 0-100, ne {value}")
+            values[criterion] = value
+        return values
+
+    def _set_cell(self, row: int, project: str, criterion: str, value: float) -> None:
+        """Zápis jedné (zkontrolované) buňky s aktualizací součtů kritéria"""
+        column = self._columns[criterion]
+        old = column[row]
+        sums = self._criterion_sums[project][criterion]
+        if math.isnan(old):
+            sums[1] += 1
+        else:
+            sums[0] -= old
+        sums[0] += value
+        column[row] = value
+
+    def _update_total(self, row: int, project: str) -> float:
+        """Přepočet celkového skóre řádku a seřazených skóre projektu"""
+        total = round(math.fsum(
+            column[row] * self.criteria[name]
+            for name, column in self._columns.items()
+            if not math.isnan(column[row])
+        ), 2)
+        old = self._totals[row]
+        if total != old:
+            totals = self._sorted_totals[project]
+            del totals[bisect.bisect_left(totals, old)]
+            bisect.insort(totals, total)
+            self._totals[row] = total
+        return total
+
+
+def _percentile(sorted_values: Sequence[float], percent: float) -> float:
+    """Percentil s lineární interpolací (jako numpy.percentile)"""
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    position = (len(sorted_values) - 1) * percent / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    fraction = position - lower
+    return round(sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * fraction, 2)
+
+
+def _parse_scores(pairs: List[str]) -> Dict[str, float]:
+    """Převod voleb ``kritérium=body`` na slovník"""
+    scores = {}
+    for pair in pairs:
+        criterion, separator, value = pair.partition('=')
+        try:
+            if not separator:
+                raise ValueError
+            scores[criterion.strip()] = float(value)
+        except ValueError:
+            raise ValueError(f"Neplatné hodnocení '{pair}' (očekáváno kritérium=body)")
+    return scores
+
+
+def _evaluate(args: argparse.Namespace, session: Any) -> Dict[str, float]:
+    """Ohodnocení odevzdané práce ProjectEvaluatorem (zadání ze stavu projektů)"""
+    from .project_evaluator import ProjectEvaluator
+
+    with open(args.submission, 'r', encoding='utf-8') as f:
+        submission = json.load(f)
+    project = {'name': args.project}
+    if session is not None:
+        project = session.manager.projects.get(args.project, project)
+    return ProjectEvaluator().evaluate_project(project, submission)['scores']
+
+
+def _write(args: argparse.Namespace) -> int:
+    """Příkazy record, evaluate a sync: zápis do klasifikace a převzetí pokroku"""
+    from .cli import Session
+
+    if os.path.exists(args.data):
+        gradebook = Gradebook.load(args.data)
+    else:
+        gradebook = Gradebook()
+    session = Session(args.state, read_only=True) if os.path.exists(args.state) else None
+    if session is None and args.command == 'sync':
+        print(f"Stav projektů '{args.state}' neexistuje", file=sys.stderr)
+        return 1
+
+    try:
+        if args.command in ('record', 'evaluate'):
+            if args.command == 'record':
+                scores = _parse_scores(args.score)
+            else:
+                scores = _evaluate(args, session)
+            total = gradebook.record_evaluation(args.student, args.project, scores)
+            print(f"{args.student} ({args.project}): "
+                  + ", ".join(f"{name} {value:g}" for name, value in scores.items())
+                  + f"; celkem {total:.2f}")
+        if session is not None:
+            gradebook.sync_progress(session.manager)
+            if args.command == 'sync':
+                print(f"Pokrok převzat pro {len(gradebook.progress)} projektů")
+    finally:
+        if session is not None:
+            session.close()
+    return 0 if gradebook.save(args.data) else 1
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Příkaz ``project-grades``: zápis, výpis a export klasifikace projektů.
+
+    Bez podpříkazu vypíše pořadí (nebo exportuje CSV). Podpříkazy
+    ``record`` (body zadané ručně) a ``evaluate`` (ProjectEvaluator nad
+    odevzdanou prací) zapíší hodnocení do ``--data``; spolu se ``sync``
+    převezmou pokrok projektů ze stavu project-manager (``--state``).
+
+    Args:
+        argv: Argumenty příkazové řádky (výchozí: sys.argv)
+
+    Returns:
+        Návratový kód procesu
+    """
+    from .cli import DEFAULT_DATA_FILE, CommandError
+
+    parser = argparse.ArgumentParser(
+        prog='project-grades', description='Zobrazení hodnocení projektů'
+    )
+    parser.add_argument('--project', help='Název projektu (výchozí: všechny)')
+    parser.add_argument('--data', default=DEFAULT_GRADEBOOK_PATH, help='Soubor s klasifikací')
+    parser.add_argument('--csv', help='Export do CSV souboru')
+    parser.add_argument('--state', help='Stav project-manager (pokrok projektů)',
+                        default=os.environ.get('PROJECT_MANAGER_DATA', DEFAULT_DATA_FILE))
+    commands = parser.add_subparsers(dest='command', metavar='příkaz')
+    record = commands.add_parser('record', help='Zápis bodů za kritéria')
+    record.add_argument('--score', action='append', required=True, metavar='KRITÉRIUM=BODY',
+                        help='Body 0-100 (lze opakovat)')
+    evaluate = commands.add_parser('evaluate', help='Ohodnocení práce ProjectEvaluatorem')
+    evaluate.add_argument('--submission', required=True,
+                          help='JSON s prací (code, documentation, test_results, manual_scores)')
+    for sub in (record, evaluate):
+        sub.add_argument('--project', required=True)
+        sub.add_argument('--student', required=True, help='Uživatelské jméno studenta')
+    commands.add_parser('sync', help='Převzetí pokroku projektů ze stavu project-manager')
+    args = parser.parse_args(argv)
+
+    if args.command is not None:
+        try:
+            return _write(args)
+        except (IOError, ValueError, CommandError) as e:
+            print(f"Chyba: {e}", file=sys.stderr)
+            return 1
+
+    try:
+        gradebook = Gradebook.load(args.data)
+    except (IOError, ValueError) as e:
+        print(f"Klasifikaci nelze načíst: {e}", file=sys.stderr)
+        return 1
+
+    if args.csv:
+        return 0 if gradebook.export_csv(args.csv, args.project) else 1
+
+    stats = gradebook.statistics()
+    projects = [args.project] if args.project else sorted(stats)
+    for project in projects:
+        if project not in stats:
+            print(f"Projekt '{project}' nemá žádná hodnocení", file=sys.stderr)
+            return 1
+        summary = stats[project]
+        progress = f", pokrok {summary['progress']} %" if summary['progress'] is not None else ''
+        print(f"{project}: průměr {summary['average']}, medián {summary['median']} "
+              f"({summary['students']} studentů{progress})")
+        for entry in gradebook.rankings(project):
+            print(f"  {entry['rank']:>3}. {entry['student']:<24} {entry['total']:>6.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,626 @@
+"""
+Žurnál změn - Change Journal
+
+Append-only žurnál změn ProjectManageru ve formátu JSONL (jeden záznam
+na řádek s pořadovým číslem, časem, operací a daty změny). Zápisy se
+slučují do dávek s jediným fsync (group commit): vlákno na pozadí vezme
+vše, co se nahromadilo během předchozího fsync. Po zadaném počtu
+záznamů se uloží snímek celého stavu a začne nový segment, takže obnova
+po pádu načte poslední snímek a přehraje jen záznamy za ním – doba
+startu nezávisí na délce historie. Starší segmenty zůstávají jako
+auditní stopa (retain_history=False je po snímku maže).
+
+Do adresáře smí zapisovat jen jeden proces: žurnál při otevření zamkne
+soubor ``.lock`` (flock) a druhý zapisovatel skončí chybou. Čtenáři
+(read_only=True, např. výpisy project-manager za běhu kiosk-api) zámek
+neberou, stav jen obnoví a neúplný poslední řádek rozepsané dávky
+přeskočí místo odříznutí.
+
+Adresář žurnálu:
+    .lock                        zámek zapisovatele (PID procesu)
+    snapshot-000000001234.json   {"seq": 1234, "created_at": ..., "state": {...}}
+    journal-000000001235.jsonl   záznamy od seq 1235
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .metrics import get_registry
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows (vývojové stroje bez kiosku)
+    fcntl = None  # type: ignore[assignment]
+
+
+SEGMENT_PREFIX = "journal-"
+SEGMENT_SUFFIX = ".jsonl"
+SNAPSHOT_PREFIX = "snapshot-"
+SNAPSHOT_SUFFIX = ".json"
+DEFAULT_SNAPSHOT_EVERY = 10000
+KEEP_SNAPSHOTS = 2
+LOCK_FILE = ".lock"
+
+_RECORDS = get_registry().counter('journal_records_total', 'Počet zapsaných záznamů žurnálu')
+_FSYNC = get_registry().histogram(
+    'journal_fsync_seconds', 'Doba zápisu a fsync jedné dávky žurnálu')
+_BATCH = get_registry().histogram(
+    'journal_batch_records', 'Počet záznamů v jedné dávce (group commit)',
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500, 1000))
+
+
+def _apply_create_project(state: Dict[str, Any], data: Dict[str, Any]) -> None:
+    project = data['project']
+    state['projects'].setdefault(project['name'], dict(project, tasks=list(project['tasks'])))
+
+
+def _apply_update_project(state: Dict[str, Any], data: Dict[str, Any]) -> None:
+    state['projects'][data['name']].update(data['fields'])
+
+
+def _apply_add_tasks(state: Dict[str, Any], data: Dict[str, Any]) -> None:
+    tasks = state['projects'][data['project']]['tasks']
+    known = {task['id'] for task in tasks}
+    tasks.extend(task for task in data['tasks'] if task['id'] not in known)
+
+
+def _apply_update_task_status(state: Dict[str, Any], data: Dict[str, Any]) -> None:
+    project = state['projects'][data['project']]
+    for task in project['tasks']:
+        if task['id'] == data['task_id']:
+            task.update(status=data['status'], notes=data['notes'],
+                        updated_at=data['updated_at'])
+            return
+    raise ValueError(f"Úkol {data['task_id']} v projektu '{data['project']}' neexistuje")
+
+
+def _apply_assign_student(state: Dict[str, Any], data: Dict[str, Any]) -> None:
+    students = state['projects'][data['project']].setdefault('students', [])
+    if data['username'] not in students:
+        students.append(data['username'])
+
+
+APPLY: Dict[str, Callable[[Dict[str, Any], Dict[str, Any]], None]] = {
+    'create_project': _apply_create_project,
+    'update_project': _apply_update_project,
+    'add_task': lambda state, data: _apply_add_tasks(
+        state, {'project': data['project'], 'tasks': [data['task']]}),
+    'add_tasks': _apply_add_tasks,
+    'update_task_status': _apply_update_task_status,
+    'assign_student': _apply_assign_student,
+}
+
+
+def apply(state: Dict[str, Any], record: Dict[str, Any]) -> None:
+    """
+    Přehrání jednoho záznamu na stav ve tvaru ProjectManager.to_dict.
+
+    Přehrání je idempotentní (úkol ani projekt se nepřidá dvakrát),
+    takže nevadí, když snímek už obsahuje část záznamů za svým seq.
+
+    Args:
+        state: Stav (mění se na místě)
+        record: Záznam žurnálu
+
+    Raises:
+        ValueError: Při neznámé operaci nebo odkazu na neexistující data
+    """
+    handler = APPLY.get(record['op'])
+    if handler is None:
+        raise ValueError(f"Neznámá operace žurnálu '{record['op']}' (seq {record['seq']})")
+    try:
+        handler(state, record['data'])
+    except KeyError as e:
+        raise ValueError(f"Záznam {record['seq']} odkazuje na neexistující {e}")
+
+
+class Journal:
+    """
+    Žurnál změn se snímky a obnovou po pádu.
+
+    Bez spuštěného vlákna (start) zapisuje wait() synchronně, což stačí
+    pro krátké procesy (příkazová řádka); dlouho běžící proces vlákno
+    spustí a souběžné změny pak sdílejí jeden fsync.
+
+    Attributes:
+        directory (str): Adresář se segmenty a snímky
+        snapshot_every (int): Počet záznamů mezi automatickými snímky (0 = nikdy)
+        durable (bool): wait() čeká na fsync záznamu
+        retain_history (bool): Ponechat segmenty pokryté snímkem (auditní stopa)
+        read_only (bool): Žurnál jen pro čtení (bez zámku, append vyvolá chybu)
+        listeners (List[Callable]): Funkce volané po fsync každé dávky se
+            seznamem jejích záznamů jako (seq, origin, řádek JSON); např. replikace
+        logger (logging.Logger): Logger
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        snapshot_every: int = DEFAULT_SNAPSHOT_EVERY,
+        durable: bool = True,
+        retain_history: bool = True,
+        read_only: bool = False
+    ):
+        """
+        Inicializace žurnálu (adresář se vytvoří, pokud neexistuje).
+
+        Žurnál drží zámek adresáře až do close(); žurnál jen pro čtení
+        zámek nebere a adresář nevytváří.
+
+        Args:
+            directory: Adresář se segmenty a snímky
+            snapshot_every: Počet záznamů mezi automatickými snímky (0 = nikdy)
+            durable: wait() čeká na fsync záznamu
+            retain_history: Ponechat segmenty pokryté snímkem
+            read_only: Jen obnova stavu a čtení záznamů (souběžně se zapisovatelem)
+
+        Raises:
+            ValueError: Pokud do adresáře už zapisuje jiný žurnál (jiný proces)
+        """
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self.durable = durable
+        self.retain_history = retain_history
+        self.read_only = read_only
+        self.listeners: List[Callable[[List[Tuple[int, Optional[str], str]]], None]] = []
+        self.logger = logging.getLogger("Journal")
+        self._lock_file: Optional[Any] = None
+        if not read_only:
+            os.makedirs(directory, exist_ok=True)
+            self._lock_file = self._acquire_lock()
+
+        self._cond = threading.Condition()
+        self._io_lock = threading.Lock()
+        self._snapshot_lock = threading.Lock()
+        self._pending: List[str] = []
+        self._pending_records: List[Tuple[int, Optional[str], str]] = []
+        self._seq = 0
+        self._synced = 0
+        self._snapshot_seq = 0
+        self._file: Optional[Any] = None
+        self._source: Optional[Callable[[], Dict[str, Any]]] = None
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+    @classmethod
+    def from_config(cls, config: Any, **kwargs: Any) -> Optional["Journal"]:
+        """
+        Žurnál podle sekce ``journal`` hlavní konfigurace.
+
+        Args:
+            config: ConfigManager (nebo cokoliv s metodou ``get``)
+            **kwargs: Další parametry konstruktoru
+
+        Returns:
+            Žurnál nebo None, pokud journal.directory není nastaven
+        """
+        directory = config.get('journal.directory')
+        if not directory:
+            return None
+        kwargs.setdefault('snapshot_every',
+                          int(config.get('journal.snapshot_every', DEFAULT_SNAPSHOT_EVERY)))
+        kwargs.setdefault('retain_history', bool(config.get('journal.retain_history', True)))
+        return cls(directory, **kwargs)
+
+    @property
+    def seq(self) -> int:
+        """Pořadové číslo posledního záznamu"""
+        return self._seq
+
+    @property
+    def synced(self) -> int:
+        """Pořadové číslo posledního záznamu zapsaného na disk"""
+        return self._synced
+
+    def first_seq(self) -> int:
+        """
+        Nejnižší pořadové číslo, od kterého jsou záznamy ještě v segmentech.
+
+        Returns:
+            Číslo prvního ponechaného záznamu (seq + 1, pokud segmenty chybí)
+        """
+        segments = self._segments()
+        return segments[0][0] if segments else self._seq + 1
+
+    def attach(self, manager: Any, initial: Optional[Dict[str, Any]] = None) -> "Journal":
+        """
+        Obnova stavu správce a napojení žurnálu na jeho změny.
+
+        Žurnál jen pro čtení stav pouze obnoví; změny správce se nezapisují.
+
+        Args:
+            manager: ProjectManager
+            initial: Stav pro prázdný žurnál (např. dosavadní JSON soubor);
+                uloží se jako první snímek
+
+        Returns:
+            Tento žurnál
+        """
+        state = self.recover()
+        if state is None and initial is not None and initial.get('projects'):
+            state = initial
+            self.logger.info("Prázdný žurnál založen z dosavadního stavu")
+        if state is not None:
+            manager.restore(state)
+        if self.read_only:
+            return self
+        self._source = manager.to_dict
+        manager.journal = self
+        if self._snapshot_seq == 0 and state is not None and self._seq == 0:
+            self.snapshot()
+        return self
+
+    def recover(self) -> Optional[Dict[str, Any]]:
+        """
+        Obnova stavu z posledního snímku a záznamů za ním.
+
+        Neúplný poslední řádek (pád při zápisu) se z posledního segmentu
+        odřízne, žurnál jen pro čtení ho přeskočí. Po obnově je žurnál
+        připraven k zápisu.
+
+        Returns:
+            Stav ve tvaru ProjectManager.to_dict nebo None, pokud žurnál je prázdný
+
+        Raises:
+            ValueError: Pokud je žurnál poškozený uprostřed nebo chybí záznamy
+        """
+        started = time.perf_counter()
+        snapshot_seq, state = self._load_snapshot()
+        segments = self._segments()
+        start = 0
+        for index, (first, _) in enumerate(segments):
+            if first <= snapshot_seq + 1:
+                start = index
+        replayed = 0
+        seq = snapshot_seq
+        for index, (first, path) in enumerate(segments[start:], start):
+            last_segment = index == len(segments) - 1 and not self.read_only
+            for record in self._read_segment(path, truncate=last_segment):
+                if record['seq'] <= seq:
+                    continue
+                if record['seq'] != seq + 1:
+                    raise ValueError(
+                        f"V žurnálu chybí záznamy {seq + 1}–{record['seq'] - 1} ({path})")
+                if state is None:
+                    state = {'projects': {}, 'resources': []}
+                apply(state, record)
+                seq = record['seq']
+                replayed += 1
+
+        with self._cond:
+            self._seq = self._synced = seq
+            self._snapshot_seq = snapshot_seq
+        if segments and not self.read_only:
+            self._open_segment(segments[-1][1])
+        if state is not None:
+            self.logger.info(
+                f"Stav obnoven ze snímku {snapshot_seq} a {replayed} záznamů "
+                f"za {time.perf_counter() - started:.3f} s"
+            )
+        return state
+
+    def append(self, op: str, data: Dict[str, Any], origin: Optional[str] = None) -> int:
+        """
+        Zařazení záznamu do žurnálu (bez čekání na disk).
+
+        Volá se pod zámkem správce hned po změně, takže pořadí záznamů
+        odpovídá pořadí změn. Data se serializují okamžitě.
+
+        Args:
+            op: Operace (create_project, add_task, update_task_status, ...)
+            data: Data změny
+            origin: Uzel, ze kterého změna přišla replikací (None = místní)
+
+        Returns:
+            Pořadové číslo záznamu (pro wait)
+
+        Raises:
+            ValueError: U žurnálu jen pro čtení
+        """
+        if self.read_only:
+            raise ValueError(f"Žurnál '{self.directory}' je otevřen jen pro čtení")
+        with self._cond:
+            self._seq += 1
+            record = {'seq': self._seq, 'ts': datetime.now().isoformat(), 'op': op, 'data': data}
+            if origin is not None:
+                record['origin'] = origin
+            line = json.dumps(record, ensure_ascii=False, separators=(',', ':'))
+            self._pending.append(line)
+            if self.listeners:
+                self._pending_records.append((self._seq, origin, line))
+            self._cond.notify_all()
+            return self._seq
+
+    def wait(self, seq: int) -> None:
+        """
+        Počkání, až bude záznam na disku (při durable=True).
+
+        Args:
+            seq: Pořadové číslo záznamu z append
+        """
+        if not self.durable:
+            return
+        if not self._running:
+            self.flush()
+            return
+        with self._cond:
+            while self._synced < seq and self._running:
+                self._cond.wait()
+        if self._synced < seq:
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Zápis čekajících záznamů a fsync (jedna dávka).
+
+        Returns:
+            Počet zapsaných záznamů
+        """
+        with self._io_lock:
+            with self._cond:
+                lines, self._pending = self._pending, []
+                records, self._pending_records = self._pending_records, []
+                last = self._seq
+            if not lines:
+                return 0
+            started = time.perf_counter()
+            if self._file is None:
+                self._open_segment(self._segment_path(last - len(lines) + 1))
+            self._file.write('\n'.join(lines) + '\n')
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            _FSYNC.observe(time.perf_counter() - started)
+            _BATCH.observe(len(lines))
+            _RECORDS.inc(len(lines))
+            with self._cond:
+                self._synced = last
+                self._cond.notify_all()
+            for listener in self.listeners:
+                listener(records)
+        if (self.snapshot_every and self._source is not None
+                and last - self._snapshot_seq >= self.snapshot_every
+                and self._snapshot_lock.acquire(blocking=False)):
+            try:
+                self._snapshot()
+            finally:
+                self._snapshot_lock.release()
+        return len(lines)
+
+    def snapshot(self) -> Optional[int]:
+        """
+        Uložení snímku stavu a přechod na nový segment.
+
+        Číslo snímku se přečte před pořízením stavu; všechny změny do něj
+        jsou tedy ve snímku, pozdější se při obnově přehrají (idempotentně).
+
+        Returns:
+            Pořadové číslo snímku nebo None, pokud žurnál není napojen na správce
+        """
+        if self._source is None:
+            return None
+        with self._snapshot_lock:
+            return self._snapshot()
+
+    def _snapshot(self) -> int:
+        """Uložení snímku (volá se pod _snapshot_lock)"""
+        started = time.perf_counter()
+        seq = self._seq
+        state = self._source()
+        path = os.path.join(self.directory, f"{SNAPSHOT_PREFIX}{seq:012d}{SNAPSHOT_SUFFIX}")
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'seq': seq, 'created_at': datetime.now().isoformat(), 'state': state},
+                      f, ensure_ascii=False, separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+        self._fsync_directory()
+
+        # Nový segment začíná za vším, co už je zapsané
+        self.flush()
+        with self._io_lock:
+            with self._cond:
+                self._snapshot_seq = seq
+                next_seq = self._synced + 1
+            self._open_segment(self._segment_path(next_seq))
+            self._prune(seq)
+        self.logger.info(f"Snímek {seq} uložen za {time.perf_counter() - started:.3f} s")
+        return seq
+
+    def records(self, after: int = 0) -> Iterator[Dict[str, Any]]:
+        """
+        Záznamy ve všech ponechaných segmentech (auditní stopa).
+
+        Args:
+            after: Vrátit jen záznamy s vyšším pořadovým číslem
+
+        Yields:
+            Záznamy v pořadí
+        """
+        self.flush()
+        segments = self._segments()
+        for index, (first, path) in enumerate(segments):
+            if index + 1 < len(segments) and segments[index + 1][0] <= after + 1:
+                continue
+            for record in self._read_segment(path, truncate=False):
+                if record['seq'] > after:
+                    yield record
+
+    def start(self) -> None:
+        """Spuštění vlákna pro group commit"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run_loop, name="Journal", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Zastavení vlákna a zápis zbylých záznamů.
+
+        Args:
+            timeout: Maximální doba čekání na vlákno (sekundy)
+        """
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def close(self) -> None:
+        """Zápis zbylých záznamů a uzavření segmentu"""
+        self.stop()
+        with self._io_lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            if self._lock_file is not None:
+                # Zavření souboru uvolní i flock
+                self._lock_file.close()
+                self._lock_file = None
+
+    def _acquire_lock(self) -> Optional[Any]:
+        """
+        Výhradní zámek adresáře pro jediného zapisovatele.
+
+        Raises:
+            ValueError: Pokud zámek drží jiný žurnál
+        """
+        if fcntl is None:
+            return None
+        lock_file = open(os.path.join(self.directory, LOCK_FILE), 'a+', encoding='utf-8')
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.seek(0)
+            holder = lock_file.read().strip() or "?"
+            lock_file.close()
+            raise ValueError(
+                f"Do žurnálu '{self.directory}' už zapisuje jiný proces (PID {holder}); "
+                f"pro změny ho zastavte (např. kiosk-api), výpisy fungují i za jeho běhu")
+        lock_file.seek(0)
+        lock_file.truncate()
+        lock_file.write(str(os.getpid()))
+        lock_file.flush()
+        return lock_file
+
+    def _run_loop(self) -> None:
+        """Smyčka group commitu: každá dávka obsahuje vše, co přibylo během fsync"""
+        while True:
+            with self._cond:
+                while not self._pending and self._running:
+                    self._cond.wait()
+                if not self._pending and not self._running:
+                    return
+            try:
+                self.flush()
+            except OSError as e:
+                self.logger.error(f"Zápis žurnálu selhal: {e}")
+                time.sleep(1.0)
+
+    def _segment_path(self, first_seq: int) -> str:
+        return os.path.join(self.directory, f"{SEGMENT_PREFIX}{first_seq:012d}{SEGMENT_SUFFIX}")
+
+    def _open_segment(self, path: str) -> None:
+        """Otevření segmentu pro připisování (volá se pod _io_lock nebo při obnově)"""
+        if self._file is not None:
+            if self._file.name == path:
+                return
+            self._file.close()
+        created = not os.path.exists(path)
+        self._file = open(path, 'a', encoding='utf-8')
+        if created:
+            self._fsync_directory()
+
+    def _files(self, prefix: str, suffix: str) -> List[Tuple[int, str]]:
+        """Soubory žurnálu seřazené podle pořadového čísla v názvu"""
+        found = []
+        if not os.path.isdir(self.directory):
+            return found
+        for name in os.listdir(self.directory):
+            if name.startswith(prefix) and name.endswith(suffix):
+                try:
+                    found.append((int(name[len(prefix):-len(suffix)]),
+                                  os.path.join(self.directory, name)))
+                except ValueError:
+                    continue
+        return sorted(found)
+
+    def _segments(self) -> List[Tuple[int, str]]:
+        return self._files(SEGMENT_PREFIX, SEGMENT_SUFFIX)
+
+    def _load_snapshot(self) -> Tuple[int, Optional[Dict[str, Any]]]:
+        """Nejnovější čitelný snímek (poškozený se přeskočí)"""
+        for seq, path in reversed(self._files(SNAPSHOT_PREFIX, SNAPSHOT_SUFFIX)):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    snapshot = json.load(f)
+                return snapshot['seq'], snapshot['state']
+            except (OSError, ValueError, KeyError) as e:
+                self.logger.error(f"Snímek '{path}' nelze načíst: {e}")
+        return 0, None
+
+    def _read_segment(self, path: str, truncate: bool) -> Iterator[Dict[str, Any]]:
+        """
+        Čtení záznamů segmentu.
+
+        Neúplný nebo nečitelný poslední řádek se při truncate=True odřízne;
+        jinde znamená poškození a vyvolá ValueError.
+        """
+        with open(path, 'rb') as f:
+            data = f.read()
+        offset = 0
+        while offset < len(data):
+            end = data.find(b'\n', offset)
+            line = data[offset:] if end < 0 else data[offset:end]
+            try:
+                if end < 0:
+                    raise ValueError("chybí konec řádku")
+                record = json.loads(line)
+            except ValueError as e:
+                if end >= 0 and end + 1 < len(data):
+                    raise ValueError(f"Poškozený žurnál '{path}' na pozici {offset}: {e}")
+                if truncate:
+                    self.logger.warning(
+                        f"Neúplný poslední záznam v '{path}' odříznut ({len(data) - offset} B)")
+                    with open(path, 'r+b') as f:
+                        f.truncate(offset)
+                        os.fsync(f.fileno())
+                return
+            yield record
+            offset = end + 1
+
+    def _prune(self, snapshot_seq: int) -> None:
+        """
+        Smazání starých snímků a (bez retain_history) segmentů pokrytých snímkem.
+
+        Segmenty se mažou až za nejstarším ponechaným snímkem, aby šlo
+        obnovit i z něj, kdyby byl nejnovější snímek nečitelný.
+        """
+        snapshots = self._files(SNAPSHOT_PREFIX, SNAPSHOT_SUFFIX)
+        for _, path in snapshots[:-KEEP_SNAPSHOTS]:
+            os.remove(path)
+        if self.retain_history:
+            return
+        oldest = min([seq for seq, _ in snapshots[-KEEP_SNAPSHOTS:]] or [snapshot_seq])
+        segments = self._segments()
+        for (first, path), (next_first, _) in zip(segments, segments[1:]):
+            if next_first <= oldest + 1 and path != getattr(self._file, 'name', None):
+                os.remove(path)
+
+    def _fsync_directory(self) -> None:
+        """fsync adresáře (trvalost přejmenování a nových souborů)"""
+        if not hasattr(os, 'O_DIRECTORY'):
+            return
+        fd = os.open(self.directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
@@ -0,0 +1,542 @@
+"""
+Metriky systému - Metrics Registry
+
+Modul s registrem metrik (čítače, měřidla, histogramy) ve formátu
+Prometheus a HTTP endpointem /metrics na ``monitoring.metrics_port``.
+Aktualizace metrik nepoužívají sdílený zámek: každé vlákno zapisuje do
+vlastní buňky a buňky se sečtou až při načtení metrik (scrape), takže
+měření nezpomaluje operace, které měří. Hodnoty, které se snadno
+spočítají až při načtení (počet projektů, hloubka fronty), se zadávají
+jako funkce a v běžném provozu nestojí nic.
+"""
+
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+DEFAULT_METRICS_PORT = 9101
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelValues = Tuple[str, ...]
+
+
+class _Cells:
+    """Buňky hodnot po vláknech (zápis bez zámku, součet při čtení)"""
+
+    def __init__(self, size: int):
+        self._size = size
+        self._local = threading.local()
+        self._cells: List[List[float]] = []
+        self._lock = threading.Lock()
+
+    def cell(self) -> List[float]:
+        """Buňka aktuálního vlákna"""
+        try:
+            return self._local.cell
+        except AttributeError:
+            cell = [0.0] * self._size
+            with self._lock:
+                self._cells.append(cell)
+            self._local.cell = cell
+            return cell
+
+    def totals(self) -> List[float]:
+        """Součet buněk všech vláken"""
+        with self._lock:
+            cells = list(self._cells)
+        return [sum(cell[i] for cell in cells) for i in range(self._size)]
+
+
+class _Metric:
+    """Společný základ metrik s popisky (labels)"""
+
+    TYPE = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[LabelValues, Any] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._children[()] = self._new_child()
+
+    def labels(self, *values: str, **named: str) -> Any:
+        """
+        Metrika pro konkrétní hodnoty popisků.
+
+        Pro opakované použití v rychlých cestách je vhodné si výsledek
+        uložit (vyhledání potomka stojí jeden slovníkový přístup).
+
+        Raises:
+            ValueError: Pokud počet popisků nesouhlasí
+        """
+        if named:
+            values = tuple(named[name] for name in self.labelnames)
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"Metrika '{self.name}' očekává popisky {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _new_child(self) -> Any:
+        raise NotImplementedError
+
+    def _default(self) -> Any:
+        """Potomek bez popisků"""
+        return self._children[()]
+
+    def samples(self) -> Iterator[Tuple[str, Dict[str, str], float]]:
+        """Vzorky metriky (název, popisky, hodnota)"""
+        for values, child in sorted(list(self._children.items())):
+            labels = dict(zip(self.labelnames, values))
+            for suffix, extra, value in child.samples():
+                yield self.name + suffix, {**labels, **extra}, value
+
+
+class _CounterChild:
+    def __init__(self):
+        self._cells = _Cells(1)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._cells.cell()[0] += amount
+
+    def get(self) -> float:
+        return self._cells.totals()[0]
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        return [('', {}, self.get())]
+
+
+class Counter(_Metric):
+    """Čítač (pouze roste)"""
+
+    TYPE = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Zvýšení čítače bez popisků"""
+        self._default().inc(amount)
+
+    def get(self) -> float:
+        """Aktuální hodnota čítače bez popisků"""
+        return self._default().get()
+
+
+class _GaugeChild:
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value: float) -> None:
+        self._value = float(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.inc(-amount)
+
+    def get(self) -> float:
+        return self._value
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        return [('', {}, self._value)]
+
+
+class Gauge(_Metric):
+    """
+    Měřidlo (libovolná hodnota).
+
+    S parametrem ``callback`` se hodnota počítá až při načtení metrik;
+    funkce vrací číslo, nebo pro metriku s popisky slovník
+    {n-tice hodnot popisků: číslo}.
+    """
+
+    TYPE = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        callback: Optional[Callable[[], Any]] = None
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+    def set(self, value: float) -> None:
+        """Nastavení měřidla bez popisků"""
+        self._default().set(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Zvýšení měřidla bez popisků"""
+        self._default().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        """Snížení měřidla bez popisků"""
+        self._default().dec(amount)
+
+    def get(self) -> float:
+        """Aktuální hodnota měřidla bez popisků"""
+        return self._default().get()
+
+    def samples(self) -> Iterator[Tuple[str, Dict[str, str], float]]:
+        if self.callback is None:
+            yield from super().samples()
+            return
+        value = self.callback()
+        if not isinstance(value, dict):
+            yield self.name, {}, float(value)
+            return
+        for values, number in sorted(value.items()):
+            if not isinstance(values, tuple):
+                values = (values,)
+            yield self.name, dict(zip(self.labelnames, map(str, values))), float(number)
+
+
+class _HistogramChild:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self._buckets = buckets
+        # buňka: počty v jednotlivých intervalech, +Inf, součet
+        self._cells = _Cells(len(buckets) + 2)
+
+    def observe(self, value: float) -> None:
+        cell = self._cells.cell()
+        for index, bound in enumerate(self._buckets):
+            if value <= bound:
+                cell[index] += 1
+                break
+        else:
+            cell[len(self._buckets)] += 1
+        cell[-1] += value
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+    def snapshot(self) -> Tuple[List[float], float, float]:
+        """Kumulativní počty pro intervaly, součet a celkový počet"""
+        totals = self._cells.totals()
+        cumulative, running = [], 0.0
+        for count in totals[:-1]:
+            running += count
+            cumulative.append(running)
+        return cumulative, totals[-1], running
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        cumulative, total, count = self.snapshot()
+        samples = [
+            ('_bucket', {'le': _format_value(bound)}, cumulative[index])
+            for index, bound in enumerate(self._buckets)
+        ]
+        samples.append(('_bucket', {'le': '+Inf'}, count))
+        samples.append(('_sum', {}, total))
+        samples.append(('_count', {}, count))
+        return samples
+
+
+class Histogram(_Metric):
+    """Histogram (rozložení hodnot, typicky doby trvání v sekundách)"""
+
+    TYPE = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        """Zaznamenání hodnoty histogramu bez popisků"""
+        self._default().observe(value)
+
+    def time(self) -> Any:
+        """Kontextový manažer měřící dobu trvání bloku"""
+        return self._default().time()
+
+
+class MetricsRegistry:
+    """
+    Registr metrik.
+
+    Attributes:
+        logger (logging.Logger): Logger pro auditování
+    """
+
+    def __init__(self):
+        """Inicializace registru"""
+        self.logger = logging.getLogger("MetricsRegistry")
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> Any:
+        """Registrace metriky (existující metrika se stejným názvem se vrátí)"""
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric):
+                    raise ValueError(f"Metrika '{metric.name}' již existuje s jiným typem")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Čítač (vytvoří se, nebo se vrátí existující)"""
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        callback: Optional[Callable[[], Any]] = None
+    ) -> Gauge:
+        """Měřidlo (vytvoří se, nebo se vrátí existující; callback se aktualizuje)"""
+        gauge = self._register(Gauge(name, documentation, labelnames, callback))
+        if callback is not None:
+            gauge.callback = callback
+        return gauge
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        """Histogram (vytvoří se, nebo se vrátí existující)"""
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def get(self, name: str) -> Optional[_Metric]:
+        """Metrika podle názvu"""
+        return self._metrics.get(name)
+
+    def unregister(self, name: str) -> None:
+        """Odebrání metriky"""
+        with self._lock:
+            self._metrics.pop(name, None)
+
+    def render(self) -> str:
+        """
+        Všechny metriky v textovém formátu Prometheus (verze 0.0.4).
+
+        Returns:
+            Text pro odpověď na /metrics
+        """
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines = []
+        for metric in metrics:
+            try:
+                samples = list(metric.samples())
+            except Exception as e:
+                self.logger.error(f"Chyba při čtení metriky '{metric.name}': {e}")
+                continue
+            lines.append(f"# HELP {metric.name} {_escape_help(metric.documentation)}")
+            lines.append(f"# TYPE {metric.name} {metric.TYPE}")
+            for name, labels, value in samples:
+                if labels:
+                    rendered = ",".join(
+                        f'{key}="{_escape_label(value_)}"' for key, value_ in labels.items()
+                    )
+                    lines.append(f"{name}{{{rendered}}} {_format_value(value)}")
+                else:
+                    lines.append(f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+class MetricsLogHandler(logging.Handler):
+    """Handler počítající záznamy logu podle úrovně"""
+
+    def __init__(self, registry: MetricsRegistry):
+        super().__init__()
+        counter = registry.counter(
+            'log_messages_total', 'Počet záznamů logu podle úrovně', ['level'])
+        self._children = {
+            level: counter.labels(logging.getLevelName(level))
+            for level in (logging.DEBUG, logging.INFO, logging.WARNING,
+                          logging.ERROR, logging.CRITICAL)
+        }
+
+    def emit(self, record: logging.LogRecord) -> None:
+        child = self._children.get(record.levelno)
+        if child is not None:
+            child.inc()
+
+
+def instrument_logging(registry: MetricsRegistry) -> MetricsLogHandler:
+    """
+    Metriky logování: počty záznamů podle úrovně a hloubka front
+    QueueHandlerů (asynchronní zápis logu).
+
+    Args:
+        registry: Registr metrik
+
+    Returns:
+        Handler přidaný ke kořenovému loggeru
+    """
+    root = logging.getLogger()
+    for handler in root.handlers:
+        if isinstance(handler, MetricsLogHandler):
+            return handler
+    handler = MetricsLogHandler(registry)
+    root.addHandler(handler)
+
+    def queue_depth() -> Dict[Tuple[str, ...], float]:
+        depths: Dict[Tuple[str, ...], float] = {}
+        loggers = [root] + [
+            logger for logger in list(logging.Logger.manager.loggerDict.values())
+            if isinstance(logger, logging.Logger)
+        ]
+        for logger in loggers:
+            for log_handler in logger.handlers:
+                queue = getattr(log_handler, 'queue', None)
+                if queue is not None and hasattr(queue, 'qsize'):
+                    depths[(logger.name or 'root',)] = queue.qsize()
+        return depths
+
+    registry.gauge('logging_queue_depth', 'Počet záznamů čekajících ve frontě logu',
+                   ['logger'], callback=queue_depth)
+    return handler
+
+
+class MetricsServer:
+    """
+    HTTP server s endpointem /metrics (běží ve vlákně na pozadí).
+
+    Attributes:
+        registry (MetricsRegistry): Registr metrik
+        host (str): Adresa pro naslouchání
+        port (int): Port (0 = libovolný volný, skutečný port po start())
+    """
+
+    def __init__(
+        self, registry: MetricsRegistry, host: str = "0.0.0.0", port: int = DEFAULT_METRICS_PORT
+    ):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self.logger = logging.getLogger("MetricsServer")
+        self._server: Optional[Any] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_config(cls, config: Any, registry: MetricsRegistry) -> Optional["MetricsServer"]:
+        """
+        Vytvoření serveru podle sekce ``monitoring`` hlavní konfigurace.
+
+        Returns:
+            Server, nebo None pokud je monitoring vypnutý
+        """
+        if not config.get('monitoring.enabled', True):
+            return None
+        return cls(registry, port=int(config.get('monitoring.metrics_port', DEFAULT_METRICS_PORT)))
+
+    def start(self) -> int:
+        """
+        Spuštění serveru.
+
+        Returns:
+            Skutečné číslo portu
+        """
+        # http.server se načítá až tady; CLI, které server nespouští, ho nepotřebuje
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = registry.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="MetricsServer", daemon=True)
+        self._thread.start()
+        self.logger.info(f"Metriky na http://{self.host}:{self.port}/metrics")
+        return self.port
+
+    def stop(self) -> None:
+        """Zastavení serveru"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+def _escape_help(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('\n', '\\n')
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    """Formát čísla pro Prometheus (celá čísla bez desetinné části)"""
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    if math.isnan(value):
+        return 'NaN'
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+_registry: Optional[MetricsRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> MetricsRegistry:
+    """
+    Sdílený registr metrik procesu.
+
+    Returns:
+        Instance MetricsRegistry
+    """
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = MetricsRegistry()
+    return _registry
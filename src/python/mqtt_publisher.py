@@ -0,0 +1,629 @@
+"""
+Publikace do MQTT - MQTT Publisher
+
+Modul pro odesílání měření meteostanice do lokálního MQTT brokeru
+(Mosquitto, Node-RED). Měření se slučují do dávek (jedna zpráva s JSON
+polem), zprávy s QoS 1 a vyšším se při nedostupném brokeru ukládají
+na disk (spool) a po obnovení spojení se odešlou jako první; zprávy
+s QoS 0 se při zahlcení zahazují. Spojení se obnovuje s exponenciálním
+čekáním. Knihovna paho-mqtt je volitelná a importuje se až při
+připojení; pro testy a běh bez brokeru slouží LocalBroker.
+"""
+
+import collections
+import json
+import logging
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from .profiling import traced
+
+
+DEFAULT_TOPIC_PREFIX = "nymea/weather"
+SPOOL_SEGMENT_BYTES = 1024 * 1024
+LATENCY_SAMPLES = 1000
+
+# (podtéma, QoS, data)
+Message = Tuple[str, int, Dict[str, Any]]
+
+
+class MqttTransport:
+    """
+    Rozhraní spojení s brokerem.
+
+    Chyby spojení se hlásí výjimkou ConnectionError (nebo OSError).
+    """
+
+    def connect(self) -> None:
+        """Připojení k brokeru"""
+        raise NotImplementedError
+
+    def publish(self, topic: str, payload: bytes, qos: int) -> None:
+        """Odeslání zprávy (pro QoS >= 1 čeká na potvrzení)"""
+        raise NotImplementedError
+
+    def disconnect(self) -> None:
+        """Odpojení od brokeru"""
+        raise NotImplementedError
+
+
+class PahoTransport(MqttTransport):
+    """
+    Spojení přes knihovnu paho-mqtt (volitelná závislost).
+
+    Attributes:
+        host (str): Adresa brokeru
+        port (int): Port brokeru
+        ack_timeout (float): Maximální doba čekání na potvrzení zprávy
+    """
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 1883,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        client_id: str = "nymea-weather",
+        keepalive: int = 60,
+        ack_timeout: float = 10.0
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.client_id = client_id
+        self.keepalive = keepalive
+        self.ack_timeout = ack_timeout
+        self._client = None
+
+    def connect(self) -> None:
+        try:
+            import paho.mqtt.client as mqtt
+        except ImportError:
+            raise ConnectionError("Knihovna paho-mqtt není nainstalována (pip install paho-mqtt)")
+
+        try:
+            client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2, client_id=self.client_id)
+        except AttributeError:
+            # paho-mqtt < 2.0
+            client = mqtt.Client(client_id=self.client_id)
+        if self.username:
+            client.username_pw_set(self.username, self.password)
+        client.connect(self.host, self.port, self.keepalive)
+        client.loop_start()
+        self._client = client
+
+    def publish(self, topic: str, payload: bytes, qos: int) -> None:
+        if self._client is None:
+            raise ConnectionError("Nepřipojeno k brokeru")
+        try:
+            info = self._client.publish(topic, payload, qos)
+            if qos > 0:
+                info.wait_for_publish(self.ack_timeout)
+        except (RuntimeError, ValueError) as e:
+            raise ConnectionError(str(e))
+        if info.rc != 0 or (qos > 0 and not info.is_published()):
+            raise ConnectionError(f"Zprávu se nepodařilo odeslat (rc={info.rc})")
+
+    def disconnect(self) -> None:
+        if self._client is not None:
+            self._client.loop_stop()
+            self._client.disconnect()
+            self._client = None
+
+
+class LocalBroker(MqttTransport):
+    """
+    Náhrada brokeru v procesu (testy, běh bez Mosquitta).
+
+    Attributes:
+        available (bool): Zda je broker dostupný (lze přepínat)
+        messages (List[Tuple[str, bytes, int]]): Přijaté zprávy
+        latency (float): Umělé zpoždění potvrzení v sekundách
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.available = True
+        self.latency = latency
+        self.messages: List[Tuple[str, bytes, int]] = []
+        self.connects = 0
+        self._connected = False
+        self._subscribers: List[Callable[[str, bytes], None]] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback: Callable[[str, bytes], None]) -> None:
+        """Přihlášení odběratele přijatých zpráv"""
+        self._subscribers.append(callback)
+
+    def connect(self) -> None:
+        if not self.available:
+            raise ConnectionRefusedError("Broker není dostupný")
+        self.connects += 1
+        self._connected = True
+
+    def publish(self, topic: str, payload: bytes, qos: int) -> None:
+        if not (self.available and self._connected):
+            self._connected = False
+            raise ConnectionError("Spojení s brokerem přerušeno")
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.messages.append((topic, payload, qos))
+        for callback in self._subscribers:
+            callback(topic, payload)
+
+    def disconnect(self) -> None:
+        self._connected = False
+
+    def readings(self) -> List[Dict[str, Any]]:
+        """Všechna přijatá měření (rozbalená z dávek)"""
+        with self._lock:
+            return [item for _, payload, _ in self.messages for item in json.loads(payload)]
+
+
+class MqttPublisher:
+    """
+    Dávkové odesílání měření do MQTT s vyrovnávací pamětí na disku.
+
+    Attributes:
+        transport (MqttTransport): Spojení s brokerem
+        topic_prefix (str): Prefix témat (např. nymea/weather)
+        batch_size (int): Maximální počet měření v jedné zprávě
+        batch_interval (float): Maximální doba čekání na naplnění dávky
+        qos (int): Výchozí QoS
+        max_queue (int): Maximální počet zpráv ve frontě v paměti
+        spool_dir (str): Adresář pro zprávy čekající na broker (None = bez spoolu)
+        logger (logging.Logger): Logger pro auditování
+    """
+
+    def __init__(
+        self,
+        transport: MqttTransport,
+        topic_prefix: str = DEFAULT_TOPIC_PREFIX,
+        batch_size: int = 50,
+        batch_interval: float = 1.0,
+        qos: int = 1,
+        max_queue: int = 10000,
+        spool_dir: Optional[str] = None,
+        spool_max_bytes: int = 64 * 1024 * 1024,
+        backoff_initial: float = 0.5,
+        backoff_max: float = 60.0
+    ):
+        """
+        Inicializace publikace.
+
+        Args:
+            transport: Spojení s brokerem (PahoTransport, LocalBroker)
+            topic_prefix: Prefix témat
+            batch_size: Maximální počet měření v jedné zprávě
+            batch_interval: Maximální doba čekání na naplnění dávky (s)
+            qos: Výchozí QoS (0, 1 nebo 2)
+            max_queue: Maximální počet zpráv ve frontě v paměti
+            spool_dir: Adresář pro spool (None = zprávy QoS >= 1 se drží jen v paměti)
+            spool_max_bytes: Maximální velikost spoolu (nejstarší segmenty se zahodí)
+            backoff_initial: Počáteční čekání před novým připojením (s)
+            backoff_max: Maximální čekání před novým připojením (s)
+        """
+        self.transport = transport
+        self.topic_prefix = topic_prefix.rstrip('/')
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.qos = qos
+        self.max_queue = max_queue
+        self.spool_dir = spool_dir
+        self.spool_max_bytes = spool_max_bytes
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.logger = logging.getLogger("MqttPublisher")
+
+        self._queue: Deque[Message] = collections.deque()
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._connected = False
+        self._attempt = 0
+        self._latencies: Deque[float] = collections.deque(maxlen=LATENCY_SAMPLES)
+        self._counters = {
+            'submitted': 0, 'published_messages': 0, 'published_batches': 0,
+            'dropped': 0, 'spooled_batches': 0, 'replayed_batches': 0, 'reconnects': 0,
+        }
+        self._last_error: Optional[str] = None
+        self._spool_lock = threading.Lock()
+        self._spool_seq = 0
+        self._spool_pending = False
+        if spool_dir:
+            os.makedirs(spool_dir, exist_ok=True)
+            segments = self._spool_segments()
+            self._spool_seq = int(segments[-1][6:14]) + 1 if segments else 0
+            self._spool_pending = bool(segments)
+            if segments:
+                # Neúplný řádek po pádu by se slepil s dalším zápisem
+                self._read_spool(os.path.join(spool_dir, segments[-1]), truncate=True)
+
+    @classmethod
+    def from_config(
+        cls, config: Any, transport: Optional[MqttTransport] = None
+    ) -> "MqttPublisher":
+        """
+        Vytvoření publikace podle hlavní konfigurace (sekce ``mqtt`` a ``nymea``).
+
+        Args:
+            config: ConfigManager (nebo cokoliv s metodou ``get``)
+            transport: Spojení (výchozí: PahoTransport na nymea.mqtt_port)
+
+        Returns:
+            Nová publikace
+        """
+        if transport is None:
+            transport = PahoTransport(
+                host=config.get('mqtt.host', 'localhost'),
+                port=int(config.get('nymea.mqtt_port', 1883)),
+                username=config.get('mqtt.username'),
+                password=config.get('mqtt.password'),
+            )
+        return cls(
+            transport,
+            topic_prefix=config.get('mqtt.topic_prefix', DEFAULT_TOPIC_PREFIX),
+            batch_size=int(config.get('mqtt.batch_size', 50)),
+            batch_interval=float(config.get('mqtt.batch_interval', 1.0)),
+            qos=int(config.get('mqtt.qos', 1)),
+            spool_dir=config.get('mqtt.spool_dir'),
+        )
+
+    def attach(self, event_bus: Any) -> None:
+        """
+        Odběr nových měření ze sběrnice událostí (WeatherStore).
+
+        Args:
+            event_bus: EventBus
+        """
+        def on_event(event: Dict[str, Any]) -> None:
+            if event['topic'] == 'weather.reading':
+                reading = {k: v for k, v in event['data'].items() if k not in ('count', 'version')}
+                self.submit(reading)
+
+        event_bus.subscribe(on_event)
+
+    def submit(
+        self, data: Dict[str, Any], subtopic: str = "readings", qos: Optional[int] = None
+    ) -> bool:
+        """
+        Zařazení měření k odeslání (neblokuje).
+
+        Args:
+            data: Měření (serializovatelné do JSON)
+            subtopic: Podtéma (výsledné téma je prefix/podtéma)
+            qos: QoS (výchozí: qos publikace)
+
+        Returns:
+            False pokud byla kvůli plné frontě zahozena zpráva
+        """
+        qos = self.qos if qos is None else qos
+        with self._cond:
+            self._counters['submitted'] += 1
+            accepted = True
+            if len(self._queue) >= self.max_queue:
+                accepted = self._make_room(qos)
+            if accepted:
+                self._queue.append((subtopic, qos, data))
+                if len(self._queue) >= self.batch_size:
+                    self._cond.notify()
+        return accepted
+
+    def start(self) -> None:
+        """Spuštění odesílání na pozadí"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="MqttPublisher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Zastavení odesílání.
+
+        Zbývající zprávy se ještě zkusí odeslat; co se nepodaří, uloží
+        se (QoS >= 1) do spoolu.
+        """
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        while self._queue:
+            batch = self._take_batch(wait=False)
+            if self._connected and self._send(batch):
+                continue
+            if not self.spool_dir:
+                lost = len(batch) + len(self._queue)
+                self._queue.clear()
+                self._counters['dropped'] += lost
+                self.logger.warning(f"Broker nedostupný, zahozeno {lost} zpráv (bez spoolu)")
+                break
+            self._spool(batch)
+        if self._connected:
+            self.transport.disconnect()
+            self._connected = False
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Čekání na odeslání fronty i spoolu.
+
+        Returns:
+            True pokud je vše odesláno
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if not self._queue and not self._spool_pending:
+                return True
+            with self._cond:
+                self._cond.notify()
+            time.sleep(0.01)
+        return False
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Metriky publikace.
+
+        Returns:
+            Počítadla, hloubka fronty, velikost spoolu a latence odeslání (ms)
+        """
+        latencies = sorted(self._latencies)
+        count = len(latencies)
+        metrics: Dict[str, Any] = dict(self._counters)
+        metrics.update({
+            'connected': self._connected,
+            'queue_depth': len(self._queue),
+            'spool_bytes': self._spool_bytes(),
+            'last_error': self._last_error,
+            'publish_latency_ms': {
+                'count': count,
+                'avg': round(sum(latencies) / count, 3) if count else None,
+                'p50': round(latencies[count // 2], 3) if count else None,
+                'p95': round(latencies[min(count - 1, int(count * 0.95))], 3) if count else None,
+                'max': round(latencies[-1], 3) if count else None,
+            },
+        })
+        return metrics
+
+    def _run(self) -> None:
+        """Hlavní smyčka vlákna (nečekaná chyba vlákno neukončí)"""
+        while not self._stop.is_set():
+            try:
+                self._step()
+            except Exception as e:
+                self._last_error = str(e)
+                self.logger.exception(f"Chyba při odesílání do MQTT: {e}")
+                self._stop.wait(self.backoff_max)
+
+    def _step(self) -> None:
+        """Jeden průchod smyčkou: připojení, spool, nebo dávka z fronty"""
+        if not self._connected and not self._connect():
+            if self.spool_dir:
+                # Během výpadku se fronta průběžně přesouvá na disk
+                while self._queue:
+                    self._spool(self._take_batch(wait=False))
+            self._stop.wait(self._backoff())
+            return
+        if self._replay_spool():
+            return
+        batch = self._take_batch(wait=True)
+        if batch and not self._send(batch):
+            self._spool(batch)
+
+    def _connect(self) -> bool:
+        """Pokus o připojení"""
+        try:
+            self.transport.connect()
+        except (ConnectionError, OSError) as e:
+            self._attempt += 1
+            self._last_error = str(e)
+            self.logger.warning(f"Připojení k MQTT brokeru selhalo: {e}")
+            return False
+        if self._attempt:
+            self._counters['reconnects'] += 1
+            self.logger.info("Spojení s MQTT brokerem obnoveno")
+        self._attempt = 0
+        self._connected = True
+        return True
+
+    def _backoff(self) -> float:
+        """Exponenciální čekání s rozptylem"""
+        delay = min(self.backoff_max, self.backoff_initial * 2 ** (self._attempt - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+    def _take_batch(self, wait: bool) -> List[Message]:
+        """
+        Odebrání dávky zpráv se stejným podtématem z čela fronty.
+
+        Args:
+            wait: Čekat na naplnění dávky nejvýše batch_interval
+        """
+        with self._cond:
+            if wait:
+                deadline = time.monotonic() + self.batch_interval
+                while len(self._queue) < self.batch_size and not self._stop.is_set():
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+            batch: List[Message] = []
+            while self._queue and len(batch) < self.batch_size:
+                if batch and self._queue[0][0] != batch[0][0]:
+                    break
+                batch.append(self._queue.popleft())
+        return batch
+
+    @traced()
+    def _send(self, batch: List[Message]) -> bool:
+        """Odeslání dávky jako jedné zprávy"""
+        topic = f"{self.topic_prefix}/{batch[0][0]}"
+        qos = max(message[1] for message in batch)
+        payload = json.dumps([message[2] for message in batch]).encode('utf-8')
+        return self._publish(topic, payload, qos, len(batch))
+
+    def _publish(self, topic: str, payload: bytes, qos: int, count: int) -> bool:
+        """Odeslání jedné zprávy s měřením latence"""
+        started = time.perf_counter()
+        try:
+            self.transport.publish(topic, payload, qos)
+        except (ConnectionError, OSError) as e:
+            self._connected = False
+            self._last_error = str(e)
+            self.logger.warning(f"Odeslání do MQTT selhalo: {e}")
+            return False
+        self._latencies.append((time.perf_counter() - started) * 1000)
+        self._counters['published_messages'] += count
+        self._counters['published_batches'] += 1
+        return True
+
+    def _make_room(self, qos: int) -> bool:
+        """
+        Uvolnění místa v plné frontě (volá se pod zámkem).
+
+        Nejdřív se zahodí nejstarší zpráva s QoS 0. Pokud žádná není,
+        nová zpráva s QoS 0 se zahodí; zprávy s QoS >= 1 se přesunou
+        do spoolu (bez spoolu se zahodí nejstarší).
+        """
+        for index, message in enumerate(self._queue):
+            if message[1] == 0:
+                del self._queue[index]
+                self._counters['dropped'] += 1
+                return True
+        if qos == 0 or not self.spool_dir:
+            self._counters['dropped'] += 1
+            if qos == 0:
+                return False
+            self._queue.popleft()
+            return True
+        overflow = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+        self._spool(overflow)
+        return True
+
+    def _spool(self, batch: List[Message]) -> None:
+        """Uložení nedoručené dávky na disk (zprávy s QoS 0 se zahodí)"""
+        durable = [message for message in batch if message[1] > 0]
+        self._counters['dropped'] += len(batch) - len(durable)
+        if not durable:
+            return
+        if not self.spool_dir:
+            # Bez spoolu se zprávy vrátí na začátek fronty
+            with self._cond:
+                self._queue.extendleft(reversed(durable))
+            return
+
+        with self._spool_lock:
+            self._write_spool(durable)
+
+    def _write_spool(self, durable: List[Message]) -> None:
+        """Připsání dávky do posledního segmentu spoolu (volá se pod zámkem)"""
+        segments = self._spool_segments()
+        path = os.path.join(self.spool_dir, segments[-1]) if segments else None
+        if path is None or os.path.getsize(path) >= SPOOL_SEGMENT_BYTES:
+            path = os.path.join(self.spool_dir, f"spool-{self._spool_seq:08d}.jsonl")
+            self._spool_seq += 1
+        topic = f"{self.topic_prefix}/{durable[0][0]}"
+        line = json.dumps({
+            'topic': topic,
+            'qos': max(message[1] for message in durable),
+            'data': [message[2] for message in durable],
+        })
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(line + '\n')
+        self._spool_pending = True
+        self._counters['spooled_batches'] += 1
+        self._trim_spool()
+
+    def _replay_spool(self) -> bool:
+        """
+        Odeslání nejstaršího segmentu spoolu.
+
+        Returns:
+            True pokud byl spool zpracováván (smyčka má pokračovat)
+        """
+        if not self._spool_pending:
+            return False
+        with self._spool_lock:
+            segments = self._spool_segments()
+            if not segments:
+                self._spool_pending = False
+                return False
+            path = os.path.join(self.spool_dir, segments[0])
+            entries = self._read_spool(path)
+            for index, entry in enumerate(entries):
+                payload = json.dumps(entry['data']).encode('utf-8')
+                if not self._publish(entry['topic'], payload, entry['qos'], len(entry['data'])):
+                    temp_path = f"{path}.tmp"
+                    with open(temp_path, 'w', encoding='utf-8') as f:
+                        f.writelines(json.dumps(rest) + '\n' for rest in entries[index:])
+                    os.replace(temp_path, path)
+                    return True
+                self._counters['replayed_batches'] += 1
+            os.remove(path)
+            self._spool_pending = len(segments) > 1
+        return True
+
+    def _trim_spool(self) -> None:
+        """Zahození nejstarších segmentů nad limit velikosti spoolu"""
+        segments = self._spool_segments()
+        while len(segments) > 1 and self._spool_bytes() > self.spool_max_bytes:
+            oldest = os.path.join(self.spool_dir, segments.pop(0))
+            self._counters['dropped'] += sum(
+                len(entry['data']) for entry in self._read_spool(oldest))
+            os.remove(oldest)
+            self.logger.warning(f"Spool přeplněn, zahozen segment '{oldest}'")
+
+    def _read_spool(self, path: str, truncate: bool = False) -> List[Dict[str, Any]]:
+        """
+        Čtení dávek ze segmentu spoolu.
+
+        Neúplný poslední řádek (pád při zápisu) se přeskočí, při
+        truncate=True i odřízne; nečitelný řádek uprostřed se zahodí
+        s varováním, aby zbytek spoolu šlo doručit.
+        """
+        with open(path, 'rb') as f:
+            data = f.read()
+        entries = []
+        offset = 0
+        while offset < len(data):
+            end = data.find(b'\n', offset)
+            if end < 0:
+                self.logger.warning(
+                    f"Neúplný poslední záznam spoolu v '{path}' ({len(data) - offset} B)")
+                if truncate:
+                    with open(path, 'r+b') as f:
+                        f.truncate(offset)
+                break
+            line = data[offset:end]
+            offset = end + 1
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+                if not isinstance(entry, dict) or not {'topic', 'qos', 'data'} <= entry.keys():
+                    raise ValueError("chybí topic, qos nebo data")
+            except ValueError as e:
+                self.logger.warning(f"Poškozený záznam spoolu v '{path}' zahozen: {e}")
+                continue
+            entries.append(entry)
+        return entries
+
+    def _spool_segments(self) -> List[str]:
+        """Seřazené názvy segmentů spoolu"""
+        if not self.spool_dir or not os.path.isdir(self.spool_dir):
+            return []
+        return sorted(
+            name for name in os.listdir(self.spool_dir)
+            if name.startswith('spool-') and name.endswith('.jsonl')
+        )
+
+    def _spool_bytes(self) -> int:
+        """Velikost spoolu v bajtech"""
+        return sum(
+            os.path.getsize(os.path.join(self.spool_dir, name))
+            for name in self._spool_segments()
+        )
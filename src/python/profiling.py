@@ -0,0 +1,453 @@
+"""
+Profilování za běhu - Runtime Profiling Hooks
+
+Volitelná instrumentace pro hledání pomalých míst na běžícím kiosku
+bez restartu služby:
+
+- úseky (spans) přes ``span()`` a dekorátor ``traced()``; ve vypnutém
+  stavu stojí jen kontrolu jednoho příznaku, po zapnutí sčítají čas
+  (celkový i vlastní) podle zanoření volání,
+- vzorkování zásobníků všech vláken (``sample_stacks``) a zachycení
+  alokací přes tracemalloc (``capture_memory``),
+- cProfile příštího volání vybraného úseku (``profile_next``).
+
+cProfile, pstats a tracemalloc se načítají až při zachycení, takže
+import modulu (a každý běh CLI) je nestojí nic.
+
+Výstupy úseků a vzorků jsou ve formátu „folded stacks“
+(``rám1;rám2;rám3 hodnota``), který přímo čte flamegraph.pl,
+speedscope nebo inferno. Zachycení lze spustit signálem
+(``install_signal_handlers``) nebo přes ladicí endpointy HTTP API.
+"""
+
+import io
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+DEFAULT_OUTPUT_DIR = "/var/log/nymea-kiosk/profiles"
+DEFAULT_SAMPLE_INTERVAL = 0.005
+MAX_CAPTURE_SECONDS = 300
+
+logger = logging.getLogger("Profiling")
+
+# Rychlá cesta: jediný příznak, který kontroluje každý úsek
+_active = False
+_spans_enabled = False
+_armed: Dict[str, Dict[str, Any]] = {}
+_local = threading.local()
+_tables: List[Dict[str, List[float]]] = []
+_lock = threading.Lock()
+
+
+def _update_active() -> None:
+    global _active
+    _active = _spans_enabled or bool(_armed)
+
+
+def enable_spans(enabled: bool = True) -> None:
+    """
+    Zapnutí nebo vypnutí měření úseků.
+
+    Args:
+        enabled: True pro zapnutí
+    """
+    global _spans_enabled
+    _spans_enabled = enabled
+    _update_active()
+    logger.info(f"Měření úseků {'zapnuto' if enabled else 'vypnuto'}")
+
+
+def spans_enabled() -> bool:
+    """Stav měření úseků"""
+    return _spans_enabled
+
+
+class _NoopSpan:
+    """Úsek ve vypnutém stavu (sdílená instance, nic neměří)"""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+
+_NOOP = _NoopSpan()
+
+
+class _Span:
+    """Měřený úsek"""
+
+    __slots__ = ('name', 'path', 'started', 'children', 'profiler')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.children = 0.0
+        self.profiler: Optional[Any] = None
+
+    def __enter__(self) -> "_Span":
+        stack = _stack()
+        self.path = f"{stack[-1].path};{self.name}" if stack else self.name
+        stack.append(self)
+        request = _armed.get(self.name)
+        if request is not None and request['profiler'] is None:
+            with _lock:
+                if request['profiler'] is None:
+                    import cProfile
+                    self.profiler = request['profiler'] = cProfile.Profile()
+            if self.profiler is not None:
+                self.profiler.enable()
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        elapsed = time.perf_counter() - self.started
+        if self.profiler is not None:
+            self.profiler.disable()
+            request = _armed.pop(self.name, None)
+            _update_active()
+            if request is not None:
+                request['done'].set()
+        stack = _local.stack
+        stack.pop()
+        if stack:
+            stack[-1].children += elapsed
+        if _spans_enabled:
+            entry = _table().get(self.path)
+            if entry is None:
+                entry = _table()[self.path] = [0, 0.0, 0.0]
+            entry[0] += 1
+            entry[1] += elapsed
+            entry[2] += elapsed - self.children
+
+
+def _stack() -> List[_Span]:
+    try:
+        return _local.stack
+    except AttributeError:
+        _local.stack = []
+        return _local.stack
+
+
+def _table() -> Dict[str, List[float]]:
+    """Tabulka úseků aktuálního vlákna (zápis bez zámku, součet při čtení)"""
+    try:
+        return _local.table
+    except AttributeError:
+        table: Dict[str, List[float]] = {}
+        with _lock:
+            _tables.append(table)
+        _local.table = table
+        return table
+
+
+def span(name: str) -> Any:
+    """
+    Kontextový manažer měřící úsek kódu.
+
+    Args:
+        name: Název úseku (např. 'project_manager.add_task')
+
+    Returns:
+        Kontextový manažer (ve vypnutém stavu sdílený prázdný)
+    """
+    return _Span(name) if _active else _NOOP
+
+
+def traced(name: Optional[str] = None) -> Callable[[Callable], Callable]:
+    """
+    Dekorátor měřící každé volání funkce jako úsek.
+
+    Args:
+        name: Název úseku (výchozí: modul.Třída.metoda)
+    """
+    def decorate(func: Callable) -> Callable:
+        label = name or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__qualname__}"
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _active:
+                return func(*args, **kwargs)
+            with _Span(label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def span_report() -> List[Dict[str, Any]]:
+    """
+    Souhrn naměřených úseků.
+
+    Returns:
+        Seznam slovníků (path, count, total_ms, self_ms) od nejdražšího
+    """
+    merged: Dict[str, List[float]] = {}
+    with _lock:
+        tables = list(_tables)
+    for table in tables:
+        for path, (count, total, own) in list(table.items()):
+            entry = merged.setdefault(path, [0, 0.0, 0.0])
+            entry[0] += count
+            entry[1] += total
+            entry[2] += own
+    report = [
+        {'path': path, 'count': int(count), 'total_ms': round(total * 1000, 3),
+         'self_ms': round(own * 1000, 3)}
+        for path, (count, total, own) in merged.items()
+    ]
+    return sorted(report, key=lambda item: item['total_ms'], reverse=True)
+
+
+def folded_spans() -> str:
+    """Úseky ve formátu folded stacks (vlastní čas v mikrosekundách)"""
+    return "".join(
+        f"{item['path']} {round(item['self_ms'] * 1000)}\n" for item in span_report()
+    )
+
+
+def reset_spans() -> None:
+    """Vynulování naměřených úseků"""
+    with _lock:
+        for table in _tables:
+            table.clear()
+
+
+def sample_stacks(
+    seconds: float, interval: float = DEFAULT_SAMPLE_INTERVAL
+) -> Counter:
+    """
+    Vzorkování zásobníků všech vláken (mimo volající vlákno).
+
+    Args:
+        seconds: Doba vzorkování
+        interval: Perioda vzorků (sekundy)
+
+    Returns:
+        Counter {folded zásobník: počet vzorků}; kořenem je název vlákna
+    """
+    counts: Counter = Counter()
+    me = threading.get_ident()
+    deadline = time.monotonic() + min(seconds, MAX_CAPTURE_SECONDS)
+    while time.monotonic() < deadline:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == me:
+                continue
+            frames = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append(
+                    f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+                )
+                frame = frame.f_back
+            frames.append(names.get(ident, f"thread-{ident}"))
+            counts[";".join(reversed(frames))] += 1
+        time.sleep(interval)
+    return counts
+
+
+def capture_memory(seconds: float, frames: int = 16, limit: int = 20) -> Dict[str, Any]:
+    """
+    Zachycení alokací paměti po dobu ``seconds`` (tracemalloc).
+
+    Args:
+        seconds: Doba zachycení
+        frames: Hloubka zaznamenaných zásobníků
+        limit: Počet nejvýznamnějších míst v souhrnu
+
+    Returns:
+        Slovník s klíči top (místa s největším nárůstem), folded (nárůst
+        v bajtech podle zásobníku) a peak_bytes
+    """
+    import tracemalloc
+
+    started_here = not tracemalloc.is_tracing()
+    if started_here:
+        tracemalloc.start(frames)
+    try:
+        before = tracemalloc.take_snapshot()
+        time.sleep(min(seconds, MAX_CAPTURE_SECONDS))
+        after = tracemalloc.take_snapshot()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        if started_here:
+            tracemalloc.stop()
+
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    before, after = before.filter_traces(ignore), after.filter_traces(ignore)
+    top = [
+        {'location': str(stat.traceback[0]), 'size_diff': stat.size_diff,
+         'count_diff': stat.count_diff}
+        for stat in after.compare_to(before, 'lineno')[:limit]
+    ]
+    folded = []
+    for stat in after.compare_to(before, 'traceback'):
+        if stat.size_diff <= 0:
+            continue
+        stack = ";".join(
+            f"{os.path.basename(frame.filename)}:{frame.lineno}"
+            for frame in reversed(stat.traceback)
+        )
+        folded.append(f"{stack} {stat.size_diff}")
+    return {'top': top, 'folded': "\n".join(folded) + ("\n" if folded else ""),
+            'peak_bytes': peak}
+
+
+def profile_next(span_name: str, timeout: float = 60.0) -> Optional[str]:
+    """
+    cProfile příštího volání úseku (v kterémkoliv vlákně).
+
+    Args:
+        span_name: Název úseku (span nebo traced)
+        timeout: Maximální doba čekání na volání (sekundy)
+
+    Returns:
+        Textový souhrn pstats seřazený podle kumulativního času, nebo None
+        pokud úsek do timeoutu neproběhl
+    """
+    request: Dict[str, Any] = {'profiler': None, 'done': threading.Event()}
+    with _lock:
+        _armed[span_name] = request
+    _update_active()
+    finished = request['done'].wait(min(timeout, MAX_CAPTURE_SECONDS))
+    if not finished:
+        with _lock:
+            if _armed.get(span_name) is request and request['profiler'] is None:
+                _armed.pop(span_name)
+        _update_active()
+        # Volání mohlo začít těsně před timeoutem
+        finished = request['profiler'] is not None and request['done'].wait(timeout)
+    if not finished:
+        return None
+    import pstats
+
+    output = io.StringIO()
+    stats = pstats.Stats(request['profiler'], stream=output)
+    stats.sort_stats('cumulative').print_stats(30)
+    return output.getvalue()
+
+
+def capture(
+    mode: str = "stack",
+    seconds: float = 10.0,
+    output_dir: Optional[str] = None,
+    span_name: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Jednorázové zachycení profilu.
+
+    Args:
+        mode: 'stack' (vzorky zásobníků), 'memory' (tracemalloc),
+            'cpu' (cProfile příštího volání úseku ``span_name``)
+            nebo 'spans' (souhrn úseků)
+        seconds: Doba zachycení (u 'cpu' maximální čekání na volání)
+        output_dir: Adresář pro výstupní soubor (None = jen výsledek)
+        span_name: Úsek pro režim 'cpu'
+
+    Returns:
+        Slovník s výsledkem (mode, text, file a podle režimu top)
+
+    Raises:
+        ValueError: Pokud je režim neznámý nebo chybí span_name
+    """
+    started = time.strftime('%Y%m%d-%H%M%S')
+    result: Dict[str, Any] = {'mode': mode, 'seconds': seconds}
+    if mode == 'stack':
+        counts = sample_stacks(seconds)
+        result['samples'] = sum(counts.values())
+        result['text'] = "".join(f"{stack} {count}\n" for stack, count in counts.most_common())
+        leaves: Counter = Counter()
+        for stack, count in counts.items():
+            leaves[stack.rsplit(';', 1)[-1]] += count
+        result['top'] = [
+            {'function': name, 'samples': count} for name, count in leaves.most_common(20)
+        ]
+        suffix = 'folded'
+    elif mode == 'memory':
+        memory = capture_memory(seconds)
+        result.update(top=memory['top'], peak_bytes=memory['peak_bytes'])
+        result['text'] = memory['folded']
+        suffix = 'memory.folded'
+    elif mode == 'cpu':
+        if not span_name:
+            raise ValueError("Režim 'cpu' vyžaduje název úseku")
+        result['span'] = span_name
+        result['text'] = profile_next(span_name, seconds)
+        suffix = 'pstats.txt'
+    elif mode == 'spans':
+        result['top'] = span_report()[:50]
+        result['text'] = folded_spans()
+        suffix = 'spans.folded'
+    else:
+        raise ValueError(f"Neznámý režim profilování '{mode}'")
+
+    result['file'] = None
+    if output_dir and result['text']:
+        try:
+            os.makedirs(output_dir, exist_ok=True)
+            path = os.path.join(output_dir, f"profile-{started}-{mode}.{suffix}")
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(result['text'])
+            result['file'] = path
+            logger.info(f"Profil '{mode}' uložen do '{path}'")
+        except OSError as e:
+            logger.error(f"Chyba při ukládání profilu: {e}")
+    return result
+
+
+def install_signal_handlers(
+    output_dir: str = DEFAULT_OUTPUT_DIR, seconds: float = 30.0
+) -> Optional[Tuple[int, int]]:
+    """
+    Spouštění profilování signálem (volat z hlavního vlákna).
+
+    SIGUSR1 přepíná měření úseků (při vypnutí uloží folded soubor),
+    SIGUSR2 spustí vzorkování zásobníků a zachycení alokací na ``seconds``
+    sekund ve vlákně na pozadí a uloží výsledky do ``output_dir``.
+
+    Args:
+        output_dir: Adresář pro výstupní soubory
+        seconds: Doba zachycení po SIGUSR2
+
+    Returns:
+        Čísla obsloužených signálů (None na systému bez SIGUSR1/SIGUSR2)
+    """
+    if not hasattr(signal, 'SIGUSR2'):
+        return None
+
+    def toggle_spans(signum: int, frame: Any) -> None:
+        if spans_enabled():
+            enable_spans(False)
+            _in_background(capture, 'spans', 0, output_dir)
+        else:
+            reset_spans()
+            enable_spans(True)
+
+    def start_capture(signum: int, frame: Any) -> None:
+        _in_background(capture, 'stack', seconds, output_dir)
+        _in_background(capture, 'memory', seconds, output_dir)
+
+    signal.signal(signal.SIGUSR1, toggle_spans)
+    signal.signal(signal.SIGUSR2, start_capture)
+    logger.info(f"Profilování: SIGUSR1 úseky, SIGUSR2 zachycení do '{output_dir}'")
+    return signal.SIGUSR1, signal.SIGUSR2
+
+
+def _in_background(func: Callable, *args: Any) -> None:
+    def run() -> None:
+        try:
+            func(*args)
+        except Exception as e:
+            logger.error(f"Chyba při profilování: {e}")
+
+    threading.Thread(target=run, name="Profiling", daemon=True).start()
@@ -0,0 +1,588 @@
+"""
+Historie pokroku projektů - Progress History
+
+Průběžně zaznamenávaná časová řada pokroku každého projektu (počet
+úkolů a počet hotových úkolů). Bod se zapíše při každé změně, která
+počty změní – nový úkol nebo změna stavu z/do 'completed'. Počty se
+udržují čítači, úkoly se nepřepočítávají. Nad řadou se počítá burndown,
+týdenní rychlost (velocity) a odhad dokončení proti termínu z
+``timeline`` projektu.
+
+Každý projekt má vlastní soubor s body zakódovanými rozdílově: posun
+času v sekundách a změny obou počtů jako varinty. Bod tak zabere typicky
+3–5 B. Body starší než ``detail_days`` se při kompakci sloučí na jeden
+za den, takže celý školní rok projektu zabere jednotky kB. Do souborů
+smí zapisovat více procesů (project-manager i kiosk-api). Zápis probíhá
+pod zámkem adresáře a každý proces si před zápisem dočte body, které
+mezitím připsal jiný proces.
+"""
+
+import bisect
+import logging
+import os
+import re
+import threading
+from array import array
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote, unquote
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows (vývojové stroje bez kiosku)
+    fcntl = None  # type: ignore[assignment]
+
+
+MAGIC = b'PRG1'
+SUFFIX = '.progress'
+LOCK_FILE = '.lock'
+DEFAULT_DETAIL_DAYS = 14
+COMPACT_EVERY = 512
+DEFAULT_VELOCITY_WEEKS = 3
+COMPLETED = 'completed'
+
+_UNITS = (('d', 1), ('t', 7), ('w', 7), ('m', 30))
+_TIMELINE = re.compile(r'(\d+(?:[.,]\d+)?)\s*([^\W\d_]+)', re.UNICODE)
+
+
+def parse_timeline(timeline: Optional[str]) -> Optional[timedelta]:
+    """
+    Délka projektu z textu pole ``timeline``.
+
+    Rozumí číslu s jednotkou česky i anglicky ("4 týdny", "10 dní",
+    "2 měsíce", "6 weeks"); měsíc se počítá jako 30 dní.
+
+    Args:
+        timeline: Text časového plánu
+
+    Returns:
+        Délka projektu nebo None, pokud text nelze rozpoznat
+    """
+    match = _TIMELINE.search(timeline or '')
+    if match is None:
+        return None
+    unit = match.group(2).lower()
+    for prefix, days in _UNITS:
+        if unit.startswith(prefix):
+            return timedelta(days=float(match.group(1).replace(',', '.')) * days)
+    return None
+
+
+def _varint(value: int, out: bytearray) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _zigzag(value: int) -> int:
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def _read_varint(data: bytes, offset: int) -> Tuple[int, int]:
+    """Varint na pozici offset; vrací (hodnota, nová pozice), IndexError u neúplného"""
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def _unzigzag(value: int) -> int:
+    return value >> 1 if not value & 1 else -(value >> 1) - 1
+
+
+def _timestamp(moment: Any) -> int:
+    """Unixový čas v sekundách z datetime nebo ISO řetězce (místní čas)"""
+    if isinstance(moment, str):
+        moment = datetime.fromisoformat(moment)
+    return int(moment.timestamp())
+
+
+class _Series:
+    """Body jednoho projektu v paměti a stav jeho souboru"""
+
+    def __init__(self) -> None:
+        self.times = array('q')
+        self.totals = array('l')
+        self.completed = array('l')
+        self.offset = 0
+        self.inode = 0
+        self.compacted = 0
+
+    def append(self, moment: int, total: int, completed: int) -> None:
+        self.times.append(moment)
+        self.totals.append(total)
+        self.completed.append(completed)
+
+    def last(self) -> Tuple[int, int, int]:
+        if not self.times:
+            return 0, 0, 0
+        return self.times[-1], self.totals[-1], self.completed[-1]
+
+    def at(self, moment: int) -> Tuple[int, int]:
+        """Počty platné v čase moment (poslední bod nejpozději v něm)"""
+        index = bisect.bisect_right(self.times, moment) - 1
+        if index < 0:
+            return 0, 0
+        return self.totals[index], self.completed[index]
+
+    def encode(self, start: int = 0) -> bytes:
+        """Body od indexu start zakódované rozdílově za bodem start - 1"""
+        out = bytearray()
+        previous = (self.times[start - 1], self.totals[start - 1],
+                    self.completed[start - 1]) if start else (0, 0, 0)
+        for index in range(start, len(self.times)):
+            moment = self.times[index]
+            _varint(max(0, moment - previous[0]), out)
+            _varint(_zigzag(self.totals[index] - previous[1]), out)
+            _varint(_zigzag(self.completed[index] - previous[2]), out)
+            previous = (max(moment, previous[0]), self.totals[index], self.completed[index])
+        return bytes(out)
+
+    def decode(self, data: bytes) -> int:
+        """Připojení bodů ze souboru; vrací délku celých přečtených záznamů"""
+        moment, total, completed = self.last()
+        offset = good = 0
+        try:
+            while offset < len(data):
+                delta, offset = _read_varint(data, offset)
+                change, offset = _read_varint(data, offset)
+                done, offset = _read_varint(data, offset)
+                moment += delta
+                total += _unzigzag(change)
+                completed += _unzigzag(done)
+                self.append(moment, total, completed)
+                good = offset
+        except IndexError:
+            pass
+        return good
+
+
+class ProgressHistory:
+    """
+    Časové řady pokroku projektů s burndownem a odhadem dokončení.
+
+    Napojuje se na ProjectManager (attach), který při přidání úkolu
+    a změně stavu volá task_added a status_changed; po obnovení stavu
+    rebuild srovná čítače se stavem.
+
+    Attributes:
+        directory (str): Adresář se soubory řad
+        detail_days (int): Kolik dní zpět se drží všechny body (starší po dnech)
+        logger (logging.Logger): Logger
+    """
+
+    def __init__(self, directory: str, detail_days: int = DEFAULT_DETAIL_DAYS):
+        """
+        Inicializace historie (adresář se vytvoří při prvním zápisu).
+
+        Args:
+            directory: Adresář se soubory řad
+            detail_days: Kolik dní zpět se drží všechny body
+        """
+        self.directory = directory
+        self.detail_days = detail_days
+        self.logger = logging.getLogger("ProgressHistory")
+        self._lock = threading.RLock()
+        self._series: Dict[str, _Series] = {}
+        self._counts: Dict[str, List[int]] = {}
+        self._lock_file: Optional[Any] = None
+        self._lock_depth = 0
+
+    @classmethod
+    def from_config(cls, config: Any, default_directory: str) -> "ProgressHistory":
+        """
+        Historie podle sekce ``projects`` hlavní konfigurace.
+
+        Args:
+            config: ConfigManager (nebo cokoliv s metodou ``get``)
+            default_directory: Adresář, pokud projects.history_dir není nastaven
+
+        Returns:
+            Historie pokroku
+        """
+        return cls(config.get('projects.history_dir') or default_directory,
+                   int(config.get('projects.history_detail_days', DEFAULT_DETAIL_DAYS)))
+
+    def attach(self, manager: Any) -> "ProgressHistory":
+        """
+        Napojení na ProjectManager a srovnání s jeho aktuálním stavem.
+
+        Args:
+            manager: ProjectManager
+
+        Returns:
+            Tato historie
+        """
+        manager.progress_history = self
+        self.rebuild(manager.projects)
+        return self
+
+    def rebuild(self, projects: Dict[str, Dict[str, Any]], at: Any = None) -> None:
+        """
+        Přepočet čítačů ze stavu (po načtení) a bod, pokud se liší od řady.
+
+        Args:
+            projects: Projekty ProjectManageru včetně úkolů
+            at: Čas bodu (výchozí: teď)
+        """
+        moment = _timestamp(at or datetime.now())
+        with self._lock:
+            self._counts = {}
+            for name, project in list(projects.items()):
+                tasks = list(project['tasks'])
+                counts = [len(tasks), sum(1 for task in tasks if task['status'] == COMPLETED)]
+                self._counts[name] = counts
+                with self._locked():
+                    series = self._load(name)
+                    if tasks and series.last()[1:] != tuple(counts):
+                        self._write(name, series, moment, *counts)
+
+    def task_added(self, project_name: str, tasks: Iterable[Dict[str, Any]]) -> None:
+        """
+        Bod po přidání úkolů (volá ProjectManager pod zámkem projektu).
+
+        Args:
+            project_name: Název projektu
+            tasks: Nové úkoly
+        """
+        tasks = list(tasks)
+        if not tasks:
+            return
+        with self._lock:
+            counts = self._counts.setdefault(project_name, [0, 0])
+            counts[0] += len(tasks)
+            counts[1] += sum(1 for task in tasks if task['status'] == COMPLETED)
+            self._record(project_name, tasks[-1].get('created_at') or datetime.now())
+
+    def status_changed(self, project_name: str, old_status: str, new_status: str,
+                       at: Any = None) -> None:
+        """
+        Bod po změně stavu úkolu, pokud se změnil počet hotových.
+
+        Args:
+            project_name: Název projektu
+            old_status: Původní stav
+            new_status: Nový stav
+            at: Čas změny (datetime nebo ISO řetězec, výchozí: teď)
+        """
+        change = (new_status == COMPLETED) - (old_status == COMPLETED)
+        if not change:
+            return
+        with self._lock:
+            counts = self._counts.setdefault(project_name, [0, 0])
+            counts[1] += change
+            self._record(project_name, at or datetime.now())
+
+    def series(self, project_name: str) -> List[Dict[str, Any]]:
+        """
+        Všechny body řady projektu.
+
+        Args:
+            project_name: Název projektu
+
+        Returns:
+            Body {'at', 'total', 'completed'} v časovém pořadí
+        """
+        with self._lock, self._locked():
+            series = self._load(project_name)
+            return [{'at': datetime.fromtimestamp(moment).isoformat(), 'total': total,
+                     'completed': completed}
+                    for moment, total, completed in zip(series.times, series.totals,
+                                                        series.completed)]
+
+    def burndown(self, project: Dict[str, Any], now: Optional[datetime] = None,
+                 weeks: int = DEFAULT_VELOCITY_WEEKS) -> Dict[str, Any]:
+        """
+        Burndown projektu po dnech s ideální čarou, rychlostí a odhadem.
+
+        Args:
+            project: Projekt (kvůli created_at a timeline)
+            now: Aktuální čas (výchozí: teď)
+            weeks: Počet posledních týdnů pro průměrnou rychlost
+
+        Returns:
+            Slovník project, start, deadline, days (den, total, completed,
+            remaining, ideal), velocity a forecast
+        """
+        now = now or datetime.now()
+        name = project['name']
+        with self._lock, self._locked():
+            series = self._load(name)
+            start = datetime.fromisoformat(project['created_at'])
+            if series.times:
+                start = min(start, datetime.fromtimestamp(series.times[0]))
+            length = parse_timeline(project.get('timeline'))
+            deadline = start + length if length else None
+            days = []
+            day = start.date()
+            while day <= now.date():
+                end = _timestamp(datetime.combine(day + timedelta(days=1), datetime.min.time()))
+                total, completed = series.at(end - 1)
+                point = {'date': day.isoformat(), 'total': total, 'completed': completed,
+                         'remaining': total - completed}
+                if deadline is not None:
+                    span = max((deadline - start).total_seconds(), 1.0)
+                    elapsed = (datetime.fromtimestamp(end) - start).total_seconds()
+                    point['ideal'] = round(total * max(0.0, 1.0 - elapsed / span), 1)
+                days.append(point)
+                day += timedelta(days=1)
+            return {
+                'project': name,
+                'timeline': project.get('timeline'),
+                'start': start.isoformat(),
+                'deadline': deadline.isoformat() if deadline else None,
+                'days': days,
+                'velocity': self._velocity(series, start, now),
+                'forecast': self._forecast(series, now, deadline, weeks),
+            }
+
+    def velocity(self, project_name: str, start: datetime,
+                 now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        Počet dokončených úkolů v jednotlivých týdnech (pondělí–neděle).
+
+        Args:
+            project_name: Název projektu
+            start: Začátek projektu
+            now: Aktuální čas (výchozí: teď)
+
+        Returns:
+            Týdny {'week', 'completed'}; znovu otevřené úkoly se odečtou
+        """
+        with self._lock, self._locked():
+            return self._velocity(self._load(project_name), start, now or datetime.now())
+
+    def forecast(self, project: Dict[str, Any], now: Optional[datetime] = None,
+                 weeks: int = DEFAULT_VELOCITY_WEEKS) -> Dict[str, Any]:
+        """
+        Odhad dokončení podle průměrné rychlosti posledních týdnů.
+
+        Args:
+            project: Projekt (kvůli created_at a timeline)
+            now: Aktuální čas (výchozí: teď)
+            weeks: Počet posledních týdnů pro průměrnou rychlost
+
+        Returns:
+            Slovník remaining, per_week, forecast (datum nebo None, když
+            projekt nepostupuje), deadline, on_track a days_late
+        """
+        length = parse_timeline(project.get('timeline'))
+        deadline = datetime.fromisoformat(project['created_at']) + length if length else None
+        with self._lock, self._locked():
+            return self._forecast(self._load(project['name']), now or datetime.now(),
+                                  deadline, weeks)
+
+    def compact(self, project_name: Optional[str] = None,
+                now: Optional[datetime] = None) -> int:
+        """
+        Sloučení bodů starších než detail_days na poslední bod každého dne.
+
+        Args:
+            project_name: Projekt (výchozí: všechny se soubory v adresáři)
+            now: Aktuální čas (výchozí: teď)
+
+        Returns:
+            Počet odebraných bodů
+        """
+        cutoff = _timestamp((now or datetime.now()) - timedelta(days=self.detail_days))
+        names = [project_name] if project_name else self._names()
+        removed = 0
+        with self._lock, self._locked():
+            for name in names:
+                removed += self._compact(name, self._load(name), cutoff)
+        return removed
+
+    def size(self) -> Dict[str, int]:
+        """
+        Velikost uložené historie.
+
+        Returns:
+            Slovník s počtem projektů, bodů a bajtů na disku
+        """
+        names = self._names()
+        with self._lock, self._locked():
+            points = sum(len(self._load(name).times) for name in names)
+        size = sum(os.path.getsize(self._path(name)) for name in names)
+        return {'projects': len(names), 'points': points, 'bytes': size}
+
+    def close(self) -> None:
+        """Uzavření zámkového souboru"""
+        with self._lock:
+            if self._lock_file is not None:
+                self._lock_file.close()
+                self._lock_file = None
+
+    def _record(self, name: str, at: Any) -> None:
+        """Zápis bodu s aktuálními čítači (volá se pod _lock)"""
+        counts = self._counts[name]
+        with self._locked():
+            series = self._load(name)
+            if series.last()[1:] == tuple(counts):
+                return
+            self._write(name, series, _timestamp(at), *counts)
+            if len(series.times) - series.compacted >= COMPACT_EVERY:
+                self._compact(name, series, _timestamp(
+                    datetime.now() - timedelta(days=self.detail_days)))
+
+    def _write(self, name: str, series: _Series, moment: int, total: int,
+               completed: int) -> None:
+        """Připsání bodu do řady a jejího souboru (pod oběma zámky)"""
+        series.append(max(moment, series.last()[0]), total, completed)
+        path = self._path(name)
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            data = series.encode(len(series.times) - 1)
+            if series.offset == 0:
+                data = MAGIC + data
+                series.inode = os.fstat(fd).st_ino
+            os.write(fd, data)
+            series.offset += len(data)
+        finally:
+            os.close(fd)
+
+    def _load(self, name: str) -> _Series:
+        """Řada projektu s dočtenými body jiných procesů (pod oběma zámky)"""
+        series = self._series.get(name)
+        path = self._path(name)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            if series is None or series.offset:
+                series = self._series[name] = _Series()
+            return series
+        if series is None or stat.st_ino != series.inode or stat.st_size < series.offset:
+            series = self._series[name] = _Series()
+            series.inode = stat.st_ino
+        if stat.st_size == series.offset:
+            return series
+        with open(path, 'rb') as f:
+            f.seek(series.offset)
+            data = f.read()
+        if series.offset == 0:
+            if data[:len(MAGIC)] != MAGIC:
+                self.logger.error(f"Soubor historie '{path}' má neznámý formát, ignoruji ho")
+                series.offset = stat.st_size
+                return series
+            data = data[len(MAGIC):]
+            series.offset = len(MAGIC)
+        good = series.decode(data)
+        series.offset += good
+        if good < len(data):
+            # Neúplný poslední bod (pád při zápisu) by rozbil další rozdíly
+            self.logger.warning(f"Neúplný konec historie '{path}' odříznut")
+            os.truncate(path, series.offset)
+        if not series.compacted:
+            series.compacted = len(series.times)
+        return series
+
+    def _compact(self, name: str, series: _Series, cutoff: int) -> int:
+        """Přepsání souboru se sloučenými starými body (pod oběma zámky)"""
+        kept = _Series()
+        for index, moment in enumerate(series.times):
+            if moment < cutoff and index + 1 < len(series.times):
+                following = series.times[index + 1]
+                if (following < cutoff and datetime.fromtimestamp(moment).date()
+                        == datetime.fromtimestamp(following).date()):
+                    continue
+            kept.append(moment, series.totals[index], series.completed[index])
+        removed = len(series.times) - len(kept.times)
+        kept.compacted = len(kept.times)
+        if not removed:
+            series.compacted = len(series.times)
+            return 0
+        path = self._path(name)
+        data = MAGIC + kept.encode()
+        with open(f"{path}.tmp", 'wb') as f:
+            f.write(data)
+        os.replace(f"{path}.tmp", path)
+        kept.offset = len(data)
+        kept.inode = os.stat(path).st_ino
+        self._series[name] = kept
+        self.logger.info(f"Historie '{name}' zkompaktována: odebráno {removed} bodů")
+        return removed
+
+    def _velocity(self, series: _Series, start: datetime, now: datetime) -> List[Dict[str, Any]]:
+        week = start.date() - timedelta(days=start.weekday())
+        weeks = []
+        previous = series.at(_timestamp(datetime.combine(week, datetime.min.time())) - 1)[1]
+        while week <= now.date():
+            end = datetime.combine(week + timedelta(days=7), datetime.min.time())
+            completed = series.at(_timestamp(min(end, now)))[1]
+            weeks.append({'week': week.isoformat(), 'completed': completed - previous})
+            previous = completed
+            week += timedelta(days=7)
+        return weeks
+
+    def _forecast(self, series: _Series, now: datetime, deadline: Optional[datetime],
+                  weeks: int) -> Dict[str, Any]:
+        total, completed = series.at(_timestamp(now))
+        remaining = total - completed
+        window = timedelta(weeks=weeks)
+        first = datetime.fromtimestamp(series.times[0]) if series.times else now
+        since = max(now - window, first)
+        days = (now - since).total_seconds() / 86400
+        done = completed - series.at(_timestamp(since))[1]
+        per_day = done / days if days >= 1 else 0.0
+        if remaining <= 0 and total:
+            index = bisect.bisect_right(series.times, _timestamp(now)) - 1
+            while index > 0 and series.completed[index - 1] >= series.totals[index - 1]:
+                index -= 1
+            eta: Optional[datetime] = datetime.fromtimestamp(series.times[index])
+        elif per_day > 0:
+            eta = now + timedelta(days=remaining / per_day)
+        else:
+            eta = None
+        result: Dict[str, Any] = {
+            'remaining': remaining,
+            'per_week': round(per_day * 7, 2),
+            'forecast': eta.date().isoformat() if eta else None,
+            'deadline': deadline.date().isoformat() if deadline else None,
+            'on_track': None,
+            'days_late': None,
+        }
+        if deadline is not None:
+            result['on_track'] = eta is not None and eta <= deadline
+            if eta is not None:
+                result['days_late'] = max(0, (eta.date() - deadline.date()).days)
+        return result
+
+    def _names(self) -> List[str]:
+        """Projekty, které mají soubor historie"""
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(unquote(name[:-len(SUFFIX)]) for name in os.listdir(self.directory)
+                      if name.endswith(SUFFIX))
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, quote(name, safe='') + SUFFIX)
+
+    def _locked(self) -> "_DirectoryLock":
+        """Zámek adresáře mezi procesy (flock; bez fcntl jen zámek vláken)"""
+        if self._lock_file is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._lock_file = open(os.path.join(self.directory, LOCK_FILE), 'a')
+        return _DirectoryLock(self)
+
+
+class _DirectoryLock:
+    """flock zámkového souboru historie; používá se pod _lock, vnoření je bezpečné"""
+
+    def __init__(self, history: ProgressHistory):
+        self.history = history
+
+    def __enter__(self) -> None:
+        history = self.history
+        if history._lock_depth == 0 and fcntl is not None:
+            fcntl.flock(history._lock_file.fileno(), fcntl.LOCK_EX)
+        history._lock_depth += 1
+
+    def __exit__(self, *exc: Any) -> None:
+        history = self.history
+        history._lock_depth -= 1
+        if history._lock_depth == 0 and fcntl is not None:
+            fcntl.flock(history._lock_file.fileno(), fcntl.LOCK_UN)
@@ -0,0 +1,459 @@
+"""
+Hodnocení studentských prací - Project Evaluator
+
+Modul pro vyhodnocování odevzdaných projektů podle vážených kritérií.
+Vychází ze skriptu ``Systematické vyhodnocování studentských prací.py``
+a přidává dávkové hodnocení celé třídy v procesním poolu s časovými
+limity, průběžným vracením výsledků a cache podle obsahu odevzdání.
+"""
+
+import hashlib
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .code_analyzer import get_analyzer
+from .sandbox_runner import get_runner
+
+
+def submission_hash(project: Dict[str, Any], submission: Dict[str, Any]) -> str:
+    """
+    Otisk obsahu odevzdání (SHA-256) pro cache výsledků.
+
+    Zahrnuje i projekt, protože se stejné odevzdání může hodnotit
+    proti jiným testům.
+
+    Args:
+        project: Projekt, ke kterému práce patří
+        submission: Odevzdaná práce
+
+    Returns:
+        Hexadecimální otisk
+    """
+    payload = json.dumps(
+        {'project': project, 'submission': submission},
+        sort_keys=True, ensure_ascii=False, default=str
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+# Fronta, kterou pracovní proces hlásí začátek úlohy (nastaví _init_worker);
+# úloha je označena pořadovým číslem odeslání, aby se po restartu poolu
+# nepletla se svým předchozím pokusem
+_started: Optional[Any] = None
+
+
+def _init_worker(started: Any) -> None:
+    """Inicializace pracovního procesu"""
+    global _started
+    _started = started
+
+
+def _score_criterion(
+    evaluator: "ProjectEvaluator",
+    task: Tuple[int, str],
+    project: Dict[str, Any],
+    submission: Dict[str, Any]
+) -> float:
+    """Ohodnocení jednoho kritéria (spouští se v pracovním procesu)"""
+    if _started is not None:
+        _started.put((task, time.monotonic()))
+    return evaluator.score_criterion(task[1], project, submission)
+
+
+class ProjectEvaluator:
+    """
+    Třída pro hodnocení studentských projektů.
+
+    Každé kritérium se hodnotí na škále 0-100; celkové skóre je vážený
+    součet podle ``evaluation_criteria``.
+
+    Attributes:
+        evaluation_criteria (Dict): Váhy kritérií (součet 1.0)
+        cache_size (int): Maximální počet výsledků v cache
+        analysis_cache_dir (Optional[str]): Disková cache statické analýzy
+        logger (logging.Logger): Logger pro auditování
+    """
+
+    def __init__(self, cache_size: int = 4096, analysis_cache_dir: Optional[str] = None):
+        """
+        Inicializace hodnotitele.
+
+        Args:
+            cache_size: Maximální počet výsledků v cache
+            analysis_cache_dir: Adresář pro cache metrik kódu sdílenou
+                mezi pracovními procesy (volitelné)
+        """
+        self.evaluation_criteria = {
+            'functionality': 0.3,
+            'code_quality': 0.2,
+            'documentation': 0.15,
+            'creativity': 0.15,
+            'presentation': 0.2
+        }
+        self.cache_size = cache_size
+        self.analysis_cache_dir = analysis_cache_dir
+        self.logger = logging.getLogger("ProjectEvaluator")
+        self._cache: "OrderedDict[str, Dict[str, float]]" = OrderedDict()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Cache se do pracovních procesů nepřenáší"""
+        state = self.__dict__.copy()
+        state['_cache'] = OrderedDict()
+        return state
+
+    def evaluate_project(
+        self,
+        project: Dict[str, Any],
+        submission: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Komplexní vyhodnocení projektu podle stanovených kritérií.
+
+        Args:
+            project: Projekt (zadání)
+            submission: Odevzdaná práce (code, documentation, ...)
+
+        Returns:
+            Slovník s body za kritéria ('scores') a celkovým skóre ('total')
+        """
+        scores = {
+            criterion: self.score_criterion(criterion, project, submission)
+            for criterion in self.evaluation_criteria
+        }
+        total = self.weighted_totals([self._score_row(scores)])[0]
+        return {'scores': scores, 'total': total}
+
+    def score_criterion(
+        self,
+        criterion: str,
+        project: Dict[str, Any],
+        submission: Dict[str, Any]
+    ) -> float:
+        """
+        Ohodnocení jednoho kritéria.
+
+        Args:
+            criterion: Název kritéria z ``evaluation_criteria``
+            project: Projekt (zadání)
+            submission: Odevzdaná práce
+
+        Returns:
+            Body 0-100
+
+        Raises:
+            ValueError: Pokud kritérium neexistuje
+        """
+        if criterion == 'functionality':
+            return float(self.evaluate_functionality(project, submission))
+        if criterion == 'code_quality':
+            return float(self.evaluate_code_quality(submission.get('code', '')))
+        if criterion == 'documentation':
+            return float(self.evaluate_documentation(submission.get('documentation', '')))
+        if criterion in ('creativity', 'presentation'):
+            return float((submission.get('manual_scores') or {}).get(criterion, 0.0))
+        raise ValueError(f"Neznámé kritérium '{criterion}'")
+
+    def evaluate_functionality(
+        self,
+        project: Dict[str, Any],
+        submission: Dict[str, Any]
+    ) -> float:
+        """
+        Hodnocení funkčnosti podle výsledků testů.
+
+        Pokud práce nemá hotové výsledky ('test_results'), spustí se testy
+        projektu (nebo práce) v SandboxRunneru.
+
+        Args:
+            project: Projekt (zadání), volitelně s 'tests'
+                ({název testu: kód testu})
+            submission: Odevzdaná práce s klíči 'code' a volitelně
+                'test_results' ({'passed': int, 'total': int}) nebo 'tests'
+
+        Returns:
+            Podíl úspěšných testů (0-100)
+        """
+        results = submission.get('test_results')
+        if not results:
+            tests = submission.get('tests') or project.get('tests')
+            if not tests:
+                return 0.0
+            code = submission.get('code') or ''
+            if isinstance(code, dict):
+                code = '\n\n'.join(source for _, source in sorted(code.items()))
+            results = get_runner().run(code, tests)
+
+        total = results.get('total', 0)
+        if not total:
+            return 0.0
+        return 100.0 * results.get('passed', 0) / total
+
+    def evaluate_code_quality(self, code: Union[str, Dict[str, str]]) -> float:
+        """
+        Hodnocení kvality kódu statickou analýzou (viz CodeAnalyzer).
+
+        Args:
+            code: Zdrojový kód nebo slovník {jméno souboru: zdrojový kód}
+
+        Returns:
+            Body 0-100
+        """
+        return get_analyzer(self.analysis_cache_dir).analyze_submission(code)['score']
+
+    def evaluate_documentation(self, documentation: str) -> float:
+        """
+        Hodnocení dokumentace podle rozsahu a struktury.
+
+        Plný počet bodů dostane dokumentace s alespoň 300 slovy
+        a třemi nadpisy (Markdown ``#``).
+
+        Args:
+            documentation: Text dokumentace (Markdown)
+
+        Returns:
+            Body 0-100
+        """
+        text = documentation or ''
+        words = len(text.split())
+        headings = sum(1 for line in text.splitlines() if line.lstrip().startswith('#'))
+        return min(words / 300.0, 1.0) * 70.0 + min(headings / 3.0, 1.0) * 30.0
+
+    def weighted_totals(self, score_rows: Sequence[Sequence[float]]) -> List[float]:
+        """
+        Vážené celkové skóre pro celou matici najednou.
+
+        Args:
+            score_rows: Řádky bodů v pořadí kritérií ``evaluation_criteria``
+
+        Returns:
+            Celkové skóre pro každý řádek (zaokrouhleno na 2 místa)
+        """
+        weights = list(self.evaluation_criteria.values())
+        # Sčítání po sloupcích: jeden průchod na kritérium místo volání na řádek
+        totals = [0.0] * len(score_rows)
+        for column, weight in enumerate(weights):
+            totals = [total + row[column] * weight for total, row in zip(totals, score_rows)]
+        return [round(total, 2) for total in totals]
+
+    def evaluate_batch(
+        self,
+        project: Dict[str, Any],
+        submissions: Iterable[Dict[str, Any]],
+        max_workers: Optional[int] = None,
+        criterion_timeout: float = 30.0
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Dávkové hodnocení odevzdaných prací v procesním poolu.
+
+        Každé kritérium každé práce běží jako samostatná úloha. Výsledky
+        se vrací průběžně v pořadí dokončení. Kritérium, které běží déle
+        než ``criterion_timeout``, dostane 0 bodů a je uvedeno
+        v 'timed_out'; pool se pak vymění za nový a nedokončené úlohy
+        se do něj odešlou znovu. Nezměněné práce se berou z cache bez
+        přepočtu.
+
+        Args:
+            project: Projekt (zadání)
+            submissions: Odevzdané práce (volitelně s klíčem 'id')
+            max_workers: Počet pracovních procesů (výchozí: počet CPU)
+            criterion_timeout: Časový limit jednoho kritéria (sekundy)
+
+        Yields:
+            Slovník s 'index', 'submission_id', 'scores', 'total',
+            'cached', 'timed_out' a 'errors'
+        """
+        criteria = list(self.evaluation_criteria)
+        results: Dict[int, Dict[str, Any]] = {}
+        keys: Dict[int, str] = {}
+        queued: List[Tuple[int, Dict[str, Any]]] = []
+        cached_results: List[Dict[str, Any]] = []
+
+        for index, submission in enumerate(submissions):
+            key = submission_hash(project, submission)
+            results[index] = {
+                'index': index,
+                'submission_id': submission.get('id', index),
+                'scores': {},
+                'cached': False,
+                'timed_out': [],
+                'errors': {},
+            }
+            cached = self._cache_get(key)
+            if cached is not None:
+                results[index].update(scores=dict(cached), cached=True)
+                cached_results.append(results.pop(index))
+            else:
+                keys[index] = key
+                queued.append((index, submission))
+
+        yield from self._finish(cached_results, criteria)
+        if not queued:
+            return
+
+        # running() hlásí i úlohy předané do fronty poolu, které ještě čekají;
+        # začátek úlohy proto hlásí až pracovní proces. Úloha, která se
+        # nespustí do limitu měřeného od odeslání, propadne jako zaseknutá.
+        context = multiprocessing.get_context()
+        workers = max_workers or os.cpu_count() or 1
+        submissions_by_index = dict(queued)
+        pending: Dict[Future, Tuple[int, str]] = {}
+        tasks: Dict[int, Future] = {}
+        deadlines: Dict[Future, float] = {}
+        queue_deadlines: Dict[Future, float] = {}
+        remaining = {index: len(criteria) for index, _ in queued}
+        tokens = itertools.count()
+
+        def submit(work: List[Tuple[int, str]]) -> None:
+            now = time.monotonic()
+            for position, (index, criterion) in enumerate(work):
+                token = next(tokens)
+                future = pool.submit(_score_criterion, self, (token, criterion),
+                                     project, submissions_by_index[index])
+                pending[future] = (index, criterion)
+                tasks[token] = future
+                # Nejhorší případ: každá úloha před ní vyčerpá celý limit
+                queue_deadlines[future] = now + (position // workers + 2) * criterion_timeout
+
+        pool, started = self._start_pool(context, workers)
+        stuck = False
+        try:
+            submit([(index, criterion) for index, _ in queued for criterion in criteria])
+
+            while pending:
+                while True:
+                    try:
+                        (token, _), began = started.get_nowait()
+                    except queue.Empty:
+                        break
+                    future = tasks.pop(token)
+                    if future in pending:
+                        deadlines[future] = began + criterion_timeout
+                now = time.monotonic()
+                wake = min(
+                    min(deadlines.values(), default=now + 0.05),
+                    min(queue_deadlines.values(), default=now + 0.05)
+                )
+                done, _ = wait(
+                    list(pending), timeout=max(0.0, min(wake - now, 0.05)),
+                    return_when=FIRST_COMPLETED
+                )
+
+                now = time.monotonic()
+                finished = []
+                for future in list(pending):
+                    index, criterion = pending[future]
+                    result = results[index]
+                    if future in done:
+                        try:
+                            result['scores'][criterion] = future.result()
+                        except Exception as e:
+                            result['scores'][criterion] = 0.0
+                            result['errors'][criterion] = str(e)
+                    elif deadlines.get(future, queue_deadlines[future]) <= now:
+                        stuck = stuck or future in deadlines
+                        future.cancel()
+                        result['scores'][criterion] = 0.0
+                        result['timed_out'].append(criterion)
+                        self.logger.warning(
+                            f"Kritérium '{criterion}' práce {result['submission_id']} "
+                            f"překročilo limit {criterion_timeout} s"
+                        )
+                    else:
+                        continue
+                    del pending[future]
+                    deadlines.pop(future, None)
+                    queue_deadlines.pop(future, None)
+                    remaining[index] -= 1
+                    if remaining[index] == 0:
+                        finished.append(index)
+
+                batch = [results.pop(index) for index in finished]
+                for result in batch:
+                    if not result['timed_out'] and not result['errors']:
+                        self._cache_put(keys[result['index']], result['scores'])
+                yield from self._finish(batch, criteria)
+
+                if stuck and pending:
+                    # Zaseknutou úlohu nelze zrušit a drží místo v poolu: procesy
+                    # se ukončí a nedokončená práce se odešle do nového poolu
+                    self._stop_pool(pool, started, terminate=True)
+                    retry = []
+                    for future in list(pending):
+                        if isinstance(future.exception(), BrokenProcessPool):
+                            retry.append(pending.pop(future))
+                            deadlines.pop(future, None)
+                            queue_deadlines.pop(future, None)
+                    tasks.clear()
+                    pool, started = self._start_pool(context, workers)
+                    stuck = False
+                    submit(retry)
+        finally:
+            for future in pending:
+                future.cancel()
+            # Zaseknuté úlohy ani rozpracovanou práci přerušené dávky nedokončujeme
+            self._stop_pool(pool, started, terminate=stuck or bool(pending))
+
+    def clear_cache(self) -> None:
+        """Vyprázdnění cache výsledků"""
+        self._cache.clear()
+
+    def _start_pool(self, context: Any, workers: int) -> Tuple[ProcessPoolExecutor, Any]:
+        """Nový procesní pool s frontou, kterou procesy hlásí začátek úlohy"""
+        started = context.Queue()
+        pool = ProcessPoolExecutor(
+            max_workers=workers, mp_context=context,
+            initializer=_init_worker, initargs=(started,)
+        )
+        return pool, started
+
+    def _stop_pool(self, pool: ProcessPoolExecutor, started: Any, terminate: bool) -> None:
+        """Ukončení poolu; s ``terminate`` i procesů, které ještě počítají"""
+        if terminate:
+            for process in list((getattr(pool, '_processes', None) or {}).values()):
+                process.terminate()
+        pool.shutdown(wait=True)
+        started.close()
+
+    def _finish(
+        self,
+        batch: List[Dict[str, Any]],
+        criteria: List[str]
+    ) -> List[Dict[str, Any]]:
+        """Doplnění celkového skóre k výsledkům najednou dokončených prací"""
+        totals = self.weighted_totals(
+            [self._score_row(result['scores'], criteria) for result in batch]
+        )
+        for result, total in zip(batch, totals):
+            result['total'] = total
+        return batch
+
+    def _score_row(
+        self,
+        scores: Dict[str, float],
+        criteria: Optional[List[str]] = None
+    ) -> List[float]:
+        """Převod bodů na řádek v pořadí kritérií"""
+        return [scores.get(criterion, 0.0) for criterion in criteria or self.evaluation_criteria]
+
+    def _cache_get(self, key: str) -> Optional[Dict[str, float]]:
+        """Čtení z LRU cache"""
+        scores = self._cache.get(key)
+        if scores is not None:
+            self._cache.move_to_end(key)
+        return scores
+
+    def _cache_put(self, key: str, scores: Dict[str, float]) -> None:
+        """Zápis do LRU cache"""
+        self._cache[key] = dict(scores)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
@@ -5,12 +5,63 @@ Modul pro řízení vzdělávacích projektů, sledování pokroku a generován
 Používá se v rámci vzdělávacího IoT systému pro RPi 5.
 """
 
+import itertools
 import json
 import logging
+import os
+import threading
+import time
+import weakref
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any
 from enum import Enum
 
+from .metrics import get_registry
+from .profiling import traced
+from .task_query import INDEXED_FIELDS, MAX_LIMIT, SELECTIVITY, SecondaryIndex, TaskQuery
+
+
+_OPERATIONS = get_registry().counter(
+    'project_manager_operations_total', 'Počet operací správce projektů', ['operation'])
+_DURATION = get_registry().histogram(
+    'project_manager_operation_seconds', 'Doba trvání operací správce projektů', ['operation'])
+_ERRORS = get_registry().counter(
+    'project_manager_errors_total', 'Počet neúspěšných operací správce projektů', ['operation'])
+
+
+def _operation_metrics(operation: str) -> tuple:
+    """Předem navázané metriky operace (bez vyhledávání v rychlé cestě)"""
+    return (_OPERATIONS.labels(operation), _DURATION.labels(operation),
+            _ERRORS.labels(operation))
+
+
+_CREATE_PROJECT = _operation_metrics('create_project')
+_ADD_TASK = _operation_metrics('add_task')
+_ADD_TASKS = _operation_metrics('add_tasks')
+_UPDATE_STATUS = _operation_metrics('update_task_status')
+_REPORT = _operation_metrics('generate_report')
+_QUERY_TASKS = _operation_metrics('query_tasks')
+_SAVE_STATE = _operation_metrics('save_state')
+_LOAD_STATE = _operation_metrics('load_state')
+
+
+def _observe(metrics: tuple, started: float, ok: bool = True) -> None:
+    """Zaznamenání operace do metrik"""
+    operations, duration, errors = metrics
+    operations.inc()
+    duration.observe(time.perf_counter() - started)
+    if not ok:
+        errors.inc()
+
+
+def _insert_by_id(tasks: List[Dict[str, Any]], new_tasks: List[Dict[str, Any]]) -> None:
+    """Vložení úkolů do seznamu seřazeného podle ID (replikované bývají na konci)"""
+    for task in sorted(new_tasks, key=lambda t: t['id']):
+        position = len(tasks)
+        while position and tasks[position - 1]['id'] > task['id']:
+            position -= 1
+        tasks.insert(position, task)
+
 
 class TaskStatus(Enum):
     """Stavy úkolu v projektu"""
@@ -35,24 +86,85 @@ class ProjectManager:
     Spravuje vytváření projektů, přidělování úkolů, sledování pokroku
     a generování reportů.
     
+    Instance je bezpečná pro souběžné použití z více vláken (webový
+    dashboard, kiosk, tablety učitelů). ID úkolů přiděluje atomický
+    čítač, změny úkolů jednoho projektu se serializují zámkem projektu
+    a strukturální změny (nový projekt, seznam tasks) globálním zámkem.
+    Čtecí metody zámky neberou: pracují nad kopií seznamu úkolů (kopie
+    seznamu je pod GIL atomická) a stav úkolu se mění jedinou operací
+    ``dict.update``. Konzistentní pohled na celý projekt vrací snapshot().
+    
+    Při replikaci mezi kiosky (Replicator) si každý uzel přiděluje ID
+    úkolů z vlastní zbytkové třídy (partition_task_ids) a změny z jiných
+    uzlů přebírá přes apply_remote.
+    
     Attributes:
         projects (Dict): Slovník všech projektů
         tasks (List): Seznam všech úkolů
         resources (List): Seznam dostupných zdrojů
+        registry (StudentRegistry): Evidence studentů (volitelná)
+        event_bus (EventBus): Sběrnice pro publikování změn (volitelná)
+        search_index (SearchIndex): Fulltextový index (volitelný)
+        journal (Journal): Žurnál změn pro obnovu po pádu a audit (volitelný)
+        progress_history (ProgressHistory): Časové řady pokroku projektů (volitelné)
+        version (int): Čítač verzí dat (zvýší se při každé změně)
         logger (logging.Logger): Logger pro auditování
     """
     
-    def __init__(self, log_file: str = "/var/log/project-manager.log"):
+    def __init__(
+        self,
+        log_file: str = "/var/log/project-manager.log",
+        registry: Optional[Any] = None,
+        event_bus: Optional[Any] = None,
+        search_index: Optional[Any] = None,
+        journal: Optional[Any] = None,
+        progress_history: Optional[Any] = None
+    ):
         """
         Inicializace správce projektů.
         
         Args:
             log_file: Cesta k log souboru
+            registry: Evidence studentů (StudentRegistry) pro indexy úkolů
+                a limit projektů na studenta
+            event_bus: Sběrnice událostí (EventBus), do které se publikují
+                nové úkoly, změny stavu a obnovení stavu
+            search_index: Fulltextový index (SearchIndex) průběžně
+                doplňovaný o projekty a úkoly
+            journal: Žurnál změn (Journal); stav se do něj obnovuje
+                přes Journal.attach
+            progress_history: Historie pokroku (ProgressHistory), do které
+                se zapisuje každá změna počtu úkolů a hotových úkolů
         """
         self.projects: Dict[str, Dict[str, Any]] = {}
         self.tasks: List[Dict[str, Any]] = []
         self.resources: List[Dict[str, Any]] = []
+        self.registry = registry
+        self.event_bus = event_bus
+        self.search_index = search_index
+        self.journal = journal
+        self.progress_history = progress_history
+        self.version = 0
         self.logger = self._setup_logging(log_file)
+        
+        self._lock = threading.Lock()
+        self._version_lock = threading.Lock()
+        self._project_versions: Dict[str, int] = {}
+        self._project_locks: Dict[str, threading.Lock] = {}
+        self._task_index: Dict[int, Dict[str, Any]] = {}
+        self._task_projects: Dict[int, str] = {}
+        self._indexes = {field: SecondaryIndex(field) for field in INDEXED_FIELDS}
+        self._id_stride = 1
+        self._id_offset = 0
+        self._task_ids = self._id_counter(0)
+        
+        manager = weakref.ref(self)
+        get_registry().gauge(
+            'project_manager_projects', 'Počet projektů',
+            callback=lambda: len(manager().projects) if manager() else 0)
+        get_registry().gauge(
+            'project_manager_tasks', 'Počet úkolů podle stavu', ['status'],
+            callback=lambda: manager()._status_counts() if manager() else {})
     
     def _setup_logging(self, log_file: str) -> logging.Logger:
         """Nastavení loggingu"""
@@ -66,6 +178,7 @@ class ProjectManager:
         logger.setLevel(logging.INFO)
         return logger
     
+    @traced()
     def create_project(
         self,
         name: str,
@@ -90,10 +203,7 @@ class ProjectManager:
         Raises:
             ValueError: Pokud projekt s tímto názvem již existuje
         """
-        if name in self.projects:
-            self.logger.error(f"Projekt '{name}' již existuje")
-            raise ValueError(f"Projekt '{name}' již existuje")
-        
+        started = time.perf_counter()
         project = {
             'name': name,
             'description': description,
@@ -108,10 +218,23 @@ class ProjectManager:
             'risks': []
         }
         
-        self.projects[name] = project
+        with self._lock:
+            if name in self.projects:
+                self.logger.error(f"Projekt '{name}' již existuje")
+                _observe(_CREATE_PROJECT, started, ok=False)
+                raise ValueError(f"Projekt '{name}' již existuje")
+            self._project_locks[name] = threading.Lock()
+            self.projects[name] = project
+            self._bump_version(name)
+            seq = self._record('create_project', {'project': project})
+        self._commit(seq)
+        if self.search_index is not None:
+            self.search_index.index_project(project)
         self.logger.info(f"Projekt '{name}' vytvořen uživatelem '{created_by}'")
+        _observe(_CREATE_PROJECT, started)
         return project
     
+    @traced()
     def add_task(
         self,
         project_name: str,
@@ -119,7 +242,8 @@ class ProjectManager:
         assignee: str,
         deadline: str,
         description: str = "",
-        priority: str = "normal"
+        priority: str = "normal",
+        dependencies: Optional[List[int]] = None
     ) -> Optional[Dict[str, Any]]:
         """
         Přidání úkolu do projektu.
@@ -131,19 +255,27 @@ class ProjectManager:
             deadline: Deadline (ISO format: YYYY-MM-DD)
             description: Popis úkolu
             priority: Priorita (low, normal, high, critical)
+            dependencies: ID úkolů, které musí být hotové dřív
         
         Returns:
             Slovník s údaji úkolu nebo None
         
         Raises:
-            ValueError: Pokud projekt neexistuje
+            ValueError: Pokud projekt nebo některá závislost neexistuje
         """
+        started = time.perf_counter()
         if project_name not in self.projects:
             self.logger.error(f"Projekt '{project_name}' neexistuje")
+            _observe(_ADD_TASK, started, ok=False)
             raise ValueError(f"Projekt '{project_name}' neexistuje")
+        missing = [d for d in dependencies or () if d not in self._task_index]
+        if missing:
+            self.logger.error(f"Závislosti {missing} neexistují")
+            _observe(_ADD_TASK, started, ok=False)
+            raise ValueError(f"Závislosti {missing} neexistují")
         
         task = {
-            'id': len(self.tasks) + 1,
+            'id': 0,
             'name': task_name,
             'description': description,
             'assignee': assignee,
@@ -151,17 +283,189 @@ class ProjectManager:
             'priority': priority,
             'status': TaskStatus.ASSIGNED.value,
             'created_at': datetime.now().isoformat(),
-            'dependencies': []
+            'dependencies': list(dependencies or ())
         }
         
-        self.projects[project_name]['tasks'].append(task)
-        self.tasks.append(task)
+        with self._project_locks[project_name]:
+            with self._lock:
+                task['id'] = next(self._task_ids)
+                self._task_projects[task['id']] = project_name
+                self._task_index[task['id']] = task
+                self.tasks.append(task)
+                for index in self._indexes.values():
+                    index.add(task)
+                if self.registry is not None:
+                    self.registry.link_task(task)
+            self.projects[project_name]['tasks'].append(task)
+            self._bump_version(project_name)
+            if self.progress_history is not None:
+                self.progress_history.task_added(project_name, [task])
+            self._publish('task.added', project_name, task)
+            seq = self._record('add_task', {'project': project_name, 'task': task})
+        self._commit(seq)
+        if self.search_index is not None:
+            self.search_index.index_task(task, project_name)
         self.logger.info(
             f"Úkol '{task_name}' přidán do projektu '{project_name}' "
             f"a přidělen uživateli '{assignee}'"
         )
+        _observe(_ADD_TASK, started)
         return task
     
+    @traced()
+    def add_tasks(
+        self,
+        project_name: str,
+        specs: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Hromadné přidání úkolů do projektu.
+        
+        Všechny úkoly se vloží pod jedním zámkem, s jedním zvýšením verze,
+        jedním záznamem v logu a jednou událostí 'tasks.added'.
+        
+        Args:
+            project_name: Název projektu
+            specs: Úkoly jako slovníky s klíči 'name', 'assignee', 'deadline'
+                a volitelně 'description', 'priority', 'milestone',
+                'dependencies' (ID existujících úkolů) a 'depends_on'
+                (indexy úkolů v této dávce)
+        
+        Returns:
+            Seznam vytvořených úkolů ve stejném pořadí
+        
+        Raises:
+            ValueError: Pokud projekt nebo některá závislost neexistuje
+        """
+        started = time.perf_counter()
+        if project_name not in self.projects:
+            self.logger.error(f"Projekt '{project_name}' neexistuje")
+            _observe(_ADD_TASKS, started, ok=False)
+            raise ValueError(f"Projekt '{project_name}' neexistuje")
+        for index, spec in enumerate(specs):
+            missing = [d for d in spec.get('dependencies') or () if d not in self._task_index]
+            missing += [d for d in spec.get('depends_on') or () if not 0 <= d < index]
+            if missing:
+                self.logger.error(f"Závislosti {missing} úkolu '{spec['name']}' neexistují")
+                _observe(_ADD_TASKS, started, ok=False)
+                raise ValueError(f"Závislosti {missing} úkolu '{spec['name']}' neexistují")
+        
+        created_at = datetime.now().isoformat()
+        tasks: List[Dict[str, Any]] = []
+        with self._project_locks[project_name]:
+            with self._lock:
+                for spec in specs:
+                    task = {
+                        'id': next(self._task_ids),
+                        'name': spec['name'],
+                        'description': spec.get('description', ''),
+                        'assignee': spec['assignee'],
+                        'deadline': spec['deadline'],
+                        'priority': spec.get('priority', 'normal'),
+                        'status': TaskStatus.ASSIGNED.value,
+                        'created_at': created_at,
+                        'dependencies': list(spec.get('dependencies') or ()) + [
+                            tasks[d]['id'] for d in spec.get('depends_on') or ()
+                        ]
+                    }
+                    if spec.get('milestone'):
+                        task['milestone'] = spec['milestone']
+                    self._task_projects[task['id']] = project_name
+                    self._task_index[task['id']] = task
+                    for index in self._indexes.values():
+                        index.add(task)
+                    if self.registry is not None:
+                        self.registry.link_task(task)
+                    tasks.append(task)
+                self.tasks.extend(tasks)
+            self.projects[project_name]['tasks'].extend(tasks)
+            self._bump_version(project_name)
+            if self.progress_history is not None:
+                self.progress_history.task_added(project_name, tasks)
+            self._publish_added(project_name, tasks)
+            seq = self._record('add_tasks', {'project': project_name, 'tasks': tasks})
+        self._commit(seq)
+        if self.search_index is not None:
+            for task in tasks:
+                self.search_index.index_task(task, project_name)
+        self.logger.info(f"{len(tasks)} úkolů přidáno do projektu '{project_name}'")
+        _observe(_ADD_TASKS, started)
+        return tasks
+    
+    @traced()
+    def assign_student(self, project_name: str, username: str) -> List[str]:
+        """
+        Přiřazení projektu studentovi z evidence.
+        
+        Args:
+            project_name: Název projektu
+            username: Uživatelské jméno studenta
+        
+        Returns:
+            Seznam studentů přiřazených k projektu
+        
+        Raises:
+            ValueError: Pokud projekt nebo student neexistuje, evidence není
+                nastavena nebo by student překročil limit projektů
+        """
+        if project_name not in self.projects:
+            self.logger.error(f"Projekt '{project_name}' neexistuje")
+            raise ValueError(f"Projekt '{project_name}' neexistuje")
+        if self.registry is None:
+            raise ValueError("Evidence studentů není nastavena")
+        
+        with self._project_locks[project_name]:
+            with self._lock:
+                try:
+                    self.registry.assign_project(username, project_name)
+                except ValueError as e:
+                    self.logger.error(str(e))
+                    raise
+            assigned = self.projects[project_name].setdefault('students', [])
+            seq = 0
+            if username not in assigned:
+                assigned.append(username)
+                self._bump_version(project_name)
+                seq = self._record('assign_student',
+                                   {'project': project_name, 'username': username})
+            students = list(assigned)
+        self._commit(seq)
+        return students
+    
+    @traced()
+    def update_project(self, name: str, **fields: Any) -> Dict[str, Any]:
+        """
+        Změna údajů projektu (kategorie, obtížnost, milníky, stav...).
+        
+        Args:
+            name: Název projektu
+            **fields: Nové hodnoty polí
+        
+        Returns:
+            Projekt
+        
+        Raises:
+            ValueError: Pokud projekt neexistuje nebo pole spravuje správce
+                (name, tasks, students)
+        """
+        if name not in self.projects:
+            self.logger.error(f"Projekt '{name}' neexistuje")
+            raise ValueError(f"Projekt '{name}' neexistuje")
+        protected = sorted({'name', 'tasks', 'students'} & set(fields))
+        if protected:
+            raise ValueError(f"Pole {protected} nelze měnit přes update_project")
+        
+        with self._project_locks[name]:
+            self.projects[name].update(fields)
+            self._bump_version(name)
+            seq = self._record('update_project', {'name': name, 'fields': fields})
+        self._commit(seq)
+        if self.search_index is not None and {'description', 'objectives'} & set(fields):
+            self.search_index.index_project(self.projects[name])
+        self.logger.info(f"Projekt '{name}' upraven: {', '.join(fields)}")
+        return self.projects[name]
+    
+    @traced()
     def update_task_status(
         self,
         task_id: int,
@@ -179,20 +483,41 @@ class ProjectManager:
         Returns:
             True pokud byla aktualizace úspěšná
         """
-        for task in self.tasks:
-            if task['id'] == task_id:
-                old_status = task['status']
-                task['status'] = new_status
-                task['updated_at'] = datetime.now().isoformat()
-                task['notes'] = notes
-                self.logger.info(
-                    f"Úkol {task_id}: '{old_status}' → '{new_status}' ({notes})"
-                )
-                return True
+        started = time.perf_counter()
+        task = self._task_index.get(task_id)
+        if task is None:
+            self.logger.warning(f"Úkol s ID {task_id} nebyl nalezen")
+            _observe(_UPDATE_STATUS, started, ok=False)
+            return False
         
-        self.logger.warning(f"Úkol s ID {task_id} nebyl nalezen")
-        return False
+        project_name = self._task_projects[task_id]
+        with self._project_locks[project_name]:
+            old_status = task['status']
+            task.update({
+                'status': new_status,
+                'updated_at': datetime.now().isoformat(),
+                'notes': notes
+            })
+            self._indexes['status'].move(task, old_status)
+            self._bump_version(project_name)
+            if self.progress_history is not None:
+                self.progress_history.status_changed(project_name, old_status, task['status'],
+                                                     task['updated_at'])
+            self._publish('task.status', project_name, task, old_status=old_status)
+            seq = self._record('update_task_status', {
+                'project': project_name, 'task_id': task_id, 'status': new_status,
+                'notes': notes, 'updated_at': task['updated_at']
+            })
+        self._commit(seq)
+        if self.search_index is not None and notes:
+            self.search_index.index_task(task, project_name)
+        self.logger.info(
+            f"Úkol {task_id}: '{old_status}' → '{new_status}' ({notes})"
+        )
+        _observe(_UPDATE_STATUS, started)
+        return True
     
+    @traced()
     def track_progress(self, project_name: str) -> Optional[float]:
         """
         Sledování pokroku projektu (procento hotových úkolů).
@@ -207,8 +532,7 @@ class ProjectManager:
             self.logger.error(f"Projekt '{project_name}' neexistuje")
             return None
         
-        project = self.projects[project_name]
-        tasks = project['tasks']
+        tasks = list(self.projects[project_name]['tasks'])
         
         if not tasks:
             return 0.0
@@ -225,6 +549,7 @@ class ProjectManager:
         )
         return round(progress, 1)
     
+    @traced()
     def generate_report(self, project_name: str) -> Optional[Dict[str, Any]]:
         """
         Generování podrobného reportu o projektu.
@@ -235,15 +560,19 @@ class ProjectManager:
         Returns:
             Slovník s reportem nebo None
         """
+        started = time.perf_counter()
         if project_name not in self.projects:
             self.logger.error(f"Projekt '{project_name}' neexistuje")
+            _observe(_REPORT, started, ok=False)
             return None
         
         project = self.projects[project_name]
-        progress = self.track_progress(project_name)
+        tasks = list(project['tasks'])
+        completed = sum(1 for task in tasks if task['status'] == TaskStatus.COMPLETED.value)
+        progress = round(completed / len(tasks) * 100, 1) if tasks else 0.0
         
         completed_tasks = [
-            task['name'] for task in project['tasks']
+            task['name'] for task in tasks
             if task['status'] == TaskStatus.COMPLETED.value
         ]
         
@@ -255,7 +584,7 @@ class ProjectManager:
                 'priority': task['priority'],
                 'status': task['status']
             }
-            for task in project['tasks']
+            for task in tasks
             if task['status'] != TaskStatus.COMPLETED.value
         ]
         
@@ -263,7 +592,7 @@ class ProjectManager:
             'project_name': project_name,
             'status': project['status'],
             'progress': progress,
-            'total_tasks': len(project['tasks']),
+            'total_tasks': len(tasks),
             'completed_tasks_count': len(completed_tasks),
             'completed_tasks': completed_tasks,
             'pending_tasks_count': len(pending_tasks),
@@ -274,6 +603,7 @@ class ProjectManager:
         }
         
         self.logger.info(f"Report pro projekt '{project_name}' vygenerován")
+        _observe(_REPORT, started)
         return report
     
     def export_project(self, project_name: str, filepath: str) -> bool:
@@ -292,7 +622,7 @@ class ProjectManager:
             return False
         
         try:
-            project = self.projects[project_name]
+            project = self.snapshot(project_name)
             with open(filepath, 'w', encoding='utf-8') as f:
                 json.dump(project, f, indent=2, ensure_ascii=False)
             self.logger.info(f"Projekt '{project_name}' exportován do '{filepath}'")
@@ -301,6 +631,7 @@ class ProjectManager:
             self.logger.error(f"Chyba při exportu projektu: {e}")
             return False
     
+    @traced()
     def get_project_stats(self, project_name: str) -> Optional[Dict[str, Any]]:
         """
         Získání statistik projektu.
@@ -314,8 +645,7 @@ class ProjectManager:
         if project_name not in self.projects:
             return None
         
-        project = self.projects[project_name]
-        tasks = project['tasks']
+        tasks = list(self.projects[project_name]['tasks'])
         
         stats = {
             'total_tasks': len(tasks),
@@ -332,6 +662,519 @@ class ProjectManager:
         }
         
         return stats
+    
+    def project_version(self, project_name: str) -> Optional[int]:
+        """
+        Verze dat projektu (pro ETag a detekci změn).
+        
+        Args:
+            project_name: Název projektu
+        
+        Returns:
+            Číslo verze nebo None, pokud projekt neexistuje
+        """
+        return self._project_versions.get(project_name)
+    
+    def _bump_version(self, project_name: str) -> None:
+        """Zvýšení globální verze a verze projektu"""
+        with self._version_lock:
+            self.version += 1
+            self._project_versions[project_name] = self.version
+    
+    def _status_counts(self) -> Dict[tuple, int]:
+        """Počty úkolů podle stavu (pro metriky)"""
+        counts = dict.fromkeys(((status.value,) for status in TaskStatus), 0)
+        for task in list(self.tasks):
+            key = (task['status'],)
+            counts[key] = counts.get(key, 0) + 1
+        return counts
+    
+    @traced()
+    def query_tasks(
+        self,
+        query: Optional[TaskQuery] = None,
+        offset: int = 0,
+        limit: int = 50,
+        explain: bool = False,
+        **filters: Any
+    ) -> Dict[str, Any]:
+        """
+        Filtrování úkolů se stránkováním.
+        
+        Kandidáty vybere nejselektivnější zdroj: sekundární index (stav,
+        priorita, řešitel), pokud vybere nanejvýš SELECTIVITY všech úkolů,
+        jinak úkoly projektu, jinak všechny úkoly. Na kandidáty se použije
+        zkompilovaný predikát dotazu.
+        
+        Args:
+            query: Dotaz (TaskQuery); místo něj lze předat podmínky
+                jako klíčové argumenty (status, priority, assignee,
+                project, deadline_from, deadline_to, order_by)
+            offset: Počet přeskočených výsledků
+            limit: Velikost stránky (1 až MAX_LIMIT)
+            explain: Přidat do výsledku plán dotazu
+        
+        Returns:
+            Slovník s klíči 'tasks' (kopie úkolů), 'total', 'offset',
+            'limit', 'next_offset' a při explain=True 'explain'
+        
+        Raises:
+            ValueError: Při neplatném dotazu, stránkování nebo neexistujícím projektu
+        """
+        started = time.perf_counter()
+        try:
+            if query is None:
+                query = TaskQuery(**filters)
+            if offset < 0 or not 1 <= limit <= MAX_LIMIT:
+                raise ValueError(f"Neplatné stránkování (offset {offset}, limit {limit})")
+            if query.project is not None and query.project not in self.projects:
+                raise ValueError(f"Projekt '{query.project}' neexistuje")
+        except ValueError as e:
+            self.logger.error(str(e))
+            _observe(_QUERY_TASKS, started, ok=False)
+            raise
+        
+        estimates = {
+            field: self._indexes[field].count(values)
+            for field, values in query.indexed().items()
+        }
+        best = min(estimates, key=estimates.get) if estimates else None
+        if best is not None and estimates[best] <= SELECTIVITY * len(self.tasks):
+            source = f'index:{best}'
+            candidates = self._indexes[best].tasks(getattr(query, best))
+        elif query.project is not None:
+            source = 'project'
+            candidates = list(self.projects[query.project]['tasks'])
+        else:
+            source = 'scan'
+            candidates = list(self.tasks)
+        if query.project is not None:
+            estimates['project'] = len(self.projects[query.project]['tasks'])
+        
+        predicate, expression = query.compile(
+            self._task_projects, skip=('project',) if source == 'project' else ())
+        matched = [task for task in candidates if predicate(task)]
+        page = [
+            dict(task) for task in
+            query.page(matched, offset, limit, ordered=not source.startswith('index'))
+        ]
+        result: Dict[str, Any] = {
+            'tasks': page,
+            'total': len(matched),
+            'offset': offset,
+            'limit': limit,
+            'next_offset': offset + limit if offset + limit < len(matched) else None,
+        }
+        if explain:
+            result['explain'] = {
+                'query': query.to_dict(),
+                'source': source,
+                'estimates': estimates,
+                'candidates': len(candidates),
+                'predicate': expression,
+                'matched': len(matched),
+                'milliseconds': round((time.perf_counter() - started) * 1000, 3),
+            }
+        _observe(_QUERY_TASKS, started)
+        return result
+    
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        kind: Optional[str] = None,
+        project: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Fulltextové vyhledání projektů a úkolů.
+        
+        Args:
+            query: Dotaz (bez ohledu na diakritiku, poslední slovo jako prefix)
+            limit: Maximální počet výsledků
+            kind: Jen 'task' nebo 'project' (volitelné)
+            project: Jen v daném projektu (volitelné)
+        
+        Returns:
+            Seznam výsledků {'type', 'score', 'project', 'task'/'name', ...}
+            seřazený podle relevance
+        
+        Raises:
+            ValueError: Pokud fulltextový index není nastaven
+        """
+        if self.search_index is None:
+            raise ValueError("Fulltextový index není nastaven")
+        
+        results = []
+        for hit in self.search_index.search(query, limit, kind=kind, project=project):
+            if hit['type'] == 'task':
+                task = self._task_index.get(hit['id'])
+                if task is None:
+                    continue
+                results.append({'type': 'task', 'score': hit['score'],
+                                'project': hit['project'], 'task': dict(task)})
+            else:
+                found = self.projects.get(hit['id'])
+                if found is None:
+                    continue
+                results.append({'type': 'project', 'score': hit['score'],
+                                'project': hit['id'], 'description': found['description'],
+                                'status': found['status']})
+        return results
+    
+    def _record(self, op: str, data: Dict[str, Any], origin: Optional[str] = None) -> int:
+        """Zápis změny do žurnálu (volá se pod zámkem hned po změně)"""
+        if self.journal is None:
+            return 0
+        return self.journal.append(op, data, origin)
+    
+    def _commit(self, seq: int) -> None:
+        """Počkání na zápis záznamu na disk (volá se až po uvolnění zámků)"""
+        if seq:
+            self.journal.wait(seq)
+    
+    def _publish(
+        self, topic: str, project_name: str, task: Dict[str, Any], **extra: Any
+    ) -> None:
+        """Publikování změny úkolu (volá se pod zámkem projektu kvůli pořadí)"""
+        if self.event_bus is None:
+            return
+        tasks = self.projects[project_name]['tasks']
+        completed = sum(1 for t in tasks if t['status'] == TaskStatus.COMPLETED.value)
+        self.event_bus.publish(topic, {
+            'project': project_name,
+            'task_id': task['id'],
+            'task': task['name'],
+            'status': task['status'],
+            'deadline': task['deadline'],
+            'progress': round(completed / len(tasks) * 100, 1),
+            'version': self._project_versions[project_name],
+            **extra
+        }, key=f"project:{project_name}")
+    
+    def _publish_added(self, project_name: str, tasks: List[Dict[str, Any]]) -> None:
+        """Publikování dávky nových úkolů (volá se pod zámkem projektu)"""
+        if self.event_bus is None or not tasks:
+            return
+        self.event_bus.publish('tasks.added', {
+            'project': project_name,
+            'tasks': [
+                {'task_id': t['id'], 'status': t['status'], 'deadline': t['deadline']}
+                for t in tasks
+            ],
+            'version': self._project_versions[project_name]
+        }, key=f"project:{project_name}")
+    
+    def _id_counter(self, last: int) -> Iterator[int]:
+        """Čítač ID úkolů této instance začínající za ID last"""
+        first = last + 1
+        first += (self._id_offset - first) % self._id_stride
+        return itertools.count(first, self._id_stride)
+    
+    def partition_task_ids(self, index: int, count: int) -> None:
+        """
+        Omezení nových ID úkolů na zbytkovou třídu uzlu (replikace).
+        
+        Uzel s pořadím index z count uzlů přiděluje jen ID, pro která
+        platí ``id % count == (index + 1) % count``, takže ID vzniklá
+        souběžně na různých kioscích se nikdy nepotkají.
+        
+        Args:
+            index: Pořadí uzlu (0 až count - 1)
+            count: Počet uzlů
+        
+        Raises:
+            ValueError: Pokud index neleží v rozsahu
+        """
+        if not 0 <= index < count:
+            raise ValueError(f"Neplatné pořadí uzlu {index} z {count}")
+        with self._lock:
+            self._id_stride = count
+            self._id_offset = (index + 1) % count
+            self._task_ids = self._id_counter(max(self._task_index, default=0))
+    
+    @traced()
+    def apply_remote(self, op: str, data: Dict[str, Any], origin: str) -> bool:
+        """
+        Použití změny replikované z jiného uzlu (kiosku).
+        
+        Změna projde stejnými strukturami jako místní (indexy, evidence,
+        fulltext, verze, události) a zapíše se do žurnálu s původem,
+        takže se dál nereplikuje. Použití je idempotentní. O souběžných
+        změnách stavu téhož úkolu rozhoduje poslední zápis (last-writer-wins)
+        podle času změny, při shodě času pořadí stavu a poznámky, takže
+        všechny uzly dojdou ke stejnému výsledku bez ohledu na pořadí.
+        
+        Args:
+            op: Operace záznamu žurnálu
+            data: Data změny
+            origin: Uzel, na kterém změna vznikla
+        
+        Returns:
+            True pokud se stav změnil, False pokud už změnu obsahoval
+            nebo změna prohrála konflikt
+        
+        Raises:
+            ValueError: Pokud je operace neznámá nebo změna odkazuje na
+                projekt či úkol, který z jiného uzlu ještě nedorazil
+        """
+        handler = getattr(self, f"_remote_{op}", None)
+        if handler is None:
+            raise ValueError(f"Neznámá replikovaná operace '{op}'")
+        return handler(data, origin)
+    
+    def _remote_project(self, name: str) -> threading.Lock:
+        """Zámek projektu, na který odkazuje replikovaná změna"""
+        lock = self._project_locks.get(name)
+        if lock is None:
+            raise ValueError(f"Projekt '{name}' neexistuje")
+        return lock
+    
+    def _remote_create_project(self, data: Dict[str, Any], origin: str) -> bool:
+        project = dict(data['project'], tasks=[])
+        name = project['name']
+        with self._lock:
+            if name in self.projects:
+                return False
+            self._project_locks[name] = threading.Lock()
+            self.projects[name] = project
+            self._bump_version(name)
+            seq = self._record('create_project', {'project': project}, origin)
+        self._commit(seq)
+        if self.search_index is not None:
+            self.search_index.index_project(project)
+        self.logger.info(f"Projekt '{name}' převzat z uzlu '{origin}'")
+        return True
+    
+    def _remote_update_project(self, data: Dict[str, Any], origin: str) -> bool:
+        name = data['name']
+        with self._remote_project(name):
+            self.projects[name].update(data['fields'])
+            self._bump_version(name)
+            seq = self._record('update_project', data, origin)
+        self._commit(seq)
+        if self.search_index is not None and {'description', 'objectives'} & set(data['fields']):
+            self.search_index.index_project(self.projects[name])
+        return True
+    
+    def _remote_add_task(self, data: Dict[str, Any], origin: str) -> bool:
+        return self._remote_add_tasks({'project': data['project'], 'tasks': [data['task']]},
+                                      origin)
+    
+    def _remote_add_tasks(self, data: Dict[str, Any], origin: str) -> bool:
+        project_name = data['project']
+        with self._remote_project(project_name):
+            with self._lock:
+                tasks = []
+                for task in data['tasks']:
+                    known = self._task_index.get(task['id'])
+                    if known is None:
+                        tasks.append(dict(task))
+                    elif known.get('created_at') != task.get('created_at'):
+                        self.logger.error(
+                            f"ID úkolu {task['id']} z uzlu '{origin}' už patří jinému úkolu")
+                if not tasks:
+                    return False
+                for task in tasks:
+                    self._task_projects[task['id']] = project_name
+                    self._task_index[task['id']] = task
+                    for index in self._indexes.values():
+                        index.add(task)
+                    if self.registry is not None:
+                        self.registry.link_task(task)
+                _insert_by_id(self.tasks, tasks)
+                # Místní ID pokračují za všemi známými (i po převzetí výchozího stavu)
+                upcoming = next(self._task_ids)
+                self._task_ids = self._id_counter(
+                    max(upcoming - 1, max(task['id'] for task in tasks)))
+            _insert_by_id(self.projects[project_name]['tasks'], tasks)
+            self._bump_version(project_name)
+            if self.progress_history is not None:
+                self.progress_history.task_added(project_name, tasks)
+            self._publish_added(project_name, tasks)
+            seq = self._record('add_tasks', {'project': project_name, 'tasks': tasks}, origin)
+        self._commit(seq)
+        if self.search_index is not None:
+            for task in tasks:
+                self.search_index.index_task(task, project_name)
+        return True
+    
+    def _remote_update_task_status(self, data: Dict[str, Any], origin: str) -> bool:
+        task = self._task_index.get(data['task_id'])
+        if task is None:
+            raise ValueError(f"Úkol {data['task_id']} neexistuje")
+        project_name = self._task_projects[data['task_id']]
+        incoming = (data['updated_at'], data['status'], data['notes'])
+        with self._project_locks[project_name]:
+            current = (task.get('updated_at') or '', task['status'], task.get('notes') or '')
+            if incoming <= current:
+                return False
+            old_status = task['status']
+            task.update({
+                'status': data['status'],
+                'updated_at': data['updated_at'],
+                'notes': data['notes']
+            })
+            self._indexes['status'].move(task, old_status)
+            self._bump_version(project_name)
+            if self.progress_history is not None:
+                self.progress_history.status_changed(project_name, old_status, task['status'],
+                                                     task['updated_at'])
+            self._publish('task.status', project_name, task, old_status=old_status,
+                          origin=origin)
+            seq = self._record('update_task_status', dict(data, project=project_name), origin)
+        self._commit(seq)
+        if self.search_index is not None and data['notes']:
+            self.search_index.index_task(task, project_name)
+        return True
+    
+    def _remote_assign_student(self, data: Dict[str, Any], origin: str) -> bool:
+        project_name, username = data['project'], data['username']
+        with self._remote_project(project_name):
+            assigned = self.projects[project_name].setdefault('students', [])
+            if username in assigned:
+                return False
+            if self.registry is not None:
+                with self._lock:
+                    try:
+                        self.registry.assign_project(username, project_name)
+                    except ValueError as e:
+                        # Přiřazení už proběhlo jinde; evidence jen nezná studenta
+                        self.logger.warning(f"Replikované přiřazení z '{origin}': {e}")
+            assigned.append(username)
+            self._bump_version(project_name)
+            seq = self._record('assign_student', data, origin)
+        self._commit(seq)
+        return True
+    
+    def snapshot(self, project_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Konzistentní kopie projektu včetně úkolů.
+        
+        Kopie se pořídí pod zámkem projektu, takže obsahuje buď celou
+        změnu úkolu, nebo žádnou; volající ji může libovolně procházet.
+        
+        Args:
+            project_name: Název projektu
+        
+        Returns:
+            Kopie projektu nebo None
+        """
+        lock = self._project_locks.get(project_name)
+        if lock is None:
+            return None
+        
+        with lock:
+            project = dict(self.projects[project_name])
+            project['tasks'] = [dict(task) for task in project['tasks']]
+            if 'students' in project:
+                project['students'] = list(project['students'])
+        return project
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Serializovatelný stav správce (projekty včetně úkolů a zdroje).
+        
+        Returns:
+            Slovník se stavem (konzistentní kopie)
+        """
+        names = list(self.projects)
+        return {
+            'projects': {name: self.snapshot(name) for name in names},
+            'resources': list(self.resources)
+        }
+    
+    @traced()
+    def restore(self, state: Dict[str, Any]) -> None:
+        """
+        Obnovení stavu ze slovníku vytvořeného metodou to_dict.
+        
+        Úkoly v projektech a v seznamu tasks jsou po obnovení opět
+        sdílené objekty.
+        
+        Args:
+            state: Slovník se stavem
+        """
+        projects = state.get('projects', {})
+        tasks = sorted(
+            (task for project in projects.values() for task in project['tasks']),
+            key=lambda task: task['id']
+        )
+        
+        with self._lock:
+            self.projects = projects
+            self.resources = state.get('resources', [])
+            self.tasks = tasks
+            self._project_locks = {name: threading.Lock() for name in projects}
+            self._task_index = {task['id']: task for task in tasks}
+            self._task_projects = {
+                task['id']: name
+                for name, project in projects.items() for task in project['tasks']
+            }
+            self._task_ids = self._id_counter(tasks[-1]['id'] if tasks else 0)
+            for index in self._indexes.values():
+                index.rebuild(tasks)
+            if self.registry is not None:
+                self.registry.rebuild_task_index(tasks)
+            with self._version_lock:
+                self.version += 1
+                self._project_versions = dict.fromkeys(projects, self.version)
+        if self.search_index is not None:
+            self.search_index.rebuild(projects)
+        if self.progress_history is not None:
+            self.progress_history.rebuild(projects)
+        if self.journal is not None:
+            self.journal.snapshot()
+        if self.event_bus is not None:
+            self.event_bus.publish('projects.reloaded', {'version': self.version})
+        self.logger.info(
+            f"Obnoveno {len(self.projects)} projektů a {len(self.tasks)} úkolů"
+        )
+    
+    @traced()
+    def save_state(self, filepath: str) -> bool:
+        """
+        Uložení stavu do JSON souboru (atomicky přes dočasný soubor).
+        
+        Args:
+            filepath: Cesta k souboru
+        
+        Returns:
+            True pokud bylo uložení úspěšné
+        """
+        started = time.perf_counter()
+        temp_path = f"{filepath}.tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+            os.replace(temp_path, filepath)
+            _observe(_SAVE_STATE, started)
+            return True
+        except IOError as e:
+            self.logger.error(f"Chyba při ukládání stavu: {e}")
+            _observe(_SAVE_STATE, started, ok=False)
+            return False
+    
+    @traced()
+    def load_state(self, filepath: str) -> bool:
+        """
+        Načtení stavu z JSON souboru.
+        
+        Args:
+            filepath: Cesta k souboru
+        
+        Returns:
+            True pokud bylo načtení úspěšné
+        """
+        started = time.perf_counter()
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                self.restore(json.load(f))
+            _observe(_LOAD_STATE, started)
+            return True
+        except (IOError, ValueError) as e:
+            self.logger.error(f"Chyba při načítání stavu: {e}")
+            _observe(_LOAD_STATE, started, ok=False)
+            return False
 
 
 # Příklad použití
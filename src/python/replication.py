@@ -0,0 +1,628 @@
+"""
+Replikace mezi kiosky - Multi-kiosk Replication
+
+Log-shipping replikace změn projektů a úkolů mezi kiosky ve škole.
+Každý uzel zveřejňuje přes HTTP své místní záznamy žurnálu změn
+(Journal) a od každého dalšího uzlu si jeho záznamy stahuje dávkami
+(long-poll, gzip); převzaté změny použije přes
+ProjectManager.apply_remote a zapíše do vlastního žurnálu s původem,
+takže se dál nešíří. Souběžné změny stavu téhož úkolu rozhoduje
+poslední zápis (last-writer-wins podle času změny, hodiny kiosků se
+synchronizují přes NTP; při shodě času rozhoduje deterministicky
+pořadí stavu a poznámky). Nové ID úkolů si každý uzel přiděluje z vlastní
+zbytkové třídy, takže se nepotkají.
+
+Nový uzel (nebo uzel, kterému protějšek mezitím smazal historii) se
+nejdřív dorovná ze snímku stavu protějšku a pak pokračuje záznamy za
+ním. Pozice v logu každého protějšku se ukládá vedle žurnálu, po
+restartu se tak stahuje jen to, co chybí.
+
+Endpointy (port replication.port):
+    GET /replication/log?after=N&limit=M&wait=S   záznamy za pozicí N
+    GET /replication/snapshot                     {"node", "seq", "state"}
+    GET /replication/status                       stav protějšků (zpoždění, přenos)
+"""
+
+import gzip
+import json
+import logging
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+import weakref
+from collections import deque
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .metrics import get_registry
+
+
+DEFAULT_PORT = 8091
+DEFAULT_BATCH = 500
+DEFAULT_BACKLOG = 10000
+DEFAULT_POLL_WAIT = 10.0
+GZIP_MIN_SIZE = 256
+TOKEN_HEADER = 'X-Replication-Token'
+STATE_FILE = 'replication-state.json'
+MAX_DEFERRED = 10000
+
+_LAG = get_registry().histogram(
+    'replication_lag_seconds', 'Zpoždění replikované změny od vzniku po použití', ['peer'],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0))
+_BYTES = get_registry().counter(
+    'replication_bytes_total', 'Přenesené bajty replikace (po kompresi)', ['peer'])
+_RECORDS = get_registry().counter(
+    'replication_records_total', 'Počet převzatých záznamů replikace', ['peer'])
+
+
+class Replicator:
+    """
+    Replikace změn ProjectManageru mezi uzly (kiosky).
+
+    Attributes:
+        manager (ProjectManager): Správce projektů s napojeným žurnálem
+        node_id (str): Identifikátor tohoto uzlu
+        peers (Dict[str, str]): Ostatní uzly (ID → základní URL)
+        host (str): Adresa pro naslouchání
+        port (int): Port (0 = libovolný volný, skutečný port po start())
+        token (str): Sdílený klíč v hlavičce X-Replication-Token (prázdný = bez kontroly)
+        batch (int): Maximální počet záznamů v jedné dávce
+        poll_wait (float): Jak dlouho protějšek drží dotaz bez nových záznamů (sekundy)
+        interval (float): Prodleva před dalším pokusem po chybě spojení (sekundy)
+        logger (logging.Logger): Logger
+    """
+
+    def __init__(
+        self,
+        manager: Any,
+        node_id: str,
+        peers: Dict[str, str],
+        host: str = "0.0.0.0",
+        port: int = DEFAULT_PORT,
+        token: str = "",
+        batch: int = DEFAULT_BATCH,
+        poll_wait: float = DEFAULT_POLL_WAIT,
+        interval: float = 1.0,
+        backlog: int = DEFAULT_BACKLOG,
+        state_file: Optional[str] = None
+    ):
+        """
+        Inicializace replikace a rozdělení ID úkolů mezi uzly.
+
+        Args:
+            manager: ProjectManager s napojeným žurnálem (Journal.attach)
+            node_id: Identifikátor tohoto uzlu
+            peers: Ostatní uzly (ID → základní URL, např. http://kiosk-2:8091)
+            host: Adresa pro naslouchání
+            port: Port (0 = libovolný volný)
+            token: Sdílený klíč uzlů
+            batch: Maximální počet záznamů v jedné dávce
+            poll_wait: Doba držení dotazu bez nových záznamů (sekundy)
+            interval: Prodleva po chybě spojení (sekundy)
+            backlog: Počet posledních místních záznamů drženého v paměti;
+                starší se čtou ze segmentů žurnálu
+            state_file: Soubor s pozicemi v logu protějšků
+                (výchozí: replication-state.json v adresáři žurnálu)
+
+        Raises:
+            ValueError: Pokud správce nemá žurnál nebo ID uzlu je mezi protějšky
+        """
+        if manager.journal is None:
+            raise ValueError("Replikace vyžaduje žurnál změn (journal.directory)")
+        if node_id in peers:
+            raise ValueError(f"Uzel '{node_id}' nemůže být svým vlastním protějškem")
+        self.manager = manager
+        self.journal = manager.journal
+        self.node_id = node_id
+        self.peers = dict(peers)
+        self.host = host
+        self.port = port
+        self.token = token
+        self.batch = batch
+        self.poll_wait = poll_wait
+        self.interval = interval
+        self.backlog = backlog
+        self.state_file = state_file or os.path.join(self.journal.directory, STATE_FILE)
+        self.logger = logging.getLogger("Replicator")
+
+        nodes = sorted(set(peers) | {node_id})
+        manager.partition_task_ids(nodes.index(node_id), len(nodes))
+
+        # Místní záznamy za _floor (seq, řádek JSON); starší jen v segmentech.
+        # _head je poslední záznam, který prošel _on_records: žurnál zvyšuje
+        # synced dřív, než zavolá posluchače, a pozice za synced bez
+        # záznamů v _recent by protějšek posunula za neodeslané změny
+        self._cond = threading.Condition()
+        self._recent: Deque[Tuple[int, str]] = deque()
+        self._floor = 0
+        self._head = 0
+        self._state_lock = threading.Lock()
+        self._cursors: Dict[str, int] = {}
+        self._deferred: List[Dict[str, Any]] = []
+        self._stats: Dict[str, Dict[str, Any]] = {
+            peer: {'records': 0, 'bytes': 0, 'snapshot_bytes': 0, 'snapshots': 0, 'errors': 0,
+                   'head': 0,
+                   'lag_ms': deque(maxlen=1024), 'last_error': None, 'last_pull': None}
+            for peer in self.peers
+        }
+        self._load_state()
+        self.journal.listeners.append(self._on_records)
+        self.journal.flush()
+        with self._cond:
+            self._floor = max(self._floor, self.journal.synced)
+            self._head = max(self._head, self._floor)
+
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._threads: List[threading.Thread] = []
+        self._running = threading.Event()
+
+        replicator = weakref.ref(self)
+        get_registry().gauge(
+            'replication_peer_behind', 'Počet záznamů protějšku, které uzel ještě nepřevzal',
+            ['peer'], callback=lambda: {
+                (peer,): stats['behind'] for peer, stats in replicator().stats()['peers'].items()
+            } if replicator() else {})
+
+    @classmethod
+    def from_config(cls, config: Any, manager: Any, **kwargs: Any) -> Optional["Replicator"]:
+        """
+        Replikace podle sekce ``replication`` hlavní konfigurace.
+
+        Args:
+            config: ConfigManager (nebo cokoliv s metodou ``get``)
+            manager: ProjectManager s napojeným žurnálem
+            **kwargs: Další parametry konstruktoru
+
+        Returns:
+            Replikace nebo None, pokud replication.node_id není nastaven
+        """
+        node_id = config.get('replication.node_id')
+        if not node_id:
+            return None
+        nodes = config.get('replication.nodes', {}) or {}
+        kwargs.setdefault('port', int(config.get('replication.port', DEFAULT_PORT)))
+        kwargs.setdefault('token', config.get('replication.token', '') or '')
+        kwargs.setdefault('batch', int(config.get('replication.batch', DEFAULT_BATCH)))
+        kwargs.setdefault('poll_wait',
+                          float(config.get('replication.poll_wait', DEFAULT_POLL_WAIT)))
+        kwargs.setdefault('interval', float(config.get('replication.interval', 1.0)))
+        peers = {str(peer): url.rstrip('/') for peer, url in nodes.items() if peer != node_id}
+        return cls(manager, str(node_id), peers, **kwargs)
+
+    # Strana protějšku: zveřejnění místních záznamů
+
+    def _on_records(self, records: List[Tuple[int, Optional[str], str]]) -> None:
+        """Posluchač žurnálu: místní záznamy dávky po jejím fsync"""
+        with self._cond:
+            for seq, origin, line in records:
+                if origin is None:
+                    self._recent.append((seq, line))
+                self._head = max(self._head, seq)
+            while len(self._recent) > self.backlog:
+                self._floor = self._recent.popleft()[0]
+            self._cond.notify_all()
+
+    def changes(self, after: int, limit: Optional[int] = None,
+                wait: float = 0.0) -> Optional[Dict[str, Any]]:
+        """
+        Místní záznamy za pozicí after (obsah odpovědi /replication/log).
+
+        Záznamy převzaté z jiných uzlů se přeskočí, pozice ``seq`` v
+        odpovědi je ale za nimi, takže je protějšek při dalším dotazu
+        už neprochází. Posílají se jen záznamy zapsané na disk.
+
+        Args:
+            after: Poslední převzatá pozice v žurnálu tohoto uzlu
+            limit: Maximální počet záznamů (nejvýše batch)
+            wait: Jak dlouho čekat, když za pozicí zatím nic není (sekundy)
+
+        Returns:
+            Slovník node, seq (nová pozice), head (poslední zapsaný záznam),
+            more a records (řádky JSON), nebo None, pokud záznamy za
+            pozicí už nejsou k dispozici a je potřeba snímek
+        """
+        limit = max(1, min(limit or self.batch, self.batch))
+        deadline = time.monotonic() + max(0.0, wait)
+        with self._cond:
+            while self._head <= after and self._running.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            head = self._head
+            if after >= head:
+                return self._page(head, head, [], False)
+            if after >= self._floor:
+                pending = []
+                for seq, line in reversed(self._recent):
+                    if seq <= after:
+                        break
+                    pending.append((seq, line))
+                pending.reverse()
+                more = len(pending) > limit
+                pending = pending[:limit]
+                upto = pending[-1][0] if more else head
+                return self._page(upto, head, [line for _, line in pending], more)
+
+        # Starší záznamy ze segmentů žurnálu
+        if after + 1 < self.journal.first_seq():
+            return None
+        lines = []
+        upto = head
+        for record in self.journal.records(after):
+            if record['seq'] > head:
+                break
+            if 'origin' in record:
+                continue
+            if len(lines) == limit:
+                upto = record['seq'] - 1
+                break
+            lines.append(json.dumps(record, ensure_ascii=False, separators=(',', ':')))
+        return self._page(upto, head, lines, upto < head)
+
+    def _page(self, upto: int, head: int, lines: List[str], more: bool) -> Dict[str, Any]:
+        return {'node': self.node_id, 'seq': upto, 'head': head, 'more': more, 'records': lines}
+
+    def snapshot_state(self) -> Dict[str, Any]:
+        """
+        Snímek stavu pro dorovnání nového uzlu.
+
+        Pozice se přečte před pořízením stavu; změny za ní, které už ve
+        stavu jsou, protějšek při použití přeskočí.
+
+        Returns:
+            Slovník node, seq a state (ProjectManager.to_dict)
+        """
+        seq = self.journal.seq
+        return {'node': self.node_id, 'seq': seq, 'state': self.manager.to_dict()}
+
+    # Strana odběratele: stahování od protějšků
+
+    def pull(self, peer: str, wait: float = 0.0) -> int:
+        """
+        Jedna dávka záznamů od protějšku.
+
+        Při první synchronizaci s protějškem, po ztrátě historie protějšku nebo po
+        jeho návratu na nižší pozici (obnova ze zálohy) se nejdřív
+        dorovná ze snímku.
+
+        Args:
+            peer: ID protějšku
+            wait: Jak dlouho může protějšek dotaz držet (sekundy)
+
+        Returns:
+            Počet převzatých záznamů
+
+        Raises:
+            OSError: Při chybě spojení (včetně urllib.error.URLError)
+            ValueError: Při neplatné odpovědi protějšku
+        """
+        if peer not in self._cursors:
+            self.catch_up(peer)
+        cursor = self._cursors[peer]
+        status, page = self._get(
+            peer, f"/replication/log?after={cursor}&limit={self.batch}&wait={wait:g}")
+        if status == 410 or page['seq'] < cursor:
+            self.logger.warning(
+                f"Protějšek '{peer}' nemá záznamy za pozicí {cursor}, dorovnání ze snímku")
+            self.catch_up(peer)
+            return 0
+
+        stats = self._stats[peer]
+        now = datetime.now()
+        applied = 0
+        for record in page['records']:
+            self._apply(peer, record)
+            lag = max(0.0, (now - datetime.fromisoformat(record['ts'])).total_seconds())
+            _LAG.labels(peer).observe(lag)
+            stats['lag_ms'].append(lag * 1000)
+            applied += 1
+        _RECORDS.labels(peer).inc(applied)
+        stats['records'] += applied
+        stats['head'] = page['head']
+        stats['last_pull'] = time.time()
+        with self._state_lock:
+            self._cursors[peer] = page['seq']
+        self._retry_deferred()
+        if applied or page['seq'] != cursor:
+            self._save_state()
+        return applied
+
+    def catch_up(self, peer: str) -> int:
+        """
+        Dorovnání ze snímku stavu protějšku.
+
+        Args:
+            peer: ID protějšku
+
+        Returns:
+            Pozice v logu protějšku, od které se pokračuje
+        """
+        started = time.perf_counter()
+        transferred = self._stats[peer]['bytes']
+        _, snapshot = self._get(peer, "/replication/snapshot")
+        self._stats[peer]['snapshot_bytes'] += self._stats[peer]['bytes'] - transferred
+        changed = self.merge(peer, snapshot['state'])
+        with self._state_lock:
+            self._cursors[peer] = snapshot['seq']
+        self._stats[peer]['snapshots'] += 1
+        self._stats[peer]['head'] = max(self._stats[peer]['head'], snapshot['seq'])
+        self._save_state()
+        self.logger.info(
+            f"Dorovnáno ze snímku '{peer}' (pozice {snapshot['seq']}, {changed} změn) "
+            f"za {time.perf_counter() - started:.3f} s"
+        )
+        return snapshot['seq']
+
+    def merge(self, origin: str, state: Dict[str, Any]) -> int:
+        """
+        Sloučení stavu jiného uzlu do správce (bez mazání).
+
+        Chybějící projekty, úkoly a přiřazení studentů se doplní, stav
+        existujících úkolů rozhodne last-writer-wins jako u záznamů.
+
+        Args:
+            origin: Uzel, ze kterého stav pochází
+            state: Stav ve tvaru ProjectManager.to_dict
+
+        Returns:
+            Počet změn, které se projevily
+        """
+        apply_remote = self.manager.apply_remote
+        changed = 0
+        for name, project in state.get('projects', {}).items():
+            fields = {key: value for key, value in project.items()
+                      if key not in ('tasks', 'students')}
+            changed += apply_remote('create_project', {'project': fields}, origin)
+            tasks = project.get('tasks', [])
+            if tasks:
+                changed += apply_remote('add_tasks', {'project': name, 'tasks': tasks}, origin)
+            for task in tasks:
+                if task.get('updated_at'):
+                    changed += apply_remote('update_task_status', {
+                        'project': name, 'task_id': task['id'], 'status': task['status'],
+                        'notes': task.get('notes') or '', 'updated_at': task['updated_at']
+                    }, origin)
+            for username in project.get('students', []):
+                changed += apply_remote('assign_student',
+                                        {'project': name, 'username': username}, origin)
+        return changed
+
+    def _apply(self, peer: str, record: Dict[str, Any]) -> None:
+        """Použití záznamu; změna odkazující na data z třetího uzlu počká"""
+        try:
+            self.manager.apply_remote(record['op'], record['data'], peer)
+        except ValueError as e:
+            with self._state_lock:
+                self._deferred.append({'peer': peer, 'op': record['op'], 'data': record['data']})
+                if len(self._deferred) > MAX_DEFERRED:
+                    dropped = self._deferred.pop(0)
+                    self.logger.error(f"Odložená změna {dropped['op']} zahozena")
+            self.logger.debug(f"Změna {record['op']} z '{peer}' odložena: {e}")
+
+    def _retry_deferred(self) -> None:
+        """Opakování odložených změn (třetí uzel mezitím mohl dodat projekt nebo úkol)"""
+        with self._state_lock:
+            deferred, self._deferred = self._deferred, []
+        if not deferred:
+            return
+        waiting = []
+        for entry in deferred:
+            try:
+                self.manager.apply_remote(entry['op'], entry['data'], entry['peer'])
+            except ValueError:
+                waiting.append(entry)
+        with self._state_lock:
+            self._deferred = waiting + self._deferred
+
+    def _get(self, peer: str, path: str) -> Tuple[int, Dict[str, Any]]:
+        """HTTP GET na protějšek (gzip); vrací stav a JSON odpověď"""
+        headers = {'Accept-Encoding': 'gzip'}
+        if self.token:
+            headers[TOKEN_HEADER] = self.token
+        request = urllib.request.Request(self.peers[peer] + path, headers=headers)
+        wait = float(parse_qs(urlsplit(path).query).get('wait', ['0'])[0])
+        try:
+            with urllib.request.urlopen(request, timeout=wait + 10.0) as response:
+                status, encoding = response.status, response.headers.get('Content-Encoding')
+                body = response.read()
+        except urllib.error.HTTPError as e:
+            if e.code != 410:
+                raise
+            status, encoding, body = e.code, e.headers.get('Content-Encoding'), e.read()
+        self._stats[peer]['bytes'] += len(body)
+        _BYTES.labels(peer).inc(len(body))
+        if encoding == 'gzip':
+            body = gzip.decompress(body)
+        return status, json.loads(body)
+
+    # Stav a běh
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Stav replikace: pozice, zpoždění a přenos za každý protějšek.
+
+        Returns:
+            Slovník s uzlem, pozicí vlastního žurnálu a údaji protějšků
+            (cursor, head, behind, records, bytes, snapshot_bytes,
+            bytes_per_record bez snímků,
+            lag_ms_p50/p95/max, snapshots, errors, last_error)
+        """
+        peers = {}
+        for peer, stats in self._stats.items():
+            cursor = self._cursors.get(peer, 0)
+            lags = sorted(stats['lag_ms'])
+            peers[peer] = {
+                'url': self.peers[peer],
+                'cursor': cursor,
+                'head': stats['head'],
+                'behind': max(0, stats['head'] - cursor),
+                'records': stats['records'],
+                'bytes': stats['bytes'],
+                'snapshot_bytes': stats['snapshot_bytes'],
+                'bytes_per_record': (
+                    round((stats['bytes'] - stats['snapshot_bytes']) / stats['records'], 1)
+                    if stats['records'] else None),
+                'lag_ms_p50': round(lags[len(lags) // 2], 1) if lags else None,
+                'lag_ms_p95': round(lags[int(len(lags) * 0.95)], 1) if lags else None,
+                'lag_ms_max': round(lags[-1], 1) if lags else None,
+                'snapshots': stats['snapshots'],
+                'errors': stats['errors'],
+                'last_error': stats['last_error'],
+                'last_pull': stats['last_pull'],
+            }
+        return {'node': self.node_id, 'seq': self._head,
+                'deferred': len(self._deferred), 'peers': peers}
+
+    def start(self) -> int:
+        """
+        Spuštění HTTP serveru a vlákna stahování pro každý protějšek.
+
+        Returns:
+            Skutečné číslo portu
+        """
+        port = self.serve()
+        for peer in self.peers:
+            thread = threading.Thread(
+                target=self._run_peer, args=(peer,), name=f"Replicator-{peer}", daemon=True)
+            self._threads.append(thread)
+            thread.start()
+        self.logger.info(
+            f"Replikace uzlu '{self.node_id}' na portu {port}, "
+            f"protějšky: {', '.join(sorted(self.peers)) or 'žádné'}"
+        )
+        return port
+
+    def serve(self) -> int:
+        """
+        Spuštění jen HTTP serveru (protějšky stahují, tento uzel zatím ne).
+
+        Returns:
+            Skutečné číslo portu
+        """
+        if self._server is not None:
+            return self.port
+        replicator = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                url = urlsplit(self.path)
+                params = {key: values[0] for key, values in parse_qs(url.query).items()}
+                if replicator.token and self.headers.get(TOKEN_HEADER) != replicator.token:
+                    self._send(403, {'error': 'Neplatný klíč replikace'})
+                    return
+                try:
+                    if url.path == '/replication/log':
+                        page = replicator.changes(int(params.get('after', 0)),
+                                                  int(params.get('limit', 0)) or None,
+                                                  min(float(params.get('wait', 0)),
+                                                      replicator.poll_wait))
+                        if page is None:
+                            self._send(410, {'error': 'snapshot_required'})
+                        else:
+                            self._send_page(page)
+                    elif url.path == '/replication/snapshot':
+                        self._send(200, replicator.snapshot_state())
+                    elif url.path == '/replication/status':
+                        self._send(200, replicator.stats())
+                    else:
+                        self._send(404, {'error': 'Neznámý endpoint'})
+                except ValueError as e:
+                    self._send(400, {'error': str(e)})
+
+            def _send_page(self, page: Dict[str, Any]) -> None:
+                # Řádky žurnálu se posílají tak, jak jsou (bez nové serializace)
+                header = json.dumps({key: value for key, value in page.items()
+                                     if key != 'records'}, ensure_ascii=False)
+                body = f"{header[:-1]},\"records\":[{','.join(page['records'])}]}}"
+                self._write(200, body.encode('utf-8'))
+
+            def _send(self, status: int, payload: Dict[str, Any]) -> None:
+                self._write(status, json.dumps(payload, ensure_ascii=False,
+                                               separators=(',', ':')).encode('utf-8'))
+
+            def _write(self, status: int, body: bytes) -> None:
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                if (len(body) >= GZIP_MIN_SIZE
+                        and 'gzip' in self.headers.get('Accept-Encoding', '')):
+                    body = gzip.compress(body, compresslevel=6)
+                    self.send_header('Content-Encoding', 'gzip')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._running.set()
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        threading.Thread(
+            target=self._server.serve_forever, name="Replicator", daemon=True).start()
+        return self.port
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """
+        Zastavení serveru a vláken stahování.
+
+        Args:
+            timeout: Maximální doba čekání na každé vlákno (sekundy); vlákno
+                čekající na odpověď protějšku doběhne samo
+        """
+        self._running.clear()
+        with self._cond:
+            self._cond.notify_all()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        self._save_state()
+        if self._on_records in self.journal.listeners:
+            self.journal.listeners.remove(self._on_records)
+
+    def _run_peer(self, peer: str) -> None:
+        """Smyčka stahování od jednoho protějšku"""
+        stats = self._stats[peer]
+        while self._running.is_set():
+            try:
+                self.pull(peer, wait=self.poll_wait)
+                stats['last_error'] = None
+            except (OSError, ValueError, KeyError) as e:
+                if stats['last_error'] is None:
+                    self.logger.warning(f"Replikace z '{peer}' selhala: {e}")
+                stats['errors'] += 1
+                stats['last_error'] = str(e)
+                time.sleep(self.interval)
+
+    def _load_state(self) -> None:
+        """Načtení pozic a odložených změn z minulého běhu"""
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            self.logger.error(f"Stav replikace '{self.state_file}' nelze načíst: {e}")
+            return
+        self._cursors = {peer: int(cursor) for peer, cursor in state.get('cursors', {}).items()
+                         if peer in self.peers}
+        self._deferred = list(state.get('deferred', []))
+
+    def _save_state(self) -> None:
+        """Atomické uložení pozic v logu protějšků"""
+        with self._state_lock:
+            state = {'node': self.node_id, 'cursors': dict(self._cursors),
+                     'deferred': list(self._deferred)}
+            temp_path = f"{self.state_file}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(temp_path, self.state_file)
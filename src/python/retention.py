@@ -0,0 +1,423 @@
+"""
+Retence a kompakce dat - Retention Compactor
+
+Modul pro promazávání starých surových měření z tabulky weather_data
+a system_data (vzorky SystemSampleru) a starých rotovaných logů podle
+``monitoring.log_retention_days``.
+Mazání probíhá v malých dávkách s krátkými transakcemi, aby neblokovalo
+zápis nových měření. Před smazáním se data započítají do hodinových
+souhrnů (weather_data_hourly), volitelně se archivují do CSV a uvolněné
+stránky se vrací systému přes inkrementální VACUUM.
+"""
+
+import csv
+import gzip
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .weather_store import (
+    CHANNELS, connect, create_schema, enable_incremental_vacuum, format_timestamp
+)
+
+
+DEFAULT_RETENTION_DAYS = 30
+DEFAULT_INTERVAL = 3600.0
+
+
+class RetentionCompactor:
+    """
+    Kompakce tabulky weather_data a úklid logů.
+
+    Každá dávka (``chunk_size`` řádků) běží ve vlastní krátké transakci;
+    doba držení zámku je měřena a vystavena ve statistikách jako
+    pauza zápisu (``pause_max_ms``, ``pause_total_ms``).
+
+    Attributes:
+        db_path (str): Cesta k SQLite databázi
+        retention_days (int): Počet dní, po které se drží surová data
+        chunk_size (int): Maximální počet řádků v jedné dávce
+        chunk_pause (float): Pauza mezi dávkami (sekundy)
+        archive_dir (Optional[Path]): Adresář pro CSV archiv (None = jen mazat)
+        log_dir (Optional[Path]): Adresář s logy k promazání
+        vacuum_pages (int): Počet stránek uvolněných jedním inkrementálním VACUUM
+        stats (Dict): Statistiky posledního běhu
+        logger (logging.Logger): Logger pro auditování
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        retention_days: int = DEFAULT_RETENTION_DAYS,
+        chunk_size: int = 500,
+        chunk_pause: float = 0.05,
+        archive_dir: Optional[str] = None,
+        log_dir: Optional[str] = None,
+        vacuum_pages: int = 256
+    ):
+        """
+        Inicializace kompaktoru.
+
+        Args:
+            db_path: Cesta k SQLite databázi
+            retention_days: Počet dní, po které se drží surová data
+            chunk_size: Maximální počet řádků v jedné dávce
+            chunk_pause: Pauza mezi dávkami (sekundy)
+            archive_dir: Adresář pro CSV archiv (volitelné)
+            log_dir: Adresář s logy k promazání (volitelné)
+            vacuum_pages: Počet stránek uvolněných jedním krokem VACUUM
+
+        Raises:
+            ValueError: Pokud je retence nebo velikost dávky neplatná
+        """
+        if retention_days < 1:
+            raise ValueError("Retence musí být alespoň 1 den")
+        if chunk_size < 1:
+            raise ValueError("Velikost dávky musí být kladná")
+
+        self.db_path = db_path
+        self.retention_days = retention_days
+        self.chunk_size = chunk_size
+        self.chunk_pause = chunk_pause
+        self.archive_dir = Path(archive_dir) if archive_dir else None
+        self.log_dir = Path(log_dir) if log_dir else None
+        self.vacuum_pages = vacuum_pages
+        self.stats: Dict[str, Any] = {}
+        self.logger = logging.getLogger("RetentionCompactor")
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_config(cls, config: Any, db_path: str, **kwargs: Any) -> "RetentionCompactor":
+        """
+        Vytvoření kompaktoru podle hlavní konfigurace.
+
+        Args:
+            config: ConfigManager (nebo cokoliv s metodou ``get``)
+            db_path: Cesta k SQLite databázi
+            **kwargs: Další parametry konstruktoru
+
+        Returns:
+            Nakonfigurovaný kompaktor
+        """
+        kwargs.setdefault(
+            'retention_days',
+            int(config.get('monitoring.log_retention_days', DEFAULT_RETENTION_DAYS))
+        )
+        kwargs.setdefault('log_dir', config.get('logging.log_dir'))
+        return cls(db_path, **kwargs)
+
+    def run_once(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Jeden průchod kompakce: souhrny, archiv, mazání, VACUUM a logy.
+
+        Args:
+            now: Referenční čas (výchozí: teď)
+
+        Returns:
+            Slovník se statistikami běhu
+        """
+        now = now or datetime.now()
+        cutoff = format_timestamp(now - timedelta(days=self.retention_days))
+        stats: Dict[str, Any] = {
+            'cutoff': cutoff,
+            'rows_deleted': 0,
+            'system_rows_deleted': 0,
+            'rows_archived': 0,
+            'chunks': 0,
+            'pause_max_ms': 0.0,
+            'pause_total_ms': 0.0,
+            'pages_freed': 0,
+            'vacuum_steps': 0,
+            'logs_removed': 0,
+        }
+        started = time.perf_counter()
+
+        connection = connect(self.db_path)
+        try:
+            # Zajistí existenci tabulek (včetně souhrnů) i u starší databáze
+            create_schema(connection)
+
+            while not self._stop_event.is_set():
+                pause_started = time.perf_counter()
+                deleted = self._compact_chunk(connection, cutoff, stats)
+                pause_ms = (time.perf_counter() - pause_started) * 1000
+                if deleted == 0:
+                    break
+                stats['chunks'] += 1
+                stats['rows_deleted'] += deleted
+                stats['pause_total_ms'] += pause_ms
+                stats['pause_max_ms'] = max(stats['pause_max_ms'], pause_ms)
+                if deleted < self.chunk_size:
+                    break
+                time.sleep(self.chunk_pause)
+
+            stats['system_rows_deleted'] = self._prune_system_data(connection, cutoff)
+            if connection.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+                stats['pages_freed'], stats['vacuum_steps'] = (
+                    self._incremental_vacuum(connection)
+                )
+            else:
+                self.logger.warning(
+                    f"Databáze '{self.db_path}' nemá inkrementální VACUUM, volné stránky "
+                    f"zůstávají v souboru; převod: RetentionCompactor.convert_database()"
+                )
+            page_size = connection.execute("PRAGMA page_size").fetchone()[0]
+            page_count = connection.execute("PRAGMA page_count").fetchone()[0]
+            stats['db_size_bytes'] = page_size * page_count
+        finally:
+            connection.close()
+
+        if self.log_dir:
+            stats['logs_removed'] = self.prune_logs(now)
+
+        stats['duration_ms'] = (time.perf_counter() - started) * 1000
+        self.stats = stats
+        self.logger.info(
+            f"Kompakce dokončena: smazáno {stats['rows_deleted']} řádků "
+            f"v {stats['chunks']} dávkách, max. pauza {stats['pause_max_ms']:.1f} ms, "
+            f"uvolněno {stats['pages_freed']} stránek"
+        )
+        return stats
+
+    def convert_database(self) -> bool:
+        """
+        Jednorázový převod databáze na inkrementální VACUUM.
+
+        Plný VACUUM přepíše celý soubor a po dobu běhu blokuje zápis
+        měření, proto se nespouští automaticky, ale jako samostatný
+        údržbový krok (např. při aktualizaci kiosku).
+
+        Returns:
+            True pokud se databáze převáděla, False pokud už převedená byla
+        """
+        connection = connect(self.db_path)
+        try:
+            page_size = connection.execute("PRAGMA page_size").fetchone()[0]
+            size = page_size * connection.execute("PRAGMA page_count").fetchone()[0]
+            if connection.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+                self.logger.info(f"Databáze '{self.db_path}' už má inkrementální VACUUM")
+                return False
+            self.logger.info(
+                f"Převádím databázi '{self.db_path}' ({size / 1e6:.1f} MB) "
+                f"na inkrementální VACUUM (plný VACUUM, zápis je blokován)"
+            )
+            started = time.perf_counter()
+            enable_incremental_vacuum(connection)
+            size = page_size * connection.execute("PRAGMA page_count").fetchone()[0]
+            self.logger.info(
+                f"Převod dokončen za {time.perf_counter() - started:.1f} s, "
+                f"velikost {size / 1e6:.1f} MB"
+            )
+            return True
+        finally:
+            connection.close()
+
+    def prune_logs(self, now: Optional[datetime] = None) -> int:
+        """
+        Smazání rotovaných logů starších než retence.
+
+        Aktivní logy (``*.log``) se nemažou, pouze jejich rotované
+        kopie (``*.log.1``, ``*.log.gz`` apod.).
+
+        Args:
+            now: Referenční čas (výchozí: teď)
+
+        Returns:
+            Počet smazaných souborů
+        """
+        if not self.log_dir or not self.log_dir.is_dir():
+            return 0
+
+        now = now or datetime.now()
+        cutoff = (now - timedelta(days=self.retention_days)).timestamp()
+        removed = 0
+        for path in self.log_dir.iterdir():
+            if not path.is_file() or path.suffix == '.log' or '.log' not in path.name:
+                continue
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except OSError as e:
+                self.logger.warning(f"Log '{path}' nelze smazat: {e}")
+        return removed
+
+    def start(self, interval: float = DEFAULT_INTERVAL) -> None:
+        """
+        Spuštění kompakce na pozadí.
+
+        Args:
+            interval: Interval mezi běhy (sekundy)
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run_loop, args=(interval,),
+            name="RetentionCompactor", daemon=True
+        )
+        self._thread.start()
+        self.logger.info(f"Kompakce na pozadí spuštěna (interval {interval} s)")
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Zastavení kompakce na pozadí (rozpracovaná dávka se dokončí).
+
+        Args:
+            timeout: Maximální doba čekání na ukončení vlákna
+        """
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                return
+            self._thread = None
+        self._stop_event.clear()
+
+    def _run_loop(self, interval: float) -> None:
+        """Smyčka vlákna na pozadí"""
+        while not self._stop_event.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                self.logger.error(f"Chyba při kompakci: {e}", exc_info=True)
+            self._stop_event.wait(interval)
+
+    def _compact_chunk(self, connection: Any, cutoff: str, stats: Dict[str, Any]) -> int:
+        """
+        Zpracování jedné dávky v jedné transakci.
+
+        Returns:
+            Počet smazaných řádků
+        """
+        with connection:
+            rows = connection.execute(
+                "SELECT id, timestamp, temperature, humidity, pressure FROM weather_data "
+                "WHERE timestamp < ? ORDER BY timestamp LIMIT ?",
+                (cutoff, self.chunk_size)
+            ).fetchall()
+            if not rows:
+                return 0
+
+            self._merge_rollups(connection, rows)
+            if self.archive_dir:
+                self._archive(rows)
+                stats['rows_archived'] += len(rows)
+            connection.executemany(
+                "DELETE FROM weather_data WHERE id = ?",
+                [(row[0],) for row in rows]
+            )
+        return len(rows)
+
+    def _prune_system_data(self, connection: Any, cutoff: str) -> int:
+        """
+        Smazání starých systémových vzorků po dávkách (bez souhrnů a archivu).
+
+        Returns:
+            Počet smazaných řádků
+        """
+        exists = connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'system_data'"
+        ).fetchone()
+        deleted = 0
+        while exists and not self._stop_event.is_set():
+            with connection:
+                cursor = connection.execute(
+                    "DELETE FROM system_data WHERE id IN (SELECT id FROM system_data "
+                    "WHERE timestamp < ? ORDER BY timestamp LIMIT ?)",
+                    (cutoff, self.chunk_size)
+                )
+            deleted += cursor.rowcount
+            if cursor.rowcount < self.chunk_size:
+                break
+            time.sleep(self.chunk_pause)
+        return deleted
+
+    def _merge_rollups(self, connection: Any, rows: Sequence[Tuple[Any, ...]]) -> None:
+        """Započtení dávky do hodinových souhrnů"""
+        channels = CHANNELS
+        buckets: Dict[str, List[Any]] = {}
+        for row in rows:
+            bucket = buckets.setdefault(
+                str(row[1])[:13], [0] + [None, 0, None, None] * len(channels)
+            )
+            bucket[0] += 1
+            for index, value in enumerate(row[2:]):
+                if value is None:
+                    continue
+                offset = 1 + 4 * index
+                bucket[offset] = value if bucket[offset] is None else bucket[offset] + value
+                bucket[offset + 1] += 1
+                bucket[offset + 2] = (
+                    value if bucket[offset + 2] is None else min(bucket[offset + 2], value)
+                )
+                bucket[offset + 3] = (
+                    value if bucket[offset + 3] is None else max(bucket[offset + 3], value)
+                )
+
+        columns = ", ".join(
+            f"{channel}_sum, {channel}_count, {channel}_min, {channel}_max"
+            for channel in channels
+        )
+        updates = ", ".join(
+            f"{channel}_sum = coalesce({channel}_sum + excluded.{channel}_sum, "
+            f"{channel}_sum, excluded.{channel}_sum), "
+            f"{channel}_count = coalesce({channel}_count, samples) + excluded.{channel}_count, "
+            f"{channel}_min = min(coalesce({channel}_min, excluded.{channel}_min), "
+            f"coalesce(excluded.{channel}_min, {channel}_min)), "
+            f"{channel}_max = max(coalesce({channel}_max, excluded.{channel}_max), "
+            f"coalesce(excluded.{channel}_max, {channel}_max))"
+            for channel in channels
+        )
+        placeholders = ", ".join("?" * (2 + 4 * len(channels)))
+        connection.executemany(
+            f"INSERT INTO weather_data_hourly (hour, samples, {columns}) "
+            f"VALUES ({placeholders}) "
+            f"ON CONFLICT(hour) DO UPDATE SET samples = samples + excluded.samples, {updates}",
+            [(hour, *values) for hour, values in buckets.items()]
+        )
+
+    def _archive(self, rows: Sequence[Tuple[Any, ...]]) -> None:
+        """Připsání dávky do měsíčních CSV archivů (gzip)"""
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        by_month: Dict[str, List[Tuple[Any, ...]]] = {}
+        for row in rows:
+            by_month.setdefault(str(row[1])[:7], []).append(row)
+
+        for month, month_rows in by_month.items():
+            path = self.archive_dir / f"weather_data-{month}.csv.gz"
+            new_file = not path.exists()
+            # Režim 'at' přidává nový gzip člen; výsledek je validní gzip soubor
+            with gzip.open(path, 'at', encoding='utf-8', newline='') as f:
+                writer = csv.writer(f)
+                if new_file:
+                    writer.writerow(['id', 'timestamp', *CHANNELS])
+                writer.writerows(month_rows)
+
+    def _incremental_vacuum(self, connection: Any) -> Tuple[int, int]:
+        """
+        Vrácení volných stránek souborovému systému po malých krocích.
+
+        Returns:
+            Počet uvolněných stránek a počet kroků
+        """
+        freed = steps = 0
+        while not self._stop_event.is_set():
+            freelist = connection.execute("PRAGMA freelist_count").fetchone()[0]
+            if not freelist:
+                break
+            # PRAGMA uvolňuje jednu stránku na krok příkazu; execute() příkaz
+            # bez sloupců provede jen jednou, executescript() až do konce
+            connection.executescript(f"PRAGMA incremental_vacuum({self.vacuum_pages})")
+            freed += freelist - connection.execute("PRAGMA freelist_count").fetchone()[0]
+            steps += 1
+            time.sleep(self.chunk_pause)
+        # Kontrolní bod přenese zkrácení souboru i z WAL do hlavní databáze
+        if freed and os.path.exists(f"{self.db_path}-wal"):
+            connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return freed, steps
@@ -0,0 +1,393 @@
+"""
+Spouštění testů studentského kódu - Sandbox Runner
+
+Modul pro ověřování funkčnosti odevzdaných prací. Udržuje pool
+předem spuštěných pracovních procesů s předimportovanými moduly
+a limity prostředků (CPU čas, paměť, velikost souborů přes ``resource``).
+Procesy se znovu používají pro další práce, takže se start interpretu
+neplatí za každý test. Práce, která překročí limit, je okamžitě ukončena
+a proces nahrazen novým.
+
+Pozor: nejde o bezpečnostní hranici proti záměrně škodlivému kódu,
+pouze o ochranu kiosku před zacyklením a vyčerpáním paměti.
+"""
+
+import atexit
+import contextlib
+import importlib
+import io
+import logging
+import multiprocessing
+import os
+import queue
+import signal
+import tempfile
+import threading
+import time
+import traceback
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+
+DEFAULT_PRELOAD = ('collections', 'json', 'math', 'random', 're', 'statistics', 'unittest')
+MAX_OUTPUT_CHARS = 4000
+
+
+def _set_limit(kind: int, soft: int) -> None:
+    """Nastavení měkkého limitu (nejvýše na tvrdý limit)"""
+    _, hard = resource.getrlimit(kind)
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(kind, (soft, hard))
+
+
+def _address_space_size() -> int:
+    """Aktuální velikost adresního prostoru procesu v bajtech (Linux)"""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[0]) * os.sysconf('SC_PAGE_SIZE')
+    except (IOError, ValueError, IndexError):
+        return 0
+
+
+def _apply_static_limits(memory_mb: int, file_size_mb: int) -> None:
+    """
+    Limity platné po celou dobu života pracovního procesu.
+
+    Limit paměti se počítá navíc k již obsazenému adresnímu prostoru
+    (interpret a předimportované moduly).
+    """
+    if resource is None:
+        return
+    limits = (
+        ('RLIMIT_AS', memory_mb, _address_space_size()),
+        ('RLIMIT_FSIZE', file_size_mb, 0),
+    )
+    for kind, megabytes, base in limits:
+        if megabytes and hasattr(resource, kind):
+            try:
+                _set_limit(getattr(resource, kind), base + megabytes * 1024 * 1024)
+            except (ValueError, OSError):
+                pass
+
+
+def _apply_cpu_limit(cpu_seconds: int) -> None:
+    """Limit CPU pro další úlohu (počítá se od aktuální spotřeby procesu)"""
+    if resource is None or not cpu_seconds:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    used = int(usage.ru_utime + usage.ru_stime) + 1
+    try:
+        _set_limit(resource.RLIMIT_CPU, used + cpu_seconds)
+    except (ValueError, OSError):
+        pass
+
+
+def _worker_main(
+    connection: Any,
+    preload: Sequence[str],
+    cpu_seconds: int,
+    memory_mb: int,
+    file_size_mb: int
+) -> None:
+    """Hlavní smyčka pracovního procesu"""
+    for module in preload:
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            pass
+    workdir = tempfile.mkdtemp(prefix='sandbox-')
+    os.chdir(workdir)
+    _apply_static_limits(memory_mb, file_size_mb)
+    connection.send(('ready', os.getpid()))
+
+    while True:
+        try:
+            job = connection.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+        code, tests = job
+        _apply_cpu_limit(cpu_seconds)
+        _run_job(connection, code, tests)
+
+
+def _run_job(connection: Any, code: str, tests: List[Tuple[str, str]]) -> None:
+    """Spuštění kódu práce a jednotlivých testů; výsledky se posílají průběžně"""
+    output = io.StringIO()
+    namespace: Dict[str, Any] = {'__name__': 'submission'}
+    setup_error = None
+    with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+        try:
+            exec(compile(code, '<submission>', 'exec'), namespace)
+        except MemoryError:
+            setup_error = 'MemoryError: překročen limit paměti'
+        except BaseException as e:
+            setup_error = ''.join(traceback.format_exception_only(type(e), e)).strip()
+
+    for name, source in tests:
+        started = time.perf_counter()
+        error = setup_error
+        if error is None:
+            with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+                try:
+                    exec(compile(source, f'<test {name}>', 'exec'), dict(namespace))
+                except MemoryError:
+                    error = 'MemoryError: překročen limit paměti'
+                except BaseException as e:
+                    error = ''.join(traceback.format_exception_only(type(e), e)).strip()
+        connection.send(('test', {
+            'name': name,
+            'passed': error is None,
+            'duration_ms': round((time.perf_counter() - started) * 1000, 3),
+            'error': error,
+        }))
+
+    connection.send(('done', {
+        'setup_error': setup_error,
+        'output': output.getvalue()[:MAX_OUTPUT_CHARS],
+    }))
+
+
+class _Worker:
+    """Obal jednoho pracovního procesu a jeho roury"""
+
+    def __init__(self, context: Any, args: Tuple[Any, ...]):
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main, args=(child_connection, *args), daemon=True
+        )
+        self.process.start()
+        child_connection.close()
+        self.jobs = 0
+        _, self.pid = self.connection.recv()
+
+    def kill(self) -> None:
+        """Okamžité ukončení procesu"""
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(1)
+        self.connection.close()
+
+    def stop(self) -> None:
+        """Řádné ukončení procesu"""
+        try:
+            self.connection.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(1)
+        if self.process.is_alive():
+            self.kill()
+        else:
+            self.connection.close()
+
+
+class SandboxRunner:
+    """
+    Pool znovupoužitelných pracovních procesů pro testy studentského kódu.
+
+    Attributes:
+        workers (int): Počet pracovních procesů
+        cpu_seconds (int): Limit CPU času na jednu práci
+        memory_mb (int): Limit paměti nad rámec interpretu (MB)
+        file_size_mb (int): Limit velikosti zapisovaných souborů (MB)
+        wall_timeout (float): Limit reálného času na jednu práci (sekundy)
+        max_jobs_per_worker (int): Po kolika pracích se proces obnoví
+        logger (logging.Logger): Logger pro auditování
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        cpu_seconds: int = 5,
+        memory_mb: int = 512,
+        file_size_mb: int = 8,
+        wall_timeout: float = 10.0,
+        max_jobs_per_worker: int = 50,
+        preload: Sequence[str] = DEFAULT_PRELOAD
+    ):
+        """
+        Inicializace a spuštění pracovních procesů.
+
+        Args:
+            workers: Počet pracovních procesů
+            cpu_seconds: Limit CPU času na jednu práci
+            memory_mb: Limit paměti nad rámec interpretu (MB, 0 = bez limitu)
+            file_size_mb: Limit velikosti zapisovaných souborů (MB)
+            wall_timeout: Limit reálného času na jednu práci (sekundy)
+            max_jobs_per_worker: Po kolika pracích se proces obnoví
+                (omezuje vliv práce, která změní sdílené moduly)
+            preload: Moduly importované předem v každém procesu
+
+        Raises:
+            ValueError: Pokud je počet procesů menší než 1
+        """
+        if workers < 1:
+            raise ValueError("Počet pracovních procesů musí být alespoň 1")
+
+        self.workers = workers
+        self.cpu_seconds = cpu_seconds
+        self.memory_mb = memory_mb
+        self.file_size_mb = file_size_mb
+        self.wall_timeout = wall_timeout
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.logger = logging.getLogger("SandboxRunner")
+
+        methods = multiprocessing.get_all_start_methods()
+        self._context = multiprocessing.get_context('fork' if 'fork' in methods else 'spawn')
+        self._worker_args = (tuple(preload), cpu_seconds, memory_mb, file_size_mb)
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._all: List[_Worker] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        for _ in range(workers):
+            self._idle.put(self._spawn())
+
+    def __enter__(self) -> "SandboxRunner":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def run(
+        self,
+        code: str,
+        tests: Dict[str, str],
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Spuštění testů nad kódem jedné práce.
+
+        Každý test je úsek kódu (typicky s ``assert``), který se spustí
+        ve jmenném prostoru práce.
+
+        Args:
+            code: Zdrojový kód práce
+            tests: Slovník {název testu: kód testu}
+            timeout: Limit reálného času (výchozí: ``wall_timeout``)
+
+        Returns:
+            Slovník s 'passed', 'failed', 'total', 'tests' (výsledky
+            a časy jednotlivých testů), 'killed', 'error', 'output'
+            a 'duration_ms'
+
+        Raises:
+            RuntimeError: Pokud je runner již uzavřen
+        """
+        if self._closed:
+            raise RuntimeError("SandboxRunner je uzavřen")
+
+        test_items = list(tests.items())
+        deadline = time.monotonic() + (timeout or self.wall_timeout)
+        started = time.perf_counter()
+        results: List[Dict[str, Any]] = []
+        summary: Dict[str, Any] = {'setup_error': None, 'output': ''}
+        killed_reason = None
+
+        worker = self._idle.get()
+        try:
+            worker.connection.send((code, test_items))
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    killed_reason = 'Překročen časový limit'
+                    break
+                try:
+                    if not worker.connection.poll(min(remaining, 0.5)):
+                        continue
+                    kind, payload = worker.connection.recv()
+                except (EOFError, OSError):
+                    killed_reason = self._exit_reason(worker)
+                    break
+                if kind == 'test':
+                    results.append(payload)
+                else:
+                    summary = payload
+                    break
+        finally:
+            worker.jobs += 1
+            if killed_reason:
+                worker.kill()
+                worker = self._replace(worker)
+            elif worker.jobs >= self.max_jobs_per_worker:
+                worker.stop()
+                worker = self._replace(worker)
+            self._idle.put(worker)
+
+        if killed_reason:
+            self.logger.warning(f"Práce ukončena: {killed_reason}")
+            for name, _ in test_items[len(results):]:
+                results.append({
+                    'name': name, 'passed': False, 'duration_ms': None, 'error': killed_reason
+                })
+
+        passed = sum(1 for result in results if result['passed'])
+        return {
+            'passed': passed,
+            'failed': len(results) - passed,
+            'total': len(results),
+            'tests': results,
+            'killed': killed_reason is not None,
+            'error': killed_reason or summary['setup_error'],
+            'output': summary['output'],
+            'duration_ms': round((time.perf_counter() - started) * 1000, 3),
+        }
+
+    def close(self) -> None:
+        """Ukončení všech pracovních procesů"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            workers = list(self._all)
+        for worker in workers:
+            worker.stop()
+
+    def _spawn(self) -> _Worker:
+        """Spuštění nového pracovního procesu"""
+        worker = _Worker(self._context, self._worker_args)
+        with self._lock:
+            self._all.append(worker)
+        return worker
+
+    def _replace(self, worker: _Worker) -> _Worker:
+        """Náhrada ukončeného pracovního procesu novým"""
+        with self._lock:
+            if worker in self._all:
+                self._all.remove(worker)
+        return self._spawn()
+
+    def _exit_reason(self, worker: _Worker) -> str:
+        """Popis důvodu, proč pracovní proces skončil"""
+        worker.process.join(1)
+        code = worker.process.exitcode
+        if code is not None and code < 0:
+            name = signal.Signals(-code).name
+            if name == 'SIGXCPU':
+                return "Překročen limit CPU času"
+            return f"Proces ukončen signálem {name}"
+        return f"Proces neočekávaně skončil (kód {code})"
+
+
+_runner: Optional[SandboxRunner] = None
+_runner_lock = threading.Lock()
+
+
+def get_runner() -> SandboxRunner:
+    """
+    Sdílený runner pro aktuální proces (vytvoří se při prvním použití).
+
+    Returns:
+        Instance SandboxRunner
+    """
+    global _runner
+    with _runner_lock:
+        if _runner is None or _runner._closed:
+            _runner = SandboxRunner()
+            atexit.register(_runner.close)
+        return _runner
@@ -0,0 +1,379 @@
+"""
+Fulltextové vyhledávání - Search Index
+
+Invertovaný index nad názvy, popisy a poznámkami projektů a úkolů.
+Text se normalizuje s ohledem na češtinu (odstranění diakritiky,
+převod velikosti písmen, jednoduché odříznutí koncovek), takže dotaz
+"meteostanici" najde "Meteostanice". Poslední slovo dotazu se bere
+jako prefix (našeptávání na kiosku). Index se udržuje průběžně
+z ProjectManageru (add_task, add_tasks, update_task_status) a výsledky
+řadí podle BM25 s předpočítanou vahou v každém záznamu indexu, takže
+dotaz nepřepočítává délky dokumentů.
+"""
+
+import bisect
+import heapq
+import logging
+import math
+import re
+import threading
+import time
+import unicodedata
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .metrics import get_registry
+
+
+TASK_FIELDS = (('name', 3.0), ('assignee', 2.0), ('description', 1.0), ('notes', 1.0),
+               ('milestone', 1.0))
+PROJECT_FIELDS = (('name', 3.0), ('description', 1.0), ('objectives', 1.0))
+STOPWORDS = frozenset((
+    'a', 'i', 'k', 'o', 's', 'u', 'v', 'z', 'na', 'do', 'ze', 'se', 'si', 'je', 'to', 'pro',
+    'po', 'za', 'od', 'pri', 'jak', 'ale', 'nebo', 'jako', 'ktery', 'ktera', 'ktere',
+))
+# Koncovky (bez diakritiky), nejdelší první; kmen musí mít aspoň MIN_STEM znaků
+SUFFIXES = tuple(sorted((
+    'atech', 'etem', 'atum', 'ovi', 'ove', 'ovy', 'ech', 'ich', 'ych', 'ymi', 'ami', 'emi',
+    'imi', 'ach', 'eho', 'emu', 'ymu', 'iho', 'imu', 'ou', 'em', 'im', 'om', 'um', 'ho', 'mu',
+    'a', 'e', 'i', 'o', 'u', 'y',
+), key=len, reverse=True))
+MIN_STEM = 3
+MIN_PREFIX = 2
+MAX_PREFIX_TERMS = 64
+TOP_CACHE = 50
+K1 = 1.2
+B = 0.75
+REFERENCE_LENGTH = 8.0
+
+_TOKEN = re.compile(r'[^\W_]+')
+_QUERY_SECONDS = get_registry().histogram(
+    'search_query_seconds', 'Doba fulltextového dotazu')
+
+
+def fold(text: str) -> str:
+    """
+    Převod na malá písmena bez diakritiky.
+
+    Args:
+        text: Vstupní text
+
+    Returns:
+        Text bez diakritiky, malými písmeny
+    """
+    decomposed = unicodedata.normalize('NFKD', text.casefold())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def stem(token: str) -> str:
+    """Odříznutí české koncovky (token musí být už bez diakritiky)"""
+    if token.isdigit():
+        return token
+    for suffix in SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= MIN_STEM:
+            return token[:-len(suffix)]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Rozdělení textu na normalizovaná slova (bez stop slov, bez kmenů).
+
+    Args:
+        text: Vstupní text
+
+    Returns:
+        Seznam slov bez diakritiky, malými písmeny
+    """
+    return [token for token in _TOKEN.findall(fold(text)) if token not in STOPWORDS]
+
+
+def analyze(text: str) -> List[str]:
+    """Slova textu jako termy indexu (kmeny)"""
+    return [stem(token) for token in tokenize(text)]
+
+
+class SearchIndex:
+    """
+    Průběžně udržovaný invertovaný index projektů a úkolů.
+
+    Dokument je projekt (klíč ('project', název)) nebo úkol (klíč
+    ('task', ID)). Každý záznam indexu nese předpočítanou váhu BM25
+    (četnost slova ve vážených polích normalizovaná délkou dokumentu);
+    při dotazu se k ní přidává jen IDF termu.
+
+    Attributes:
+        logger (logging.Logger): Logger
+    """
+
+    def __init__(self):
+        """Inicializace prázdného indexu"""
+        self.logger = logging.getLogger("SearchIndex")
+        self._lock = threading.RLock()
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._vocabulary: List[str] = []
+        self._top: Dict[str, List[Tuple[int, float]]] = {}
+        self._doc_ids: Dict[Tuple[str, Any], int] = {}
+        self._docs: Dict[int, Tuple[Tuple[str, Any], Optional[str], Tuple[str, ...]]] = {}
+        self._next_id = 0
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def attach(self, manager: Any) -> "SearchIndex":
+        """
+        Napojení na ProjectManager a naplnění z jeho aktuálního stavu.
+
+        Args:
+            manager: ProjectManager
+
+        Returns:
+            Tento index
+        """
+        manager.search_index = self
+        self.rebuild(manager.projects)
+        return self
+
+    def rebuild(self, projects: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Přestavba celého indexu (např. po načtení stavu).
+
+        Args:
+            projects: Projekty ProjectManageru včetně úkolů
+        """
+        started = time.perf_counter()
+        with self._lock:
+            self._postings = {}
+            self._vocabulary = []
+            self._top = {}
+            self._doc_ids = {}
+            self._docs = {}
+            for name, project in list(projects.items()):
+                self.index_project(project)
+                for task in list(project['tasks']):
+                    self.index_task(task, name)
+        self.logger.info(
+            f"Index přestavěn: {len(self._docs)} dokumentů, {len(self._vocabulary)} termů "
+            f"za {time.perf_counter() - started:.2f} s"
+        )
+
+    def index_project(self, project: Dict[str, Any]) -> None:
+        """Zaindexování (nebo přeindexování) projektu"""
+        self._index(('project', project['name']), None, project, PROJECT_FIELDS)
+
+    def index_task(self, task: Dict[str, Any], project_name: Optional[str] = None) -> None:
+        """
+        Zaindexování (nebo přeindexování) úkolu.
+
+        Args:
+            task: Úkol z ProjectManageru
+            project_name: Projekt úkolu (vrací se ve výsledcích a filtruje se podle něj)
+        """
+        self._index(('task', task['id']), project_name, task, TASK_FIELDS)
+
+    def remove(self, kind: str, key: Any) -> bool:
+        """
+        Odebrání dokumentu z indexu.
+
+        Args:
+            kind: 'task' nebo 'project'
+            key: ID úkolu nebo název projektu
+
+        Returns:
+            True pokud dokument v indexu byl
+        """
+        with self._lock:
+            doc_id = self._doc_ids.pop((kind, key), None)
+            if doc_id is None:
+                return False
+            self._drop(doc_id)
+            return True
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        kind: Optional[str] = None,
+        project: Optional[str] = None,
+        prefix: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Vyhledání dokumentů, které obsahují všechna slova dotazu.
+
+        Args:
+            query: Dotaz (poslední slovo se při prefix=True doplňuje)
+            limit: Maximální počet výsledků
+            kind: Jen 'task' nebo 'project' (volitelné)
+            project: Jen úkoly daného projektu (volitelné)
+            prefix: Doplňovat poslední slovo dotazu
+
+        Returns:
+            Seznam {'type', 'id', 'project', 'score'} seřazený podle skóre
+        """
+        started = time.perf_counter()
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        with self._lock:
+            groups = [self._term(stem(token)) for token in tokens[:-1]]
+            last = tokens[-1]
+            groups.append(self._prefix(last) if prefix else self._term(stem(last)))
+            accept: Optional[Callable[[int], bool]] = None
+            if kind is not None or project is not None:
+                def matches(doc_id: int) -> bool:
+                    (doc_kind, key), project_name, _ = self._docs[doc_id]
+                    return ((kind is None or doc_kind == kind) and
+                            (project is None or project_name == project
+                             or (doc_kind == 'project' and key == project)))
+                accept = matches
+            best = self._rank(groups, limit, accept)
+            results = []
+            for doc_id, score in best:
+                (doc_kind, key), project_name, _ = self._docs[doc_id]
+                results.append({
+                    'type': doc_kind,
+                    'id': key,
+                    'project': project_name if doc_kind == 'task' else key,
+                    'score': round(score, 4),
+                })
+        _QUERY_SECONDS.observe(time.perf_counter() - started)
+        return results
+
+    def stats(self) -> Dict[str, int]:
+        """Velikost indexu"""
+        with self._lock:
+            return {
+                'documents': len(self._docs),
+                'terms': len(self._vocabulary),
+                'postings': sum(len(postings) for postings in self._postings.values()),
+            }
+
+    def _index(
+        self,
+        key: Tuple[str, Any],
+        project_name: Optional[str],
+        document: Dict[str, Any],
+        fields: Iterable[Tuple[str, float]]
+    ) -> None:
+        """Přepočet termů dokumentu a aktualizace záznamů indexu"""
+        frequencies: Dict[str, float] = {}
+        length = 0
+        for field, weight in fields:
+            value = document.get(field)
+            if not value:
+                continue
+            if isinstance(value, (list, tuple)):
+                value = ' '.join(str(item) for item in value)
+            terms = analyze(str(value))
+            length += len(terms)
+            for term in terms:
+                frequencies[term] = frequencies.get(term, 0.0) + weight
+        norm = K1 * (1 - B + B * length / REFERENCE_LENGTH)
+
+        with self._lock:
+            doc_id = self._doc_ids.get(key)
+            if doc_id is not None:
+                self._drop(doc_id)
+            doc_id = self._next_id
+            self._next_id += 1
+            self._doc_ids[key] = doc_id
+            self._docs[doc_id] = (key, project_name, tuple(frequencies))
+            for term, frequency in frequencies.items():
+                self._top.pop(term, None)
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = {}
+                    bisect.insort(self._vocabulary, term)
+                postings[doc_id] = frequency * (K1 + 1) / (frequency + norm)
+
+    def _drop(self, doc_id: int) -> None:
+        """Odebrání záznamů dokumentu (volá se pod zámkem)"""
+        _, _, terms = self._docs.pop(doc_id)
+        for term in terms:
+            self._top.pop(term, None)
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+                del self._vocabulary[bisect.bisect_left(self._vocabulary, term)]
+
+    def _idf(self, term: str) -> float:
+        frequency = len(self._postings[term])
+        return math.log(1 + (len(self._docs) - frequency + 0.5) / (frequency + 0.5))
+
+    def _term(self, term: str) -> List[Tuple[str, float, Dict[int, float]]]:
+        """Term s násobitelem (IDF) a záznamy; prázdný seznam = nic nenalezeno"""
+        postings = self._postings.get(term)
+        if not postings:
+            return []
+        return [(term, self._idf(term), postings)]
+
+    def _prefix(self, token: str) -> List[Tuple[str, float, Dict[int, float]]]:
+        """Alternativy pro doplňované slovo (kmen a termy s prefixem)"""
+        term = stem(token)
+        terms = {term} if term in self._postings else set()
+        if len(token) >= MIN_PREFIX:
+            start = bisect.bisect_left(self._vocabulary, token)
+            end = bisect.bisect_left(self._vocabulary, token + '\uffff')
+            matched = self._vocabulary[start:end]
+            if len(matched) > MAX_PREFIX_TERMS:
+                matched = heapq.nlargest(MAX_PREFIX_TERMS, matched,
+                                         key=lambda item: len(self._postings[item]))
+            terms.update(matched)
+        return [(item, self._idf(item), self._postings[item]) for item in terms]
+
+    def _best(self, term: str, postings: Dict[int, float], limit: int) -> List[Tuple[int, float]]:
+        """Záznamy termu s největší vahou (do TOP_CACHE z mezipaměti)"""
+        if limit > TOP_CACHE:
+            return heapq.nlargest(limit, postings.items(), key=itemgetter(1))
+        top = self._top.get(term)
+        if top is None:
+            top = self._top[term] = heapq.nlargest(TOP_CACHE, postings.items(),
+                                                   key=itemgetter(1))
+        return top[:limit]
+
+    def _rank(
+        self,
+        groups: List[List[Tuple[str, float, Dict[int, float]]]],
+        limit: int,
+        accept: Optional[Callable[[int], bool]]
+    ) -> List[Tuple[int, float]]:
+        """
+        Nejlepší dokumenty obsažené ve všech skupinách.
+
+        Skupina je seznam alternativ (term, IDF, záznamy); skóre skupiny je
+        nejlepší alternativa. Prochází se jen nejmenší skupina a ostatní
+        se dotazují po dokumentech, takže se záznamy indexu nekopírují.
+        U jediného slova bez filtru stačí sloučit nejlepší záznamy termů.
+        """
+        if not all(groups):
+            return []
+        groups = sorted(groups, key=lambda group: sum(len(item[2]) for item in group))
+        first, rest = groups[0], groups[1:]
+        scores: Dict[int, float] = {}
+        if not rest and accept is None:
+            for term, factor, postings in first:
+                for doc_id, weight in self._best(term, postings, limit):
+                    if weight * factor > scores.get(doc_id, 0.0):
+                        scores[doc_id] = weight * factor
+            return heapq.nlargest(limit, scores.items(), key=itemgetter(1))
+
+        for _, factor, postings in first:
+            for doc_id, weight in postings.items():
+                if weight * factor > scores.get(doc_id, 0.0) and (
+                        accept is None or doc_id in scores or accept(doc_id)):
+                    scores[doc_id] = weight * factor
+        for group in rest:
+            matched: Dict[int, float] = {}
+            for doc_id, score in scores.items():
+                best = 0.0
+                for _, factor, postings in group:
+                    weight = postings.get(doc_id)
+                    if weight is not None and weight * factor > best:
+                        best = weight * factor
+                if best:
+                    matched[doc_id] = score + best
+            scores = matched
+            if not scores:
+                break
+        return heapq.nlargest(limit, scores.items(), key=itemgetter(1))
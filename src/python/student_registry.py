@@ -0,0 +1,313 @@
+"""
+Evidence studentů - Student Registry
+
+Modul pro evidenci studentů a tříd s indexy podle uživatelského jména,
+jména a třídy a s reverzním indexem student -> úkoly. Dotazy typu
+"otevřené úkoly třídy 8.A" nebo "vytížení studentů" tak procházejí jen
+úkoly dotčených studentů, ne všechny úkoly v systému. Při přiřazení
+projektu hlídá limit ``education.max_projects_per_student``.
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+
+DEFAULT_MAX_PROJECTS = 5
+
+# Stav úkolu, který se nepočítá do otevřených (TaskStatus.COMPLETED)
+COMPLETED_STATUS = "completed"
+
+
+def _normalize_name(name: str) -> str:
+    """Klíč pro index jmen (bez ohledu na velikost písmen a mezery)"""
+    return " ".join(name.casefold().split())
+
+
+class StudentRegistry:
+    """
+    Evidence studentů s indexy.
+
+    Úkoly se v reverzním indexu drží jako sdílené objekty z ProjectManageru,
+    takže změna stavu úkolu je v dotazech vidět bez přeindexování. Zápisy
+    serializuje ProjectManager svým zámkem; dotazy procházejí kopie indexů,
+    takže je lze volat souběžně bez zámku.
+
+    Attributes:
+        students (Dict[str, Dict]): Studenti podle uživatelského jména
+        max_projects_per_student (int): Maximální počet projektů na studenta
+        logger (logging.Logger): Logger pro auditování
+    """
+
+    def __init__(self, max_projects_per_student: int = DEFAULT_MAX_PROJECTS):
+        """
+        Inicializace evidence.
+
+        Args:
+            max_projects_per_student: Maximální počet projektů na studenta
+        """
+        self.students: Dict[str, Dict[str, Any]] = {}
+        self.max_projects_per_student = max_projects_per_student
+        self.logger = logging.getLogger("StudentRegistry")
+
+        self._by_class: Dict[str, Set[str]] = {}
+        self._by_name: Dict[str, Set[str]] = {}
+        self._tasks: Dict[str, Dict[int, Dict[str, Any]]] = {}
+
+    @classmethod
+    def from_config(cls, config: Any) -> "StudentRegistry":
+        """
+        Vytvoření evidence podle hlavní konfigurace.
+
+        Args:
+            config: ConfigManager (nebo cokoliv s metodou ``get``)
+
+        Returns:
+            Nová evidence
+        """
+        return cls(int(config.get('education.max_projects_per_student', DEFAULT_MAX_PROJECTS)))
+
+    def __len__(self) -> int:
+        return len(self.students)
+
+    def __contains__(self, username: object) -> bool:
+        return username in self.students
+
+    def add_student(self, username: str, name: str, class_name: str) -> Dict[str, Any]:
+        """
+        Přidání studenta.
+
+        Args:
+            username: Uživatelské jméno (např. jan.novak)
+            name: Celé jméno
+            class_name: Třída (např. 8.A)
+
+        Returns:
+            Slovník s údaji studenta
+
+        Raises:
+            ValueError: Pokud student s tímto uživatelským jménem již existuje
+        """
+        if username in self.students:
+            raise ValueError(f"Student '{username}' již existuje")
+
+        student = {'username': username, 'name': name, 'class': class_name, 'projects': []}
+        self.students[username] = student
+        self._by_class.setdefault(class_name, set()).add(username)
+        self._by_name.setdefault(_normalize_name(name), set()).add(username)
+        self._tasks.setdefault(username, {})
+        self.logger.info(f"Student '{username}' přidán do třídy {class_name}")
+        return student
+
+    def remove_student(self, username: str) -> bool:
+        """
+        Odebrání studenta ze všech indexů.
+
+        Args:
+            username: Uživatelské jméno
+
+        Returns:
+            True pokud student existoval
+        """
+        student = self.students.pop(username, None)
+        if student is None:
+            return False
+        self._discard(self._by_class, student['class'], username)
+        self._discard(self._by_name, _normalize_name(student['name']), username)
+        self._tasks.pop(username, None)
+        return True
+
+    def get(self, username: str) -> Optional[Dict[str, Any]]:
+        """Student podle uživatelského jména"""
+        return self.students.get(username)
+
+    def find_by_name(self, name: str) -> List[Dict[str, Any]]:
+        """
+        Studenti podle celého jména (bez ohledu na velikost písmen).
+
+        Args:
+            name: Celé jméno
+
+        Returns:
+            Seznam nalezených studentů
+        """
+        return [self.students[u] for u in sorted(self._by_name.get(_normalize_name(name), ()))]
+
+    def class_members(self, class_name: str) -> List[Dict[str, Any]]:
+        """Studenti jedné třídy"""
+        return [self.students[u] for u in sorted(self._by_class.get(class_name, ()))]
+
+    def classes(self) -> List[str]:
+        """Seznam tříd"""
+        return sorted(c for c, members in self._by_class.items() if members)
+
+    def resolve(self, assignee: str) -> Optional[str]:
+        """
+        Převod řešitele úkolu na uživatelské jméno.
+
+        Přijímá uživatelské jméno nebo jednoznačné celé jméno.
+
+        Args:
+            assignee: Uživatelské jméno nebo celé jméno
+
+        Returns:
+            Uživatelské jméno nebo None
+        """
+        if assignee in self.students:
+            return assignee
+        matches = self._by_name.get(_normalize_name(assignee), set())
+        return next(iter(matches)) if len(matches) == 1 else None
+
+    def assign_project(self, username: str, project_name: str) -> List[str]:
+        """
+        Přiřazení projektu studentovi.
+
+        Args:
+            username: Uživatelské jméno
+            project_name: Název projektu
+
+        Returns:
+            Seznam projektů studenta
+
+        Raises:
+            ValueError: Pokud student neexistuje nebo by překročil limit projektů
+        """
+        student = self.students.get(username)
+        if student is None:
+            raise ValueError(f"Student '{username}' neexistuje")
+        projects = student['projects']
+        if project_name in projects:
+            return projects
+        if len(projects) >= self.max_projects_per_student:
+            raise ValueError(
+                f"Student '{username}' již má maximální počet projektů "
+                f"({self.max_projects_per_student})"
+            )
+        projects.append(project_name)
+        self.logger.info(f"Projekt '{project_name}' přiřazen studentovi '{username}'")
+        return projects
+
+    def unassign_project(self, username: str, project_name: str) -> bool:
+        """Odebrání projektu studentovi"""
+        student = self.students.get(username)
+        if student is None or project_name not in student['projects']:
+            return False
+        student['projects'].remove(project_name)
+        return True
+
+    def link_task(self, task: Dict[str, Any]) -> Optional[str]:
+        """
+        Zařazení úkolu do reverzního indexu podle řešitele.
+
+        Args:
+            task: Úkol z ProjectManageru (sdílený objekt)
+
+        Returns:
+            Uživatelské jméno řešitele nebo None, pokud není v evidenci
+        """
+        username = self.resolve(task.get('assignee', ''))
+        if username is not None:
+            self._tasks[username][task['id']] = task
+        return username
+
+    def unlink_task(self, task: Dict[str, Any]) -> None:
+        """Odebrání úkolu z reverzního indexu"""
+        for tasks in self._tasks.values():
+            tasks.pop(task['id'], None)
+
+    def rebuild_task_index(self, tasks: Iterable[Dict[str, Any]]) -> None:
+        """
+        Přestavba reverzního indexu (např. po načtení stavu).
+
+        Args:
+            tasks: Všechny úkoly
+        """
+        self._tasks = {username: {} for username in self.students}
+        for task in tasks:
+            self.link_task(task)
+
+    def student_tasks(self, username: str, open_only: bool = False) -> List[Dict[str, Any]]:
+        """
+        Úkoly studenta (O(počet úkolů studenta)).
+
+        Args:
+            username: Uživatelské jméno
+            open_only: Jen nedokončené úkoly
+
+        Returns:
+            Seznam úkolů seřazený podle ID
+        """
+        tasks = list(self._tasks.get(username, {}).items())
+        return [
+            task for _, task in sorted(tasks)
+            if not open_only or task['status'] != COMPLETED_STATUS
+        ]
+
+    def class_tasks(self, class_name: str, open_only: bool = False) -> List[Dict[str, Any]]:
+        """
+        Úkoly všech studentů třídy.
+
+        Args:
+            class_name: Třída
+            open_only: Jen nedokončené úkoly
+
+        Returns:
+            Seznam úkolů seřazený podle ID
+        """
+        tasks: Dict[int, Dict[str, Any]] = {}
+        for username in list(self._by_class.get(class_name, ())):
+            for task_id, task in list(self._tasks[username].items()):
+                if not open_only or task['status'] != COMPLETED_STATUS:
+                    tasks[task_id] = task
+        return [task for _, task in sorted(tasks.items())]
+
+    def workload(self, class_name: Optional[str] = None) -> Dict[str, Dict[str, int]]:
+        """
+        Vytížení studentů (počty úkolů a projektů).
+
+        Args:
+            class_name: Omezení na třídu (volitelné)
+
+        Returns:
+            Slovník {uživatelské jméno: {'open', 'completed', 'projects'}}
+        """
+        usernames = self._by_class.get(class_name, set()) if class_name else self.students
+        workload = {}
+        for username in sorted(list(usernames)):
+            tasks = list(self._tasks[username].values())
+            completed = sum(1 for task in tasks if task['status'] == COMPLETED_STATUS)
+            workload[username] = {
+                'open': len(tasks) - completed,
+                'completed': completed,
+                'projects': len(self.students[username]['projects']),
+            }
+        return workload
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializovatelný stav (studenti včetně přiřazených projektů)"""
+        return {'students': self.students}
+
+    def restore(self, state: Dict[str, Any], tasks: Iterable[Dict[str, Any]] = ()) -> None:
+        """
+        Obnovení evidence ze stavu vytvořeného metodou to_dict.
+
+        Args:
+            state: Slovník se stavem
+            tasks: Úkoly pro přestavbu reverzního indexu
+        """
+        self.students = {}
+        self._by_class = {}
+        self._by_name = {}
+        self._tasks = {}
+        for username, data in state.get('students', {}).items():
+            student = self.add_student(username, data['name'], data['class'])
+            student['projects'] = list(data.get('projects', []))
+        self.rebuild_task_index(tasks)
+
+    @staticmethod
+    def _discard(index: Dict[str, Set[str]], key: str, username: str) -> None:
+        """Odebrání studenta z jednoho indexu"""
+        members = index.get(key)
+        if members is not None:
+            members.discard(username)
+            if not members:
+                del index[key]
@@ -0,0 +1,580 @@
+"""
+Vzorkování systémových prostředků - System Resource Sampler
+
+Modul pro pravidelné měření vytížení CPU, paměti, teploty, frekvence
+a I/O SD karty přímým čtením /proc a /sys (bez spouštění procesů jako
+``vcgencmd`` nebo ``top``). Soubory zůstávají otevřené a před každým
+čtením se jen přetočí na začátek, vzorky se zapisují po dávkách do tabulky
+system_data ve stejné SQLite databázi jako data meteostanice a při
+změně stavu škrcení (podpětí, omezení frekvence, teplotní limit) se
+zapíše varování a publikuje událost ``system.throttled``.
+"""
+
+import argparse
+import glob
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+from .metrics import get_registry
+from .profiling import traced
+from .weather_store import connect, format_timestamp
+
+
+DEFAULT_INTERVAL = 1.0
+DEFAULT_THERMAL_LIMIT = 80.0
+BUSY_CPU_PERCENT = 90.0
+SECTOR_SIZE = 512
+PREFERRED_DISKS = ('mmcblk0', 'nvme0n1', 'sda', 'vda')
+
+# Bity stavu škrcení (shodné s dolními bity ``vcgencmd get_throttled``)
+UNDERVOLTAGE = 0x1
+FREQ_CAPPED = 0x2
+THROTTLED = 0x4
+SOFT_TEMP_LIMIT = 0x8
+THROTTLE_FLAGS = {
+    UNDERVOLTAGE: "podpětí",
+    FREQ_CAPPED: "omezená frekvence",
+    THROTTLED: "škrcení CPU",
+    SOFT_TEMP_LIMIT: "teplotní limit",
+}
+
+COLUMNS = (
+    'timestamp', 'cpu_percent', 'load1', 'mem_used_percent', 'mem_available_kb',
+    'cpu_temperature', 'cpu_freq_mhz', 'disk_read_kbps', 'disk_write_kbps', 'throttled'
+)
+
+_CPU_PERCENT = get_registry().gauge('system_cpu_percent', 'Vytížení CPU (%)')
+_MEM_PERCENT = get_registry().gauge('system_memory_used_percent', 'Využitá paměť (%)')
+_TEMPERATURE = get_registry().gauge('system_cpu_temperature_celsius', 'Teplota CPU (°C)')
+_THROTTLED = get_registry().gauge('system_throttled', 'Příznaky škrcení (bity get_throttled)')
+_THROTTLE_EVENTS = get_registry().counter(
+    'system_throttle_events_total', 'Počet změn stavu škrcení')
+
+
+def create_system_schema(connection: sqlite3.Connection) -> None:
+    """
+    Vytvoření tabulky system_data a indexu (idempotentní).
+
+    Args:
+        connection: Připojení k databázi
+    """
+    connection.execute('''CREATE TABLE IF NOT EXISTS system_data
+                 (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                 timestamp DATETIME,
+                 cpu_percent REAL,
+                 load1 REAL,
+                 mem_used_percent REAL,
+                 mem_available_kb INTEGER,
+                 cpu_temperature REAL,
+                 cpu_freq_mhz REAL,
+                 disk_read_kbps REAL,
+                 disk_write_kbps REAL,
+                 throttled INTEGER)''')
+    connection.execute(
+        "CREATE INDEX IF NOT EXISTS idx_system_data_timestamp ON system_data (timestamp)"
+    )
+    connection.commit()
+
+
+def describe_throttled(flags: int) -> List[str]:
+    """
+    Popis příznaků škrcení.
+
+    Args:
+        flags: Bity stavu škrcení
+
+    Returns:
+        Seznam popisů aktivních příznaků
+    """
+    return [text for bit, text in THROTTLE_FLAGS.items() if flags & bit]
+
+
+class _ProcFile:
+    """Soubor v /proc nebo /sys otevřený jednou a čtený opakovaně"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file: Optional[Any] = None
+
+    def read(self) -> Optional[str]:
+        """Aktuální obsah souboru (None pokud soubor není dostupný)"""
+        try:
+            if self._file is None:
+                self._file = open(self.path, 'rb', buffering=0)
+            else:
+                self._file.seek(0)
+            return self._file.readall().decode('ascii', 'replace')
+        except OSError:
+            self.close()
+            return None
+
+    def read_int(self) -> Optional[int]:
+        """Obsah souboru jako celé číslo (i šestnáctkové 0x...)"""
+        text = self.read()
+        try:
+            return int(text.strip(), 0) if text else None
+        except ValueError:
+            return None
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class SystemSampler:
+    """
+    Vzorkovač systémových prostředků.
+
+    Attributes:
+        db_path (str): Cesta k SQLite databázi (sdílená s WeatherStore)
+        interval (float): Perioda vzorkování (sekundy)
+        thermal_limit (float): Teplota, od které se hlásí teplotní limit (°C)
+        flush_every (int): Počet vzorků zapsaných jednou transakcí
+        disk (Optional[str]): Sledované blokové zařízení
+        event_bus (EventBus): Sběrnice pro vzorky a změny stavu škrcení (volitelná)
+        throttled (int): Poslední stav škrcení
+        stats (Dict): Počet vzorků a spotřeba CPU vzorkovače
+        logger (logging.Logger): Logger pro auditování
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        interval: float = DEFAULT_INTERVAL,
+        thermal_limit: float = DEFAULT_THERMAL_LIMIT,
+        flush_every: int = 10,
+        disk: Optional[str] = None,
+        proc_root: str = "/proc",
+        sys_root: str = "/sys",
+        event_bus: Optional[Any] = None
+    ):
+        """
+        Inicializace vzorkovače.
+
+        Args:
+            db_path: Cesta k SQLite databázi
+            interval: Perioda vzorkování (sekundy)
+            thermal_limit: Teplotní limit pro hlášení škrcení (°C)
+            flush_every: Počet vzorků zapsaných jednou transakcí
+            disk: Název blokového zařízení (výchozí: první z mmcblk0, nvme0n1, sda, vda)
+            proc_root: Kořen procfs (pro testy mimo zařízení)
+            sys_root: Kořen sysfs (pro testy mimo zařízení)
+            event_bus: Sběrnice událostí (EventBus) pro vzorky (``system.sample``)
+                a změny stavu škrcení (``system.throttled``)
+
+        Raises:
+            ValueError: Pokud je perioda nebo velikost dávky neplatná
+        """
+        if interval <= 0:
+            raise ValueError("Perioda vzorkování musí být kladná")
+        if flush_every < 1:
+            raise ValueError("Velikost dávky musí být kladná")
+
+        self.db_path = db_path
+        self.interval = interval
+        self.thermal_limit = thermal_limit
+        self.flush_every = flush_every
+        self.event_bus = event_bus
+        self.throttled = 0
+        self.stats: Dict[str, Any] = {'samples': 0, 'cpu_seconds': 0.0, 'overhead_percent': 0.0}
+        self.logger = logging.getLogger("SystemSampler")
+
+        self._stat = _ProcFile(os.path.join(proc_root, 'stat'))
+        self._meminfo = _ProcFile(os.path.join(proc_root, 'meminfo'))
+        self._loadavg = _ProcFile(os.path.join(proc_root, 'loadavg'))
+        self._diskstats = _ProcFile(os.path.join(proc_root, 'diskstats'))
+        self._thermal = [
+            _ProcFile(path) for path in sorted(
+                glob.glob(os.path.join(sys_root, 'class/thermal/thermal_zone*/temp')))
+        ]
+        cpufreq = os.path.join(sys_root, 'devices/system/cpu/cpu0/cpufreq')
+        self._cur_freq = _ProcFile(os.path.join(cpufreq, 'scaling_cur_freq'))
+        self._max_freq = _ProcFile(os.path.join(cpufreq, 'scaling_max_freq'))
+        hw_max_freq = _ProcFile(os.path.join(cpufreq, 'cpuinfo_max_freq'))
+        self._hw_max_freq = hw_max_freq.read_int()
+        hw_max_freq.close()
+        self._firmware = self._find_firmware(sys_root)
+        self._undervolt = self._find_undervolt_alarm(sys_root)
+        self.disk = disk or self._find_disk()
+
+        self._previous_cpu: Optional[Sequence[int]] = None
+        self._previous_disk: Optional[Sequence[int]] = None
+        self._previous_time = 0.0
+        self._pending: List[Sequence[Any]] = []
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.connection = connect(db_path)
+        create_system_schema(self.connection)
+
+    @classmethod
+    def from_config(cls, config: Any, db_path: str, **kwargs: Any) -> "SystemSampler":
+        """
+        Vytvoření vzorkovače podle sekce ``monitoring`` hlavní konfigurace.
+
+        Args:
+            config: ConfigManager (nebo cokoliv s metodou ``get``)
+            db_path: Cesta k SQLite databázi
+            **kwargs: Další parametry konstruktoru
+
+        Returns:
+            Nakonfigurovaný vzorkovač
+        """
+        kwargs.setdefault(
+            'interval', float(config.get('monitoring.system_sample_interval', DEFAULT_INTERVAL)))
+        kwargs.setdefault(
+            'thermal_limit', float(config.get('monitoring.thermal_limit', DEFAULT_THERMAL_LIMIT)))
+        return cls(db_path, **kwargs)
+
+    @traced()
+    def sample(self) -> Dict[str, Any]:
+        """
+        Jedno měření (zařadí se do dávky pro zápis).
+
+        Vytížení CPU a I/O disku se počítá z rozdílu proti minulému
+        měření, v prvním měření jsou proto None.
+
+        Returns:
+            Slovník s hodnotami měření
+        """
+        now = time.monotonic()
+        elapsed = now - self._previous_time if self._previous_time else None
+        self._previous_time = now
+
+        cpu_percent = self._cpu_percent()
+        mem_used_percent, mem_available_kb = self._memory()
+        temperature = self._temperature()
+        read_kbps, write_kbps = self._disk_rates(elapsed)
+        cur_freq = self._cur_freq.read_int()
+        record = {
+            'timestamp': format_timestamp(datetime.now()),
+            'cpu_percent': cpu_percent,
+            'load1': self._load1(),
+            'mem_used_percent': mem_used_percent,
+            'mem_available_kb': mem_available_kb,
+            'cpu_temperature': temperature,
+            'cpu_freq_mhz': cur_freq / 1000 if cur_freq else None,
+            'disk_read_kbps': read_kbps,
+            'disk_write_kbps': write_kbps,
+        }
+        record['throttled'] = self._throttled_flags(cpu_percent, temperature, cur_freq)
+        self._check_throttled(record)
+
+        if cpu_percent is not None:
+            _CPU_PERCENT.set(cpu_percent)
+        if mem_used_percent is not None:
+            _MEM_PERCENT.set(mem_used_percent)
+        if temperature is not None:
+            _TEMPERATURE.set(temperature)
+        _THROTTLED.set(record['throttled'])
+        if self.event_bus is not None:
+            self.event_bus.publish('system.sample', record, key='system:sample')
+
+        with self._lock:
+            self._pending.append(tuple(record[column] for column in COLUMNS))
+            if len(self._pending) >= self.flush_every:
+                self._flush_locked()
+        return record
+
+    def flush(self) -> int:
+        """
+        Zápis čekajících vzorků do databáze.
+
+        Returns:
+            Počet zapsaných vzorků
+        """
+        with self._lock:
+            return self._flush_locked()
+
+    def latest(self, limit: int = 1) -> List[Dict[str, Any]]:
+        """
+        Poslední uložené vzorky.
+
+        Args:
+            limit: Maximální počet záznamů
+
+        Returns:
+            Seznam vzorků od nejnovějšího
+        """
+        with self._lock:
+            rows = self.connection.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM system_data "
+                "ORDER BY timestamp DESC, id DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [dict(zip(COLUMNS, row)) for row in rows]
+
+    def start(self) -> None:
+        """Spuštění vzorkování ve vlákně na pozadí"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run_loop, name="SystemSampler", daemon=True)
+        self._thread.start()
+        self.logger.info(f"Vzorkování systému každých {self.interval} s (disk: {self.disk})")
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Zastavení vzorkování a zápis zbylých vzorků.
+
+        Args:
+            timeout: Maximální doba čekání na vlákno (sekundy)
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def close(self) -> None:
+        """Zápis zbylých vzorků a uzavření souborů i databáze"""
+        self.stop()
+        for handle in [self._stat, self._meminfo, self._loadavg, self._diskstats,
+                       self._cur_freq, self._max_freq, *self._thermal]:
+            handle.close()
+        for handle in (self._firmware, self._undervolt):
+            if handle is not None:
+                handle.close()
+        self.connection.close()
+
+    def _run_loop(self) -> None:
+        """Smyčka vzorkování (perioda se drží proti monotónním hodinám)"""
+        deadline = time.monotonic()
+        while not self._stop_event.is_set():
+            started = time.thread_time()
+            try:
+                self.sample()
+            except Exception as e:
+                self.logger.error(f"Chyba při vzorkování: {e}")
+            self.stats['samples'] += 1
+            self.stats['cpu_seconds'] += time.thread_time() - started
+            self.stats['overhead_percent'] = (
+                self.stats['cpu_seconds'] / (self.stats['samples'] * self.interval) * 100
+            )
+            deadline += self.interval
+            self._stop_event.wait(max(0.0, deadline - time.monotonic()))
+
+    def _flush_locked(self) -> int:
+        """Zápis dávky (volá se se zámkem)"""
+        if not self._pending:
+            return 0
+        rows, self._pending = self._pending, []
+        try:
+            self.connection.executemany(
+                f"INSERT INTO system_data ({', '.join(COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(COLUMNS))})",
+                rows
+            )
+            self.connection.commit()
+        except sqlite3.Error as e:
+            self.logger.error(f"Chyba při zápisu vzorků: {e}")
+            return 0
+        return len(rows)
+
+    def _cpu_percent(self) -> Optional[float]:
+        """Vytížení CPU z prvního řádku /proc/stat"""
+        text = self._stat.read()
+        if not text:
+            return None
+        # user nice system idle iowait irq softirq steal (guest je už v user)
+        values = [int(value) for value in text.split('\n', 1)[0].split()[1:9]]
+        previous, self._previous_cpu = self._previous_cpu, values
+        if previous is None:
+            return None
+        total = sum(values) - sum(previous)
+        idle = (values[3] + values[4]) - (previous[3] + previous[4])
+        if total <= 0:
+            return 0.0
+        return round(100.0 * (total - idle) / total, 1)
+
+    def _memory(self) -> tuple:
+        """Využitá paměť (%) a dostupná paměť (kB) z /proc/meminfo"""
+        text = self._meminfo.read()
+        if not text:
+            return None, None
+        values: Dict[str, int] = {}
+        for line in text.splitlines():
+            name, _, rest = line.partition(':')
+            if name in ('MemTotal', 'MemAvailable'):
+                values[name] = int(rest.split()[0])
+                if len(values) == 2:
+                    break
+        total, available = values.get('MemTotal'), values.get('MemAvailable')
+        if not total or available is None:
+            return None, available
+        return round(100.0 * (total - available) / total, 1), available
+
+    def _load1(self) -> Optional[float]:
+        """Průměrná zátěž za poslední minutu"""
+        text = self._loadavg.read()
+        return float(text.split()[0]) if text else None
+
+    def _temperature(self) -> Optional[float]:
+        """Nejvyšší teplota ze všech teplotních zón (°C)"""
+        temperatures = [
+            value / 1000 for value in (zone.read_int() for zone in self._thermal)
+            if value is not None
+        ]
+        return round(max(temperatures), 1) if temperatures else None
+
+    def _disk_rates(self, elapsed: Optional[float]) -> tuple:
+        """Rychlost čtení a zápisu sledovaného disku (kB/s)"""
+        text = self._diskstats.read() if self.disk else None
+        if not text:
+            return None, None
+        needle = f' {self.disk} '
+        for line in text.splitlines():
+            if needle in line:
+                fields = line.split()
+                current = (int(fields[5]), int(fields[9]))
+                break
+        else:
+            return None, None
+        previous, self._previous_disk = self._previous_disk, current
+        if previous is None or not elapsed:
+            return None, None
+        return tuple(
+            round((now - before) * SECTOR_SIZE / 1024 / elapsed, 1)
+            for now, before in zip(current, previous)
+        )
+
+    def _throttled_flags(
+        self, cpu_percent: Optional[float], temperature: Optional[float], cur_freq: Optional[int]
+    ) -> int:
+        """
+        Stav škrcení: hodnota z firmwaru Raspberry Pi (pokud ji jádro
+        vystavuje), doplněná o odhad z cpufreq, hwmon a teploty.
+        """
+        flags = 0
+        if self._firmware is not None:
+            flags |= (self._firmware.read_int() or 0) & 0xF
+        if self._undervolt is not None and self._undervolt.read_int():
+            flags |= UNDERVOLTAGE
+        if self._hw_max_freq:
+            max_freq = self._max_freq.read_int()
+            if max_freq and max_freq < self._hw_max_freq:
+                flags |= FREQ_CAPPED
+            if (cur_freq and cur_freq < self._hw_max_freq * 0.95
+                    and cpu_percent is not None and cpu_percent >= BUSY_CPU_PERCENT):
+                flags |= THROTTLED
+        if temperature is not None and temperature >= self.thermal_limit:
+            flags |= SOFT_TEMP_LIMIT
+        return flags
+
+    def _check_throttled(self, record: Dict[str, Any]) -> None:
+        """Zápis a publikace změny stavu škrcení"""
+        flags = record['throttled']
+        if flags == self.throttled:
+            return
+        previous, self.throttled = self.throttled, flags
+        _THROTTLE_EVENTS.inc()
+        if flags:
+            self.logger.warning(
+                f"Škrcení systému: {', '.join(describe_throttled(flags))} "
+                f"(teplota {record['cpu_temperature']} °C, {record['cpu_freq_mhz']} MHz)"
+            )
+        else:
+            self.logger.info("Škrcení systému skončilo")
+        if self.event_bus is not None:
+            self.event_bus.publish('system.throttled', {
+                'throttled': flags,
+                'previous': previous,
+                'flags': describe_throttled(flags),
+                'cpu_temperature': record['cpu_temperature'],
+                'cpu_freq_mhz': record['cpu_freq_mhz'],
+            }, key='system')
+
+    def _find_disk(self) -> Optional[str]:
+        """Výběr sledovaného disku podle /proc/diskstats"""
+        text = self._diskstats.read() or ''
+        names = {line.split()[2] for line in text.splitlines() if len(line.split()) > 2}
+        for name in PREFERRED_DISKS:
+            if name in names:
+                return name
+        return None
+
+    @staticmethod
+    def _find_firmware(sys_root: str) -> Optional[_ProcFile]:
+        """Atribut get_throttled firmwaru Raspberry Pi (pokud existuje)"""
+        for pattern in ('devices/platform/*firmware*/get_throttled',
+                        'devices/platform/*/*firmware*/get_throttled'):
+            paths = glob.glob(os.path.join(sys_root, pattern))
+            if paths:
+                return _ProcFile(paths[0])
+        return None
+
+    @staticmethod
+    def _find_undervolt_alarm(sys_root: str) -> Optional[_ProcFile]:
+        """Alarm podpětí ovladače rpi_volt (hwmon)"""
+        for name_path in glob.glob(os.path.join(sys_root, 'class/hwmon/hwmon*/name')):
+            handle = _ProcFile(name_path)
+            name = handle.read()
+            handle.close()
+            if name and name.strip() == 'rpi_volt':
+                return _ProcFile(os.path.join(os.path.dirname(name_path), 'in0_lcrit_alarm'))
+        return None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Vstupní bod příkazu ``kiosk-sampler``.
+
+    Args:
+        argv: Argumenty příkazové řádky (výchozí: sys.argv)
+
+    Returns:
+        Návratový kód procesu
+    """
+    parser = argparse.ArgumentParser(prog='kiosk-sampler',
+                                     description='Vzorkování systémových prostředků')
+    parser.add_argument('--db', default='weather_data.db',
+                        help='SQLite databáze (stejná jako u meteostanice)')
+    parser.add_argument('--config', default=os.environ.get('PROJECT_MANAGER_CONFIG'),
+                        help='Hlavní konfigurace (sekce monitoring)')
+    parser.add_argument('--interval', type=float)
+    parser.add_argument('--once', action='store_true', help='Vypsat jedno měření a skončit')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    kwargs: Dict[str, Any] = {}
+    if args.interval is not None:
+        kwargs['interval'] = args.interval
+    if args.config:
+        from .config_manager import ConfigManager
+
+        config = ConfigManager(os.path.dirname(os.path.abspath(args.config)))
+        config.load_config(os.path.basename(args.config))
+        sampler = SystemSampler.from_config(config, args.db, **kwargs)
+    else:
+        sampler = SystemSampler(args.db, **kwargs)
+
+    if args.once:
+        sampler.sample()
+        time.sleep(min(sampler.interval, 1.0))
+        record = sampler.sample()
+        sampler.close()
+        for column in COLUMNS:
+            print(f"{column}: {record[column]}")
+        return 0
+
+    sampler.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sampler.close()
+        print(f"Režie vzorkování: {sampler.stats['overhead_percent']:.3f} % jádra")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
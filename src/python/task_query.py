@@ -0,0 +1,284 @@
+"""
+Dotazy nad úkoly - Task Query
+
+Filtr úkolů (stav, priorita, řešitel, projekt, rozsah deadlinu)
+zkompilovaný do jediného predikátu a sekundární indexy, podle kterých
+ProjectManager.query_tasks vybírá kandidáty. Index se použije jen tehdy,
+když je dost selektivní; jinak je levnější projít úkoly postupně.
+Výsledek se stránkuje a na požádání vrací plán dotazu (explain).
+"""
+
+import heapq
+from datetime import date
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+
+INDEXED_FIELDS = ('status', 'priority', 'assignee')
+PRIORITY_ORDER = {'critical': 0, 'high': 1, 'normal': 2, 'low': 3}
+ORDERS = ('id', 'deadline', 'priority')
+# Index se použije, pokud vybere nanejvýš tento podíl všech úkolů
+SELECTIVITY = 0.25
+MAX_LIMIT = 1000
+
+Values = Union[str, Sequence[str], None]
+
+
+def _values(value: Values) -> Optional[Tuple[str, ...]]:
+    """Jedna hodnota, seznam nebo hodnoty oddělené čárkou jako n-tice"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value.split(',')
+    values = tuple(dict.fromkeys(item.strip() for item in value if item.strip()))
+    return values or None
+
+
+def _iso_date(value: Optional[str], name: str) -> Optional[str]:
+    """Kontrola data ve formátu YYYY-MM-DD"""
+    if value is None:
+        return None
+    try:
+        return date.fromisoformat(value).isoformat()
+    except (TypeError, ValueError):
+        raise ValueError(f"Neplatné datum {name}: '{value}' (očekáváno YYYY-MM-DD)")
+
+
+class TaskQuery:
+    """
+    Zkompilovaný filtr úkolů.
+
+    Podmínky se spojují logickým AND, u stavu, priority a řešitele stačí
+    shoda s jednou z hodnot. Predikát vzniká jako jediný výraz, takže se
+    u každého úkolu nevolá řetěz funkcí.
+
+    Attributes:
+        status (Tuple[str, ...]): Povolené stavy (volitelné)
+        priority (Tuple[str, ...]): Povolené priority (volitelné)
+        assignee (Tuple[str, ...]): Povolení řešitelé (volitelné)
+        project (str): Projekt (volitelný)
+        deadline_from (str): Deadline od (včetně, volitelný)
+        deadline_to (str): Deadline do (včetně, volitelný)
+        order_by (str): Řazení výsledku ('id', 'deadline' nebo 'priority')
+    """
+
+    def __init__(
+        self,
+        status: Values = None,
+        priority: Values = None,
+        assignee: Values = None,
+        project: Optional[str] = None,
+        deadline_from: Optional[str] = None,
+        deadline_to: Optional[str] = None,
+        order_by: str = 'id'
+    ):
+        """
+        Vytvoření dotazu.
+
+        Args:
+            status: Stav nebo stavy (seznam nebo text oddělený čárkou)
+            priority: Priorita nebo priority
+            assignee: Řešitel nebo řešitelé
+            project: Název projektu
+            deadline_from: Nejdřívější deadline (YYYY-MM-DD)
+            deadline_to: Nejpozdější deadline (YYYY-MM-DD)
+            order_by: Řazení výsledku
+
+        Raises:
+            ValueError: Při neplatném datu, rozsahu nebo řazení
+        """
+        self.status = _values(status)
+        self.priority = _values(priority)
+        self.assignee = _values(assignee)
+        self.project = project or None
+        self.deadline_from = _iso_date(deadline_from, 'deadline_from')
+        self.deadline_to = _iso_date(deadline_to, 'deadline_to')
+        if order_by not in ORDERS:
+            raise ValueError(f"Neznámé řazení '{order_by}' (povoleno: {', '.join(ORDERS)})")
+        self.order_by = order_by
+        if self.deadline_from and self.deadline_to and self.deadline_from > self.deadline_to:
+            raise ValueError("deadline_from je později než deadline_to")
+
+    @classmethod
+    def from_params(cls, params: Dict[str, Any]) -> "TaskQuery":
+        """
+        Dotaz z parametrů URL nebo příkazové řádky.
+
+        Args:
+            params: Slovník s klíči jako u konstruktoru; hodnoty mohou být
+                seznamy (výstup parse_qs), neznámé klíče se ignorují
+
+        Returns:
+            TaskQuery
+        """
+        def first(name: str) -> Optional[str]:
+            value = params.get(name)
+            if isinstance(value, (list, tuple)):
+                return ','.join(value) if value else None
+            return value
+
+        return cls(
+            status=first('status'),
+            priority=first('priority'),
+            assignee=first('assignee'),
+            project=first('project'),
+            deadline_from=first('deadline_from'),
+            deadline_to=first('deadline_to'),
+            order_by=first('order_by') or 'id'
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Podmínky dotazu (bez prázdných)"""
+        data = {
+            'status': list(self.status) if self.status else None,
+            'priority': list(self.priority) if self.priority else None,
+            'assignee': list(self.assignee) if self.assignee else None,
+            'project': self.project,
+            'deadline_from': self.deadline_from,
+            'deadline_to': self.deadline_to,
+        }
+        data = {key: value for key, value in data.items() if value is not None}
+        data['order_by'] = self.order_by
+        return data
+
+    def indexed(self) -> Dict[str, Tuple[str, ...]]:
+        """Podmínky, pro které existuje sekundární index"""
+        return {field: getattr(self, field) for field in INDEXED_FIELDS if getattr(self, field)}
+
+    def compile(
+        self,
+        project_of: Dict[int, str],
+        skip: Iterable[str] = ()
+    ) -> Tuple[Callable[[Dict[str, Any]], bool], str]:
+        """
+        Kompilace podmínek do jednoho predikátu.
+
+        Hodnoty se do zdrojového textu nevkládají, výraz na ně odkazuje
+        jmény, takže vstup od uživatele nikdy není kódem.
+
+        Args:
+            project_of: Mapa ID úkolu → projekt (pro podmínku projektu)
+            skip: Podmínky, které už splňuje zdroj kandidátů (index, projekt)
+
+        Returns:
+            Dvojice (predikát, text výrazu pro explain)
+        """
+        skip = set(skip)
+        namespace: Dict[str, Any] = {'project_of': project_of}
+        terms: List[str] = []
+        for field in INDEXED_FIELDS:
+            values = getattr(self, field)
+            if not values or field in skip:
+                continue
+            if len(values) == 1:
+                namespace[field] = values[0]
+                terms.append(f"t[{field!r}] == {field}")
+            else:
+                namespace[field] = frozenset(values)
+                terms.append(f"t[{field!r}] in {field}")
+        if self.project and 'project' not in skip:
+            namespace['project'] = self.project
+            terms.append("project_of.get(t['id']) == project")
+        if self.deadline_from:
+            namespace['deadline_from'] = self.deadline_from
+            terms.append("deadline_from <= t['deadline']")
+        if self.deadline_to:
+            namespace['deadline_to'] = self.deadline_to
+            terms.append("t['deadline'] <= deadline_to")
+        source = ' and '.join(terms) or 'True'
+        namespace['__builtins__'] = {}
+        predicate = eval(f"lambda t: {source}", namespace)
+        return predicate, source
+
+    def sort_key(self) -> Callable[[Dict[str, Any]], Any]:
+        """Klíč řazení výsledku"""
+        if self.order_by == 'deadline':
+            return lambda task: (task['deadline'], task['id'])
+        if self.order_by == 'priority':
+            return lambda task: (PRIORITY_ORDER.get(task['priority'], len(PRIORITY_ORDER)),
+                                 task['id'])
+        return itemgetter('id')
+
+    def page(
+        self,
+        tasks: List[Dict[str, Any]],
+        offset: int,
+        limit: int,
+        ordered: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Stránka seřazeného výsledku.
+
+        Pro první stránky stačí částečné řazení (heapq.nsmallest), celý
+        výsledek se řadí jen u stránek blízko konce.
+
+        Args:
+            tasks: Úkoly splňující dotaz
+            offset: Počet přeskočených výsledků
+            limit: Velikost stránky
+            ordered: Úkoly už jsou v pořadí ID (úkoly projektu, seznam tasks)
+        """
+        if ordered and self.order_by == 'id':
+            return tasks[offset:offset + limit]
+        end = offset + limit
+        if end < len(tasks) // 2:
+            return heapq.nsmallest(end, tasks, key=self.sort_key())[offset:]
+        return sorted(tasks, key=self.sort_key())[offset:end]
+
+
+class SecondaryIndex:
+    """
+    Index úkolů podle hodnoty jednoho pole.
+
+    Pro každou hodnotu drží slovník ID → úkol. Zápisy provádí
+    ProjectManager pod svými zámky; čtení si dělá kopii hodnot, která je
+    pod GIL atomická.
+
+    Attributes:
+        field (str): Indexované pole úkolu
+    """
+
+    def __init__(self, field: str):
+        """
+        Inicializace prázdného indexu.
+
+        Args:
+            field: Indexované pole úkolu
+        """
+        self.field = field
+        self._entries: Dict[Any, Dict[int, Dict[str, Any]]] = {}
+
+    def add(self, task: Dict[str, Any]) -> None:
+        """Zařazení úkolu podle aktuální hodnoty pole"""
+        self._entries.setdefault(task.get(self.field), {})[task['id']] = task
+
+    def move(self, task: Dict[str, Any], old_value: Any) -> None:
+        """Přeřazení úkolu po změně hodnoty pole"""
+        if old_value == task.get(self.field):
+            return
+        entries = self._entries.get(old_value)
+        if entries is not None:
+            entries.pop(task['id'], None)
+        self.add(task)
+
+    def rebuild(self, tasks: Iterable[Dict[str, Any]]) -> None:
+        """Přestavba indexu ze seznamu úkolů"""
+        entries: Dict[Any, Dict[int, Dict[str, Any]]] = {}
+        for task in tasks:
+            entries.setdefault(task.get(self.field), {})[task['id']] = task
+        self._entries = entries
+
+    def count(self, values: Iterable[Any]) -> int:
+        """Počet úkolů s některou z hodnot"""
+        return sum(len(self._entries.get(value, ())) for value in values)
+
+    def tasks(self, values: Iterable[Any]) -> List[Dict[str, Any]]:
+        """Úkoly s některou z hodnot (pořadí není zaručeno, přesunuté úkoly jsou na konci)"""
+        tasks: List[Dict[str, Any]] = []
+        for value in values:
+            tasks.extend(list(self._entries.get(value, {}).values()))
+        return tasks
+
+    def counts(self) -> Dict[Any, int]:
+        """Počty úkolů podle hodnoty"""
+        return {value: len(entries) for value, entries in list(self._entries.items()) if entries}
@@ -0,0 +1,738 @@
+"""
+Sloupcový archiv měření - Weather Archive
+
+Dlouhodobý archiv dat meteostanice mimo SQLite. Každý kanál (čas,
+teplota, vlhkost, tlak) je samostatný soubor s 64bajtovou hlavičkou
+a hodnotami pevné šířky za ní (čas jako int64 mikrosekund, kanály jako
+float64, chybějící hodnota je NaN). Soubory se jen připisují a po
+``segment_rows`` řádcích se začne nový segment (adresář), starší
+segmenty se už nemění. Časový sloupec je seřazený, takže slouží jako
+index: rozsah se najde binárním vyhledáváním bez načítání dat.
+
+Čtení jde přes mmap bez kopírování: ``column`` vrací memoryview nad
+mapovaným souborem a ``memmap`` pole numpy.memmap (numpy je volitelné),
+takže studentský notebook otevře rok měření po sekundě okamžitě::
+
+    archive = WeatherArchive('/home/nymea/archive/weather')
+    for segment in archive.segments:
+        teploty = segment.memmap('temperature')
+
+Převody z a do tabulky weather_data: export_sqlite a import_sqlite.
+"""
+
+import argparse
+import bisect
+import json
+import logging
+import math
+import mmap
+import os
+import sqlite3
+import struct
+import sys
+import threading
+from array import array
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .weather_store import CHANNELS, connect, create_schema, format_timestamp
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows (vývojové stroje bez kiosku)
+    fcntl = None  # type: ignore[assignment]
+
+
+MAGIC = b'WXCOL1\r\n'
+HEADER = struct.Struct('<8s16s1sB38x')
+HEADER_SIZE = HEADER.size
+MANIFEST = 'archive.json'
+LOCK_FILE = '.lock'
+SUFFIX = '.col'
+TIME_COLUMN = 'time'
+TIME_TYPECODE = 'q'
+DEFAULT_TYPECODE = 'd'
+DEFAULT_SEGMENT_ROWS = 1 << 21  # ~24 dní měření po sekundě
+DEFAULT_BATCH = 10000
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+NUMPY_DTYPES = {'q': '<i8', 'd': '<f8', 'f': '<f4'}
+_LITTLE_ENDIAN = sys.byteorder == 'little'
+
+
+def to_micros(moment: datetime) -> int:
+    """
+    Čas jako mikrosekundy od 1970-01-01 (bez časové zóny, jako tabulka).
+
+    Args:
+        moment: Časový okamžik (naivní, místní čas)
+
+    Returns:
+        Hodnota časového sloupce
+    """
+    return (moment - EPOCH) // MICROSECOND
+
+
+def from_micros(value: int) -> datetime:
+    """
+    Převod hodnoty časového sloupce zpět na datetime.
+
+    Args:
+        value: Mikrosekundy od 1970-01-01
+
+    Returns:
+        Časový okamžik
+    """
+    return EPOCH + timedelta(microseconds=int(value))
+
+
+class ArchiveSegment:
+    """
+    Jeden segment archivu: adresář se souborem pro každý kanál.
+
+    Soubory se mapují do paměti až při prvním čtení. Počet řádků je
+    nejmenší délka ze všech sloupců, takže souběžné připisování ani
+    neúplný zápis po pádu nevadí.
+
+    Attributes:
+        path (str): Adresář segmentu
+        columns (Dict[str, str]): Typový kód každého sloupce včetně času
+        rows (int): Počet celých řádků
+    """
+
+    def __init__(self, path: str, columns: Dict[str, str]):
+        """
+        Inicializace segmentu.
+
+        Args:
+            path: Adresář segmentu
+            columns: Typové kódy sloupců (array) včetně časového
+        """
+        self.path = path
+        self.columns = columns
+        self.rows = min(self._length(column) for column in columns)
+        self._maps: Dict[str, mmap.mmap] = {}
+
+    @property
+    def first(self) -> Optional[int]:
+        """Čas prvního řádku (mikrosekundy) nebo None"""
+        return self.column(TIME_COLUMN)[0] if self.rows else None
+
+    @property
+    def last(self) -> Optional[int]:
+        """Čas posledního řádku (mikrosekundy) nebo None"""
+        return self.column(TIME_COLUMN)[self.rows - 1] if self.rows else None
+
+    def file(self, column: str) -> str:
+        """Cesta k souboru sloupce"""
+        return os.path.join(self.path, column + SUFFIX)
+
+    def column(self, column: str) -> memoryview:
+        """
+        Hodnoty sloupce bez kopírování (memoryview nad mmap).
+
+        Args:
+            column: Název kanálu nebo 'time'
+
+        Returns:
+            memoryview s ``rows`` hodnotami (na big-endian stroji kopie)
+
+        Raises:
+            ValueError: Pokud sloupec v archivu není nebo má neplatnou hlavičku
+        """
+        if column not in self.columns:
+            raise ValueError(f"Sloupec '{column}' v archivu není")
+        typecode = self.columns[column]
+        size = array(typecode).itemsize
+        if not self.rows:
+            return memoryview(array(typecode))
+        mapped = self._maps.get(column)
+        if mapped is None:
+            with open(self.file(column), 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, name, stored, _ = HEADER.unpack_from(mapped)
+            expected = (MAGIC, column.encode('utf-8'), typecode.encode('ascii'))
+            if (magic, name.rstrip(b'\0'), stored) != expected:
+                mapped.close()
+                raise ValueError(f"Soubor '{self.file(column)}' má neplatnou hlavičku")
+            self._maps[column] = mapped
+        view = memoryview(mapped)[HEADER_SIZE:HEADER_SIZE + self.rows * size]
+        if _LITTLE_ENDIAN:
+            return view.cast(typecode)
+        values = array(typecode, view.tobytes())
+        values.byteswap()
+        return memoryview(values)
+
+    def memmap(self, column: str) -> Any:
+        """
+        Sloupec jako numpy.memmap (jen pro čtení, bez kopírování).
+
+        Args:
+            column: Název kanálu nebo 'time'
+
+        Returns:
+            numpy.memmap s ``rows`` hodnotami
+
+        Raises:
+            ImportError: Pokud numpy není nainstalováno
+            ValueError: Pokud sloupec v archivu není
+        """
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("Knihovna numpy není nainstalována (pip install numpy)")
+        if column not in self.columns:
+            raise ValueError(f"Sloupec '{column}' v archivu není")
+        dtype = NUMPY_DTYPES[self.columns[column]]
+        if not self.rows:
+            return numpy.empty(0, dtype=dtype)
+        return numpy.memmap(self.file(column), dtype=dtype, mode='r', offset=HEADER_SIZE,
+                            shape=(self.rows,))
+
+    def bounds(self, start: Optional[int], end: Optional[int]) -> Tuple[int, int]:
+        """
+        Rozsah řádků s časem v [start, end) podle časového sloupce.
+
+        Args:
+            start: Začátek v mikrosekundách (None = od začátku)
+            end: Konec v mikrosekundách (None = do konce)
+
+        Returns:
+            Dvojice (první řádek, řádek za posledním)
+        """
+        times = self.column(TIME_COLUMN)
+        low = bisect.bisect_left(times, start) if start is not None else 0
+        high = bisect.bisect_left(times, end, low) if end is not None else self.rows
+        return low, high
+
+    def size(self) -> int:
+        """Velikost segmentu na disku v bajtech"""
+        return sum(os.path.getsize(self.file(column)) for column in self.columns)
+
+    def close(self) -> None:
+        """Uvolnění mapování (pole vydaná přes column drží mapování dál)"""
+        for mapped in self._maps.values():
+            try:
+                mapped.close()
+            except BufferError:
+                pass
+        self._maps = {}
+
+    def _length(self, column: str) -> int:
+        """Počet celých hodnot v souboru sloupce"""
+        try:
+            size = os.path.getsize(self.file(column)) - HEADER_SIZE
+        except FileNotFoundError:
+            return 0
+        return max(0, size) // array(self.columns[column]).itemsize
+
+
+class WeatherArchive:
+    """
+    Sloupcový archiv měření v segmentech pro čtení přes mmap.
+
+    Do archivu zapisuje jeden proces najednou (zámek adresáře), číst může
+    kdokoliv i během zápisu; nové řádky uvidí po ``refresh``.
+
+    Attributes:
+        directory (str): Adresář archivu
+        channels (Tuple[str, ...]): Kanály (sloupce kromě času)
+        typecode (str): Typový kód kanálů ('d' = float64, 'f' = float32)
+        segment_rows (int): Počet řádků, po kterém se začne nový segment
+        segments (List[ArchiveSegment]): Segmenty v časovém pořadí
+        logger (logging.Logger): Logger
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        channels: Sequence[str] = CHANNELS,
+        segment_rows: int = DEFAULT_SEGMENT_ROWS,
+        typecode: str = DEFAULT_TYPECODE
+    ):
+        """
+        Otevření archivu (nový se založí při prvním zápisu).
+
+        U existujícího archivu platí kanály, typ a velikost segmentu
+        z jeho manifestu.
+
+        Args:
+            directory: Adresář archivu
+            channels: Kanály nového archivu
+            segment_rows: Počet řádků v segmentu nového archivu
+            typecode: Typ hodnot nového archivu ('d' nebo 'f')
+
+        Raises:
+            ValueError: Pokud jsou parametry nebo manifest neplatné
+        """
+        self.directory = directory
+        self.logger = logging.getLogger("WeatherArchive")
+        manifest_path = os.path.join(directory, MANIFEST)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('format') != 1:
+                raise ValueError(f"Archiv '{directory}' má neznámý formát")
+            channels = manifest['channels']
+            segment_rows = manifest['segment_rows']
+            typecode = manifest['typecode']
+        if typecode not in ('d', 'f'):
+            raise ValueError(f"Nepodporovaný typ hodnot '{typecode}' (d nebo f)")
+        if segment_rows < 1:
+            raise ValueError("Velikost segmentu musí být kladná")
+        if not channels or TIME_COLUMN in channels:
+            raise ValueError("Archiv potřebuje alespoň jeden kanál a žádný nesmí být 'time'")
+        self.channels = tuple(channels)
+        self.typecode = typecode
+        self.segment_rows = segment_rows
+        self.segments: List[ArchiveSegment] = []
+        self._columns = {TIME_COLUMN: TIME_TYPECODE, **dict.fromkeys(self.channels, typecode)}
+        self._lock = threading.Lock()
+        self.refresh()
+
+    @classmethod
+    def from_config(cls, config: Any, directory: Optional[str] = None) -> "WeatherArchive":
+        """
+        Archiv podle sekce ``monitoring`` hlavní konfigurace.
+
+        Args:
+            config: ConfigManager (nebo cokoliv s metodou ``get``)
+            directory: Adresář archivu (výchozí monitoring.archive_dir)
+
+        Returns:
+            Archiv
+
+        Raises:
+            ValueError: Pokud adresář není nastaven
+        """
+        directory = directory or config.get('monitoring.archive_dir')
+        if not directory:
+            raise ValueError("Adresář archivu není nastaven (monitoring.archive_dir)")
+        return cls(directory, segment_rows=int(
+            config.get('monitoring.archive_segment_rows', DEFAULT_SEGMENT_ROWS)))
+
+    def __len__(self) -> int:
+        return sum(segment.rows for segment in self.segments)
+
+    @property
+    def first(self) -> Optional[datetime]:
+        """Čas nejstaršího měření nebo None"""
+        segment = next((s for s in self.segments if s.rows), None)
+        return from_micros(segment.first) if segment is not None else None
+
+    @property
+    def last(self) -> Optional[datetime]:
+        """Čas nejnovějšího měření nebo None"""
+        segment = next((s for s in reversed(self.segments) if s.rows), None)
+        return from_micros(segment.last) if segment is not None else None
+
+    def refresh(self) -> None:
+        """Znovunačtení seznamu segmentů a jejich délek (po zápisu jiného procesu)"""
+        self.close()
+        names = sorted(name for name in os.listdir(self.directory)
+                       if name.isdigit()) if os.path.isdir(self.directory) else []
+        self.segments = [ArchiveSegment(os.path.join(self.directory, name), self._columns)
+                         for name in names]
+
+    def append(self, readings: Iterable[Sequence[Any]]) -> int:
+        """
+        Připsání měření na konec archivu.
+
+        Měření musí jít v časovém pořadí; starší než poslední uložené se
+        přeskočí. Chybějící hodnota (None) se uloží jako NaN.
+
+        Args:
+            readings: N-tice (čas, hodnota pro každý kanál)
+
+        Returns:
+            Počet připsaných měření
+        """
+        width = len(self.channels)
+        with self._lock, self._locked():
+            self.refresh()
+            self._repair()
+            last = self.segments[-1].last if self.segments else None
+            written = skipped = 0
+            batch: List[Tuple[int, Sequence[Optional[float]]]] = []
+            for reading in readings:
+                moment = to_micros(reading[0])
+                if last is not None and moment < last:
+                    skipped += 1
+                    continue
+                last = moment
+                batch.append((moment, reading[1:1 + width]))
+                if len(batch) >= DEFAULT_BATCH:
+                    written += self._write(batch)
+                    batch = []
+            written += self._write(batch)
+            self.refresh()
+        if skipped:
+            self.logger.warning(f"{skipped} měření starších než konec archivu přeskočeno")
+        return written
+
+    def column(self, channel: str) -> List[memoryview]:
+        """
+        Kanál celého archivu bez kopírování (jeden memoryview na segment).
+
+        Args:
+            channel: Název kanálu nebo 'time'
+
+        Returns:
+            Seznam memoryview v časovém pořadí
+        """
+        return [segment.column(channel) for segment in self.segments if segment.rows]
+
+    def memmap(self, channel: str) -> List[Any]:
+        """
+        Kanál celého archivu jako pole numpy.memmap (jedno na segment).
+
+        Args:
+            channel: Název kanálu nebo 'time'
+
+        Returns:
+            Seznam numpy.memmap v časovém pořadí
+
+        Raises:
+            ImportError: Pokud numpy není nainstalováno
+        """
+        return [segment.memmap(channel) for segment in self.segments if segment.rows]
+
+    def select(
+        self,
+        channel: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> List[memoryview]:
+        """
+        Hodnoty kanálu v intervalu [start, end) bez kopírování.
+
+        Args:
+            channel: Název kanálu nebo 'time'
+            start: Začátek intervalu (volitelné)
+            end: Konec intervalu (volitelné)
+
+        Returns:
+            Výřezy memoryview po segmentech v časovém pořadí
+        """
+        return [segment.column(channel)[low:high]
+                for segment, low, high in self._slices(start, end)]
+
+    def read(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> Iterator[Tuple[Any, ...]]:
+        """
+        Měření v intervalu [start, end) po řádcích.
+
+        Args:
+            start: Začátek intervalu (volitelné)
+            end: Konec intervalu (volitelné)
+
+        Yields:
+            N-tice (čas, hodnota pro každý kanál); NaN se vrací jako None
+        """
+        for segment, low, high in self._slices(start, end):
+            times = segment.column(TIME_COLUMN)
+            columns = [segment.column(channel) for channel in self.channels]
+            for row in range(low, high):
+                yield (from_micros(times[row]),) + tuple(
+                    None if math.isnan(column[row]) else column[row] for column in columns)
+
+    def info(self) -> Dict[str, Any]:
+        """
+        Přehled archivu.
+
+        Returns:
+            Slovník s kanály, počtem řádků, rozsahem, velikostí a segmenty
+        """
+        first, last = self.first, self.last
+        return {
+            'directory': self.directory,
+            'channels': list(self.channels),
+            'typecode': self.typecode,
+            'rows': len(self),
+            'first': first.isoformat() if first else None,
+            'last': last.isoformat() if last else None,
+            'bytes': sum(segment.size() for segment in self.segments),
+            'segments': [{
+                'name': os.path.basename(segment.path),
+                'rows': segment.rows,
+                'first': from_micros(segment.first).isoformat() if segment.rows else None,
+                'last': from_micros(segment.last).isoformat() if segment.rows else None,
+            } for segment in self.segments],
+        }
+
+    def close(self) -> None:
+        """Uvolnění mapování všech segmentů"""
+        for segment in self.segments:
+            segment.close()
+
+    def _slices(
+        self,
+        start: Optional[datetime],
+        end: Optional[datetime]
+    ) -> Iterator[Tuple[ArchiveSegment, int, int]]:
+        """Segmenty a rozsahy řádků s časem v [start, end)"""
+        low_time = to_micros(start) if start is not None else None
+        high_time = to_micros(end) if end is not None else None
+        for segment in self.segments:
+            if not segment.rows:
+                continue
+            if low_time is not None and segment.last < low_time:
+                continue
+            if high_time is not None and segment.first >= high_time:
+                break
+            low, high = segment.bounds(low_time, high_time)
+            if low < high:
+                yield segment, low, high
+
+    def _write(self, batch: List[Tuple[int, Sequence[Optional[float]]]]) -> int:
+        """Zápis dávky do posledního segmentu, případně do nových (pod zámky)"""
+        done = 0
+        while done < len(batch):
+            segment = self.segments[-1] if self.segments else None
+            if segment is None or segment.rows >= self.segment_rows:
+                segment = self._new_segment()
+            chunk = batch[done:done + self.segment_rows - segment.rows]
+            columns = {TIME_COLUMN: array(TIME_TYPECODE, (moment for moment, _ in chunk))}
+            for index, channel in enumerate(self.channels):
+                columns[channel] = array(self.typecode, (
+                    math.nan if index >= len(values) or values[index] is None
+                    else values[index] for _, values in chunk))
+            # Časový sloupec až nakonec: čtenář bere nejkratší sloupec
+            for name in (*self.channels, TIME_COLUMN):
+                values = columns[name]
+                if not _LITTLE_ENDIAN:
+                    values.byteswap()
+                with open(segment.file(name), 'ab') as f:
+                    f.write(values.tobytes())
+            segment.rows += len(chunk)
+            done += len(chunk)
+        return done
+
+    def _new_segment(self) -> ArchiveSegment:
+        """Založení dalšího segmentu s hlavičkami sloupců (pod zámky)"""
+        if not self.segments:
+            self._write_manifest()
+        number = int(os.path.basename(self.segments[-1].path)) + 1 if self.segments else 1
+        path = os.path.join(self.directory, f"{number:06d}")
+        os.makedirs(path)
+        for column, typecode in self._columns.items():
+            header = HEADER.pack(MAGIC, column.encode('utf-8'), typecode.encode('ascii'),
+                                 array(typecode).itemsize)
+            with open(os.path.join(path, column + SUFFIX), 'wb') as f:
+                f.write(header)
+        segment = ArchiveSegment(path, self._columns)
+        self.segments.append(segment)
+        self.logger.info(f"Nový segment archivu {path}")
+        return segment
+
+    def _repair(self) -> None:
+        """Zkrácení sloupců posledního segmentu na společnou délku (po pádu při zápisu)"""
+        if not self.segments:
+            return
+        segment = self.segments[-1]
+        for column, typecode in self._columns.items():
+            path = segment.file(column)
+            expected = HEADER_SIZE + segment.rows * array(typecode).itemsize
+            if os.path.getsize(path) > expected:
+                self.logger.warning(f"Sloupec '{path}' zkrácen na {segment.rows} řádků")
+                os.truncate(path, expected)
+
+    def _write_manifest(self) -> None:
+        """Manifest s kanály, typem a velikostí segmentu (jednou při založení)"""
+        path = os.path.join(self.directory, MANIFEST)
+        if os.path.exists(path):
+            return
+        with open(f"{path}.tmp", 'w', encoding='utf-8') as f:
+            json.dump({'format': 1, 'channels': list(self.channels), 'typecode': self.typecode,
+                       'segment_rows': self.segment_rows, 'time_unit': 'us'}, f, indent=2)
+        os.replace(f"{path}.tmp", path)
+
+    def _locked(self) -> "_ArchiveLock":
+        """Zámek adresáře pro zápis mezi procesy"""
+        os.makedirs(self.directory, exist_ok=True)
+        return _ArchiveLock(os.path.join(self.directory, LOCK_FILE))
+
+
+class _ArchiveLock:
+    """flock zámkového souboru archivu (bez fcntl jen zámek vláken)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file: Any = None
+
+    def __enter__(self) -> None:
+        self._file = open(self.path, 'a')
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+
+    def __exit__(self, *exc: Any) -> None:
+        self._file.close()
+
+
+def export_sqlite(
+    db_path: str,
+    archive: WeatherArchive,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None
+) -> int:
+    """
+    Převod měření z tabulky weather_data do archivu.
+
+    Převádí se jen měření novější než konec archivu, takže opakované
+    spuštění (např. každou noc před promazáním) archiv jen doplní.
+
+    Args:
+        db_path: SQLite databáze meteostanice
+        archive: Cílový archiv (kanály musí být sloupce tabulky)
+        start: Začátek intervalu (volitelné)
+        end: Konec intervalu (volitelné)
+
+    Returns:
+        Počet převedených měření
+    """
+    last = archive.last
+    conditions, params = [], []
+    if last is not None and (start is None or start <= last):
+        conditions.append("timestamp > ?")
+        params.append(format_timestamp(last))
+    elif start is not None:
+        conditions.append("timestamp >= ?")
+        params.append(format_timestamp(start))
+    if end is not None:
+        conditions.append("timestamp < ?")
+        params.append(format_timestamp(end))
+    where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+    connection = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+    try:
+        cursor = connection.execute(
+            f"SELECT timestamp, {', '.join(archive.channels)} FROM weather_data "
+            f"{where}ORDER BY timestamp, id", params)
+
+        def readings() -> Iterator[Tuple[Any, ...]]:
+            while True:
+                rows = cursor.fetchmany(DEFAULT_BATCH)
+                if not rows:
+                    return
+                for row in rows:
+                    yield (datetime.fromisoformat(str(row[0])),) + tuple(row[1:])
+
+        count = archive.append(readings())
+    finally:
+        connection.close()
+    archive.logger.info(f"Do archivu převedeno {count} měření z '{db_path}'")
+    return count
+
+
+def import_sqlite(
+    archive: WeatherArchive,
+    db_path: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None
+) -> int:
+    """
+    Převod měření z archivu zpět do tabulky weather_data.
+
+    Měření v časovém rozsahu, který už tabulka obsahuje (mezi jejím
+    nejstarším a nejnovějším záznamem), se přeskočí, takže obnova
+    promazané historie nevytvoří duplicity.
+
+    Args:
+        archive: Zdrojový archiv
+        db_path: Cílová SQLite databáze (tabulka se případně založí)
+        start: Začátek intervalu (volitelné)
+        end: Konec intervalu (volitelné)
+
+    Returns:
+        Počet vložených měření
+    """
+    connection = connect(db_path)
+    try:
+        create_schema(connection)
+        low, high = connection.execute(
+            "SELECT MIN(timestamp), MAX(timestamp) FROM weather_data").fetchone()
+        columns = ', '.join(archive.channels)
+        placeholders = ', '.join('?' * (len(archive.channels) + 1))
+        sql = f"INSERT INTO weather_data (timestamp, {columns}) VALUES ({placeholders})"
+        count = 0
+        batch: List[Tuple[Any, ...]] = []
+        for reading in archive.read(start, end):
+            timestamp = format_timestamp(reading[0])
+            if low is not None and low <= timestamp <= high:
+                continue
+            batch.append((timestamp,) + reading[1:])
+            if len(batch) >= DEFAULT_BATCH:
+                connection.executemany(sql, batch)
+                count += len(batch)
+                batch = []
+        connection.executemany(sql, batch)
+        count += len(batch)
+        connection.commit()
+    finally:
+        connection.close()
+    archive.logger.info(f"Z archivu vloženo {count} měření do '{db_path}'")
+    return count
+
+
+def _parse_time(value: Optional[str]) -> Optional[datetime]:
+    """Čas z argumentu příkazové řádky (ISO datum nebo datum a čas)"""
+    return datetime.fromisoformat(value) if value else None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Vstupní bod příkazu ``kiosk-archive``.
+
+    Args:
+        argv: Argumenty příkazové řádky (výchozí: sys.argv)
+
+    Returns:
+        Návratový kód procesu
+    """
+    parser = argparse.ArgumentParser(prog='kiosk-archive',
+                                     description='Sloupcový archiv měření meteostanice')
+    parser.add_argument('--archive', help='Adresář archivu (výchozí monitoring.archive_dir)')
+    parser.add_argument('--config', default=os.environ.get('PROJECT_MANAGER_CONFIG'),
+                        help='Hlavní konfigurace (sekce monitoring)')
+    commands = parser.add_subparsers(dest='command', metavar='příkaz')
+    commands.required = True
+    for name, help_text in (('export', 'Převod z SQLite do archivu'),
+                            ('import', 'Převod z archivu do SQLite')):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument('--db', default='weather_data.db', help='SQLite databáze')
+        command.add_argument('--from', dest='start', help='Začátek (ISO datum)')
+        command.add_argument('--to', dest='end', help='Konec (ISO datum, nezahrnuje se)')
+    commands.add_parser('info', help='Přehled archivu (JSON)')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        if args.config:
+            from .config_manager import ConfigManager
+
+            config = ConfigManager(os.path.dirname(os.path.abspath(args.config)))
+            config.load_config(os.path.basename(args.config))
+            archive = WeatherArchive.from_config(config, args.archive)
+        elif args.archive:
+            archive = WeatherArchive(args.archive)
+        else:
+            parser.error("Zadejte --archive nebo --config")
+        if args.command == 'info':
+            print(json.dumps(archive.info(), indent=2, ensure_ascii=False))
+        elif args.command == 'export':
+            print(export_sqlite(args.db, archive, _parse_time(args.start),
+                                _parse_time(args.end)))
+        else:
+            print(import_sqlite(archive, args.db, _parse_time(args.start),
+                                _parse_time(args.end)))
+    except ValueError as e:
+        print(f"Chyba: {e}", file=sys.stderr)
+        return 1
+    archive.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,389 @@
+"""
+Úložiště meteorologických dat - Weather Store
+
+Modul pro ukládání a dotazování měření meteostanice (SQLite tabulka
+weather_data) včetně hodinových agregací, které přežijí promazání
+surových dat.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .metrics import get_registry
+from .profiling import traced
+
+
+CHANNELS = ('temperature', 'humidity', 'pressure')
+
+_INGESTED = get_registry().counter(
+    'weather_readings_ingested_total', 'Počet uložených měření meteostanice')
+_INGEST_SECONDS = get_registry().histogram(
+    'weather_ingest_seconds', 'Doba zápisu měření do databáze', ['mode'])
+_QUERY_SECONDS = get_registry().histogram(
+    'weather_query_seconds', 'Doba dotazů na data meteostanice', ['query'])
+_INGEST_SINGLE = _INGEST_SECONDS.labels('single')
+_INGEST_BATCH = _INGEST_SECONDS.labels('batch')
+_QUERY_LATEST = _QUERY_SECONDS.labels('latest')
+_QUERY_RANGE = _QUERY_SECONDS.labels('range')
+_QUERY_HOURLY = _QUERY_SECONDS.labels('hourly')
+
+
+def format_timestamp(moment: datetime) -> str:
+    """
+    Převod času do formátu, který používá tabulka weather_data.
+
+    Formát odpovídá výchozímu adaptéru sqlite3 (``YYYY-MM-DD HH:MM:SS.ffffff``),
+    takže jsou záznamy kompatibilní s původním skriptem meteostanice
+    a lze je porovnávat jako řetězce.
+
+    Args:
+        moment: Časový okamžik
+
+    Returns:
+        Časová značka jako řetězec
+    """
+    return moment.isoformat(sep=' ', timespec='microseconds')
+
+
+def connect(db_path: str) -> sqlite3.Connection:
+    """
+    Otevření SQLite databáze s nastavením vhodným pro SD kartu.
+
+    Zapíná WAL (souběžné čtení během zápisu) a timeout při zamčené
+    databázi. Nové databázi nastaví inkrementální VACUUM; existující
+    databázi bez něj nepřevádí (plný VACUUM by zamkl databázi na dlouho),
+    převod je samostatný krok ``enable_incremental_vacuum``.
+
+    Args:
+        db_path: Cesta k databázi (nebo ':memory:')
+
+    Returns:
+        Připojení k databázi
+    """
+    connection = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+    connection.execute("PRAGMA busy_timeout = 30000")
+    if connection.execute("PRAGMA page_count").fetchone()[0] == 0:
+        # U prázdné databáze se režim projeví bez VACUUM
+        connection.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    if db_path != ':memory:':
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA synchronous = NORMAL")
+    return connection
+
+
+def enable_incremental_vacuum(connection: sqlite3.Connection) -> bool:
+    """
+    Jednorázový převod existující databáze na inkrementální VACUUM.
+
+    Změna režimu se u existující databáze projeví až po plném VACUUM,
+    které přepíše celý soubor a po dobu běhu blokuje zápis.
+
+    Args:
+        connection: Připojení k databázi
+
+    Returns:
+        True pokud se databáze převáděla, False pokud už převedená byla
+    """
+    if connection.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+        return False
+    connection.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    connection.execute("VACUUM")
+    return True
+
+
+def create_schema(connection: sqlite3.Connection) -> None:
+    """
+    Vytvoření tabulky weather_data, indexu a hodinových souhrnů (idempotentní).
+
+    Args:
+        connection: Připojení k databázi
+    """
+    cursor = connection.cursor()
+    cursor.execute('''CREATE TABLE IF NOT EXISTS weather_data
+                 (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                 timestamp DATETIME,
+                 temperature REAL,
+                 humidity REAL,
+                 pressure REAL)''')
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_weather_data_timestamp "
+        "ON weather_data (timestamp)"
+    )
+    rollup_columns = ", ".join(
+        f"{channel}_sum REAL, {channel}_count INTEGER, {channel}_min REAL, {channel}_max REAL"
+        for channel in CHANNELS
+    )
+    cursor.execute(
+        "CREATE TABLE IF NOT EXISTS weather_data_hourly "
+        f"(hour TEXT PRIMARY KEY, samples INTEGER NOT NULL, {rollup_columns})"
+    )
+    # Starší souhrny neměly počty hodnot po kanálech
+    existing = {row[1] for row in cursor.execute("PRAGMA table_info(weather_data_hourly)")}
+    for channel in CHANNELS:
+        if f"{channel}_count" not in existing:
+            cursor.execute(
+                f"ALTER TABLE weather_data_hourly ADD COLUMN {channel}_count INTEGER"
+            )
+    connection.commit()
+
+
+class WeatherStore:
+    """
+    Úložiště naměřených dat meteostanice.
+
+    Schéma tabulky weather_data je shodné s původním skriptem
+    ``Chytrá meteorologická stanice.py``. Navíc udržuje tabulku
+    weather_data_hourly s hodinovými souhrny (počet měření a pro každý
+    kanál součet, počet hodnot, minimum a maximum).
+
+    Attributes:
+        db_path (str): Cesta k SQLite databázi
+        connection (sqlite3.Connection): Připojení k databázi
+        version (int): Čítač verzí dat (zvýší se při každém zápisu)
+        event_bus (EventBus): Sběrnice pro publikování nových měření (volitelná)
+        logger (logging.Logger): Logger pro auditování
+    """
+
+    CHANNELS = CHANNELS
+
+    def __init__(self, db_path: str = "weather_data.db", event_bus: Optional[Any] = None):
+        """
+        Inicializace úložiště.
+
+        Args:
+            db_path: Cesta k SQLite databázi
+            event_bus: Sběrnice událostí (EventBus) pro nová měření
+        """
+        self.db_path = db_path
+        self.event_bus = event_bus
+        self.logger = logging.getLogger("WeatherStore")
+        self._lock = threading.Lock()
+        self.version = 0
+        self.connection = connect(db_path)
+        self.create_database()
+        self._seen_id = self._max_id()
+
+    def create_database(self) -> None:
+        """Vytvoření tabulek a indexů (idempotentní)"""
+        create_schema(self.connection)
+
+    @traced()
+    def insert_reading(
+        self,
+        temperature: Optional[float],
+        humidity: Optional[float],
+        pressure: Optional[float],
+        timestamp: Optional[datetime] = None
+    ) -> int:
+        """
+        Uložení jednoho měření.
+
+        Args:
+            temperature: Teplota (°C)
+            humidity: Relativní vlhkost (%)
+            pressure: Tlak (hPa)
+            timestamp: Čas měření (výchozí: teď)
+
+        Returns:
+            ID nového záznamu
+        """
+        started = time.perf_counter()
+        moment = timestamp or datetime.now()
+        with self._lock:
+            cursor = self.connection.execute(
+                "INSERT INTO weather_data (timestamp, temperature, humidity, pressure) "
+                "VALUES (?, ?, ?, ?)",
+                (format_timestamp(moment), temperature, humidity, pressure)
+            )
+            self.connection.commit()
+            self.version += 1
+            self._seen_id = max(self._seen_id, cursor.lastrowid)
+        _INGESTED.inc()
+        _INGEST_SINGLE.observe(time.perf_counter() - started)
+        if self.event_bus is not None:
+            self._publish(
+                (cursor.lastrowid, format_timestamp(moment), temperature, humidity, pressure), 1
+            )
+        return cursor.lastrowid
+
+    @traced()
+    def insert_many(
+        self,
+        readings: Iterable[Tuple[datetime, Optional[float], Optional[float], Optional[float]]]
+    ) -> int:
+        """
+        Hromadné uložení měření v jedné transakci.
+
+        Args:
+            readings: Iterovatelné n-tice (čas, teplota, vlhkost, tlak)
+
+        Returns:
+            Počet uložených záznamů
+        """
+        started = time.perf_counter()
+        rows = [
+            (format_timestamp(moment), temperature, humidity, pressure)
+            for moment, temperature, humidity, pressure in readings
+        ]
+        with self._lock:
+            self.connection.executemany(
+                "INSERT INTO weather_data (timestamp, temperature, humidity, pressure) "
+                "VALUES (?, ?, ?, ?)",
+                rows
+            )
+            self.connection.commit()
+            self.version += 1
+            self._seen_id = self._max_id()
+            if self.event_bus is not None and rows:
+                self._publish((self._seen_id,) + rows[-1], len(rows))
+        _INGESTED.inc(len(rows))
+        _INGEST_BATCH.observe(time.perf_counter() - started)
+        return len(rows)
+
+    @traced()
+    def latest(self, limit: int = 1) -> List[Dict[str, Any]]:
+        """
+        Získání posledních měření.
+
+        Args:
+            limit: Maximální počet záznamů
+
+        Returns:
+            Seznam měření od nejnovějšího
+        """
+        started = time.perf_counter()
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT id, timestamp, temperature, humidity, pressure FROM weather_data "
+                "ORDER BY timestamp DESC, id DESC LIMIT ?",
+                (limit,)
+            ).fetchall()
+        result = [self._row_to_dict(row) for row in rows]
+        _QUERY_LATEST.observe(time.perf_counter() - started)
+        return result
+
+    @traced()
+    def query_range(self, start: datetime, end: datetime) -> List[Dict[str, Any]]:
+        """
+        Získání měření v časovém intervalu [start, end).
+
+        Args:
+            start: Začátek intervalu
+            end: Konec intervalu
+
+        Returns:
+            Seznam měření seřazený podle času
+        """
+        started = time.perf_counter()
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT id, timestamp, temperature, humidity, pressure FROM weather_data "
+                "WHERE timestamp >= ? AND timestamp < ? ORDER BY timestamp, id",
+                (format_timestamp(start), format_timestamp(end))
+            ).fetchall()
+        result = [self._row_to_dict(row) for row in rows]
+        _QUERY_RANGE.observe(time.perf_counter() - started)
+        return result
+
+    @traced()
+    def hourly(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Získání hodinových souhrnů (průměr, minimum, maximum).
+
+        Args:
+            start: Začátek intervalu (volitelné)
+            end: Konec intervalu (volitelné)
+
+        Returns:
+            Seznam hodinových souhrnů seřazený podle času
+        """
+        started = time.perf_counter()
+        start_key = format_timestamp(start)[:13] if start else ''
+        end_key = format_timestamp(end)[:13] if end else '9999'
+        with self._lock:
+            cursor = self.connection.execute(
+                "SELECT * FROM weather_data_hourly WHERE hour >= ? AND hour < ? ORDER BY hour",
+                (start_key, end_key)
+            )
+            columns = [description[0] for description in cursor.description]
+            rows = cursor.fetchall()
+
+        summaries = []
+        for row in rows:
+            record = dict(zip(columns, row))
+            summary: Dict[str, Any] = {'hour': record['hour'], 'samples': record['samples']}
+            for channel in self.CHANNELS:
+                total = record[f'{channel}_sum']
+                # SUM vynechává chybějící hodnoty, průměr se dělí jejich počtem;
+                # souhrny ze starší verze počet nemají a dělí se počtem měření
+                count = record[f'{channel}_count'] or record['samples']
+                summary[channel] = {
+                    'avg': total / count if total is not None else None,
+                    'min': record[f'{channel}_min'],
+                    'max': record[f'{channel}_max'],
+                }
+            summaries.append(summary)
+        _QUERY_HOURLY.observe(time.perf_counter() - started)
+        return summaries
+
+    @traced()
+    def refresh(self) -> bool:
+        """
+        Zjištění měření zapsaných jiným procesem (např. meteostanicí).
+
+        Při nových záznamech zvýší verzi dat a publikuje poslední měření.
+
+        Returns:
+            True pokud přibyla nová měření
+        """
+        with self._lock:
+            max_id = self._max_id()
+            if max_id <= self._seen_id:
+                return False
+            count = max_id - self._seen_id
+            self._seen_id = max_id
+            self.version += 1
+            row = self.connection.execute(
+                "SELECT id, timestamp, temperature, humidity, pressure "
+                "FROM weather_data WHERE id = ?", (max_id,)
+            ).fetchone()
+        if self.event_bus is not None and row is not None:
+            self._publish(row, count)
+        return True
+
+    def count(self) -> int:
+        """Počet surových záznamů v tabulce weather_data"""
+        with self._lock:
+            return self.connection.execute("SELECT COUNT(*) FROM weather_data").fetchone()[0]
+
+    def close(self) -> None:
+        """Uzavření připojení k databázi"""
+        self.connection.close()
+
+    def _max_id(self) -> int:
+        """Nejvyšší ID v tabulce weather_data (0 pro prázdnou tabulku)"""
+        return self.connection.execute("SELECT MAX(id) FROM weather_data").fetchone()[0] or 0
+
+    def _publish(self, row: Sequence[Any], count: int) -> None:
+        """Publikování posledního měření do sběrnice událostí"""
+        self.event_bus.publish('weather.reading', {
+            **self._row_to_dict(row), 'count': count, 'version': self.version
+        }, key='weather')
+
+    def _row_to_dict(self, row: Sequence[Any]) -> Dict[str, Any]:
+        """Převod řádku tabulky na slovník"""
+        return {
+            'id': row[0],
+            'timestamp': row[1],
+            'temperature': row[2],
+            'humidity': row[3],
+            'pressure': row[4],
+        }
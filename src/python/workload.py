@@ -0,0 +1,396 @@
+"""
+Syntetická zátěž - Workload Generator
+
+Generuje deterministické (podle semínka) scénáře celé školy: třídy,
+studenty, projekty ze šablon a úkoly s termíny a závislostmi. Umí je
+nahrát do ProjectManageru, vytvořit průběh plnění úkolů, odevzdané
+práce pro ProjectEvaluator a proud měření meteostanice, který lze
+přehrát do WeatherStore zadanou rychlostí.
+"""
+
+import math
+import random
+import time
+import unicodedata
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+FIRST_NAMES = ('Jan', 'Petr', 'Tomáš', 'Jakub', 'Lukáš', 'Ondřej', 'Matěj', 'Adam',
+               'Eliška', 'Tereza', 'Anna', 'Karolína', 'Natálie', 'Klára', 'Zuzana', 'Adéla')
+SURNAMES = ('Novák', 'Svoboda', 'Novotný', 'Dvořák', 'Černý', 'Procházka', 'Kučera',
+            'Veselý', 'Horák', 'Němec', 'Marek', 'Pokorný', 'Král', 'Růžička')
+
+# Vestavěné šablony: název, předmět, cíle, délka (týdny) a řetězec úkolů
+# (název, indexy úkolů téže šablony, na kterých úkol závisí)
+TEMPLATES = (
+    {'title': 'Meteostanice', 'subject': 'fyzika', 'weeks': 6,
+     'objectives': ['Měření teploty a vlhkosti', 'Vizualizace dat'],
+     'tasks': [('Zapojení čidel', []), ('Sběr dat', [0]), ('Databáze', [1]),
+               ('Grafy', [2]), ('Prezentace', [3])]},
+    {'title': 'Chytrý skleník', 'subject': 'biologie', 'weeks': 8,
+     'objectives': ['Řízení zálivky', 'Sledování půdní vlhkosti'],
+     'tasks': [('Návrh', []), ('Čidlo vlhkosti', [0]), ('Čerpadlo', [0]),
+               ('Automatika', [1, 2]), ('Vyhodnocení', [3])]},
+    {'title': 'Robotické auto', 'subject': 'informatika', 'weeks': 5,
+     'objectives': ['Ovládání motorů', 'Vyhýbání se překážkám'],
+     'tasks': [('Podvozek', []), ('Motory', [0]), ('Ultrazvuk', [0]),
+               ('Algoritmus', [1, 2]), ('Závod', [3])]},
+    {'title': 'Webová kronika', 'subject': 'informatika', 'weeks': 4,
+     'objectives': ['HTML a CSS', 'Publikace na kiosku'],
+     'tasks': [('Osnova', []), ('Texty', [0]), ('Stránky', [0]), ('Publikace', [1, 2])]},
+)
+PRIORITIES = (('low', 2), ('normal', 6), ('high', 2), ('critical', 1))
+
+
+def _ascii(text: str) -> str:
+    """Odstranění diakritiky (pro uživatelská jména)"""
+    return unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
+
+
+def latency_summary(samples: Sequence[float]) -> Dict[str, Any]:
+    """
+    Souhrn latencí v milisekundách.
+
+    Args:
+        samples: Doby jednotlivých operací v sekundách
+
+    Returns:
+        Slovník s 'count', 'p50_ms', 'p95_ms', 'p99_ms' a 'max_ms'
+    """
+    ordered = sorted(samples)
+    if not ordered:
+        return {'count': 0, 'p50_ms': None, 'p95_ms': None, 'p99_ms': None, 'max_ms': None}
+
+    def percentile(percent: float) -> float:
+        position = (len(ordered) - 1) * percent / 100.0
+        lower = int(position)
+        upper = min(lower + 1, len(ordered) - 1)
+        value = ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+        return round(value * 1000, 4)
+
+    return {'count': len(ordered), 'p50_ms': percentile(50), 'p95_ms': percentile(95),
+            'p99_ms': percentile(99), 'max_ms': round(ordered[-1] * 1000, 4)}
+
+
+class WorkloadGenerator:
+    """
+    Generátor deterministických scénářů.
+
+    Stejné semínko a parametry vždy dají stejný scénář, takže lze
+    porovnávat běhy mezi verzemi kódu.
+
+    Attributes:
+        seed (int): Semínko generátoru
+        start (date): Začátek školního roku (od něj se počítají termíny)
+    """
+
+    def __init__(self, seed: int = 0, start: Optional[date] = None):
+        """
+        Inicializace generátoru.
+
+        Args:
+            seed: Semínko generátoru
+            start: Začátek školního roku (výchozí 1. 9. 2025)
+        """
+        self.seed = seed
+        self.start = start or date(2025, 9, 1)
+
+    def school(
+        self,
+        classes: int = 4,
+        students_per_class: int = 25,
+        projects_per_class: int = 3,
+        tasks_per_student: int = 4
+    ) -> Dict[str, Any]:
+        """
+        Scénář celé školy.
+
+        Každý projekt třídy dostane pro každého studenta řetězec úkolů
+        ze šablony (nejvýše ``tasks_per_student``); závislosti odkazují
+        na pořadí úkolů v projektu ('depends_on') a termíny po nich
+        nepředbíhají.
+
+        Args:
+            classes: Počet tříd
+            students_per_class: Počet studentů ve třídě
+            projects_per_class: Počet projektů na třídu
+            tasks_per_student: Maximální počet úkolů studenta v projektu
+
+        Returns:
+            Slovník s 'classes', 'students' a 'projects'
+        """
+        rng = random.Random(self.seed)
+        class_names = [f"{6 + i % 4}.{chr(ord('A') + i // 4)}" for i in range(classes)]
+        students = []
+        for class_name in class_names:
+            for _ in range(students_per_class):
+                first, surname = rng.choice(FIRST_NAMES), rng.choice(SURNAMES)
+                username = _ascii(f"{first}.{surname}{len(students) + 1}").lower()
+                students.append({'username': username, 'name': f"{first} {surname}",
+                                 'class': class_name})
+
+        priorities = [name for name, weight in PRIORITIES for _ in range(weight)]
+        projects = []
+        for class_index, class_name in enumerate(class_names):
+            members = [s['username'] for s in students if s['class'] == class_name]
+            for p in range(projects_per_class):
+                template = TEMPLATES[(class_index + p) % len(TEMPLATES)]
+                begin = self.start + timedelta(days=rng.randrange(0, 120))
+                chain = template['tasks'][:tasks_per_student]
+                step = template['weeks'] * 7 // max(len(chain), 1)
+                tasks = []
+                for username in members:
+                    offset = len(tasks)
+                    for index, (name, depends) in enumerate(chain):
+                        tasks.append({
+                            'name': name,
+                            'assignee': username,
+                            'deadline': (begin + timedelta(
+                                days=step * (index + 1) + rng.randrange(0, 3))).isoformat(),
+                            'priority': rng.choice(priorities),
+                            'description': f"{template['title']}: {name}",
+                            'depends_on': [offset + d for d in depends if d < len(chain)],
+                        })
+                    for task in tasks[offset:]:
+                        latest = max((tasks[d]['deadline'] for d in task['depends_on']),
+                                     default=task['deadline'])
+                        task['deadline'] = max(task['deadline'], latest)
+                projects.append({
+                    'name': f"{template['title']} {class_name} #{p + 1}",
+                    'description': f"{template['title']} ({template['subject']})",
+                    'subject': template['subject'],
+                    'objectives': list(template['objectives']),
+                    'timeline': f"{template['weeks']} týdnů",
+                    'class': class_name,
+                    'students': members,
+                    'tasks': tasks,
+                })
+        return {'classes': class_names, 'students': students, 'projects': projects}
+
+    def progress_events(
+        self,
+        tasks: Sequence[Dict[str, Any]],
+        count: int
+    ) -> List[Tuple[int, str]]:
+        """
+        Průběh plnění úkolů, který respektuje závislosti.
+
+        Úkol přejde assigned → in_progress → completed; začít lze jen
+        úkol, jehož závislosti jsou hotové. Občas se úkol zablokuje
+        a později zase pokračuje.
+
+        Args:
+            tasks: Úkoly z ProjectManageru (s 'id', 'status', 'dependencies')
+            count: Maximální počet událostí
+
+        Returns:
+            Seznam dvojic (ID úkolu, nový stav)
+        """
+        rng = random.Random(self.seed + 1)
+        status = {task['id']: task['status'] for task in tasks}
+        waiting: Dict[int, int] = {}
+        dependents: Dict[int, List[int]] = {}
+        for task in tasks:
+            pending = [d for d in task.get('dependencies') or () if status.get(d, 'completed')
+                       != 'completed']
+            waiting[task['id']] = len(pending)
+            for dependency in pending:
+                dependents.setdefault(dependency, []).append(task['id'])
+        ready = [task_id for task_id, value in status.items()
+                 if value != 'completed' and not waiting[task_id]]
+        position = {task_id: index for index, task_id in enumerate(ready)}
+
+        events: List[Tuple[int, str]] = []
+        while ready and len(events) < count:
+            task_id = ready[rng.randrange(len(ready))]
+            if status[task_id] == 'in_progress':
+                new_status = 'blocked' if rng.random() < 0.05 else 'completed'
+            else:
+                new_status = 'in_progress'
+            status[task_id] = new_status
+            events.append((task_id, new_status))
+            if new_status != 'completed':
+                continue
+            # Odebrání z připravených výměnou s posledním prvkem (O(1))
+            last = ready.pop()
+            if last != task_id:
+                ready[position[task_id]] = last
+                position[last] = position[task_id]
+            del position[task_id]
+            for dependent in dependents.get(task_id, ()):
+                waiting[dependent] -= 1
+                if not waiting[dependent] and status[dependent] != 'completed':
+                    position[dependent] = len(ready)
+                    ready.append(dependent)
+        return events
+
+    def submissions(self, project: Dict[str, Any], count: int) -> List[Dict[str, Any]]:
+        """
+        Odevzdané práce pro ProjectEvaluator.
+
+        Práce nesou hotové 'test_results', takže hodnocení nespouští
+        sandbox a měří se jen hodnotitel samotný.
+
+        Args:
+            project: Projekt ze scénáře
+            count: Počet prací
+
+        Returns:
+            Seznam odevzdání
+        """
+        rng = random.Random(f"{self.seed}:{project['name']}")
+        submissions = []
+        for i in range(count):
+            student = project['students'][i % len(project['students'])]
+            functions = rng.randrange(1, 8)
+            code = '"""Projekt {}."""\n\n'.format(project['name']) + '\n\n'.join(
+                f"def krok_{n}(hodnota):\n    \"\"\"Krok {n}.\"\"\"\n"
+                f"    return hodnota * {n} + {rng.randrange(100)}\n"
+                for n in range(functions))
+            sections = rng.randrange(1, 5)
+            documentation = '\n\n'.join(
+                f"# Kapitola {n}\n" + ' '.join(rng.choice(SURNAMES) for _ in range(80))
+                for n in range(sections))
+            total = rng.randrange(5, 15)
+            submissions.append({
+                'id': f"{student}-{i}",
+                'student': student,
+                'code': code,
+                'documentation': documentation,
+                'test_results': {'passed': rng.randrange(0, total + 1), 'total': total},
+                'manual_scores': {'creativity': rng.randrange(40, 101),
+                                  'presentation': rng.randrange(40, 101)},
+            })
+        return submissions
+
+    def sensor_stream(
+        self,
+        count: int,
+        interval: float = 10.0,
+        start: Optional[datetime] = None
+    ) -> Iterator[Tuple[datetime, float, float, float]]:
+        """
+        Proud měření meteostanice (denní cyklus s náhodnou procházkou).
+
+        Args:
+            count: Počet měření
+            interval: Rozestup měření v sekundách
+            start: Čas prvního měření (výchozí začátek školního roku)
+
+        Yields:
+            N-tice (čas, teplota, vlhkost, tlak)
+        """
+        rng = random.Random(self.seed + 2)
+        moment = start or datetime.combine(self.start, datetime.min.time())
+        drift, pressure = 0.0, 1013.0
+        for i in range(count):
+            hour = moment.hour + moment.minute / 60.0
+            daily = math.sin((hour - 9) / 24.0 * 2 * math.pi)
+            drift = max(-5.0, min(5.0, drift + rng.gauss(0, 0.05)))
+            pressure = max(960.0, min(1050.0, pressure + rng.gauss(0, 0.1)))
+            temperature = 15.0 + 7.0 * daily + drift
+            humidity = max(10.0, min(100.0, 60.0 - 20.0 * daily + rng.gauss(0, 1.5)))
+            yield (moment, round(temperature, 2), round(humidity, 1), round(pressure, 1))
+            moment += timedelta(seconds=interval)
+
+
+def populate(
+    scenario: Dict[str, Any],
+    manager: Any,
+    registry: Optional[Any] = None,
+    latencies: Optional[List[float]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Nahrání scénáře do ProjectManageru (a evidence studentů).
+
+    Args:
+        scenario: Výstup WorkloadGenerator.school()
+        manager: ProjectManager
+        registry: StudentRegistry správce (volitelná); musí mít dostatečný
+            limit projektů na studenta
+        latencies: Seznam, do kterého se připíší doby add_task (volitelný)
+
+    Returns:
+        Vytvořené úkoly (objekty z ProjectManageru)
+    """
+    if registry is not None:
+        for student in scenario['students']:
+            registry.add_student(student['username'], student['name'], student['class'])
+    created: List[Dict[str, Any]] = []
+    for project in scenario['projects']:
+        manager.create_project(project['name'], project['description'],
+                               project['objectives'], project['timeline'])
+        if registry is not None:
+            for username in project['students']:
+                manager.assign_student(project['name'], username)
+        ids: List[int] = []
+        for spec in project['tasks']:
+            started = time.perf_counter()
+            task = manager.add_task(project['name'], spec['name'], spec['assignee'],
+                                    spec['deadline'], description=spec['description'],
+                                    priority=spec['priority'],
+                                    dependencies=[ids[d] for d in spec['depends_on']])
+            if latencies is not None:
+                latencies.append(time.perf_counter() - started)
+            ids.append(task['id'])
+            created.append(task)
+    return created
+
+
+def replay(
+    store: Any,
+    stream: Iterator[Tuple[datetime, float, float, float]],
+    rate: float = 0.0,
+    batch: int = 1,
+    clock: Callable[[], float] = time.perf_counter,
+    sleep: Callable[[float], None] = time.sleep
+) -> Dict[str, Any]:
+    """
+    Přehrání proudu měření do WeatherStore zadanou rychlostí.
+
+    Args:
+        store: WeatherStore
+        stream: Proud měření (viz WorkloadGenerator.sensor_stream)
+        rate: Měření za sekundu (0 = co nejrychleji)
+        batch: Velikost dávky (1 = insert_reading, jinak insert_many)
+        clock: Hodiny (pro testy)
+        sleep: Uspání (pro testy)
+
+    Returns:
+        Slovník s 'readings', 'seconds', 'throughput' a 'latency'
+        (souhrn doby jednoho zápisu či dávky)
+    """
+    latencies: List[float] = []
+    readings = 0
+    began = clock()
+    pending: List[Tuple[datetime, float, float, float]] = []
+
+    def write(rows: List[Tuple[datetime, float, float, float]]) -> None:
+        started = clock()
+        if batch <= 1:
+            moment, temperature, humidity, pressure = rows[0]
+            store.insert_reading(temperature, humidity, pressure, timestamp=moment)
+        else:
+            store.insert_many(rows)
+        latencies.append(clock() - started)
+
+    for reading in stream:
+        pending.append(reading)
+        readings += 1
+        if len(pending) >= max(batch, 1):
+            write(pending)
+            pending = []
+        if rate > 0:
+            delay = began + readings / rate - clock()
+            if delay > 0:
+                sleep(delay)
+    if pending:
+        write(pending)
+    seconds = clock() - began
+    return {
+        'readings': readings,
+        'seconds': round(seconds, 4),
+        'throughput': round(readings / seconds, 1) if seconds > 0 else None,
+        'latency': latency_summary(latencies),
+    }
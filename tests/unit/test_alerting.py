@@ -0,0 +1,147 @@
+"""
+Unit testy pro AlertEngine
+
+Testuje kompilaci pravidel, hysterezi, deduplikaci, rychlost změny
+a napojení na sběrnici událostí.
+"""
+
+import os
+import tempfile
+import threading
+import time
+import unittest
+from datetime import date, timedelta
+
+from src.python.alerting import AlertEngine, EventBusNotifier, LocalNotifier, Notifier
+from src.python.config_manager import ConfigManager
+from src.python.event_bus import EventBus
+from src.python.project_manager import ProjectManager
+
+
+class TestAlertEngine(unittest.TestCase):
+    """Testy pro AlertEngine třídu"""
+
+    def setUp(self):
+        """Příprava - lokální oznamovač"""
+        self.notifier = LocalNotifier()
+
+    def _engine(self, *rules):
+        """Pomocná metoda pro vytvoření enginu"""
+        return AlertEngine(list(rules), notifiers=[self.notifier])
+
+    def test_hysteresis_and_deduplication(self):
+        """Test spuštění po N vzorcích, deduplikace a návratu pod práh clear"""
+        engine = self._engine({'name': 'cpu_hot', 'metric': 'system.cpu_temperature',
+                               'above': 80, 'clear': 75, 'for': 2})
+        for second, value in enumerate([79, 81, 79, 81, 82, 85, 78, 76, 74, 81]):
+            engine.observe('system.cpu_temperature', value, timestamp=second)
+
+        states = [(a['state'], a['value'], a['time']) for a in self.notifier.alerts]
+        # 81 -> 79 přeruší sérii; 81, 82 spustí; 78 a 76 drží (hystereze); 74 vyřeší
+        self.assertEqual(states, [('firing', 82.0, 4), ('resolved', 74.0, 8)])
+        self.assertEqual(engine.firing(), [])
+
+    def test_rate_of_change_and_keys(self):
+        """Test pravidla rychlosti změny a oddělených řad podle klíče"""
+        engine = self._engine({'name': 'spike', 'metric': 'weather.temperature',
+                               'rate_above': 3, 'window': 60,
+                               'message': "Změna {value:+.1f} °C ({key})"})
+        for second, value in [(0, 20.0), (30, 21.0), (50, 24.5), (200, 24.6)]:
+            engine.observe('weather.temperature', value, timestamp=second, key='venku')
+        engine.observe('weather.temperature', 20.0, timestamp=0, key='uvnitř')
+        engine.observe('weather.temperature', 21.0, timestamp=10, key='uvnitř')
+
+        self.assertEqual([a['state'] for a in self.notifier.alerts], ['firing', 'resolved'])
+        self.assertEqual(self.notifier.alerts[0]['message'], "Změna +4.5 °C (venku)")
+
+    def test_invalid_rules(self):
+        """Test odmítnutí neplatných pravidel při kompilaci"""
+        invalid = [
+            {'name': 'a', 'metric': 'x'},
+            {'name': 'a', 'metric': 'x', 'above': 1, 'below': 0},
+            {'name': 'a', 'metric': 'x', 'above': 10, 'clear': 11},
+            {'name': 'a', 'metric': 'x', 'rate_above': 1},
+            {'name': 'a', 'metric': 'x', 'above': 1, 'severity': 'panika'},
+        ]
+        for spec in invalid:
+            with self.assertRaises(ValueError):
+                self._engine(spec)
+        with self.assertRaises(ValueError):
+            self._engine({'name': 'a', 'metric': 'x', 'above': 1},
+                         {'name': 'a', 'metric': 'y', 'above': 1})
+
+    def test_failing_notifier_does_not_block_others(self):
+        """Test že chyba jednoho oznamovače neovlivní ostatní"""
+        class Failing(Notifier):
+            def notify(self, alert):
+                raise ConnectionError("nedostupné")
+
+        engine = AlertEngine([{'name': 'low', 'metric': 'x', 'below': 5}],
+                             notifiers=[Failing(), self.notifier])
+        engine.observe('x', 1, timestamp=0)
+        self.assertEqual(len(self.notifier.alerts), 1)
+
+    def test_slow_notifier_does_not_block_publish(self):
+        """Test, že spuštěný engine volá oznamovače mimo EventBus.publish"""
+        release = threading.Event()
+
+        class Slow(Notifier):
+            def notify(self, alert):
+                release.wait(5)
+
+        bus = EventBus()
+        engine = AlertEngine([{'name': 'throttled', 'metric': 'system.throttled', 'above': 0}],
+                             notifiers=[Slow(), self.notifier])
+        engine.attach(bus)
+        engine.start(interval=3600)
+        started = time.monotonic()
+        bus.publish('system.sample', {'throttled': 4})
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertEqual(self.notifier.alerts, [])
+
+        release.set()
+        engine.stop(timeout=5)
+        self.assertEqual([a['state'] for a in self.notifier.alerts], ['firing'])
+
+    def test_event_bus_pipeline(self):
+        """Test úkolů po termínu a upozornění ze systémových vzorků přes sběrnici"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            bus = EventBus()
+            events = []
+            bus.subscribe(lambda event: event['topic'].startswith('alert') and events.append(event))
+            pm = ProjectManager(os.path.join(temp_dir, 'pm.log'), event_bus=bus)
+            pm.create_project("Meteostanice", "Popis", [], "4 týdny")
+            yesterday = (date.today() - timedelta(days=1)).isoformat()
+            late = pm.add_task("Meteostanice", "Čidlo", "jan.novak", yesterday)
+
+            engine = AlertEngine(
+                [{'name': 'overdue', 'metric': 'projects.overdue_tasks', 'above': 0},
+                 {'name': 'throttled', 'metric': 'system.throttled', 'above': 0}],
+                notifiers=[self.notifier, EventBusNotifier(bus)])
+            engine.attach(bus, pm)
+            engine.tick()
+            pm.add_task("Meteostanice", "Graf", "jan.novak", "2999-01-01")
+            pm.update_task_status(late['id'], "completed")
+            bus.publish('system.sample', {'throttled': 4, 'timestamp': 'x'})
+
+        self.assertEqual(
+            [(a['rule'], a['state'], a['value']) for a in self.notifier.alerts],
+            [('overdue', 'firing', 1.0), ('overdue', 'resolved', 0.0),
+             ('throttled', 'firing', 4.0)])
+        self.assertEqual([e['topic'] for e in events],
+                         ['alert.firing', 'alert.resolved', 'alert.firing'])
+
+    def test_from_config(self):
+        """Test vypnutí a pravidel z konfigurace"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config = ConfigManager(temp_dir)
+            config.set('monitoring.alerting_enabled', False)
+            self.assertIsNone(AlertEngine.from_config(config))
+            config.set('monitoring.alerting_enabled', True)
+            config.set('alerting.rules', [{'name': 'a', 'metric': 'x', 'above': 1}])
+            engine = AlertEngine.from_config(config)
+        self.assertEqual([rule.name for rule in engine.rules], ['a'])
+
+
+if __name__ == '__main__':
+    unittest.main()
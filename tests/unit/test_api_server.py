@@ -0,0 +1,330 @@
+"""
+Unit testy pro ApiServer
+
+Testuje endpointy, keep-alive, ETag/If-None-Match a gzip.
+"""
+
+import asyncio
+import gzip
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from src.python.api_server import ApiServer, main, request
+from src.python.event_bus import EventBus
+from src.python.progress_history import ProgressHistory
+from src.python.project_manager import ProjectManager
+from src.python.search_index import SearchIndex
+from src.python.weather_store import WeatherStore
+
+
+class TestApiServer(unittest.TestCase):
+    """Testy pro ApiServer třídu"""
+
+    def setUp(self):
+        """Příprava - projekt s úkoly a meteostanice"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.pm = ProjectManager(os.path.join(self.temp_dir.name, 'pm.log'))
+        self.pm.create_project("Meteostanice", "Popis", ["Sběr dat"], "4 týdny")
+        for i in range(20):
+            self.pm.add_task("Meteostanice", f"Úkol {i}", "jan.novak", "2025-12-31")
+        self.store = WeatherStore(os.path.join(self.temp_dir.name, 'weather.db'))
+        self.store.insert_reading(21.5, 45.0, 1013.2)
+        self.server = ApiServer(self.pm, self.store, port=0)
+
+    def tearDown(self):
+        """Čistka"""
+        self.store.close()
+        self.temp_dir.cleanup()
+
+    def _run(self, scenario):
+        """Spuštění scénáře proti běžícímu serveru"""
+        async def wrapper():
+            await self.server.start()
+            reader, writer = await asyncio.open_connection('127.0.0.1', self.server.port)
+            try:
+                await scenario(reader, writer)
+            finally:
+                writer.close()
+                await self.server.stop()
+        asyncio.run(wrapper())
+
+    def test_etag_and_keep_alive(self):
+        """Test 304 při nezměněných datech a nového ETagu po změně"""
+        async def scenario(reader, writer):
+            path = '/api/projects/Meteostanice/progress'
+            status, headers, body = await request(reader, writer, path)
+            self.assertEqual(status, 200)
+            self.assertEqual(headers['connection'], 'keep-alive')
+            self.assertEqual(json.loads(body)['progress'], 0.0)
+            etag = headers['etag']
+
+            # Stejné spojení, nezměněná data
+            status, headers, body = await request(reader, writer, path, {'If-None-Match': etag})
+            self.assertEqual((status, body), (304, b''))
+
+            self.pm.update_task_status(1, "completed")
+            status, headers, body = await request(reader, writer, path, {'If-None-Match': etag})
+            self.assertEqual(status, 200)
+            self.assertNotEqual(headers['etag'], etag)
+            self.assertEqual(json.loads(body)['progress'], 5.0)
+
+        self._run(scenario)
+        self.assertEqual(self.server.stats['not_modified'], 1)
+
+    def test_gzip_and_cache(self):
+        """Test gzip komprese a znovupoužití serializovaného těla"""
+        async def scenario(reader, writer):
+            path = '/api/projects/Meteostanice/report'
+            status, headers, body = await request(
+                reader, writer, path, {'Accept-Encoding': 'gzip, deflate'})
+            self.assertEqual(headers['content-encoding'], 'gzip')
+            report = json.loads(gzip.decompress(body))
+            self.assertEqual(report['total_tasks'], 20)
+
+            gzip_etag = headers['etag']
+
+            status, headers, body = await request(reader, writer, path)
+            self.assertNotIn('content-encoding', headers)
+            self.assertEqual(json.loads(body)['total_tasks'], 20)
+            # Každé kódování má vlastní ETag
+            self.assertNotEqual(headers['etag'], gzip_etag)
+            self.assertEqual(gzip_etag, headers['etag'][:-1] + '-gzip"')
+
+            status, headers, body = await request(
+                reader, writer, path, {'Accept-Encoding': 'gzip', 'If-None-Match': gzip_etag})
+            self.assertEqual((status, headers['etag']), (304, gzip_etag))
+
+        self._run(scenario)
+        self.assertEqual(self.server.stats['cache_hits'], 1)
+
+    def test_head_content_length(self):
+        """Test, že HEAD hlásí délku těla odpovědi na GET"""
+        async def scenario(reader, writer):
+            for path in ('/api/projects/Meteostanice/report', '/api/health'):
+                _, get_headers, body = await request(reader, writer, path)
+                status, headers, head_body = await request(reader, writer, path, method='HEAD')
+                self.assertEqual((status, head_body), (200, b''))
+                self.assertEqual(headers['content-length'], str(len(body)))
+                self.assertEqual(headers.get('etag'), get_headers.get('etag'))
+            # Spojení pokračuje dalším požadavkem, tělo HEAD se neposlalo
+            status, _, _ = await request(reader, writer, '/api/health')
+            self.assertEqual(status, 200)
+
+        self._run(scenario)
+
+    def test_invalid_content_length(self):
+        """Test neplatné hlavičky Content-Length"""
+        async def scenario(reader, writer):
+            status, headers, body = await request(
+                reader, writer, '/api/health', {'Content-Length': 'abc'})
+            self.assertEqual((status, headers['connection']), (400, 'close'))
+            self.assertIn('Content-Length', json.loads(body)['error'])
+            self.assertEqual(await reader.read(), b'')
+
+            reader, writer = await asyncio.open_connection('127.0.0.1', self.server.port)
+            status, _, _ = await request(reader, writer, '/api/health', {'Content-Length': '-5'})
+            self.assertEqual(status, 400)
+            writer.close()
+
+        self._run(scenario)
+
+    def test_weather_latest(self):
+        """Test posledních měření a verze meteostanice"""
+        async def scenario(reader, writer):
+            status, headers, body = await request(reader, writer, '/api/weather/latest?limit=5')
+            self.assertEqual(json.loads(body)[0]['temperature'], 21.5)
+            etag = headers['etag']
+
+            self.store.insert_reading(22.0, 44.0, 1012.8)
+            status, headers, body = await request(
+                reader, writer, '/api/weather/latest?limit=5', {'If-None-Match': etag})
+            self.assertEqual(status, 200)
+            self.assertEqual(len(json.loads(body)), 2)
+
+        self._run(scenario)
+
+    def test_task_query(self):
+        """Test filtrovaných úkolů se stránkováním a plánem dotazu"""
+        async def scenario(reader, writer):
+            self.pm.update_task_status(3, 'blocked')
+            status, _, body = await request(reader, writer,
+                                            '/api/tasks?status=blocked&explain=1')
+            self.assertEqual(status, 200)
+            result = json.loads(body)
+            self.assertEqual([t['id'] for t in result['tasks']], [3])
+            self.assertEqual(result['explain']['source'], 'index:status')
+
+            status, _, body = await request(
+                reader, writer, '/api/tasks?project=Meteostanice&limit=5&offset=15')
+            self.assertEqual(json.loads(body)['next_offset'], None)
+            self.assertEqual(len(json.loads(body)['tasks']), 5)
+            status, _, _ = await request(reader, writer, '/api/tasks?deadline_to=zitra')
+            self.assertEqual(status, 400)
+            status, _, _ = await request(reader, writer, '/api/tasks?project=Jiný')
+            self.assertEqual(status, 404)
+
+        self._run(scenario)
+
+    def test_search(self):
+        """Test fulltextového vyhledávání přes API"""
+        async def scenario(reader, writer):
+            status, _, _ = await request(reader, writer, '/api/search?q=ukol')
+            self.assertEqual(status, 404)
+
+            SearchIndex().attach(self.pm)
+            status, headers, body = await request(reader, writer,
+                                                  '/api/search?q=%C3%BAkol%2012&limit=3')
+            self.assertEqual(status, 200)
+            self.assertNotIn('etag', headers)
+            results = json.loads(body)['results']
+            self.assertEqual(results[0]['task']['name'], "Úkol 12")
+            status, _, _ = await request(reader, writer, '/api/search?q=ukol&type=x')
+            self.assertEqual(status, 400)
+
+        self._run(scenario)
+
+    def test_burndown(self):
+        """Test burndownu a odhadu dokončení přes API"""
+        async def scenario(reader, writer):
+            path = '/api/projects/Meteostanice/burndown'
+            status, _, _ = await request(reader, writer, path)
+            self.assertEqual(status, 404)
+
+            history = ProgressHistory(os.path.join(self.temp_dir.name, 'progress'))
+            history.attach(self.pm)
+            self.pm.update_task_status(1, "completed")
+            status, headers, body = await request(reader, writer, path + '?weeks=1')
+            self.assertEqual(status, 200)
+            self.assertNotIn('etag', headers)
+            burndown = json.loads(body)
+            self.assertEqual(burndown['days'][-1]['remaining'], 19)
+            self.assertEqual(burndown['forecast']['remaining'], 19)
+            status, _, _ = await request(reader, writer, path + '?weeks=x')
+            self.assertEqual(status, 400)
+            history.close()
+
+        self._run(scenario)
+
+    def test_errors(self):
+        """Test chybových odpovědí"""
+        async def scenario(reader, writer):
+            status, _, body = await request(reader, writer, '/api/projects/Neznámý/stats')
+            self.assertEqual(status, 404)
+            self.assertIn('Neznámý', json.loads(body)['error'])
+            status, headers, _ = await request(reader, writer, '/api/projects', method='POST')
+            self.assertEqual((status, headers['allow']), (405, 'GET, HEAD'))
+            status, _, _ = await request(reader, writer, '/api/weather/latest?limit=x')
+            self.assertEqual(status, 400)
+
+            status, headers, _ = await request(reader, writer, '/api/health',
+                                               {'Connection': 'close'})
+            self.assertEqual((status, headers['connection']), (200, 'close'))
+            self.assertEqual(await reader.read(), b'')
+
+        self._run(scenario)
+
+    def test_server_sent_events(self):
+        """Test doručení změny stavu úkolu přes SSE"""
+        bus = EventBus()
+        self.pm.event_bus = bus
+        self.server = ApiServer(self.pm, self.store, port=0, event_bus=bus, sse_heartbeat=0.05)
+
+        async def read_event(reader):
+            block = (await reader.readuntil(b'\n\n')).decode('utf-8')
+            return dict(line.split(': ', 1) for line in block.strip().split('\n'))
+
+        async def scenario(reader, writer):
+            writer.write(b"GET /api/events?topics=task HTTP/1.1\r\nHost: localhost\r\n\r\n")
+            head = await reader.readuntil(b'\r\n\r\n')
+            self.assertIn(b'text/event-stream', head)
+            self.assertEqual(await reader.readuntil(b'\n\n'), b'retry: 2000\n\n')
+            hello = await read_event(reader)
+            self.assertEqual(hello['event'], 'hello')
+
+            # Heartbeat při nečinnosti
+            self.assertEqual(await reader.readuntil(b'\n\n'), b': ping\n\n')
+            self.assertEqual(self.server.stats['streams'], 1)
+
+            self.store.insert_reading(20.0, 40.0, 1000.0)
+            self.pm.update_task_status(3, "completed")
+            event = await read_event(reader)
+            while event.get('event') is None:
+                event = await read_event(reader)
+            self.assertEqual(event['event'], 'task.status')
+            self.assertEqual(json.loads(event['data'])['task_id'], 3)
+
+        self._run(scenario)
+        self.assertEqual(bus.subscriber_count, 0)
+
+    def test_reload_state_file(self):
+        """Test znovunačtení stavu zapsaného příkazem project-manager"""
+        state_file = os.path.join(self.temp_dir.name, 'state.json')
+        self.pm.save_state(state_file)
+        self.server = ApiServer(self.pm, port=0, state_file=state_file, reload_interval=0)
+
+        other = ProjectManager(os.path.join(self.temp_dir.name, 'pm.log'))
+        other.load_state(state_file)
+        other.create_project("Robot", "Popis", [], "2 týdny")
+        other.save_state(state_file)
+        os.utime(state_file, (0, 0))
+
+        async def scenario(reader, writer):
+            # Stav se načte v executoru; do té doby se obsluhuje dosavadní
+            for _ in range(200):
+                _, _, body = await request(reader, writer, '/api/projects')
+                names = [p['name'] for p in json.loads(body)]
+                if names != ['Meteostanice']:
+                    break
+                await asyncio.sleep(0.01)
+            self.assertEqual(names, ['Meteostanice', 'Robot'])
+
+        self._run(scenario)
+
+    def test_reload_does_not_block_loop(self):
+        """Test, že pomalé načtení stavu neblokuje obsluhu ostatních požadavků"""
+        state_file = os.path.join(self.temp_dir.name, 'state.json')
+        self.pm.save_state(state_file)
+        self.server = ApiServer(self.pm, port=0, state_file=state_file, reload_interval=0)
+        os.utime(state_file, (0, 0))
+        restore = self.pm.restore
+
+        def slow_restore(state):
+            time.sleep(0.5)
+            restore(state)
+
+        async def scenario(reader, writer):
+            with mock.patch.object(self.pm, 'restore', slow_restore):
+                started = time.monotonic()
+                status, _, _ = await request(reader, writer, '/api/health')
+                self.assertEqual(status, 200)
+                self.assertLess(time.monotonic() - started, 0.4)
+                await self.server._reload
+
+        self._run(scenario)
+
+    def test_main_runs_retention(self):
+        """Test, že kiosk-api s --weather-db spouští a zastavuje retenci měření"""
+        def run(coroutine):
+            coroutine.close()
+            raise KeyboardInterrupt
+
+        with mock.patch('src.python.retention.RetentionCompactor.start') as start, \
+                mock.patch('src.python.retention.RetentionCompactor.stop') as stop, \
+                mock.patch('src.python.api_server.instrument_logging'), \
+                mock.patch('logging.basicConfig'), \
+                mock.patch('asyncio.run', run):
+            code = main(['--data', os.path.join(self.temp_dir.name, 'state.json'),
+                         '--log-file', os.path.join(self.temp_dir.name, 'pm.log'),
+                         '--weather-db', os.path.join(self.temp_dir.name, 'weather.db'),
+                         '--metrics-port', '0'])
+        self.assertEqual(code, 0)
+        start.assert_called_once_with(3600.0)
+        stop.assert_called_once_with()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,180 @@
+"""
+Unit testy pro zálohování
+
+Testuje dělení na bloky, deduplikaci mezi snímky, online kopii
+SQLite databáze během zápisu, proudovou obnovu a retenci snímků.
+"""
+
+import contextlib
+import io
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta
+
+from src.python.backup import BackupEngine, main, text_chunks
+from src.python.weather_store import WeatherStore
+
+
+class TestBackupEngine(unittest.TestCase):
+    """Testy pro BackupEngine"""
+
+    def setUp(self):
+        """Příprava - konfigurace, stav projektů a databáze měření"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        root = self.temp_dir.name
+        self.config_dir = os.path.join(root, 'config')
+        os.makedirs(os.path.join(self.config_dir, 'rules'))
+        with open(os.path.join(self.config_dir, 'main-config.yaml'), 'w') as f:
+            f.write("security:\n  backup_retention_days: 7\n")
+        with open(os.path.join(self.config_dir, 'rules', 'light.yaml'), 'w') as f:
+            f.write("rule: light\n")
+        self.data = os.path.join(root, 'projects.json')
+        self._write_state(200)
+        self.db_path = os.path.join(root, 'weather.db')
+        self.store = WeatherStore(self.db_path)
+        self.store.insert_many((datetime(2025, 10, 1) + timedelta(minutes=i), 20.0 + i % 7,
+                                50.0, 1000.0) for i in range(5000))
+        self.engine = BackupEngine(os.path.join(root, 'repo'), chunk_size=16 * 1024)
+        self.files = {'config': self.config_dir, 'projects': self.data}
+        self.databases = {'weather': self.db_path}
+
+    def tearDown(self):
+        """Čistka"""
+        self.store.close()
+        self.temp_dir.cleanup()
+
+    def _write_state(self, tasks, first=1):
+        state = {'projects': {'P': {'name': 'P', 'tasks': [
+            {'id': i, 'name': f"Úkol {i}", 'status': 'assigned'}
+            for i in range(first, tasks + 1)]}}}
+        with open(self.data, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2, ensure_ascii=False)
+
+    def test_text_chunks_are_content_defined(self):
+        """Test, že vložení řádku změní jen blok, do kterého padne"""
+        lines = [f'    "task": {i},\n'.encode() for i in range(5000)]
+        original = list(text_chunks(io.BytesIO(b''.join(lines)), 16 * 1024))
+        edited = list(text_chunks(io.BytesIO(b''.join(lines[:10] + [b'new\n'] + lines[10:])),
+                                  16 * 1024))
+        self.assertEqual(b''.join(edited).count(b'new\n'), 1)
+        self.assertGreater(len(original), 10)
+        self.assertEqual(len(set(original) - set(edited)), 1)
+        self.assertEqual(original[1:], edited[1:])
+        long_line = list(text_chunks(io.BytesIO(b'x' * 40000), 16 * 1024))
+        self.assertEqual([len(chunk) for chunk in long_line], [16384, 16384, 7232])
+
+    def test_incremental_backup_and_restore(self):
+        """Test, že druhý snímek zapíše jen změněné bloky a obnova sedí"""
+        first = self.engine.backup(self.files, self.databases, now=datetime(2025, 10, 1, 2))
+        self.assertEqual(first['files'], 4)
+        self.assertGreater(first['chunks_new'], 0)
+        self.assertLess(first['bytes_stored'], first['bytes_read'])
+
+        unchanged = self.engine.backup(self.files, self.databases, now=datetime(2025, 10, 2, 2))
+        self.assertEqual(unchanged['files_unchanged'], 3)
+        self.assertLessEqual(unchanged['chunks_new'], 1)
+
+        self.store.insert_reading(25.0, 40.0, 990.0, datetime(2025, 10, 5))
+        self._write_state(201)
+        second = self.engine.backup(self.files, self.databases, now=datetime(2025, 10, 3, 2))
+        self.assertEqual(second['files_unchanged'], 2)
+        self.assertLess(second['chunks_new'], 6)
+        self.assertLess(second['bytes_stored'], first['bytes_stored'] / 5)
+
+        target = os.path.join(self.temp_dir.name, 'restore')
+        stats = self.engine.restore(target, second['snapshot'])
+        self.assertEqual(stats['files'], 4)
+        with open(os.path.join(target, 'projects', 'projects.json'), 'rb') as restored, \
+                open(self.data, 'rb') as original:
+            self.assertEqual(restored.read(), original.read())
+        connection = sqlite3.connect(os.path.join(target, 'weather', 'weather.db'))
+        self.assertEqual(connection.execute("SELECT count(*) FROM weather_data").fetchone(),
+                         (5001,))
+        connection.close()
+
+        # Starší snímek a výběr podle prefixu
+        partial = os.path.join(self.temp_dir.name, 'partial')
+        self.engine.restore(partial, first['snapshot'], include=['config/rules'])
+        self.assertEqual(os.listdir(partial), ['config'])
+        self.assertEqual(b''.join(self.engine.read('config/rules/light.yaml')), b"rule: light\n")
+        self.assertEqual(self.engine.verify(), [])
+
+    def test_database_copy_during_ingestion(self):
+        """Test online kopie databáze během souběžného zápisu měření"""
+        stop = threading.Event()
+
+        def ingest():
+            store = WeatherStore(self.db_path)
+            moment = datetime(2025, 10, 10)
+            while not stop.is_set():
+                moment += timedelta(seconds=1)
+                store.insert_reading(21.0, 45.0, 1005.0, moment)
+            store.close()
+
+        writer = threading.Thread(target=ingest)
+        writer.start()
+        try:
+            stats = self.engine.backup(databases=self.databases)
+        finally:
+            stop.set()
+            writer.join()
+        self.assertEqual(stats['files'], 1)
+        target = os.path.join(self.temp_dir.name, 'restore')
+        self.engine.restore(target)
+        connection = sqlite3.connect(os.path.join(target, 'weather', 'weather.db'))
+        self.assertEqual(connection.execute("PRAGMA integrity_check").fetchone(), ('ok',))
+        self.assertGreaterEqual(
+            connection.execute("SELECT count(*) FROM weather_data").fetchone()[0], 5000)
+        connection.close()
+
+    def test_corruption_and_prune(self):
+        """Test odhalení poškozeného bloku a mazání starých snímků s bloky"""
+        first = self.engine.backup(self.files, now=datetime(2025, 10, 1, 2))
+        self._write_state(400, first=201)
+        self.engine.backup(self.files, now=datetime(2025, 10, 20, 2))
+        self.assertEqual(len(self.engine.snapshots()), 2)
+
+        old_chunks = self.engine.size()['chunks']
+        stats = self.engine.prune(now=datetime(2025, 11, 5))
+        self.assertEqual(stats['snapshots_removed'], 1)
+        self.assertGreater(stats['chunks_removed'], 0)
+        self.assertEqual(self.engine.size()['chunks'], old_chunks - stats['chunks_removed'])
+        with self.assertRaises(ValueError):
+            self.engine.manifest(first['snapshot'])
+        # Nejnovější snímek zůstává i po uplynutí retence
+        self.assertEqual(self.engine.prune(now=datetime(2026, 1, 1))['snapshots_removed'], 0)
+
+        entry = next(e for e in self.engine.manifest()['files'] if e['name'].endswith('.json'))
+        digest = entry['chunks'][0][0]
+        with open(os.path.join(self.engine.repository, 'chunks', digest[:2], digest), 'wb') as f:
+            f.write(b'rcorrupted')
+        self.assertEqual(len(self.engine.verify()), 1)
+        with self.assertRaises(ValueError):
+            self.engine.restore(os.path.join(self.temp_dir.name, 'restore'))
+
+    def test_command_line(self):
+        """Test příkazů kiosk-backup"""
+        repository = os.path.join(self.temp_dir.name, 'cli-repo')
+        config = os.path.join(self.config_dir, 'main-config.yaml')
+        base = ['--config', config, '--repository', repository]
+        self.assertEqual(main(base + ['run', '--data', self.data,
+                                      '--weather-db', self.db_path]), 0)
+        engine = BackupEngine(repository)
+        names = [entry['name'] for entry in engine.manifest()['files']]
+        self.assertEqual(names, ['projects/projects.json', 'config/main-config.yaml',
+                                 'config/rules/light.yaml', 'weather/weather.db'])
+        self.assertEqual(main(base + ['verify']), 0)
+        self.assertEqual(main(base + ['restore', '--snapshot', 'neexistuje',
+                                      '--target', repository]), 1)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertEqual(main(['schedule']), 0)
+        self.assertEqual(output.getvalue(), "0 2 * * *\n")
+
+
+if __name__ == '__main__':
+    unittest.main()
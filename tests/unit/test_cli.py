@@ -0,0 +1,284 @@
+"""
+Unit testy pro příkaz project-manager
+
+Testuje podpříkazy nad dočasným souborem se stavem a líné importy.
+"""
+
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from src.python.cli import main
+from src.python.gradebook import Gradebook
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class TestCli(unittest.TestCase):
+    """Testy pro příkaz project-manager"""
+
+    def setUp(self):
+        """Příprava - dočasný soubor se stavem"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data = os.path.join(self.temp_dir.name, 'state.json')
+        self.log = os.path.join(self.temp_dir.name, 'pm.log')
+
+    def tearDown(self):
+        """Čistka"""
+        self.temp_dir.cleanup()
+
+    def _run(self, *args: str) -> tuple:
+        """Pomocná metoda pro spuštění příkazu"""
+        out, err = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            code = main(['--data', self.data, '--log-file', self.log, *args])
+        return code, out.getvalue(), err.getvalue()
+
+    def test_sprava_script_commands(self):
+        """Test příkazů ze skriptů sprava/*.sh"""
+        self.assertEqual(self._run('student', 'add', '--name', 'Jan Novak',
+                                   '--class', '8.A', '--username', 'jan.novak')[0], 0)
+        self.assertEqual(self._run('create', '--name', 'weather-station',
+                                   '--category', 'iot', '--difficulty', 'beginner')[0], 0)
+        self.assertEqual(self._run('project', 'assign', '--project', 'weather-station',
+                                   '--student', 'jan.novak')[0], 0)
+
+        with open(self.data, encoding='utf-8') as f:
+            state = json.load(f)
+        self.assertEqual(state['students']['jan.novak']['class'], '8.A')
+        self.assertEqual(state['projects']['weather-station']['category'], 'iot')
+        self.assertEqual(state['projects']['weather-station']['students'], ['jan.novak'])
+
+    def test_tasks_persist_between_runs(self):
+        """Test že úkoly a jejich stav přežijí mezi spuštěními"""
+        self._run('create', '--name', 'P')
+        self._run('task', 'add', '--project', 'P', '--name', 'T1',
+                  '--assignee', 'jan.novak', '--deadline', '2025-12-31')
+        self._run('task', 'add', '--project', 'P', '--name', 'T2',
+                  '--assignee', 'jan.novak', '--deadline', '2025-12-31')
+        self.assertEqual(self._run('task', 'status', '--id', '2', '--status', 'completed')[0], 0)
+
+        code, out, _ = self._run('--json', 'project', 'report', '--project', 'P')
+        self.assertEqual(code, 0)
+        report = json.loads(out)
+        self.assertEqual(report['progress'], 50.0)
+        self.assertEqual(report['completed_tasks'], ['T2'])
+
+        self._run('task', 'status', '--id', '1', '--status', 'blocked', '--notes', 'Chybí čidlo')
+        code, out, _ = self._run('--json', 'task', 'search', 'cidlo')
+        self.assertEqual(code, 0)
+        self.assertEqual([r['task']['name'] for r in json.loads(out)], ['T1'])
+
+        code, out, _ = self._run('--json', 'task', 'list', '--status', 'blocked,completed',
+                                 '--order-by', 'deadline')
+        self.assertEqual([t['name'] for t in json.loads(out)], ['T1', 'T2'])
+        code, out, _ = self._run('task', 'list', '--project', 'P', '--limit', '1', '--explain')
+        self.assertIn('další stránka: --offset 1', out)
+        self.assertIn('"source": "project"', out)
+        self.assertEqual(self._run('task', 'list', '--to', 'zítra')[0], 1)
+
+        # Historie pokroku se zapisuje mezi spuštěními vedle datového souboru
+        code, out, _ = self._run('--json', 'project', 'burndown', '--project', 'P')
+        self.assertEqual(code, 0)
+        burndown = json.loads(out)
+        self.assertEqual(burndown['days'][-1]['remaining'], 1)
+        self.assertEqual(burndown['velocity'][-1]['completed'], 1)
+        self.assertIn('zbývá', self._run('project', 'burndown', '--project', 'P')[1])
+
+    def test_student_workload_and_project_limit(self):
+        """Test vytížení studenta a limitu projektů z konfigurace"""
+        config = os.path.join(self.temp_dir.name, 'main-config.yaml')
+        with open(config, 'w', encoding='utf-8') as f:
+            f.write("education:\n  max_projects_per_student: 1\n")
+
+        self._run('student', 'add', '--name', 'Jan Novak', '--class', '8.A',
+                  '--username', 'jan.novak')
+        self._run('create', '--name', 'A')
+        self._run('create', '--name', 'B')
+        self._run('task', 'add', '--project', 'A', '--name', 'T1',
+                  '--assignee', 'jan.novak', '--deadline', '2025-12-31')
+        self.assertEqual(self._run('--config', config, 'project', 'assign',
+                                   '--project', 'A', '--student', 'jan.novak')[0], 0)
+        code, _, err = self._run('--config', config, 'project', 'assign',
+                                 '--project', 'B', '--student', 'jan.novak')
+        self.assertEqual(code, 1)
+        self.assertIn('maximální počet projektů', err)
+
+        code, out, _ = self._run('--json', 'student', 'workload', '--class', '8.A')
+        self.assertEqual(json.loads(out), {'jan.novak': {'open': 1, 'completed': 0, 'projects': 1}})
+        code, out, _ = self._run('--json', 'student', 'tasks', '--class', '8.A', '--open')
+        self.assertEqual([t['name'] for t in json.loads(out)], ['T1'])
+
+    def test_template_create_for_class(self):
+        """Test vytvoření projektu ze šablony pro celou třídu"""
+        templates = os.path.join(self.temp_dir.name, 'templates')
+        os.makedirs(templates)
+        with open(os.path.join(templates, 'kronika.yaml'), 'w', encoding='utf-8') as f:
+            f.write("project:\n  id: kronika\n  name: Kronika\n  category: programming\n"
+                    "milestones:\n  - name: Osnova\n    week: 1\n"
+                    "  - name: Publikace\n    week: 2\n")
+        for username in ('anna', 'jan'):
+            self._run('student', 'add', '--name', username, '--class', '8.A',
+                      '--username', username)
+
+        code, out, _ = self._run('template', 'list', '--dir', templates)
+        self.assertEqual(code, 0)
+        self.assertIn('kronika', out)
+        code, _, _ = self._run('template', 'create', '--dir', templates, '--template', 'kronika',
+                               '--class', '8.A', '--start', '2025-09-01')
+        self.assertEqual(code, 0)
+        with open(self.data, encoding='utf-8') as f:
+            project = json.load(f)['projects']['Kronika 8.A']
+        self.assertEqual([t['deadline'] for t in project['tasks']],
+                         ['2025-09-08', '2025-09-15'] * 2)
+        self.assertEqual(project['students'], ['anna', 'jan'])
+        self.assertEqual(self._run('template', 'create', '--dir', templates,
+                                   '--template', 'nic', '--class', '8.A')[0], 1)
+
+    def test_journal_recovery_and_log(self):
+        """Test obnovy projektů ze žurnálu po ztrátě souboru se stavem"""
+        journal = os.path.join(self.temp_dir.name, 'journal')
+        self._run('--journal', journal, 'create', '--name', 'P')
+        self._run('--journal', journal, 'task', 'add', '--project', 'P', '--name', 'T1',
+                  '--assignee', 'jan.novak', '--deadline', '2025-12-31')
+        self._run('--journal', journal, 'task', 'status', '--id', '1', '--status', 'completed')
+        os.remove(self.data)
+
+        code, out, _ = self._run('--journal', journal, '--json', 'project', 'report',
+                                 '--project', 'P')
+        self.assertEqual(code, 0)
+        self.assertEqual(json.loads(out)['completed_tasks'], ['T1'])
+        code, out, _ = self._run('--journal', journal, 'journal', 'log', '--project', 'P')
+        self.assertEqual(len(out.splitlines()), 4)
+        self.assertIn('update_task_status', out)
+        code, out, _ = self._run('--journal', journal, 'journal', 'snapshot')
+        self.assertIn('Snímek 4 uložen', out)
+        self.assertEqual(self._run('journal', 'log')[0], 1)
+
+    def test_read_commands_while_journal_writer_runs(self):
+        """Test výpisů za běhu zapisovatele žurnálu (kiosk-api) a odmítnutí změn"""
+        from src.python.journal import Journal
+        from src.python.project_manager import ProjectManager
+
+        journal = os.path.join(self.temp_dir.name, 'journal')
+        self._run('--journal', journal, 'create', '--name', 'P')
+        writer = ProjectManager(self.log)
+        Journal(journal).attach(writer)
+        self.addCleanup(writer.journal.close)
+        writer.add_task('P', 'Z API', 'jan.novak', '2025-12-31')
+
+        code, out, err = self._run('--journal', journal, '--json', 'project', 'report',
+                                   '--project', 'P')
+        self.assertEqual(code, 0, err)
+        self.assertEqual(json.loads(out)['total_tasks'], 1)
+        code, out, _ = self._run('--journal', journal, 'journal', 'log')
+        self.assertIn('Z API', out)
+        code, _, err = self._run('--journal', journal, 'task', 'add', '--project', 'P',
+                                 '--name', 'Z CLI', '--assignee', 'jan.novak',
+                                 '--deadline', '2025-12-31')
+        self.assertEqual(code, 1)
+        self.assertIn('zastavte', err)
+
+    def test_grades_forwards_options(self):
+        """Test, že volby za grades dostane project-grades"""
+        grades = os.path.join(self.temp_dir.name, 'gradebook.json')
+        gradebook = Gradebook()
+        gradebook.record_evaluation('jan.novak', 'weather-station', {'functionality': 90})
+        gradebook.record_evaluation('eva.mala', 'robot', {'functionality': 50})
+        gradebook.save(grades)
+
+        code, out, err = self._run('grades', '--project', 'weather-station', '--data', grades)
+        self.assertEqual(code, 0, err)
+        self.assertIn('jan.novak', out)
+        self.assertNotIn('eva.mala', out)
+        code, out, _ = self._run('grades', '--', '--data', grades, '--project', 'robot')
+        self.assertEqual(code, 0)
+        self.assertIn('eva.mala', out)
+        export = os.path.join(self.temp_dir.name, 'grades.csv')
+        self.assertEqual(self._run('grades', '--data', grades, '--csv', export)[0], 0)
+        self.assertTrue(os.path.exists(export))
+        with self.assertRaises(SystemExit):
+            self._run('student', 'list', '--neznama-volba')
+
+    def test_grades_record_evaluate_and_progress(self):
+        """Test zápisu hodnocení a pokroku projektu přes project-manager grades"""
+        grades = os.path.join(self.temp_dir.name, 'gradebook.json')
+        self._run('create', '--name', 'weather-station')
+        for name in ('Senzor', 'Graf'):
+            self._run('task', 'add', '--project', 'weather-station', '--name', name,
+                      '--assignee', 'jan.novak', '--deadline', '2025-12-15')
+        self._run('task', 'status', '--id', '1', '--status', 'completed')
+
+        code, out, err = self._run(
+            'grades', '--data', grades, 'record', '--project', 'weather-station',
+            '--student', 'eva.mala', '--score', 'functionality=50', '--score', 'creativity=100')
+        self.assertEqual(code, 0, err)
+        self.assertIn('celkem 30.00', out)
+        submission = os.path.join(self.temp_dir.name, 'submission.json')
+        with open(submission, 'w', encoding='utf-8') as f:
+            json.dump({'code': '"""Modul."""\nx = 1\n', 'test_results': {'passed': 4, 'total': 4},
+                       'documentation': '# Úvod\n# Zapojení\n# Závěr\n' + 'slovo ' * 300,
+                       'manual_scores': {'creativity': 80, 'presentation': 90}}, f)
+        code, out, err = self._run('grades', '--data', grades, 'evaluate', '--project',
+                                   'weather-station', '--student', 'jan.novak',
+                                   '--submission', submission)
+        self.assertEqual(code, 0, err)
+
+        code, out, _ = self._run('grades', '--data', grades, '--project', 'weather-station')
+        self.assertEqual(code, 0)
+        lines = out.splitlines()
+        self.assertIn('pokrok 50.0 %', lines[0])
+        self.assertIn('jan.novak', lines[1])
+        self.assertIn('eva.mala', lines[2])
+        code, _, err = self._run('grades', '--data', grades, 'record', '--project', 'x',
+                                 '--student', 'y', '--score', 'functionality=120')
+        self.assertEqual(code, 1)
+        self.assertIn('0-100', err)
+
+    def test_errors(self):
+        """Test chybových stavů"""
+        code, _, err = self._run('project', 'assign', '--project', 'X', '--student', 'y')
+        self.assertEqual(code, 1)
+        self.assertIn("Projekt 'X' neexistuje", err)
+        self.assertEqual(self._run('task', 'status', '--id', '99', '--status', 'completed')[0], 1)
+
+        with open(self.data, 'w', encoding='utf-8') as f:
+            f.write('{nedokončený')
+        code, _, err = self._run('project', 'list')
+        self.assertEqual(code, 1)
+        self.assertIn('není platný JSON', err)
+
+    def test_internal_error_is_not_blamed_on_data_file(self):
+        """Test, že vnitřní chyba propadne s vlastní zprávou"""
+        self._run('create', '--name', 'A')
+        with mock.patch('src.python.project_manager.ProjectManager.generate_report',
+                        side_effect=ValueError('vnitřní chyba')):
+            with self.assertRaisesRegex(ValueError, 'vnitřní chyba'):
+                self._run('project', 'report', '--project', 'A')
+
+    def test_simple_command_avoids_heavy_imports(self):
+        """Test že jednoduchý příkaz nenačítá těžké moduly"""
+        self._run('student', 'add', '--name', 'A', '--class', '8.A', '--username', 'a')
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-m', 'src.python.cli',
+             '--data', self.data, 'student', 'list'],
+            cwd=REPO_ROOT, capture_output=True, text=True
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        imported = {
+            line.split('|')[-1].strip().split('.')[0]
+            for line in result.stderr.splitlines() if line.startswith('import time:')
+        }
+        for heavy in ('yaml', 'numpy', 'matplotlib', 'sqlite3'):
+            self.assertNotIn(heavy, imported)
+
+
+if __name__ == '__main__':
+    unittest.main()
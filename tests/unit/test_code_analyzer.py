@@ -0,0 +1,106 @@
+"""
+Unit testy pro CodeAnalyzer
+
+Testuje metriky statické analýzy a cache podle otisku souboru.
+"""
+
+import tempfile
+import unittest
+
+from src.python.code_analyzer import CodeAnalyzer
+
+
+CLEAN_CODE = '''"""Ukázkový modul."""
+
+
+class WeatherReading:
+    """Jedno měření."""
+
+    def average(self, values):
+        """Průměr hodnot."""
+        return sum(values) / len(values)
+'''
+
+COMPLEX_CODE = '''
+def classify(t, h):
+    if t > 30 and h > 80:
+        return "tropic"
+    elif t > 20 or h > 90:
+        return "warm"
+    for i in range(3):
+        while i:
+            i -= 1
+    return [x for x in range(10) if x % 2]
+
+def BadName():
+    pass
+'''
+
+
+class TestCodeAnalyzer(unittest.TestCase):
+    """Testy pro CodeAnalyzer třídu"""
+
+    def setUp(self):
+        """Příprava testu"""
+        self.analyzer = CodeAnalyzer()
+
+    def test_clean_code_full_score(self):
+        """Test že čistý zdokumentovaný kód dostane plný počet bodů"""
+        metrics = self.analyzer.analyze_source(CLEAN_CODE)
+
+        self.assertEqual(metrics['score'], 100.0)
+        self.assertEqual(metrics['docstring_coverage'], 1.0)
+        self.assertEqual(metrics['naming_violations'], [])
+        self.assertEqual(metrics['classes'], 1)
+
+    def test_complexity_and_naming(self):
+        """Test cyklomatické složitosti a konvencí pojmenování"""
+        metrics = self.analyzer.analyze_source(COMPLEX_CODE)
+        functions = {f['name']: f for f in metrics['functions']}
+
+        # 1 + if/and + elif/or + for + while + comprehension s podmínkou
+        self.assertEqual(functions['classify']['complexity'], 9)
+        self.assertEqual(functions['BadName']['complexity'], 1)
+        self.assertIn("funkce 'BadName'", metrics['naming_violations'])
+        self.assertEqual(metrics['docstring_coverage'], 0.0)
+        self.assertLess(metrics['score'], 100.0)
+
+    def test_syntax_error(self):
+        """Test kódu se syntaktickou chybou"""
+        metrics = self.analyzer.analyze_source("def broken(:\n")
+
+        self.assertEqual(metrics['score'], 0.0)
+        self.assertIsNotNone(metrics['syntax_error'])
+
+    def test_only_changed_files_are_analyzed(self):
+        """Test že se při opakovaném hodnocení analyzují jen změněné soubory"""
+        submission = {'main.py': CLEAN_CODE, 'utils.py': COMPLEX_CODE}
+        first = self.analyzer.analyze_submission(submission)
+        self.assertEqual((first['analyzed'], first['cached']), (2, 0))
+
+        submission['utils.py'] = COMPLEX_CODE + "\nx = 1\n"
+        second = self.analyzer.analyze_submission(submission)
+        self.assertEqual((second['analyzed'], second['cached']), (1, 1))
+
+    def test_disk_cache_shared_between_instances(self):
+        """Test diskové cache sdílené mezi instancemi (procesy)"""
+        with tempfile.TemporaryDirectory() as cache_dir:
+            CodeAnalyzer(cache_dir=cache_dir).analyze_source(CLEAN_CODE)
+
+            other = CodeAnalyzer(cache_dir=cache_dir)
+            metrics = other.analyze_source(CLEAN_CODE)
+
+            self.assertEqual(other.hits, 1)
+            self.assertEqual(other.misses, 0)
+            self.assertEqual(metrics['score'], 100.0)
+
+    def test_submission_score_weighted_by_lines(self):
+        """Test že skóre práce je vážené počtem řádků souborů"""
+        result = self.analyzer.analyze_submission({'a.py': CLEAN_CODE, 'b.py': "def broken(:"})
+
+        self.assertGreater(result['score'], 0.0)
+        self.assertLess(result['score'], 100.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
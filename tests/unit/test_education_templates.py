@@ -0,0 +1,164 @@
+"""
+Unit testy pro katalog projektových šablon
+
+Testuje načtení a cache katalogu, vyhledávání podle indexů, kontrolu
+šablon a vytvoření projektu pro celou třídu hromadnou cestou.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date
+
+from src.python.education_templates import CACHE_FILE, ProjectTemplate, TemplateCatalog
+from src.python.event_bus import EventBus
+from src.python.project_manager import ProjectManager
+from src.python.student_registry import StudentRegistry
+
+
+TEMPLATES_DIR = os.path.join(
+    os.path.dirname(__file__), '..', '..', 'src', 'config', 'templates'
+)
+
+
+class TestTemplateCatalog(unittest.TestCase):
+    """Testy pro TemplateCatalog a ProjectTemplate"""
+
+    def setUp(self):
+        """Příprava - kopie šablon z repozitáře"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.temp_dir.name, 'templates')
+        shutil.copytree(TEMPLATES_DIR, self.directory,
+                        ignore=shutil.ignore_patterns(CACHE_FILE))
+        self.catalog = TemplateCatalog(self.directory)
+        self.catalog.load()
+
+    def tearDown(self):
+        """Čistka"""
+        self.temp_dir.cleanup()
+
+    def test_search_by_indexes(self):
+        """Test vyhledání podle kategorie, obtížnosti a předmětu"""
+        self.assertIn('weather-station', self.catalog)
+        ids = [t.id for t in self.catalog.search(category='iot')]
+        self.assertEqual(ids, ['smart-greenhouse', 'weather-station'])
+        ids = [t.id for t in self.catalog.search(category='iot', difficulty='intermediate')]
+        self.assertEqual(ids, ['weather-station'])
+        self.assertEqual(self.catalog.search(subject='neexistuje'), [])
+        self.assertEqual(len(self.catalog.search()), len(self.catalog))
+        self.assertEqual(self.catalog.facets()['category']['robotics'], 1)
+
+    def test_cache_is_used_until_files_change(self):
+        """Test že další načtení čte cache a změna souboru ji zneplatní"""
+        cache_path = os.path.join(self.directory, CACHE_FILE)
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        cache['templates'][0]['project']['name'] = "Z cache"
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
+
+        catalog = TemplateCatalog(self.directory)
+        catalog.load()
+        self.assertIn("Z cache", [t.name for t in catalog])
+
+        path = os.path.join(self.directory, 'web-chronicle.yaml')
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write("\n# změna\n")
+        catalog.load()
+        self.assertNotIn("Z cache", [t.name for t in catalog])
+
+    def test_invalid_templates(self):
+        """Test odmítnutí neplatných šablon a přeskočení vadného souboru"""
+        invalid = [
+            {'name': 'A', 'difficulty': 'expert'},
+            {'name': 'A', 'milestones': [{'name': 'M'}]},
+            {'name': 'A', 'tasks': [{'name': 'T', 'milestone': 'chybí'}]},
+            {'name': 'A', 'tasks': [{'name': 'T', 'depends_on': ['později']},
+                                    {'name': 'později'}]},
+        ]
+        for data in invalid:
+            with self.assertRaises(ValueError):
+                ProjectTemplate.from_dict(data)
+
+        with open(os.path.join(self.directory, 'vadna.yaml'), 'w', encoding='utf-8') as f:
+            f.write("project:\n  name: Vadná\n  difficulty: expert\n")
+        with self.assertLogs('TemplateCatalog', level='ERROR'):
+            self.assertEqual(self.catalog.load(), 4)
+
+    def test_save_and_reload_template(self):
+        """Test šablony ve stylu example.py, uložení a opětovného načtení"""
+        template = ProjectTemplate(
+            name="Weather Station IoT",
+            difficulty="beginner",
+            subjects=["programming", "electronics"],
+            learning_objectives={"programming": "Python basics"},
+            estimated_duration="4 weeks",
+            resources=["RPi 5", "BME280 sensor"]
+        )
+        self.assertEqual(template.id, 'weather-station-iot')
+        self.assertEqual(template.duration_weeks, 4)
+        self.assertEqual(template.objectives(), ["programming: Python basics"])
+
+        template.save_template(self.directory)
+        self.catalog.load()
+        loaded = self.catalog.get('weather-station-iot')
+        self.assertEqual(loaded.to_dict(), template.to_dict())
+        self.assertEqual([t.id for t in self.catalog.search(subject='electronics')],
+                         ['weather-station-iot'])
+
+    def test_instantiate_for_class(self):
+        """Test vytvoření projektu pro třídu jedním hromadným vložením"""
+        bus = EventBus()
+        events = []
+        bus.subscribe(lambda event: event['topic'].startswith('task') and events.append(event))
+        registry = StudentRegistry(max_projects_per_student=1)
+        for username in ('anna', 'jan', 'petr'):
+            registry.add_student(username, username.title(), '8.A')
+        pm = ProjectManager(os.path.join(self.temp_dir.name, 'pm.log'), registry=registry,
+                            event_bus=bus)
+
+        project = self.catalog.instantiate('weather-station', '8.A', pm, registry,
+                                           start=date(2025, 9, 1))
+
+        self.assertEqual(project['name'], "Chytrá meteorologická stanice 8.A")
+        self.assertEqual(project['template'], 'weather-station')
+        self.assertEqual(project['milestones'][0],
+                         {'name': 'Hardwarová instalace', 'deadline': '2025-09-08',
+                          'completed': False})
+        self.assertEqual(len(project['tasks']), 15)
+        jan = registry.student_tasks('jan')
+        self.assertEqual([t['deadline'] for t in jan[:2]], ['2025-09-08', '2025-09-15'])
+        self.assertEqual(jan[1]['dependencies'], [jan[0]['id']])
+        self.assertEqual(jan[1]['milestone'], 'Sběr dat')
+        self.assertEqual(registry.get('jan')['projects'], [project['name']])
+        self.assertEqual(project['students'], ['anna', 'jan', 'petr'])
+        self.assertEqual([e['topic'] for e in events], ['tasks.added'])
+        self.assertEqual(len(events[0]['data']['tasks']), 15)
+
+        # Limit projektů se kontroluje dřív, než vznikne projekt
+        with self.assertRaises(ValueError):
+            self.catalog.instantiate('robot-car', '8.A', pm, registry)
+        self.assertEqual(list(pm.projects), [project['name']])
+        with self.assertRaises(ValueError):
+            self.catalog.instantiate('robot-car', '9.B', pm, registry)
+
+    def test_add_tasks_validates_before_insert(self):
+        """Test že hromadné vložení s neplatnou závislostí nic nepřidá"""
+        pm = ProjectManager(os.path.join(self.temp_dir.name, 'pm.log'))
+        pm.create_project("Projekt", "Popis", [], "4 týdny")
+        specs = [{'name': 'A', 'assignee': 'jan', 'deadline': '2025-10-01'},
+                 {'name': 'B', 'assignee': 'jan', 'deadline': '2025-10-02', 'depends_on': [1]}]
+        with self.assertRaises(ValueError):
+            pm.add_tasks("Projekt", specs)
+        self.assertEqual(pm.tasks, [])
+
+        specs[1]['depends_on'] = [0]
+        tasks = pm.add_tasks("Projekt", specs)
+        self.assertEqual(tasks[1]['dependencies'], [tasks[0]['id']])
+        self.assertEqual(pm.get_project_stats("Projekt")['total_tasks'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
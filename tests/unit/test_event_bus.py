@@ -0,0 +1,143 @@
+"""
+Unit testy pro EventBus a Subscription
+
+Testuje publikování změn, slučování událostí a omezení fronty.
+"""
+
+import asyncio
+import os
+import tempfile
+import threading
+import unittest
+
+from src.python.config_manager import ConfigManager
+from src.python.event_bus import EventBus, Subscription
+from src.python.project_manager import ProjectManager
+from src.python.weather_store import WeatherStore
+
+
+class TestEventBus(unittest.TestCase):
+    """Testy pro EventBus a napojené publikující třídy"""
+
+    def setUp(self):
+        """Příprava - sběrnice se záznamem událostí"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.bus = EventBus()
+        self.events = []
+        self.bus.subscribe(self.events.append)
+
+    def tearDown(self):
+        """Čistka"""
+        self.temp_dir.cleanup()
+
+    def test_failing_subscriber_does_not_block_others(self):
+        """Test že chyba jednoho odběratele neovlivní ostatní"""
+        def failing(event):
+            raise RuntimeError("chyba")
+
+        self.bus.subscribe(failing)
+        self.bus.publish('test', {'a': 1})
+        self.bus.unsubscribe(failing)
+
+        self.assertEqual(len(self.events), 1)
+        self.assertEqual(self.bus.subscriber_count, 1)
+
+    def test_project_manager_publishes(self):
+        """Test událostí z ProjectManageru"""
+        pm = ProjectManager(os.path.join(self.temp_dir.name, 'pm.log'), event_bus=self.bus)
+        pm.create_project("Meteostanice", "Popis", [], "4 týdny")
+        task = pm.add_task("Meteostanice", "Čidlo", "jan.novak", "2025-09-20")
+        pm.add_task("Meteostanice", "Graf", "jan.novak", "2025-09-27")
+        pm.update_task_status(task['id'], "completed")
+
+        event = self.events[-1]
+        self.assertEqual(event['topic'], 'task.status')
+        self.assertEqual(event['key'], 'project:Meteostanice')
+        self.assertEqual(event['data']['progress'], 50.0)
+        self.assertEqual(event['data']['old_status'], 'assigned')
+        self.assertEqual(event['data']['version'], pm.project_version("Meteostanice"))
+
+    def test_config_manager_publishes(self):
+        """Test události ze změny konfigurace"""
+        cm = ConfigManager(self.temp_dir.name, event_bus=self.bus)
+        cm.set('kiosk.orientation', 'portrait')
+
+        self.assertEqual(self.events[-1]['topic'], 'config.changed')
+        self.assertEqual(self.events[-1]['data'], {'key': 'kiosk.orientation',
+                                                   'value': 'portrait'})
+
+    def test_weather_store_publishes_and_refreshes(self):
+        """Test událostí z meteostanice včetně zápisů jiného procesu"""
+        db_path = os.path.join(self.temp_dir.name, 'weather.db')
+        store = WeatherStore(db_path, event_bus=self.bus)
+        store.insert_reading(21.5, 45.0, 1013.2)
+        self.assertEqual(self.events[-1]['data']['temperature'], 21.5)
+
+        # Zápis přes jiné připojení (jako meteostanice v jiném procesu)
+        writer = WeatherStore(db_path)
+        writer.insert_reading(22.0, 44.0, 1012.0)
+        writer.insert_reading(22.5, 43.0, 1011.0)
+        writer.close()
+
+        version = store.version
+        self.assertTrue(store.refresh())
+        self.assertFalse(store.refresh())
+        self.assertEqual(store.version, version + 1)
+        self.assertEqual(self.events[-1]['data']['temperature'], 22.5)
+        self.assertEqual(self.events[-1]['data']['count'], 2)
+        store.close()
+
+
+class TestSubscription(unittest.TestCase):
+    """Testy pro Subscription třídu"""
+
+    def test_coalescing_by_key(self):
+        """Test že pomalý klient dostane jen poslední událost klíče"""
+        async def scenario():
+            bus = EventBus()
+            subscription = Subscription(bus, topics=['task'])
+            for progress in (10, 20, 30):
+                bus.publish('task.status', {'progress': progress}, key='project:A')
+            bus.publish('task.status', {'progress': 50}, key='project:B')
+            bus.publish('weather.reading', {'temperature': 20})
+
+            events = await subscription.get(timeout=1)
+            subscription.close()
+            return events, subscription.coalesced, bus.subscriber_count
+
+        events, coalesced, subscribers = asyncio.run(scenario())
+        self.assertEqual([e['data']['progress'] for e in events], [30, 50])
+        self.assertEqual(coalesced, 2)
+        self.assertEqual(subscribers, 0)
+
+    def test_overflow_sends_resync(self):
+        """Test omezené fronty a události resync"""
+        async def scenario():
+            bus = EventBus()
+            subscription = Subscription(bus, max_pending=3)
+            for i in range(5):
+                bus.publish('task.status', {'i': i}, key=f'project:{i}')
+            return await subscription.get(timeout=1), subscription.dropped
+
+        events, dropped = asyncio.run(scenario())
+        self.assertEqual(events[0]['topic'], 'resync')
+        self.assertEqual([e['data']['i'] for e in events[1:]], [2, 3, 4])
+        self.assertEqual(dropped, 2)
+
+    def test_publish_from_other_thread(self):
+        """Test doručení události publikované z jiného vlákna"""
+        async def scenario():
+            bus = EventBus()
+            subscription = Subscription(bus)
+            self.assertEqual(await subscription.get(timeout=0.01), [])
+            thread = threading.Thread(target=bus.publish, args=('weather.reading', {'t': 1}))
+            thread.start()
+            events = await subscription.get(timeout=2)
+            thread.join()
+            return events
+
+        self.assertEqual(asyncio.run(scenario())[0]['data'], {'t': 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
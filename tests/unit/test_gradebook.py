@@ -0,0 +1,144 @@
+"""
+Unit testy pro Gradebook
+
+Testuje sloupcové ukládání hodnocení, statistiky, pořadí a export.
+"""
+
+import csv
+import os
+import tempfile
+import unittest
+
+from src.python.gradebook import Gradebook, main
+from src.python.project_manager import ProjectManager, TaskStatus
+
+
+FULL = {
+    'functionality': 100, 'code_quality': 100, 'documentation': 100,
+    'creativity': 100, 'presentation': 100,
+}
+
+
+class TestGradebook(unittest.TestCase):
+    """Testy pro Gradebook třídu"""
+
+    def setUp(self):
+        """Příprava - tři studenti v projektu"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.gradebook = Gradebook()
+        self.gradebook.record_evaluation('jan.novak', 'weather-station', FULL)
+        self.gradebook.record_evaluation(
+            'marie.svobodova', 'weather-station', {k: 50 for k in FULL}
+        )
+        self.gradebook.record_evaluation(
+            'petr.dvorak', 'weather-station', {k: 50 for k in FULL}
+        )
+
+    def tearDown(self):
+        """Čistka"""
+        self.temp_dir.cleanup()
+
+    def test_statistics(self):
+        """Test průměru, mediánu a průměrů kritérií"""
+        stats = self.gradebook.statistics()['weather-station']
+
+        self.assertEqual(stats['students'], 3)
+        self.assertAlmostEqual(stats['average'], 66.67)
+        self.assertEqual(stats['median'], 50.0)
+        self.assertEqual(stats['max'], 100.0)
+        self.assertAlmostEqual(stats['criteria_averages']['functionality'], 66.67)
+
+    def test_rankings_with_ties(self):
+        """Test pořadí se shodným skóre"""
+        rankings = self.gradebook.rankings('weather-station')
+
+        self.assertEqual([r['rank'] for r in rankings], [1, 2, 2])
+        self.assertEqual(rankings[0]['student'], 'jan.novak')
+        self.assertEqual(self.gradebook.rank_of('petr.dvorak', 'weather-station'), 2)
+
+    def test_incremental_update(self):
+        """Test že změna jednoho hodnocení aktualizuje souhrny"""
+        total = self.gradebook.set_score('petr.dvorak', 'weather-station', 'functionality', 100)
+
+        self.assertEqual(total, 65.0)
+        self.assertEqual(self.gradebook.rank_of('petr.dvorak', 'weather-station'), 2)
+        self.assertEqual(self.gradebook.rank_of('marie.svobodova', 'weather-station'), 3)
+        stats = self.gradebook.statistics()['weather-station']
+        self.assertAlmostEqual(stats['criteria_averages']['functionality'], 83.33)
+        self.assertAlmostEqual(stats['average'], 71.67)
+
+    def test_rankings_across_projects(self):
+        """Test pořadí podle průměru napříč projekty"""
+        self.gradebook.record_evaluation('marie.svobodova', 'robot', FULL)
+        rankings = self.gradebook.rankings()
+
+        self.assertEqual(rankings[0]['student'], 'jan.novak')
+        self.assertEqual(rankings[1]['student'], 'marie.svobodova')
+        self.assertEqual(rankings[1]['total'], 75.0)
+
+    def test_invalid_score(self):
+        """Test neplatného kritéria a rozsahu bodů"""
+        with self.assertRaises(ValueError):
+            self.gradebook.set_score('jan.novak', 'weather-station', 'neexistuje', 10)
+        with self.assertRaises(ValueError):
+            self.gradebook.set_score('jan.novak', 'weather-station', 'creativity', 120)
+
+    def test_failed_evaluation_leaves_gradebook_unchanged(self):
+        """Test, že neplatné hodnocení nezapíše ani platná kritéria"""
+        before = self.gradebook.get_scores('jan.novak', 'weather-station')
+        stats = self.gradebook.statistics()
+        rankings = self.gradebook.rankings('weather-station')
+
+        with self.assertRaises(ValueError):
+            self.gradebook.record_evaluation(
+                'jan.novak', 'weather-station', {'functionality': 10, 'creativity': 120})
+        with self.assertRaises(ValueError):
+            self.gradebook.record_evaluation(
+                'novy.student', 'robot', {'functionality': 10, 'neexistuje': 50})
+
+        self.assertEqual(self.gradebook.get_scores('jan.novak', 'weather-station'), before)
+        self.assertIsNone(self.gradebook.get_scores('novy.student', 'robot'))
+        self.assertEqual(len(self.gradebook), 3)
+        self.assertEqual(self.gradebook.statistics(), stats)
+        self.assertEqual(self.gradebook.rankings('weather-station'), rankings)
+
+    def test_sync_progress(self):
+        """Test propojení s pokrokem z ProjectManageru"""
+        log_file = os.path.join(self.temp_dir.name, 'pm.log')
+        pm = ProjectManager(log_file)
+        pm.create_project('weather-station', 'Meteostanice', [], '4 týdny')
+        pm.add_task('weather-station', 'Čidlo', 'jan.novak', '2025-09-20')
+        pm.add_task('weather-station', 'Web', 'jan.novak', '2025-09-27')
+        pm.update_task_status(1, TaskStatus.COMPLETED.value)
+
+        self.gradebook.sync_progress(pm)
+        self.assertEqual(self.gradebook.statistics()['weather-station']['progress'], 50.0)
+
+    def test_export_csv(self):
+        """Test exportu do CSV"""
+        path = os.path.join(self.temp_dir.name, 'grades.csv')
+        self.assertTrue(self.gradebook.export_csv(path))
+
+        with open(path, encoding='utf-8-sig', newline='') as f:
+            rows = list(csv.reader(f, delimiter=';'))
+        self.assertEqual(rows[0][0], 'student')
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[1][:2], ['jan.novak', 'weather-station'])
+
+    def test_save_load_and_cli(self):
+        """Test uložení, načtení a příkazu project-grades"""
+        path = os.path.join(self.temp_dir.name, 'gradebook.json')
+        self.assertTrue(self.gradebook.save(path))
+
+        loaded = Gradebook.load(path)
+        self.assertEqual(len(loaded), 3)
+        self.assertEqual(loaded.rankings('weather-station'),
+                         self.gradebook.rankings('weather-station'))
+
+        export = os.path.join(self.temp_dir.name, 'out.csv')
+        self.assertEqual(main(['--project', 'weather-station', '--data', path, '--csv', export]), 0)
+        self.assertTrue(os.path.exists(export))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,230 @@
+"""
+Unit testy pro žurnál změn
+
+Testuje obnovu ze snímku a záznamů za ním, odříznutí neúplného
+posledního záznamu, group commit ze souběžných vláken, periodické
+snímky, auditní stopu a zámek proti druhému zapisovateli.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+
+from src.python.journal import Journal, apply
+from src.python.project_manager import ProjectManager
+from src.python.student_registry import StudentRegistry
+
+
+class TestJournal(unittest.TestCase):
+    """Testy pro Journal a napojení na ProjectManager"""
+
+    def setUp(self):
+        """Příprava - správce projektů se žurnálem"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.temp_dir.name, 'journal')
+        self.pm = self._manager()
+
+    def tearDown(self):
+        """Čistka"""
+        self.pm.journal.close()
+        self.temp_dir.cleanup()
+
+    def _manager(self, **options):
+        """Nový správce obnovený ze žurnálu"""
+        registry = StudentRegistry()
+        registry.add_student("jan.novak", "Jan Novák", "8.A")
+        pm = ProjectManager(os.path.join(self.temp_dir.name, 'pm.log'), registry=registry)
+        Journal(self.directory, **options).attach(pm)
+        return pm
+
+    def _populate(self, pm):
+        pm.create_project("Meteostanice", "Měření teploty", ["Sběr dat"], "4 týdny")
+        pm.update_project("Meteostanice", category="iot", difficulty="intermediate")
+        pm.add_task("Meteostanice", "Zapojení senzoru", "jan.novak", "2025-10-01")
+        pm.add_tasks("Meteostanice", [
+            {'name': 'Graf teplot', 'assignee': 'eva.mala', 'deadline': '2025-10-08'},
+        ])
+        pm.update_task_status(1, "completed", "Hotovo")
+        pm.assign_student("Meteostanice", "jan.novak")
+
+    def test_recovery_replays_records(self):
+        """Test obnovy stavu po restartu jen ze záznamů"""
+        self._populate(self.pm)
+        self.pm.journal.close()
+
+        restored = self._manager()
+        self.assertEqual(restored.to_dict(), self.pm.to_dict())
+        self.assertEqual(restored.journal.seq, 6)
+        project = restored.projects["Meteostanice"]
+        self.assertEqual(project['category'], "iot")
+        self.assertEqual(project['students'], ["jan.novak"])
+        # Čítač ID pokračuje za obnovenými úkoly
+        self.assertEqual(restored.add_task("Meteostanice", "Další", "eva.mala",
+                                           "2025-10-10")['id'], 3)
+        restored.journal.close()
+
+    def test_snapshot_bounds_replay(self):
+        """Test periodického snímku - obnova přehraje jen záznamy za ním"""
+        self.pm.journal.close()
+        self.pm = self._manager(snapshot_every=4)
+        self._populate(self.pm)
+        files = sorted(os.listdir(self.directory))
+        self.assertIn('snapshot-000000000004.json', files)
+        self.assertIn('journal-000000000005.jsonl', files)
+        self.pm.journal.close()
+
+        journal = Journal(self.directory)
+        with self.assertLogs('Journal', 'INFO') as logs:
+            state = journal.recover()
+        self.assertIn("ze snímku 4 a 2 záznamů", logs.output[0])
+        self.assertEqual(state, self.pm.to_dict())
+        # Auditní stopa obsahuje i záznamy pokryté snímkem
+        self.assertEqual([r['op'] for r in journal.records()][:2],
+                         ['create_project', 'update_project'])
+        self.assertEqual([r['seq'] for r in journal.records(after=4)], [5, 6])
+        journal.close()
+
+    def test_torn_tail_and_corruption(self):
+        """Test odříznutí neúplného posledního záznamu a odhalení poškození"""
+        self._populate(self.pm)
+        self.pm.journal.close()
+        path = os.path.join(self.directory, 'journal-000000000001.jsonl')
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write('{"seq":7,"ts":"2025-10-01T10:00:00","op":"add_ta')
+
+        with self.assertLogs('Journal', 'WARNING'):
+            restored = self._manager()
+        self.assertEqual(restored.journal.seq, 6)
+        restored.add_task("Meteostanice", "Po pádu", "eva.mala", "2025-10-10")
+        restored.journal.close()
+        restored = self._manager()
+        self.assertEqual(restored.projects["Meteostanice"]['tasks'][-1]['name'], "Po pádu")
+        restored.journal.close()
+
+        with open(path, 'r+', encoding='utf-8') as f:
+            lines = f.readlines()
+            lines[2] = '{"seq": 3, poškozeno\n'
+            f.seek(0)
+            f.writelines(lines)
+            f.truncate()
+        with self.assertRaises(ValueError):
+            Journal(self.directory).recover()
+
+    def test_replay_is_idempotent(self):
+        """Test, že záznam už obsažený ve stavu se znovu nepřidá"""
+        self._populate(self.pm)
+        state = self.pm.to_dict()
+        for record in self.pm.journal.records():
+            apply(state, record)
+        self.assertEqual(len(state['projects']['Meteostanice']['tasks']), 2)
+        self.assertEqual(state['projects']['Meteostanice']['students'], ["jan.novak"])
+        with self.assertRaises(ValueError):
+            apply(state, {'seq': 99, 'op': 'delete_project', 'data': {}})
+        with self.assertRaises(ValueError):
+            apply(state, {'seq': 99, 'op': 'add_task',
+                          'data': {'project': 'Neznámý', 'task': {'id': 9}}})
+
+    def test_group_commit_concurrent_writers(self):
+        """Test souběžných zápisů se společným fsync"""
+        self.pm.create_project("Zátěž", "Popis", [], "1 týden")
+        self.pm.journal.start()
+
+        def worker(offset):
+            for i in range(50):
+                self.pm.add_task("Zátěž", f"Úkol {offset + i}", "student", "2025-10-01")
+
+        threads = [threading.Thread(target=worker, args=(i * 50,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.pm.journal.close()
+
+        records = list(Journal(self.directory).records())
+        self.assertEqual([r['seq'] for r in records], list(range(1, 202)))
+        restored = self._manager()
+        self.assertEqual(len(restored.projects["Zátěž"]['tasks']), 200)
+        self.assertEqual(restored.to_dict(), self.pm.to_dict())
+        restored.journal.close()
+
+    def test_bootstrap_and_update_project(self):
+        """Test založení žurnálu z dosavadního stavu a chráněných polí"""
+        self._populate(self.pm)
+        state = self.pm.to_dict()
+        directory = os.path.join(self.temp_dir.name, 'new-journal')
+        pm = ProjectManager(os.path.join(self.temp_dir.name, 'pm2.log'))
+        journal = Journal(directory, retain_history=False).attach(pm, initial=state)
+        self.assertEqual(sorted(os.listdir(directory)),
+                         ['.lock', 'journal-000000000001.jsonl', 'snapshot-000000000000.json'])
+        self.assertEqual(pm.to_dict(), state)
+
+        for fields in ({'tasks': []}, {'students': ['eva']}):
+            with self.assertRaises(ValueError):
+                pm.update_project("Meteostanice", **fields)
+        with self.assertRaises(ValueError):
+            pm.update_project("Neznámý", category="iot")
+        self.assertEqual(journal.seq, 0)
+        journal.close()
+
+    def test_reader_alongside_writer(self):
+        """Test čtenáře bez zámku za běhu zapisovatele (rozepsaná dávka se přeskočí)"""
+        self._populate(self.pm)
+        path = os.path.join(self.directory, 'journal-000000000001.jsonl')
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write('{"seq":7,"ts":"2025-10-01T10:00:00","op":"add_ta')
+        size = os.path.getsize(path)
+
+        reader = ProjectManager(os.path.join(self.temp_dir.name, 'reader.log'))
+        journal = Journal(self.directory, read_only=True).attach(reader)
+        self.assertEqual(reader.to_dict(), self.pm.to_dict())
+        self.assertIsNone(reader.journal)
+        self.assertEqual([r['seq'] for r in journal.records(after=4)], [5, 6])
+        self.assertEqual(os.path.getsize(path), size)
+        with self.assertRaises(ValueError):
+            journal.append('add_task', {})
+        self.assertIsNone(journal.snapshot())
+        journal.close()
+
+        missing = os.path.join(self.temp_dir.name, 'chybí')
+        self.assertIsNone(Journal(missing, read_only=True).recover())
+        self.assertFalse(os.path.exists(missing))
+
+    def test_second_writer_is_rejected(self):
+        """Test, že druhý zapisovatel (i z jiného procesu) skončí chybou"""
+        self._populate(self.pm)
+        with self.assertRaises(ValueError) as error:
+            Journal(self.directory)
+        self.assertIn(f"PID {os.getpid()}", str(error.exception))
+
+        script = (
+            "import sys\n"
+            "from src.python.journal import Journal\n"
+            "from src.python.project_manager import ProjectManager\n"
+            "pm = ProjectManager(sys.argv[2])\n"
+            "Journal(sys.argv[1]).attach(pm)\n"
+            "pm.add_task('Meteostanice', 'Z CLI', 'eva.mala', '2025-10-10')\n"
+            "pm.journal.close()\n"
+        )
+        command = [sys.executable, '-c', script, self.directory,
+                   os.path.join(self.temp_dir.name, 'cli.log')]
+        root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        result = subprocess.run(command, cwd=root, capture_output=True, text=True, timeout=60)
+        self.assertNotEqual(result.returncode, 0)
+        self.assertIn("už zapisuje jiný proces", result.stderr)
+
+        # Po uvolnění zámku zapíše druhý proces navazující záznamy
+        self.pm.add_task("Meteostanice", "Z API", "eva.mala", "2025-10-10")
+        self.pm.journal.close()
+        result = subprocess.run(command, cwd=root, capture_output=True, text=True, timeout=60)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.pm = self._manager()
+        self.assertEqual([task['name'] for task in self.pm.projects["Meteostanice"]['tasks']][-2:],
+                         ["Z API", "Z CLI"])
+        self.assertEqual([r['seq'] for r in self.pm.journal.records()], list(range(1, 9)))
+
+
+if __name__ == '__main__':
+    unittest.main()
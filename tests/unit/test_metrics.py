@@ -0,0 +1,180 @@
+"""
+Unit testy pro MetricsRegistry
+
+Testuje čítače, měřidla, histogramy, formát Prometheus a instrumentaci.
+"""
+
+import logging
+import logging.handlers
+import os
+import queue
+import tempfile
+import threading
+import unittest
+import urllib.request
+
+from src.python.config_manager import ConfigManager
+from src.python.metrics import MetricsRegistry, MetricsServer, get_registry, instrument_logging
+from src.python.project_manager import ProjectManager
+from src.python.weather_store import WeatherStore
+
+
+def sample(text, line_prefix):
+    """Hodnota vzorku z textu ve formátu Prometheus"""
+    for line in text.splitlines():
+        if line.startswith(line_prefix + ' '):
+            return float(line.rsplit(' ', 1)[1])
+    raise AssertionError(f"Vzorek '{line_prefix}' chybí")
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    """Testy pro MetricsRegistry třídu"""
+
+    def setUp(self):
+        """Příprava"""
+        self.registry = MetricsRegistry()
+
+    def test_exposition_format(self):
+        """Test textového formátu Prometheus"""
+        counter = self.registry.counter('requests_total', 'Počet požadavků', ['path'])
+        counter.labels('/a').inc()
+        counter.labels(path='/a').inc(2)
+        counter.labels('/b"x').inc()
+        self.registry.gauge('queue_depth', 'Fronta').set(7)
+        histogram = self.registry.histogram('latency_seconds', 'Latence', buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 3.0):
+            histogram.observe(value)
+
+        text = self.registry.render()
+        self.assertIn('# TYPE requests_total counter', text)
+        self.assertIn('requests_total{path="/a"} 3', text)
+        self.assertIn('requests_total{path="/b\\"x"} 1', text)
+        self.assertIn('queue_depth 7', text)
+        self.assertIn('latency_seconds_bucket{le="0.1"} 1', text)
+        self.assertIn('latency_seconds_bucket{le="1"} 2', text)
+        self.assertIn('latency_seconds_bucket{le="+Inf"} 3', text)
+        self.assertIn('latency_seconds_sum 3.55', text)
+        self.assertIn('latency_seconds_count 3', text)
+
+    def test_same_name_returns_existing_metric(self):
+        """Test opakované registrace a konfliktu typů"""
+        counter = self.registry.counter('x_total', 'X')
+        self.assertIs(self.registry.counter('x_total', 'X'), counter)
+        with self.assertRaises(ValueError):
+            self.registry.gauge('x_total', 'X')
+        with self.assertRaises(ValueError):
+            self.registry.counter('y_total', 'Y', ['a']).labels('1', '2')
+
+    def test_concurrent_increments_are_not_lost(self):
+        """Test že souběžné zápisy bez zámku neztrácí přírůstky"""
+        counter = self.registry.counter('hits_total', 'Zásahy')
+        histogram = self.registry.histogram('size', 'Velikost', buckets=(1.0,))
+
+        def worker():
+            for _ in range(20000):
+                counter.inc()
+                histogram.observe(0.5)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(counter.get(), 160000)
+        self.assertIn('size_count 160000', self.registry.render())
+
+    def test_callback_gauge_and_failing_callback(self):
+        """Test měřidla počítaného při načtení a chybné funkce"""
+        self.registry.gauge('tasks', 'Úkoly', ['status'],
+                            callback=lambda: {('open',): 2, ('done',): 1})
+        self.registry.gauge('broken', 'Chyba', callback=lambda: 1 / 0)
+        text = self.registry.render()
+        self.assertIn('tasks{status="done"} 1', text)
+        self.assertIn('tasks{status="open"} 2', text)
+        self.assertNotIn('broken', text)
+
+    def test_logging_queue_depth(self):
+        """Test počtu záznamů logu a hloubky fronty"""
+        log_queue = queue.Queue()
+        logger = logging.getLogger("TestMetricsQueue")
+        handler = logging.handlers.QueueHandler(log_queue)
+        logger.addHandler(handler)
+        log_handler = instrument_logging(self.registry)
+        try:
+            logger.warning("první")
+            logger.warning("druhý")
+            text = self.registry.render()
+        finally:
+            logger.removeHandler(handler)
+            logging.getLogger().removeHandler(log_handler)
+        self.assertEqual(sample(text, 'logging_queue_depth{logger="TestMetricsQueue"}'), 2)
+        self.assertGreaterEqual(sample(text, 'log_messages_total{level="WARNING"}'), 2)
+
+    def test_http_endpoint(self):
+        """Test endpointu /metrics"""
+        self.registry.counter('served_total', 'Obslouženo').inc()
+        server = MetricsServer(self.registry, host='127.0.0.1', port=0)
+        port = server.start()
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/metrics') as response:
+                self.assertIn('version=0.0.4', response.headers['Content-Type'])
+                self.assertIn('served_total 1', response.read().decode('utf-8'))
+        finally:
+            server.stop()
+
+
+class TestInstrumentation(unittest.TestCase):
+    """Testy metrik z ProjectManageru, ConfigManageru a WeatherStore"""
+
+    def setUp(self):
+        """Příprava"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.registry = get_registry()
+
+    def tearDown(self):
+        """Čistka"""
+        self.temp_dir.cleanup()
+
+    def _value(self, line_prefix):
+        try:
+            return sample(self.registry.render(), line_prefix)
+        except AssertionError:
+            return 0.0
+
+    def test_project_manager_metrics(self):
+        """Test počtu operací a stavů úkolů"""
+        operations = 'project_manager_operations_total{operation="add_task"}'
+        errors = 'project_manager_errors_total{operation="update_task_status"}'
+        before, errors_before = self._value(operations), self._value(errors)
+
+        pm = ProjectManager(os.path.join(self.temp_dir.name, 'pm.log'))
+        pm.create_project("Meteostanice", "Popis", [], "4 týdny")
+        task = pm.add_task("Meteostanice", "Čidlo", "jan.novak", "2025-09-20")
+        pm.add_task("Meteostanice", "Graf", "jan.novak", "2025-09-27")
+        pm.update_task_status(task['id'], "completed")
+        pm.update_task_status(999, "completed")
+
+        self.assertEqual(self._value(operations) - before, 2)
+        self.assertEqual(self._value(errors) - errors_before, 1)
+        self.assertEqual(self._value('project_manager_tasks{status="completed"}'), 1)
+        self.assertEqual(self._value('project_manager_projects'), 1)
+
+    def test_config_and_weather_metrics(self):
+        """Test metrik konfigurace a meteostanice"""
+        loads = 'config_operations_total{operation="load",result="error"}'
+        ingested = 'weather_readings_ingested_total'
+        loads_before, ingested_before = self._value(loads), self._value(ingested)
+
+        ConfigManager(self.temp_dir.name).load_config('chybi.yaml')
+        store = WeatherStore(os.path.join(self.temp_dir.name, 'weather.db'))
+        store.insert_reading(21.5, 45.0, 1013.2)
+        store.latest(5)
+        store.close()
+
+        self.assertEqual(self._value(loads) - loads_before, 1)
+        self.assertEqual(self._value(ingested) - ingested_before, 1)
+        self.assertGreaterEqual(self._value('weather_query_seconds_count{query="latest"}'), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
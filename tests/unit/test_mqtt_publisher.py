@@ -0,0 +1,188 @@
+"""
+Unit testy pro MqttPublisher
+
+Testuje dávkování, spool při výpadku brokeru, obnovu spojení a QoS.
+"""
+
+import importlib.util
+import os
+import tempfile
+import time
+import unittest
+
+from src.python.event_bus import EventBus
+from src.python.mqtt_publisher import LocalBroker, MqttPublisher, PahoTransport
+from src.python.weather_store import WeatherStore
+
+
+def wait_until(condition, timeout=5.0):
+    """Čekání na splnění podmínky"""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("Podmínka nebyla splněna včas")
+        time.sleep(0.005)
+
+
+class TestMqttPublisher(unittest.TestCase):
+    """Testy pro MqttPublisher třídu"""
+
+    def setUp(self):
+        """Příprava - broker v procesu a adresář pro spool"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.spool_dir = os.path.join(self.temp_dir.name, 'spool')
+        self.broker = LocalBroker()
+
+    def tearDown(self):
+        """Čistka"""
+        self.temp_dir.cleanup()
+
+    def _publisher(self, **kwargs):
+        """Pomocná metoda pro vytvoření publikace"""
+        options = {'batch_size': 50, 'batch_interval': 0.05, 'spool_dir': self.spool_dir,
+                   'backoff_initial': 0.01, 'backoff_max': 0.05}
+        options.update(kwargs)
+        return MqttPublisher(self.broker, **options)
+
+    def test_batching(self):
+        """Test slučování měření do dávek"""
+        publisher = self._publisher()
+        for i in range(120):
+            publisher.submit({'i': i})
+        publisher.start()
+        self.assertTrue(publisher.flush())
+        publisher.stop()
+
+        self.assertEqual(len(self.broker.messages), 3)
+        self.assertEqual(self.broker.messages[0][0], 'nymea/weather/readings')
+        self.assertEqual([r['i'] for r in self.broker.readings()], list(range(120)))
+        metrics = publisher.metrics()
+        self.assertEqual(metrics['published_batches'], 3)
+        self.assertEqual(metrics['publish_latency_ms']['count'], 3)
+        self.assertEqual(metrics['queue_depth'], 0)
+
+    def test_outage_spools_and_replays_in_order(self):
+        """Test spoolu při výpadku a odeslání po obnovení spojení"""
+        self.broker.available = False
+        publisher = self._publisher()
+        publisher.start()
+        for i in range(30):
+            publisher.submit({'i': i})
+        for i in range(5):
+            publisher.submit({'q0': i}, qos=0)
+        wait_until(lambda: publisher.metrics()['spool_bytes'] > 0
+                   and publisher.metrics()['queue_depth'] == 0)
+        self.assertFalse(publisher.metrics()['connected'])
+
+        self.broker.available = True
+        for i in range(30, 40):
+            publisher.submit({'i': i})
+        self.assertTrue(publisher.flush())
+        publisher.stop()
+
+        self.assertEqual([r['i'] for r in self.broker.readings()], list(range(40)))
+        metrics = publisher.metrics()
+        self.assertEqual(metrics['dropped'], 5)
+        self.assertGreaterEqual(metrics['reconnects'], 1)
+        self.assertEqual(metrics['spool_bytes'], 0)
+
+    def test_spool_survives_restart(self):
+        """Test že spool přežije restart procesu"""
+        self.broker.available = False
+        publisher = self._publisher()
+        for i in range(10):
+            publisher.submit({'i': i})
+        publisher.stop()
+        self.assertGreater(publisher.metrics()['spool_bytes'], 0)
+
+        self.broker.available = True
+        publisher = self._publisher()
+        publisher.start()
+        self.assertTrue(publisher.flush())
+        publisher.stop()
+        self.assertEqual([r['i'] for r in self.broker.readings()], list(range(10)))
+
+    def test_torn_spool_tail_after_crash(self):
+        """Test neúplného posledního řádku spoolu po pádu (přeskočí se, vlákno běží dál)"""
+        self.broker.available = False
+        publisher = self._publisher()
+        for i in range(10):
+            publisher.submit({'i': i})
+        publisher.stop()
+        path = os.path.join(self.spool_dir, os.listdir(self.spool_dir)[0])
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write('{"topic": "nymea/weather/readings", "qos": 1, "data": [{"i"')
+
+        self.broker.available = True
+        with self.assertLogs('MqttPublisher', 'WARNING'):
+            publisher = self._publisher(batch_size=5)
+        publisher.start()
+        self.assertTrue(publisher.flush())
+        publisher.submit({'i': 10})
+        self.assertTrue(publisher.flush())
+        publisher.stop()
+        self.assertEqual([r['i'] for r in self.broker.readings()], list(range(11)))
+
+    def test_unexpected_error_does_not_kill_thread(self):
+        """Test, že nečekaná chyba transportu vlákno neukončí"""
+        failures = [RuntimeError("chyba knihovny")]
+        publish = self.broker.publish
+
+        def flaky_publish(topic, payload, qos):
+            if failures:
+                raise failures.pop()
+            publish(topic, payload, qos)
+
+        self.broker.publish = flaky_publish
+        publisher = self._publisher()
+        publisher.start()
+        with self.assertLogs('MqttPublisher', 'ERROR'):
+            publisher.submit({'i': 0})
+            wait_until(lambda: not failures)
+        publisher.submit({'i': 1})
+        wait_until(lambda: self.broker.readings())
+        publisher.stop()
+        self.assertEqual([r['i'] for r in self.broker.readings()], [1])
+        self.assertEqual(publisher.metrics()['last_error'], "chyba knihovny")
+
+    def test_full_queue_prefers_durable_messages(self):
+        """Test že při plné frontě se zahazují zprávy s QoS 0"""
+        publisher = self._publisher(max_queue=3, spool_dir=None)
+        self.assertTrue(publisher.submit({'a': 1}, qos=0))
+        self.assertTrue(publisher.submit({'b': 2}))
+        self.assertTrue(publisher.submit({'c': 3}))
+        # Nejstarší zpráva s QoS 0 uvolní místo
+        self.assertTrue(publisher.submit({'d': 4}))
+        # Fronta je plná trvalých zpráv, nová zpráva s QoS 0 se odmítne
+        self.assertFalse(publisher.submit({'e': 5}, qos=0))
+
+        metrics = publisher.metrics()
+        self.assertEqual((metrics['queue_depth'], metrics['dropped']), (3, 2))
+
+    def test_weather_store_pipeline(self):
+        """Test publikace nových měření z WeatherStore přes sběrnici událostí"""
+        bus = EventBus()
+        store = WeatherStore(os.path.join(self.temp_dir.name, 'weather.db'), event_bus=bus)
+        publisher = self._publisher()
+        publisher.attach(bus)
+        publisher.start()
+
+        store.insert_reading(21.5, 45.0, 1013.2)
+        store.insert_reading(21.7, 44.5, 1013.0)
+        self.assertTrue(publisher.flush())
+        wait_until(lambda: len(self.broker.readings()) == 2)
+        publisher.stop()
+        store.close()
+
+        self.assertEqual([r['temperature'] for r in self.broker.readings()], [21.5, 21.7])
+        self.assertNotIn('version', self.broker.readings()[0])
+
+    @unittest.skipIf(importlib.util.find_spec('paho') is not None, "paho-mqtt je nainstalováno")
+    def test_missing_paho_is_connection_error(self):
+        """Test že chybějící paho-mqtt se chová jako nedostupný broker"""
+        with self.assertRaises(ConnectionError):
+            PahoTransport().connect()
+
+
+if __name__ == '__main__':
+    unittest.main()
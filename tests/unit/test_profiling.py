@@ -0,0 +1,171 @@
+"""
+Unit testy pro profilování za běhu
+
+Testuje úseky (spans), folded výstup, vzorkování zásobníků, tracemalloc,
+cProfile příštího volání a ladicí endpointy API.
+"""
+
+import asyncio
+import json
+import os
+import signal
+import tempfile
+import threading
+import time
+import unittest
+
+from src.python import profiling
+from src.python.api_server import ApiServer, request
+from src.python.profiling import span, traced
+from src.python.project_manager import ProjectManager
+
+
+@traced('test.outer')
+def outer():
+    with span('test.inner'):
+        time.sleep(0.01)
+    return 42
+
+
+class TestProfiling(unittest.TestCase):
+    """Testy pro modul profiling"""
+
+    def setUp(self):
+        """Příprava - čisté tabulky úseků"""
+        profiling.reset_spans()
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """Čistka - vypnutí měření"""
+        profiling.enable_spans(False)
+        self.temp_dir.cleanup()
+
+    def test_disabled_spans_record_nothing(self):
+        """Test že vypnuté úseky nic nezaznamenají a vrací sdílený objekt"""
+        self.assertEqual(outer(), 42)
+        self.assertIs(span('a'), span('b'))
+        self.assertEqual(profiling.span_report(), [])
+
+    def test_nested_spans_and_folded_output(self):
+        """Test zanoření, vlastního času a formátu folded stacks"""
+        profiling.enable_spans()
+        outer()
+        outer()
+        report = {item['path']: item for item in profiling.span_report()}
+
+        self.assertEqual(report['test.outer']['count'], 2)
+        self.assertGreaterEqual(report['test.outer;test.inner']['total_ms'], 20)
+        self.assertLess(report['test.outer']['self_ms'], report['test.outer']['total_ms'])
+        lines = profiling.folded_spans().splitlines()
+        self.assertTrue(any(line.startswith('test.outer;test.inner ') for line in lines))
+        self.assertTrue(all(line.rsplit(' ', 1)[1].isdigit() for line in lines))
+
+    def test_project_manager_spans(self):
+        """Test úseků v ProjectManageru"""
+        profiling.enable_spans()
+        pm = ProjectManager(os.path.join(self.temp_dir.name, 'pm.log'))
+        pm.create_project("Meteostanice", "Popis", [], "4 týdny")
+        pm.add_task("Meteostanice", "Čidlo", "jan.novak", "2025-09-20")
+        pm.save_state(os.path.join(self.temp_dir.name, 'state.json'))
+        paths = [item['path'] for item in profiling.span_report()]
+        self.assertIn('project_manager.ProjectManager.add_task', paths)
+        self.assertIn('project_manager.ProjectManager.save_state', paths)
+
+    def test_sample_stacks_sees_other_threads(self):
+        """Test vzorkování zásobníků běžícího vlákna"""
+        stop = threading.Event()
+
+        def busy_worker():
+            while not stop.is_set():
+                sum(range(1000))
+
+        thread = threading.Thread(target=busy_worker, name="worker")
+        thread.start()
+        try:
+            counts = profiling.sample_stacks(0.1, interval=0.001)
+        finally:
+            stop.set()
+            thread.join()
+        worker = [stack for stack in counts if stack.startswith('worker;')]
+        self.assertTrue(any('busy_worker' in stack for stack in worker))
+
+    def test_capture_memory_and_file_output(self):
+        """Test zachycení alokací a uložení profilu do souboru"""
+        kept = []
+
+        def allocate():
+            time.sleep(0.02)
+            kept.append([bytearray(1024) for _ in range(200)])
+
+        thread = threading.Thread(target=allocate)
+        thread.start()
+        result = profiling.capture('memory', 0.2, self.temp_dir.name)
+        thread.join()
+        self.assertGreater(result['top'][0]['size_diff'], 100000)
+        self.assertTrue(os.path.exists(result['file']))
+        with self.assertRaises(ValueError):
+            profiling.capture('neznámý', 0)
+
+    def test_profile_next_call(self):
+        """Test cProfile příštího volání úseku v jiném vlákně"""
+        timer = threading.Timer(0.05, outer)
+        timer.start()
+        text = profiling.profile_next('test.outer', timeout=5)
+        timer.join()
+        self.assertIn('function calls', text)
+        self.assertIn('sleep', text)
+        self.assertFalse(profiling._active)
+        self.assertIsNone(profiling.profile_next('test.nikdy', timeout=0.01))
+
+    @unittest.skipUnless(hasattr(signal, 'SIGUSR1'), "Vyžaduje POSIX signály")
+    def test_signal_toggles_spans(self):
+        """Test přepnutí úseků signálem a uložení folded souboru"""
+        previous = signal.getsignal(signal.SIGUSR1), signal.getsignal(signal.SIGUSR2)
+        try:
+            profiling.install_signal_handlers(self.temp_dir.name)
+            os.kill(os.getpid(), signal.SIGUSR1)
+            self.assertTrue(profiling.spans_enabled())
+            outer()
+            os.kill(os.getpid(), signal.SIGUSR1)
+            self.assertFalse(profiling.spans_enabled())
+            deadline = time.monotonic() + 5
+            while not os.listdir(self.temp_dir.name) and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            signal.signal(signal.SIGUSR1, previous[0])
+            signal.signal(signal.SIGUSR2, previous[1])
+        self.assertTrue(os.listdir(self.temp_dir.name)[0].endswith('.spans.folded'))
+
+    def test_debug_endpoints(self):
+        """Test ladicích endpointů API"""
+        pm = ProjectManager(os.path.join(self.temp_dir.name, 'pm.log'))
+        pm.create_project("Meteostanice", "Popis", [], "4 týdny")
+        hidden = ApiServer(pm, port=0)
+        server = ApiServer(pm, port=0, debug=True)
+
+        async def scenario():
+            results = []
+            for api in (hidden, server):
+                await api.start()
+                reader, writer = await asyncio.open_connection('127.0.0.1', api.port)
+                for path in ('/api/debug/spans?enable=1', '/api/projects/Meteostanice/report',
+                             '/api/debug/spans?enable=0',
+                             '/api/debug/profile?mode=stack&seconds=0.05',
+                             '/api/debug/profile?mode=cpu'):
+                    status, _, body = await request(reader, writer, path)
+                    results.append((status, json.loads(body)))
+                writer.close()
+                await api.stop()
+            return results
+
+        results = asyncio.run(scenario())
+        self.assertEqual([status for status, _ in results[:5]], [404, 200, 404, 404, 404])
+        statuses = [status for status, _ in results[5:]]
+        self.assertEqual(statuses, [200, 200, 200, 200, 400])
+        spans = [item['path'] for item in results[7][1]['top']]
+        self.assertIn('project_manager.ProjectManager.generate_report', spans)
+        self.assertGreater(results[8][1]['samples'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+"""
+Unit testy pro historii pokroku projektů
+
+Testuje průběžné zapisování bodů ze změn ProjectManageru, obnovu
+z disku a zápis z více instancí, odříznutí neúplného konce, burndown,
+rychlost, odhad dokončení a kompakci starých bodů.
+"""
+
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from src.python.progress_history import ProgressHistory, parse_timeline
+from src.python.project_manager import ProjectManager
+
+
+class TestProgressHistory(unittest.TestCase):
+    """Testy pro ProgressHistory třídu"""
+
+    def setUp(self):
+        """Příprava - správce s historií"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.temp_dir.name, 'progress')
+        self.history = ProgressHistory(self.directory)
+        self.pm = ProjectManager(os.path.join(self.temp_dir.name, 'pm.log'))
+        self.history.attach(self.pm)
+        self.pm.create_project("Meteostanice", "Měření teploty", ["Sběr dat"], "4 týdny")
+
+    def tearDown(self):
+        """Čistka"""
+        self.history.close()
+        self.temp_dir.cleanup()
+
+    def _history(self, name, points, created_at, timeline="4 týdny"):
+        """Projekt s řadou zadanou jako [(čas, přidané úkoly, dokončené úkoly)]"""
+        project = {'name': name, 'created_at': created_at.isoformat(), 'timeline': timeline}
+        for at, added, completed in points:
+            if added:
+                self.history.task_added(name, [{'status': 'assigned',
+                                                'created_at': at.isoformat()}] * added)
+            for _ in range(completed):
+                self.history.status_changed(name, 'in_progress', 'completed', at)
+        return project
+
+    def test_points_from_project_manager(self):
+        """Test bodů zapsaných při přidání úkolů a změně počtu hotových"""
+        self.pm.add_tasks("Meteostanice", [
+            {'name': f"Úkol {i}", 'assignee': "jan.novak", 'deadline': "2025-10-01"}
+            for i in range(4)])
+        self.pm.add_task("Meteostanice", "Prezentace", "eva.mala", "2025-10-08")
+        self.pm.update_task_status(1, "in_progress")
+        self.pm.update_task_status(1, "completed")
+        self.pm.update_task_status(2, "completed")
+        self.pm.update_task_status(2, "blocked", "Chybí senzor")
+        points = [(p['total'], p['completed']) for p in self.history.series("Meteostanice")]
+        # Přechod assigned → in_progress počty nemění, bod nevzniká
+        self.assertEqual(points, [(4, 0), (5, 0), (5, 1), (5, 2), (5, 1)])
+        size = self.history.size()
+        self.assertEqual((size['projects'], size['points']), (1, 5))
+        self.assertLess(size['bytes'], 4 + 5 * 8)
+
+        # Obnova stavu bod nepřidá, pokud počty sedí
+        self.pm.restore(self.pm.to_dict())
+        self.assertEqual(len(self.history.series("Meteostanice")), 5)
+
+    def test_reload_and_second_writer(self):
+        """Test načtení z disku, dočtení cizích bodů a odříznutí neúplného konce"""
+        self.pm.add_task("Meteostanice", "Zapojení senzoru", "jan.novak", "2025-10-01")
+        other = ProgressHistory(self.directory)
+        other.rebuild(self.pm.projects)
+        self.pm.update_task_status(1, "completed")
+        other.status_changed("Meteostanice", 'assigned', 'completed')
+        self.assertEqual(len(other.series("Meteostanice")), 2)
+        other.task_added("Meteostanice", [{'status': 'assigned'}])
+        other.close()
+
+        # První instance si bod druhé dočte a stejné počty znovu nezapíše
+        self.pm.add_task("Meteostanice", "Graf teplot", "jan.novak", "2025-10-01")
+        points = [(p['total'], p['completed']) for p in self.history.series("Meteostanice")]
+        self.assertEqual(points, [(1, 0), (1, 1), (2, 1)])
+        self.pm.update_task_status(2, "completed")
+        self.assertEqual(len(self.history.series("Meteostanice")), 4)
+
+        path = os.path.join(self.directory, 'Meteostanice.progress')
+        with open(path, 'ab') as f:
+            f.write(b'\x85')
+        reloaded = ProgressHistory(self.directory)
+        with self.assertLogs('ProgressHistory', 'WARNING'):
+            self.assertEqual(len(reloaded.series("Meteostanice")), 4)
+        reloaded.close()
+        with open(path, 'rb') as f:
+            self.assertNotEqual(f.read()[-1:], b'\x85')
+
+    def test_burndown_and_forecast(self):
+        """Test denního burndownu, týdenní rychlosti a odhadu proti termínu"""
+        start = datetime(2025, 9, 1, 8, 0)
+        project = self._history("Robot", [
+            (start, 10, 0),
+            (start + timedelta(days=2), 0, 2),
+            (start + timedelta(days=9), 0, 3),
+            (start + timedelta(days=10), 2, 0),
+            (start + timedelta(days=16), 0, 1),
+        ], start)
+        now = start + timedelta(days=21)
+        burndown = self.history.burndown(project, now=now)
+        self.assertEqual(burndown['deadline'], (start + timedelta(weeks=4)).isoformat())
+        self.assertEqual(len(burndown['days']), 22)
+        first, third, last = burndown['days'][0], burndown['days'][2], burndown['days'][-1]
+        self.assertEqual((first['total'], first['remaining']), (10, 10))
+        self.assertEqual(third['remaining'], 8)
+        self.assertEqual((last['total'], last['completed'], last['remaining']), (12, 6, 6))
+        self.assertLess(last['ideal'], first['ideal'])
+        self.assertEqual([week['completed'] for week in burndown['velocity']], [2, 3, 1, 0])
+
+        # 6 úkolů za 3 týdny = 2 týdně, zbývá 6 → 3 týdny, termín za týden
+        forecast = burndown['forecast']
+        self.assertEqual(forecast['per_week'], 2.0)
+        self.assertEqual(forecast['forecast'], (now + timedelta(weeks=3)).date().isoformat())
+        self.assertFalse(forecast['on_track'])
+        self.assertEqual(forecast['days_late'], 14)
+
+        self._history("Robot", [(now + timedelta(days=1), 0, 6)], start)
+        done = self.history.forecast(project, now=now + timedelta(days=2))
+        self.assertEqual(done['remaining'], 0)
+        self.assertEqual(done['forecast'], (now + timedelta(days=1)).date().isoformat())
+        self.assertTrue(done['on_track'])
+
+    def test_compaction(self):
+        """Test sloučení starých bodů na jeden denně při zachování burndownu"""
+        start = datetime(2025, 9, 1, 8, 0)
+        points = [(start + timedelta(days=day, minutes=minute), 1, 0)
+                  for day in range(30) for minute in range(0, 600, 60)]
+        project = self._history("Web", points, start, "2 měsíce")
+        now = start + timedelta(days=30)
+        before = self.history.burndown(project, now=now)
+        size = self.history.size()['bytes']
+        self.assertEqual(self.history.compact(now=now), (30 - 14) * 9)
+        self.assertEqual(self.history.burndown(project, now=now), before)
+        self.assertLess(self.history.size()['bytes'], size)
+        reloaded = ProgressHistory(self.directory)
+        self.assertEqual(len(reloaded.series("Web")), 16 + 14 * 10)
+        reloaded.close()
+
+    def test_parse_timeline(self):
+        """Test rozpoznání délky projektu z textu"""
+        self.assertEqual(parse_timeline("4 týdny"), timedelta(weeks=4))
+        self.assertEqual(parse_timeline("10 dní"), timedelta(days=10))
+        self.assertEqual(parse_timeline("2 měsíce"), timedelta(days=60))
+        self.assertEqual(parse_timeline("6 weeks"), timedelta(weeks=6))
+        self.assertEqual(parse_timeline("1,5 týdne"), timedelta(days=10.5))
+        self.assertIsNone(parse_timeline("do Vánoc"))
+        self.assertIsNone(parse_timeline(None))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,165 @@
+"""
+Unit testy pro ProjectEvaluator
+
+Testuje hodnocení kritérií, vážení a dávkové hodnocení v procesním poolu.
+"""
+
+import threading
+import time
+import unittest
+
+from src.python.project_evaluator import ProjectEvaluator, submission_hash
+
+
+class SlowDocumentationEvaluator(ProjectEvaluator):
+    """Hodnotitel, jehož hodnocení dokumentace se pro 'slow' zasekne"""
+
+    def evaluate_documentation(self, documentation):
+        if documentation == 'slow':
+            time.sleep(30)
+        return super().evaluate_documentation(documentation)
+
+
+class PausingEvaluator(ProjectEvaluator):
+    """Hodnotitel, jehož každé kritérium trvá 0,2 s"""
+
+    def score_criterion(self, criterion, project, submission):
+        time.sleep(0.2)
+        return super().score_criterion(criterion, project, submission)
+
+
+class StuckFunctionalityEvaluator(ProjectEvaluator):
+    """Hodnotitel, jehož hodnocení funkčnosti se vždy zasekne"""
+
+    def score_criterion(self, criterion, project, submission):
+        if criterion == 'functionality':
+            time.sleep(60)
+        return super().score_criterion(criterion, project, submission)
+
+
+class TestProjectEvaluator(unittest.TestCase):
+    """Testy pro ProjectEvaluator třídu"""
+
+    def setUp(self):
+        """Příprava testu"""
+        self.evaluator = ProjectEvaluator()
+        self.project = {'name': 'Weather Station IoT'}
+
+    def _submission(self, student: str, code: str = '"""Modul."""\nx = 1\n') -> dict:
+        """Pomocná metoda pro vytvoření odevzdané práce"""
+        return {
+            'id': student,
+            'code': code,
+            'documentation': '# Úvod\n# Zapojení\n# Závěr\n' + 'slovo ' * 300,
+            'test_results': {'passed': 3, 'total': 4},
+            'manual_scores': {'creativity': 80, 'presentation': 90},
+        }
+
+    def test_evaluate_project(self):
+        """Test hodnocení jedné práce"""
+        result = self.evaluator.evaluate_project(self.project, self._submission('jan'))
+
+        self.assertEqual(result['scores']['functionality'], 75.0)
+        self.assertEqual(result['scores']['code_quality'], 100.0)
+        self.assertEqual(result['scores']['documentation'], 100.0)
+        # 0.3*75 + 0.2*100 + 0.15*100 + 0.15*80 + 0.2*90
+        self.assertEqual(result['total'], 87.5)
+
+    def test_syntax_error_scores_zero(self):
+        """Test že nesyntaktický kód dostane 0 bodů za kvalitu"""
+        self.assertEqual(self.evaluator.evaluate_code_quality("def broken(:"), 0.0)
+
+    def test_weighted_totals(self):
+        """Test vážení celé matice bodů"""
+        totals = self.evaluator.weighted_totals([
+            [100, 100, 100, 100, 100],
+            [0, 0, 0, 0, 0],
+            [100, 0, 0, 0, 0],
+        ])
+        self.assertEqual(totals, [100.0, 0.0, 30.0])
+
+    def test_evaluate_batch(self):
+        """Test dávkového hodnocení"""
+        submissions = [self._submission(f'student{i}') for i in range(4)]
+        results = list(self.evaluator.evaluate_batch(self.project, submissions, max_workers=2))
+
+        self.assertEqual(len(results), 4)
+        self.assertEqual(
+            sorted(r['submission_id'] for r in results),
+            ['student0', 'student1', 'student2', 'student3']
+        )
+        for result in results:
+            self.assertFalse(result['cached'])
+            self.assertEqual(result['total'], 87.5)
+
+    def test_batch_cache_skips_unchanged(self):
+        """Test že nezměněné práce se znovu nehodnotí"""
+        submissions = [self._submission('a'), self._submission('b')]
+        list(self.evaluator.evaluate_batch(self.project, submissions, max_workers=2))
+
+        submissions[1] = self._submission('b', code="def broken(:")
+        results = {
+            r['submission_id']: r
+            for r in self.evaluator.evaluate_batch(self.project, submissions, max_workers=2)
+        }
+
+        self.assertTrue(results['a']['cached'])
+        self.assertFalse(results['b']['cached'])
+        self.assertEqual(results['b']['scores']['code_quality'], 0.0)
+
+    def test_batch_timeout(self):
+        """Test časového limitu kritéria"""
+        evaluator = SlowDocumentationEvaluator()
+        slow = dict(self._submission('slow'), documentation='slow')
+        started = time.monotonic()
+        results = list(evaluator.evaluate_batch(
+            self.project, [slow, self._submission('ok')],
+            max_workers=2, criterion_timeout=0.5
+        ))
+
+        self.assertLess(time.monotonic() - started, 10)
+        by_id = {r['submission_id']: r for r in results}
+        self.assertEqual(by_id['slow']['timed_out'], ['documentation'])
+        self.assertEqual(by_id['slow']['scores']['documentation'], 0.0)
+        self.assertEqual(by_id['ok']['timed_out'], [])
+
+    def test_batch_timeouts_occupying_all_workers(self):
+        """Test, že zaseknuté úlohy na všech procesech dávku nezastaví"""
+        submissions = [self._submission(f'student{i}') for i in range(6)]
+        results = []
+
+        def evaluate():
+            results.extend(StuckFunctionalityEvaluator().evaluate_batch(
+                self.project, submissions, max_workers=2, criterion_timeout=0.5))
+
+        worker = threading.Thread(target=evaluate, daemon=True)
+        worker.start()
+        worker.join(30)
+        self.assertFalse(worker.is_alive(), f"dávka uvízla po {len(results)} výsledcích")
+        self.assertEqual(len(results), 6)
+        for result in results:
+            self.assertEqual(result['timed_out'], ['functionality'])
+            self.assertEqual(result['errors'], {})
+            self.assertEqual(result['scores']['documentation'], 100.0)
+
+    def test_batch_timeout_ignores_queue_wait(self):
+        """Test, že limit neběží úlohám čekajícím ve frontě poolu"""
+        # 10 úloh po 0,2 s v jednom procesu: poslední čeká ve frontě ~1,8 s
+        results = list(PausingEvaluator().evaluate_batch(
+            self.project, [self._submission('a'), self._submission('b')],
+            max_workers=1, criterion_timeout=0.5
+        ))
+
+        self.assertEqual([r['timed_out'] for r in results], [[], []])
+        self.assertEqual([r['total'] for r in results], [87.5, 87.5])
+
+    def test_submission_hash_depends_on_content(self):
+        """Test že otisk závisí na obsahu práce"""
+        a = submission_hash(self.project, self._submission('a'))
+        b = submission_hash(self.project, self._submission('a', code="y = 2\n"))
+        self.assertNotEqual(a, b)
+        self.assertEqual(a, submission_hash(self.project, self._submission('a')))
+
+
+if __name__ == '__main__':
+    unittest.main()
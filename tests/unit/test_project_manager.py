@@ -6,7 +6,10 @@ Testuje všechny kritické funkce správce projektů.
 
 import unittest
 import json
+import logging
+import sys
 import tempfile
+import threading
 import os
 from pathlib import Path
 from src.python.project_manager import ProjectManager, TaskStatus, ProjectStatus
@@ -75,6 +78,20 @@ class TestProjectManager(unittest.TestCase):
         self.assertEqual(task['name'], "Task 1")
         self.assertEqual(task['status'], TaskStatus.ASSIGNED.value)
     
+    def test_add_task_dependencies(self):
+        """Test závislostí úkolu a odmítnutí neexistující závislosti"""
+        self.pm.create_project("Project A", "Test", [], "1 week")
+        first = self.pm.add_task("Project A", "Task 1", "John Doe", "2025-12-01")
+        second = self.pm.add_task("Project A", "Task 2", "John Doe", "2025-12-31",
+                                  dependencies=[first['id']])
+        
+        self.assertEqual(first['dependencies'], [])
+        self.assertEqual(second['dependencies'], [first['id']])
+        with self.assertRaises(ValueError):
+            self.pm.add_task("Project A", "Task 3", "John Doe", "2025-12-31",
+                             dependencies=[999])
+        self.assertEqual(len(self.pm.tasks), 2)
+    
     def test_track_progress(self):
         """Test sledování pokroku projektu"""
         self.pm.create_project(
@@ -187,6 +204,136 @@ class TestProjectManager(unittest.TestCase):
         self.assertEqual(stats['by_priority']['critical'], 1)
         self.assertEqual(stats['by_priority']['normal'], 1)
 
+    def test_save_and_load_state(self):
+        """Test uložení a obnovení stavu"""
+        self.pm.create_project(
+            name="Project F",
+            description="State Test",
+            objectives=[],
+            timeline="1 week"
+        )
+        self.pm.add_task(
+            project_name="Project F",
+            task_name="Task 1",
+            assignee="Alice",
+            deadline="2025-12-15"
+        )
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            state_file = os.path.join(temp_dir, 'state.json')
+            self.assertTrue(self.pm.save_state(state_file))
+            
+            pm2 = ProjectManager(self.temp_log.name)
+            self.assertTrue(pm2.load_state(state_file))
+        
+        # Úkoly jsou po obnovení sdílené mezi projektem a seznamem tasks
+        self.assertTrue(pm2.update_task_status(1, TaskStatus.COMPLETED.value))
+        self.assertEqual(pm2.track_progress("Project F"), 100.0)
+
+
+class TestConcurrency(unittest.TestCase):
+    """Zátěžový test souběžného přístupu z více vláken"""
+
+    THREADS = 8
+    TASKS_PER_THREAD = 1000
+
+    def setUp(self):
+        """Příprava - častější přepínání vláken pro víc prokládání"""
+        self.temp_log = tempfile.NamedTemporaryFile(delete=False, suffix='.log')
+        self.pm = ProjectManager(self.temp_log.name)
+        self.pm.logger.setLevel(logging.WARNING)
+        self.switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+
+    def tearDown(self):
+        """Čistka"""
+        sys.setswitchinterval(self.switch_interval)
+        self.pm.logger.setLevel(logging.INFO)
+        os.unlink(self.temp_log.name)
+
+    def test_concurrent_writers_and_readers(self):
+        """Test unikátních ID a konzistence při souběžných zápisech a čteních"""
+        projects = [f"Projekt {i}" for i in range(4)]
+        for name in projects:
+            self.pm.create_project(name, "Zátěž", [], "1 týden")
+
+        errors = []
+        done = threading.Event()
+        barrier = threading.Barrier(self.THREADS + 2)
+
+        def writer(worker):
+            barrier.wait()
+            try:
+                for i in range(self.TASKS_PER_THREAD):
+                    task = self.pm.add_task(
+                        projects[(worker + i) % len(projects)],
+                        f"Úkol {worker}-{i}", f"student{worker}", "2025-12-31"
+                    )
+                    if i % 2:
+                        self.pm.update_task_status(task['id'], TaskStatus.COMPLETED.value)
+            except Exception as e:
+                errors.append(e)
+
+        def reader():
+            barrier.wait()
+            try:
+                while not done.is_set():
+                    for name in projects:
+                        report = self.pm.generate_report(name)
+                        stats = self.pm.get_project_stats(name)
+                        self.assertGreaterEqual(report['total_tasks'], 0)
+                        self.assertGreaterEqual(stats['total_tasks'], stats['completed'])
+                    json.dumps(self.pm.to_dict())
+            except Exception as e:
+                errors.append(e)
+
+        writers = [threading.Thread(target=writer, args=(w,)) for w in range(self.THREADS)]
+        readers = [threading.Thread(target=reader) for _ in range(2)]
+        for thread in writers + readers:
+            thread.start()
+        for thread in writers:
+            thread.join()
+        done.set()
+        for thread in readers:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        total = self.THREADS * self.TASKS_PER_THREAD
+        ids = [task['id'] for task in self.pm.tasks]
+        self.assertEqual(sorted(ids), list(range(1, total + 1)))
+        self.assertEqual(
+            sum(len(self.pm.projects[name]['tasks']) for name in projects), total
+        )
+        in_projects = {
+            id(task) for name in projects for task in self.pm.projects[name]['tasks']
+        }
+        self.assertEqual(in_projects, {id(task) for task in self.pm.tasks})
+        completed = sum(
+            1 for task in self.pm.tasks if task['status'] == TaskStatus.COMPLETED.value
+        )
+        self.assertEqual(completed, total // 2)
+
+    def test_duplicate_project_race(self):
+        """Test že souběžné vytvoření stejného projektu uspěje jen jednou"""
+        created, failed = [], []
+        barrier = threading.Barrier(self.THREADS)
+
+        def create():
+            barrier.wait()
+            try:
+                created.append(self.pm.create_project("Sdílený", "", [], "1 týden"))
+            except ValueError:
+                failed.append(True)
+
+        threads = [threading.Thread(target=create) for _ in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual((len(created), len(failed)), (1, self.THREADS - 1))
+        self.assertIs(self.pm.projects["Sdílený"], created[0])
+
 
 class TestTaskStatus(unittest.TestCase):
     """Testy pro TaskStatus enum"""
@@ -0,0 +1,211 @@
+"""
+Unit testy pro replikaci mezi kiosky
+
+Testuje sbíhání stavu několika uzlů přes HTTP na loopbacku, dělení ID
+úkolů, last-writer-wins u stavu úkolu, dorovnání ze snímku po ztrátě
+historie, odložení změn z třetího uzlu a replikaci na pozadí.
+"""
+
+import os
+import tempfile
+import time
+import unittest
+import urllib.error
+import urllib.request
+
+from src.python.journal import Journal
+from src.python.project_manager import ProjectManager
+from src.python.replication import Replicator
+
+
+class TestReplicator(unittest.TestCase):
+    """Testy pro Replicator a ProjectManager.apply_remote"""
+
+    def setUp(self):
+        """Příprava - výchozí stav na uzlu A"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.replicators = []
+        self.seed = self._manager('A')
+        self.seed.create_project("Meteostanice", "Měření teploty", ["Sběr dat"], "4 týdny")
+        for name in ("Zapojení senzoru", "Graf teplot", "Prezentace"):
+            self.seed.add_task("Meteostanice", name, "jan.novak", "2025-10-01")
+
+    def tearDown(self):
+        """Čistka"""
+        for replicator in self.replicators:
+            replicator.stop()
+            replicator.journal.close()
+        self.temp_dir.cleanup()
+
+    def _manager(self, node, **options):
+        root = os.path.join(self.temp_dir.name, node)
+        os.makedirs(root, exist_ok=True)
+        pm = ProjectManager(os.path.join(root, 'pm.log'))
+        Journal(os.path.join(root, 'journal'), **options).attach(pm)
+        return pm
+
+    def _cluster(self, managers, **options):
+        """Replikace pro uzly {ID: správce}; servery běží, stahuje se ručně"""
+        nodes = {}
+        for node, manager in managers.items():
+            peers = {peer: '' for peer in managers if peer != node}
+            nodes[node] = Replicator(manager, node, peers, host='127.0.0.1', port=0,
+                                     **options)
+            self.replicators.append(nodes[node])
+        for replicator in nodes.values():
+            replicator.serve()
+        for replicator in nodes.values():
+            for peer in replicator.peers:
+                replicator.peers[peer] = f"http://127.0.0.1:{nodes[peer].port}"
+        return nodes
+
+    def _sync(self, nodes):
+        """Stahování mezi všemi dvojicemi, dokud se něco mění"""
+        for _ in range(10):
+            if not sum(replicator.pull(peer) for replicator in nodes.values()
+                       for peer in replicator.peers):
+                return
+        self.fail("Replikace se neustálila")
+
+    def test_convergence_and_id_partitioning(self):
+        """Test sbíhání tří uzlů a nekolidujících ID úkolů"""
+        nodes = self._cluster({'A': self.seed, 'B': self._manager('B'),
+                               'C': self._manager('C')})
+        self._sync(nodes)
+        b, c = nodes['B'].manager, nodes['C'].manager
+        self.assertEqual(b.to_dict(), self.seed.to_dict())
+        self.assertEqual(nodes['B'].stats()['peers']['A']['snapshots'], 1)
+
+        # Souběžně přidané úkoly dostanou ID ze zbytkové třídy uzlu (A=1, B=2, C=0 mod 3)
+        ids = [manager.add_task("Meteostanice", f"Úkol {node}", "eva.mala", "2025-10-08")['id']
+               for node, manager in (('A', self.seed), ('B', b), ('C', c))]
+        self.assertEqual(ids, [4, 5, 6])
+        self.seed.update_task_status(1, "completed", "Hotovo")
+        c.update_task_status(6, "in_progress")
+        self._sync(nodes)
+        for manager in (b, c):
+            self.assertEqual(manager.to_dict(), self.seed.to_dict())
+        tasks = self.seed.projects["Meteostanice"]['tasks']
+        self.assertEqual([task['id'] for task in tasks], [1, 2, 3, 4, 5, 6])
+        self.assertEqual(b.query_tasks(status=['in_progress'])['tasks'][0]['id'], 6)
+        self.assertEqual(b.add_task("Meteostanice", "Další", "eva.mala", "2025-10-09")['id'], 8)
+
+        # Převzaté záznamy nesou původ a dál se nešíří
+        origins = [record.get('origin') for record in b.journal.records()]
+        self.assertIn('A', origins)
+        self.assertIn('C', origins)
+        self.assertEqual(self.seed.apply_remote(
+            'add_task', {'project': "Meteostanice", 'task': dict(tasks[4])}, 'B'), False)
+        stats = nodes['A'].stats()['peers']['C']
+        self.assertEqual(stats['behind'], 0)
+        self.assertEqual(stats['records'], 2)
+        self.assertGreater(stats['bytes_per_record'], 0)
+        self.assertIsNotNone(stats['lag_ms_p95'])
+
+    def test_poll_between_fsync_and_listener(self):
+        """Test, že dotaz těsně po fsync nepřeskočí záznamy, které ještě nemá"""
+        replicator = Replicator(self.seed, 'A', {'B': ''}, host='127.0.0.1', port=0)
+        self.replicators.append(replicator)
+        head = replicator.changes(0)['seq']
+        polled = []
+        # Posluchač před _on_records vidí žurnál už po zvýšení synced
+        replicator.journal.listeners.insert(0, lambda records: polled.append(
+            replicator.changes(head)))
+
+        self.seed.add_task("Meteostanice", "Nový", "jan.novak", "2025-10-01")
+        replicator.journal.flush()
+        self.assertEqual(polled[0]['seq'], head)
+        page = replicator.changes(polled[0]['seq'])
+        self.assertEqual(page['seq'], head + 1)
+        self.assertEqual(len(page['records']), 1)
+        self.assertIn('"Nový"', page['records'][0])
+
+    def test_last_writer_wins(self):
+        """Test, že souběžnou změnu stavu vyhraje na všech uzlech pozdější"""
+        nodes = self._cluster({'A': self.seed, 'B': self._manager('B')})
+        self._sync(nodes)
+        b = nodes['B'].manager
+        self.seed.update_task_status(2, "blocked", "Chybí senzor")
+        time.sleep(0.01)
+        b.update_task_status(2, "completed", "Hotovo")
+        # A převezme novější změnu z B, B starší změnu z A odmítne
+        self.assertEqual(nodes['A'].pull('B'), 1)
+        self.assertEqual(nodes['B'].pull('A'), 1)
+        for manager in (self.seed, b):
+            task = manager.projects["Meteostanice"]['tasks'][1]
+            self.assertEqual((task['status'], task['notes']), ("completed", "Hotovo"))
+        self.assertEqual(b.query_tasks(status=['blocked'])['total'], 0)
+        self.assertEqual(self.seed.to_dict(), b.to_dict())
+        stale = {'project': "Meteostanice", 'task_id': 2, 'status': "assigned", 'notes': "",
+                 'updated_at': "2000-01-01T00:00:00"}
+        self.assertFalse(b.apply_remote('update_task_status', stale, 'A'))
+        with self.assertRaises(ValueError):
+            b.apply_remote('delete_task', {'task_id': 2}, 'A')
+
+    def test_snapshot_catch_up_after_history_loss(self):
+        """Test dorovnání ze snímku, když protějšek záznamy za pozicí smazal"""
+        self.seed.journal.close()
+        self.seed = self._manager('A', retain_history=False)
+        nodes = self._cluster({'A': self.seed, 'B': self._manager('B')}, backlog=2)
+        self._sync(nodes)
+        nodes['B'].stop()
+        cursor = nodes['B'].stats()['peers']['A']['cursor']
+
+        for task_id in (1, 2, 3):
+            self.seed.update_task_status(task_id, "completed")
+            self.seed.journal.snapshot()
+        page = nodes['A'].changes(cursor)
+        self.assertIsNone(page)
+
+        restarted = Replicator(nodes['B'].manager, 'B', dict(nodes['B'].peers), port=0)
+        self.replicators.append(restarted)
+        self.assertEqual(restarted.stats()['peers']['A']['cursor'], cursor)
+        with self.assertLogs('Replicator', 'WARNING'):
+            restarted.pull('A')
+        self.assertEqual(restarted.stats()['peers']['A']['snapshots'], 1)
+        self.assertEqual(nodes['B'].manager.to_dict(), self.seed.to_dict())
+        # Nové záznamy už jdou z paměti
+        self.seed.add_task("Meteostanice", "Po snímku", "eva.mala", "2025-10-10")
+        self.assertEqual(restarted.pull('A'), 1)
+
+    def test_deferred_change_from_third_node(self):
+        """Test odložení změny úkolu, který z třetího uzlu ještě nedorazil"""
+        nodes = self._cluster({'A': self.seed, 'B': self._manager('B'),
+                               'C': self._manager('C')})
+        b, c = nodes['B'].manager, nodes['C'].manager
+        nodes['B'].pull('A')
+        nodes['C'].pull('A')
+        task = c.add_task("Meteostanice", "Kalibrace", "eva.mala", "2025-10-12")
+        nodes['A'].pull('C')
+        self.seed.update_task_status(task['id'], "completed", "Zkalibrováno")
+
+        nodes['B'].pull('A')
+        self.assertEqual(nodes['B'].stats()['deferred'], 1)
+        nodes['B'].pull('C')
+        self.assertEqual(nodes['B'].stats()['deferred'], 0)
+        self.assertEqual(b.projects["Meteostanice"]['tasks'][-1]['status'], "completed")
+
+    def test_background_replication_over_http(self):
+        """Test replikace na pozadí (long-poll) a klíče uzlů"""
+        nodes = self._cluster({'A': self.seed, 'B': self._manager('B')},
+                              token='tajne', poll_wait=0.5, interval=0.05)
+        for replicator in nodes.values():
+            replicator.start()
+        self.seed.update_task_status(3, "in_progress", "Začínáme")
+        b = nodes['B'].manager
+        deadline = time.monotonic() + 5
+        while b.query_tasks(status=['in_progress'])['total'] != 1:
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.02)
+
+        url = f"http://127.0.0.1:{nodes['A'].port}/replication/status"
+        with self.assertRaises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(url, timeout=5)
+        self.assertEqual(error.exception.code, 403)
+        request = urllib.request.Request(url, headers={'X-Replication-Token': 'tajne'})
+        with urllib.request.urlopen(request, timeout=5) as response:
+            self.assertEqual(response.status, 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,222 @@
+"""
+Unit testy pro WeatherStore a RetentionCompactor
+
+Testuje ukládání měření, hodinové souhrny a promazávání starých dat.
+"""
+
+import gzip
+import math
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from src.python.retention import RetentionCompactor
+from src.python.weather_store import WeatherStore, connect
+
+
+class TestWeatherStore(unittest.TestCase):
+    """Testy pro WeatherStore třídu"""
+
+    def setUp(self):
+        """Příprava - dočasná databáze"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.store = WeatherStore(os.path.join(self.temp_dir.name, 'weather.db'))
+
+    def tearDown(self):
+        """Čistka"""
+        self.store.close()
+        self.temp_dir.cleanup()
+
+    def test_insert_and_latest(self):
+        """Test uložení a čtení posledního měření"""
+        self.store.insert_reading(20.0, 50.0, 1000.0, datetime(2025, 9, 1, 10, 0))
+        self.store.insert_reading(21.5, 55.0, 1001.0, datetime(2025, 9, 1, 11, 0))
+
+        latest = self.store.latest()
+        self.assertEqual(len(latest), 1)
+        self.assertEqual(latest[0]['temperature'], 21.5)
+        self.assertEqual(self.store.count(), 2)
+
+    def test_query_range(self):
+        """Test dotazu na časový interval"""
+        start = datetime(2025, 9, 1)
+        self.store.insert_many(
+            (start + timedelta(hours=i), float(i), 50.0, 1000.0) for i in range(10)
+        )
+
+        rows = self.store.query_range(start + timedelta(hours=2), start + timedelta(hours=5))
+        self.assertEqual([row['temperature'] for row in rows], [2.0, 3.0, 4.0])
+
+    def test_connect_does_not_vacuum_existing_database(self):
+        """Test, že otevření starší databáze ji nepřevádí plným VACUUM"""
+        path = os.path.join(self.temp_dir.name, 'legacy.db')
+        legacy = sqlite3.connect(path)
+        legacy.execute("CREATE TABLE t (x)")
+        legacy.commit()
+        legacy.close()
+        connection = connect(path)
+        self.assertEqual(connection.execute("PRAGMA auto_vacuum").fetchone()[0], 0)
+        connection.close()
+        self.assertEqual(self.store.connection.execute("PRAGMA auto_vacuum").fetchone()[0], 2)
+
+
+class TestRetentionCompactor(unittest.TestCase):
+    """Testy pro RetentionCompactor třídu"""
+
+    def setUp(self):
+        """Příprava - databáze se starými i novými daty"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, 'weather.db')
+        self.store = WeatherStore(self.db_path)
+        self.now = datetime(2025, 10, 1, 12, 0)
+
+        old_start = self.now - timedelta(days=40)
+        # 120 starých měření po minutě = 2 hodiny, 10 nových měření
+        self.store.insert_many(
+            (old_start + timedelta(minutes=i), 10.0 + i % 2, 50.0, 1000.0)
+            for i in range(120)
+        )
+        self.store.insert_many(
+            (self.now - timedelta(hours=i), 20.0, 60.0, 1010.0) for i in range(10)
+        )
+
+    def tearDown(self):
+        """Čistka"""
+        self.store.close()
+        self.temp_dir.cleanup()
+
+    def test_deletes_old_rows_in_chunks(self):
+        """Test smazání starých řádků po dávkách"""
+        compactor = RetentionCompactor(
+            self.db_path, retention_days=30, chunk_size=25, chunk_pause=0
+        )
+        stats = compactor.run_once(now=self.now)
+
+        self.assertEqual(stats['rows_deleted'], 120)
+        self.assertEqual(stats['chunks'], 5)
+        self.assertGreater(stats['pause_max_ms'], 0)
+        self.assertLessEqual(stats['pause_max_ms'], stats['pause_total_ms'])
+        self.assertEqual(self.store.count(), 10)
+
+    def test_rollups_are_kept(self):
+        """Test že hodinové souhrny přežijí smazání surových dat"""
+        compactor = RetentionCompactor(
+            self.db_path, retention_days=30, chunk_size=7, chunk_pause=0
+        )
+        compactor.run_once(now=self.now)
+
+        hourly = self.store.hourly(end=self.now - timedelta(days=30))
+        self.assertEqual(len(hourly), 2)
+        self.assertEqual(sum(h['samples'] for h in hourly), 120)
+        self.assertAlmostEqual(hourly[0]['temperature']['avg'], 10.5)
+        self.assertEqual(hourly[0]['temperature']['min'], 10.0)
+        self.assertEqual(hourly[0]['temperature']['max'], 11.0)
+
+    def test_rollup_average_skips_missing_values(self):
+        """Test, že průměr souhrnu nezapočítává chybějící hodnoty kanálu"""
+        start = self.now - timedelta(days=50)
+        self.store.insert_many(
+            (start + timedelta(minutes=i), None if i % 2 else 12.0, 50.0, 1000.0)
+            for i in range(10)
+        )
+        RetentionCompactor(
+            self.db_path, retention_days=30, chunk_size=3, chunk_pause=0
+        ).run_once(now=self.now)
+
+        hourly = self.store.hourly(end=start + timedelta(hours=1))
+        self.assertEqual(hourly[0]['samples'], 10)
+        self.assertEqual(hourly[0]['temperature']['avg'], 12.0)
+        self.assertEqual(hourly[0]['humidity']['avg'], 50.0)
+
+    def test_incremental_vacuum_frees_pages_per_step(self):
+        """Test, že jeden krok VACUUM uvolní vacuum_pages stránek"""
+        self.store.insert_many(
+            (self.now - timedelta(days=45, seconds=i), 10.0, 50.0, 1000.0)
+            for i in range(20000)
+        )
+        compactor = RetentionCompactor(
+            self.db_path, retention_days=30, chunk_size=5000, chunk_pause=0, vacuum_pages=16
+        )
+        stats = compactor.run_once(now=self.now)
+
+        self.assertGreater(stats['pages_freed'], 100)
+        self.assertEqual(stats['vacuum_steps'], math.ceil(stats['pages_freed'] / 16))
+        freelist = self.store.connection.execute("PRAGMA freelist_count").fetchone()[0]
+        self.assertEqual(freelist, 0)
+
+    def test_convert_database(self):
+        """Test explicitního převodu starší databáze na inkrementální VACUUM"""
+        path = os.path.join(self.temp_dir.name, 'legacy.db')
+        legacy = sqlite3.connect(path)
+        legacy.execute("CREATE TABLE weather_data (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                       "timestamp DATETIME, temperature REAL, humidity REAL, pressure REAL)")
+        legacy.commit()
+        legacy.close()
+        compactor = RetentionCompactor(path, chunk_pause=0)
+
+        with self.assertLogs('RetentionCompactor', 'WARNING'):
+            stats = compactor.run_once(now=self.now)
+        self.assertEqual(stats['vacuum_steps'], 0)
+        with self.assertLogs('RetentionCompactor', 'INFO') as logs:
+            self.assertTrue(compactor.convert_database())
+        self.assertIn('Převádím', logs.output[0])
+        self.assertFalse(compactor.convert_database())
+        connection = connect(path)
+        self.assertEqual(connection.execute("PRAGMA auto_vacuum").fetchone()[0], 2)
+        connection.close()
+
+    def test_archive(self):
+        """Test archivace smazaných řádků do CSV"""
+        archive_dir = Path(self.temp_dir.name) / 'archive'
+        compactor = RetentionCompactor(
+            self.db_path, retention_days=30, chunk_size=50,
+            chunk_pause=0, archive_dir=str(archive_dir)
+        )
+        stats = compactor.run_once(now=self.now)
+
+        self.assertEqual(stats['rows_archived'], 120)
+        archives = list(archive_dir.glob('weather_data-*.csv.gz'))
+        self.assertEqual(len(archives), 1)
+        with gzip.open(archives[0], 'rt', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        self.assertEqual(lines[0], 'id,timestamp,temperature,humidity,pressure')
+        self.assertEqual(len(lines), 121)
+
+    def test_from_config(self):
+        """Test načtení retence z konfigurace"""
+        class _Config:
+            def get(self, key, default=None):
+                return {'monitoring.log_retention_days': 7}.get(key, default)
+
+        compactor = RetentionCompactor.from_config(_Config(), self.db_path)
+        self.assertEqual(compactor.retention_days, 7)
+
+    def test_prune_logs(self):
+        """Test smazání starých rotovaných logů"""
+        log_dir = Path(self.temp_dir.name) / 'logs'
+        log_dir.mkdir()
+        old_mtime = time.time() - 60 * 86400
+        for name in ('system.log', 'system.log.1', 'system.log.2'):
+            (log_dir / name).write_text('x')
+            os.utime(log_dir / name, (old_mtime, old_mtime))
+        (log_dir / 'system.log.3').write_text('fresh')
+
+        compactor = RetentionCompactor(self.db_path, retention_days=30, log_dir=str(log_dir))
+        removed = compactor.prune_logs()
+
+        self.assertEqual(removed, 2)
+        self.assertTrue((log_dir / 'system.log').exists())
+        self.assertTrue((log_dir / 'system.log.3').exists())
+
+    def test_invalid_retention(self):
+        """Test neplatné retence"""
+        with self.assertRaises(ValueError):
+            RetentionCompactor(self.db_path, retention_days=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
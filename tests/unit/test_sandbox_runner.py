@@ -0,0 +1,99 @@
+"""
+Unit testy pro SandboxRunner
+
+Testuje spouštění testů, znovupoužití procesů a ukončení zacyklené práce.
+"""
+
+import time
+import unittest
+
+from src.python.project_evaluator import ProjectEvaluator
+from src.python.sandbox_runner import SandboxRunner
+
+
+ADD_CODE = "def add(a, b):\n    return a + b\n"
+
+
+class TestSandboxRunner(unittest.TestCase):
+    """Testy pro SandboxRunner třídu"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Příprava - jeden pool pro všechny testy"""
+        cls.runner = SandboxRunner(workers=1, cpu_seconds=1, memory_mb=128, wall_timeout=5)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Čistka"""
+        cls.runner.close()
+
+    def test_passed_and_failed_tests(self):
+        """Test vyhodnocení úspěšných a neúspěšných testů"""
+        result = self.runner.run(ADD_CODE, {
+            'soucet': "assert add(1, 2) == 3",
+            'chyba': "assert add(1, 1) == 3",
+        })
+
+        self.assertEqual((result['passed'], result['failed'], result['total']), (1, 1, 2))
+        self.assertFalse(result['killed'])
+        self.assertEqual(result['tests'][1]['error'], 'AssertionError')
+        for test in result['tests']:
+            self.assertIsNotNone(test['duration_ms'])
+
+    def test_worker_is_reused(self):
+        """Test že se pracovní proces používá opakovaně"""
+        pid = self.runner._idle.queue[0].pid
+        for _ in range(3):
+            self.runner.run(ADD_CODE, {'t': "assert add(2, 2) == 4"})
+        self.assertEqual(self.runner._idle.queue[0].pid, pid)
+
+    def test_submission_error_fails_all_tests(self):
+        """Test že chyba v kódu práce shodí všechny testy"""
+        result = self.runner.run("raise ValueError('oops')", {'a': "pass", 'b': "pass"})
+
+        self.assertEqual(result['failed'], 2)
+        self.assertIn('ValueError', result['error'])
+
+    def test_runaway_is_killed(self):
+        """Test okamžitého ukončení zacyklené práce a náhrady procesu"""
+        started = time.monotonic()
+        result = self.runner.run("while True:\n    pass\n", {'t': "pass"}, timeout=0.5)
+
+        self.assertLess(time.monotonic() - started, 3)
+        self.assertTrue(result['killed'])
+        self.assertEqual(result['passed'], 0)
+
+        # Náhradní proces funguje
+        result = self.runner.run(ADD_CODE, {'t': "assert add(1, 2) == 3"})
+        self.assertEqual(result['passed'], 1)
+
+    def test_memory_limit(self):
+        """Test limitu paměti"""
+        result = self.runner.run("data = bytearray(1024 * 1024 * 1024)", {'t': "pass"})
+
+        self.assertEqual(result['passed'], 0)
+        self.assertIn('MemoryError', result['error'])
+
+    def test_output_is_captured(self):
+        """Test zachycení výstupu práce"""
+        result = self.runner.run("print('ahoj')", {'t': "pass"})
+        self.assertEqual(result['output'], 'ahoj\n')
+
+
+class TestEvaluatorFunctionality(unittest.TestCase):
+    """Testy napojení SandboxRunneru na ProjectEvaluator"""
+
+    def test_functionality_runs_project_tests(self):
+        """Test hodnocení funkčnosti spuštěním testů projektu"""
+        project = {'name': 'Kalkulačka', 'tests': {
+            'soucet': "assert add(1, 2) == 3",
+            'nula': "assert add(0, 0) == 0",
+            'chyba': "assert add(1, 1) == 3",
+            'zaporna': "assert add(-1, 1) == 0",
+        }}
+        score = ProjectEvaluator().evaluate_functionality(project, {'code': ADD_CODE})
+        self.assertEqual(score, 75.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+"""
+Unit testy pro fulltextový index
+
+Testuje českou normalizaci, řazení výsledků, doplňování prefixu
+a průběžnou údržbu indexu z ProjectManageru.
+"""
+
+import os
+import tempfile
+import unittest
+
+from src.python.project_manager import ProjectManager
+from src.python.search_index import SearchIndex, analyze, fold, tokenize
+
+
+class TestSearchIndex(unittest.TestCase):
+    """Testy pro SearchIndex a napojení na ProjectManager"""
+
+    def setUp(self):
+        """Příprava - správce projektů s indexem"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.index = SearchIndex()
+        self.pm = ProjectManager(os.path.join(self.temp_dir.name, 'pm.log'),
+                                 search_index=self.index)
+        self.pm.create_project("Meteostanice", "Měření teploty a vlhkosti", ["Sběr dat"],
+                               "4 týdny")
+        self.pm.create_project("Robotické auto", "Řízení motorů", [], "6 týdnů")
+        self.pm.add_task("Meteostanice", "Zapojení senzoru BME280", "jan.novak", "2025-10-01",
+                         description="Připojit čidlo ke sběrnici I2C")
+        self.pm.add_task("Meteostanice", "Graf teplot", "eva.mala", "2025-10-08",
+                         description="Vykreslit naměřené teploty")
+        self.pm.add_tasks("Robotické auto", [
+            {'name': 'Řízení motorů', 'assignee': 'petr.dvorak', 'deadline': '2025-10-01'},
+            {'name': 'Senzory vzdálenosti', 'assignee': 'jan.novak', 'deadline': '2025-10-05',
+             'description': 'Ultrazvukové senzory na přední nárazník'},
+        ])
+
+    def tearDown(self):
+        """Čistka"""
+        self.temp_dir.cleanup()
+
+    def test_czech_normalization(self):
+        """Test odstranění diakritiky, stop slov a koncovek"""
+        self.assertEqual(fold("Řízení MOTORŮ"), "rizeni motoru")
+        self.assertEqual(tokenize("Senzor na přední nárazník"), ['senzor', 'predni', 'naraznik'])
+        self.assertEqual(analyze("meteostanice meteostanici"), ['meteostanic', 'meteostanic'])
+        self.assertEqual(analyze("senzory senzorem senzoru"), ['senzor'] * 3)
+        self.assertEqual(analyze("BME280 2025"), ['bme280', '2025'])
+
+    def test_search_ranking_and_filters(self):
+        """Test vyhledání bez diakritiky, řazení podle pole a filtrů"""
+        hits = self.pm.search("senzorum")
+        self.assertEqual([hit['task']['name'] for hit in hits],
+                         ['Senzory vzdálenosti', 'Zapojení senzoru BME280'])
+        self.assertEqual(hits[0]['project'], "Robotické auto")
+
+        hits = self.pm.search("rizeni motoru")
+        self.assertEqual([hit['type'] for hit in hits], ['task', 'project'])
+        self.assertEqual(self.pm.search("rizeni", kind='project')[0]['project'],
+                         "Robotické auto")
+        self.assertEqual(len(self.pm.search("senzor", project="Meteostanice")), 1)
+        self.assertEqual(self.pm.search("senzor jan.novak teplota"), [])
+        self.assertEqual(self.pm.search("a na"), [])
+
+    def test_prefix_type_ahead(self):
+        """Test doplňování posledního slova dotazu"""
+        def names(query):
+            return [hit['id'] for hit in self.index.search(query, kind='task')]
+
+        self.assertEqual(names("tep"), [2])
+        self.assertEqual(names("Ultraz"), [4])
+        self.assertEqual(names("jan sen"), [4, 1])
+        self.assertEqual(self.index.search("tep", prefix=False), [])
+        self.assertEqual(names("t"), [])
+
+    def test_incremental_updates(self):
+        """Test přeindexování poznámek, odebrání a přestavby po obnovení"""
+        self.assertEqual(self.pm.search("kalibrace"), [])
+        self.pm.update_task_status(1, "blocked", "Chybí kalibrace čidla")
+        self.assertEqual(self.pm.search("kalibrace")[0]['task']['id'], 1)
+        self.pm.update_task_status(1, "in_progress", "Kalibrováno")
+        self.assertEqual(self.pm.search("kalibrace"), [])
+
+        self.assertEqual(len(self.pm.search("graf")), 1)
+        self.assertTrue(self.index.remove('task', 2))
+        self.assertFalse(self.index.remove('task', 2))
+        self.assertEqual(self.pm.search("graf"), [])
+        stats = self.index.stats()
+        self.assertEqual(stats['documents'], 5)
+        self.assertNotIn('graf', self.index._vocabulary)
+
+        state = self.pm.to_dict()
+        restored = ProjectManager(os.path.join(self.temp_dir.name, 'pm2.log'))
+        index = SearchIndex().attach(restored)
+        restored.restore(state)
+        self.assertEqual(len(index), 6)
+        self.assertEqual(restored.search("graf teplot")[0]['task']['id'], 2)
+
+    def test_without_index(self):
+        """Test hledání bez nastaveného indexu"""
+        pm = ProjectManager(os.path.join(self.temp_dir.name, 'pm3.log'))
+        with self.assertRaises(ValueError):
+            pm.search("cokoliv")
+
+
+if __name__ == '__main__':
+    unittest.main()
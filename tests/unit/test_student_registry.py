@@ -0,0 +1,108 @@
+"""
+Unit testy pro StudentRegistry
+
+Testuje indexy studentů, reverzní index úkolů a limit projektů.
+"""
+
+import os
+import tempfile
+import unittest
+
+from src.python.project_manager import ProjectManager
+from src.python.student_registry import StudentRegistry
+
+
+class TestStudentRegistry(unittest.TestCase):
+    """Testy pro StudentRegistry třídu"""
+
+    def setUp(self):
+        """Příprava - evidence se dvěma třídami a napojený ProjectManager"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.registry = StudentRegistry(max_projects_per_student=2)
+        self.registry.add_student('jan.novak', 'Jan Novák', '8.A')
+        self.registry.add_student('marie.svobodova', 'Marie Svobodová', '8.A')
+        self.registry.add_student('petr.dvorak', 'Petr Dvořák', '9.B')
+
+        self.pm = ProjectManager(os.path.join(self.temp_dir.name, 'pm.log'), self.registry)
+        self.pm.create_project("Meteostanice", "Popis", [], "4 týdny")
+        self.pm.create_project("Robot", "Popis", [], "2 týdny")
+        self.pm.create_project("Web", "Popis", [], "3 týdny")
+
+    def tearDown(self):
+        """Čistka"""
+        self.temp_dir.cleanup()
+
+    def test_indexes(self):
+        """Test vyhledání podle třídy a jména"""
+        self.assertEqual(
+            [s['username'] for s in self.registry.class_members('8.A')],
+            ['jan.novak', 'marie.svobodova']
+        )
+        self.assertEqual(self.registry.find_by_name('jan  NOVÁK')[0]['username'], 'jan.novak')
+        self.assertEqual(self.registry.classes(), ['8.A', '9.B'])
+
+        self.assertTrue(self.registry.remove_student('petr.dvorak'))
+        self.assertEqual(self.registry.classes(), ['8.A'])
+        self.assertEqual(self.registry.find_by_name('Petr Dvořák'), [])
+
+    def test_duplicate_student(self):
+        """Test odmítnutí duplicitního uživatelského jména"""
+        with self.assertRaises(ValueError):
+            self.registry.add_student('jan.novak', 'Jan Novák', '9.B')
+
+    def test_open_tasks_for_class(self):
+        """Test otevřených úkolů třídy přes reverzní index"""
+        t1 = self.pm.add_task("Meteostanice", "Čidlo", "jan.novak", "2025-09-20")
+        self.pm.add_task("Meteostanice", "Web UI", "Marie Svobodová", "2025-09-27")
+        self.pm.add_task("Robot", "Motory", "petr.dvorak", "2025-09-30")
+        self.pm.add_task("Robot", "Host", "Neznámý", "2025-09-30")
+        self.pm.update_task_status(t1['id'], "completed")
+
+        self.assertEqual([t['name'] for t in self.registry.class_tasks('8.A')],
+                         ['Čidlo', 'Web UI'])
+        self.assertEqual([t['name'] for t in self.registry.class_tasks('8.A', open_only=True)],
+                         ['Web UI'])
+        self.assertEqual(self.registry.student_tasks('petr.dvorak')[0]['name'], 'Motory')
+
+    def test_workload(self):
+        """Test vytížení studentů"""
+        t1 = self.pm.add_task("Meteostanice", "Čidlo", "jan.novak", "2025-09-20")
+        self.pm.add_task("Meteostanice", "Graf", "jan.novak", "2025-09-27")
+        self.pm.update_task_status(t1['id'], "completed")
+        self.pm.assign_student("Meteostanice", "jan.novak")
+
+        workload = self.registry.workload('8.A')
+        self.assertEqual(workload['jan.novak'], {'open': 1, 'completed': 1, 'projects': 1})
+        self.assertEqual(workload['marie.svobodova'], {'open': 0, 'completed': 0, 'projects': 0})
+        self.assertNotIn('petr.dvorak', workload)
+
+    def test_max_projects_per_student(self):
+        """Test limitu education.max_projects_per_student"""
+        self.pm.assign_student("Meteostanice", "jan.novak")
+        self.pm.assign_student("Robot", "jan.novak")
+        # Opakované přiřazení se do limitu nepočítá
+        self.pm.assign_student("Robot", "jan.novak")
+
+        with self.assertRaises(ValueError):
+            self.pm.assign_student("Web", "jan.novak")
+        self.assertNotIn('students', self.pm.projects["Web"])
+        with self.assertRaises(ValueError):
+            self.pm.assign_student("Web", "neznamy")
+
+    def test_restore_rebuilds_task_index(self):
+        """Test obnovení evidence a indexu úkolů ze stavu"""
+        self.pm.add_task("Robot", "Motory", "petr.dvorak", "2025-09-30")
+        self.pm.assign_student("Robot", "petr.dvorak")
+        state = {**self.pm.to_dict(), **self.registry.to_dict()}
+
+        registry = StudentRegistry()
+        registry.restore(state)
+        pm = ProjectManager(os.path.join(self.temp_dir.name, 'pm.log'), registry)
+        pm.restore(state)
+
+        self.assertEqual(registry.get('petr.dvorak')['projects'], ['Robot'])
+        self.assertIs(registry.student_tasks('petr.dvorak')[0], pm.tasks[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
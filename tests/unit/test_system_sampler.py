@@ -0,0 +1,167 @@
+"""
+Unit testy pro SystemSampler
+
+Testuje čtení /proc a /sys (podstrčený adresář), zápis do databáze
+meteostanice, detekci škrcení a promazání starých vzorků.
+"""
+
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+from datetime import datetime, timedelta
+
+from src.python.event_bus import EventBus
+from src.python.retention import RetentionCompactor
+from src.python.system_sampler import (
+    FREQ_CAPPED, SOFT_TEMP_LIMIT, THROTTLED, UNDERVOLTAGE, SystemSampler
+)
+from src.python.weather_store import WeatherStore, format_timestamp
+
+
+MEMINFO = "MemTotal:        8000000 kB\nMemFree:  1000000 kB\nMemAvailable:    6000000 kB\n"
+
+
+class TestSystemSampler(unittest.TestCase):
+    """Testy pro SystemSampler třídu"""
+
+    def setUp(self):
+        """Příprava - falešné /proc a /sys jako na Raspberry Pi 5"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        root = self.temp_dir.name
+        self.proc = os.path.join(root, 'proc')
+        self.sys = os.path.join(root, 'sys')
+        self.db_path = os.path.join(root, 'weather.db')
+        self._write('proc/stat', "cpu  100 0 100 800 0 0 0 0 0 0\ncpu0 1 2 3 4\n")
+        self._write('proc/meminfo', MEMINFO)
+        self._write('proc/loadavg', "0.52 0.40 0.30 1/200 1234\n")
+        self._write('proc/diskstats',
+                    " 179 0 mmcblk0 100 0 2000 50 10 0 400 20 0 60 70\n"
+                    " 179 1 mmcblk0p1 5 0 40 1 0 0 0 0 0 1 1\n")
+        self._write('sys/class/thermal/thermal_zone0/temp', "55000\n")
+        cpufreq = 'sys/devices/system/cpu/cpu0/cpufreq/'
+        self._write(cpufreq + 'cpuinfo_max_freq', "2400000\n")
+        self._write(cpufreq + 'scaling_max_freq', "2400000\n")
+        self._write(cpufreq + 'scaling_cur_freq', "2400000\n")
+        self._write('sys/class/hwmon/hwmon0/name', "rpi_volt\n")
+        self._write('sys/class/hwmon/hwmon0/in0_lcrit_alarm', "0\n")
+
+    def tearDown(self):
+        """Čistka"""
+        self.temp_dir.cleanup()
+
+    def _write(self, relative, content):
+        """Zápis souboru do falešného stromu (na místě, jako jádro)"""
+        path = os.path.join(self.temp_dir.name, relative)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'r+' if os.path.exists(path) else 'w') as f:
+            f.write(content)
+            f.truncate()
+
+    def _sampler(self, **kwargs):
+        """Pomocná metoda pro vytvoření vzorkovače"""
+        return SystemSampler(self.db_path, proc_root=self.proc, sys_root=self.sys, **kwargs)
+
+    def test_sample_values_and_reused_handles(self):
+        """Test výpočtu hodnot z rozdílů a čtení přes otevřené soubory"""
+        sampler = self._sampler(flush_every=2)
+        first = sampler.sample()
+        self.assertIsNone(first['cpu_percent'])
+        self.assertEqual(first['mem_used_percent'], 25.0)
+        self.assertEqual(first['cpu_temperature'], 55.0)
+        self.assertEqual(first['cpu_freq_mhz'], 2400.0)
+        self.assertEqual(first['load1'], 0.52)
+        self.assertEqual(sampler.disk, 'mmcblk0')
+        handle = sampler._stat._file
+
+        self._write('proc/stat', "cpu  250 0 150 900 0 0 0 0 0 0\n")
+        self._write('proc/diskstats', " 179 0 mmcblk0 100 0 2000 50 10 0 2448 20 0 60 70\n")
+        second = sampler.sample()
+        self.assertEqual(second['cpu_percent'], 66.7)
+        self.assertEqual(second['disk_read_kbps'], 0.0)
+        self.assertGreater(second['disk_write_kbps'], 0)
+        self.assertIs(sampler._stat._file, handle)
+
+        # Dávka dvou vzorků se zapsala do databáze meteostanice
+        sampler.close()
+        store = WeatherStore(self.db_path)
+        rows = store.connection.execute("SELECT cpu_percent FROM system_data").fetchall()
+        store.close()
+        self.assertEqual(rows, [(None,), (66.7,)])
+
+    def test_throttling_detection(self):
+        """Test detekce škrcení a publikace změny stavu"""
+        bus = EventBus()
+        events = []
+        bus.subscribe(lambda event: event['topic'] == 'system.throttled' and events.append(event))
+        sampler = self._sampler(event_bus=bus, thermal_limit=80.0)
+        self.assertEqual(sampler.sample()['throttled'], 0)
+
+        self._write('sys/class/thermal/thermal_zone0/temp', "85500\n")
+        self._write('sys/class/hwmon/hwmon0/in0_lcrit_alarm', "1\n")
+        self._write('sys/devices/system/cpu/cpu0/cpufreq/scaling_max_freq', "1500000\n")
+        self._write('sys/devices/system/cpu/cpu0/cpufreq/scaling_cur_freq', "1500000\n")
+        self._write('proc/stat', "cpu  1100 0 100 800 0 0 0 0 0 0\n")
+        flags = sampler.sample()['throttled']
+        self.assertEqual(flags, UNDERVOLTAGE | FREQ_CAPPED | THROTTLED | SOFT_TEMP_LIMIT)
+        self.assertEqual(events[-1]['topic'], 'system.throttled')
+        self.assertEqual(events[-1]['data']['cpu_temperature'], 85.5)
+
+        # Beze změny stavu se událost neopakuje
+        self._write('proc/stat', "cpu  2100 0 100 800 0 0 0 0 0 0\n")
+        sampler.sample()
+        self.assertEqual(len(events), 1)
+        sampler.close()
+
+    def test_missing_sources_and_overhead(self):
+        """Test běhu bez /sys (jiný Linux) a režie vlákna vzorkování"""
+        sampler = SystemSampler(self.db_path, interval=0.01, proc_root=self.proc,
+                                sys_root=os.path.join(self.temp_dir.name, 'chybi'))
+        record = sampler.sample()
+        self.assertIsNone(record['cpu_temperature'])
+        self.assertEqual(record['throttled'], 0)
+
+        sampler.start()
+        time.sleep(0.2)
+        sampler.stop()
+        self.assertGreater(sampler.stats['samples'], 5)
+        # Limit 1 % jádra při 1 Hz = 10 ms CPU na vzorek
+        self.assertLess(sampler.stats['cpu_seconds'] / sampler.stats['samples'], 0.01)
+        self.assertGreater(len(sampler.latest(100)), 5)
+        sampler.close()
+
+    def test_retention_prunes_system_data(self):
+        """Test promazání starých vzorků kompaktorem"""
+        sampler = self._sampler()
+        sampler.close()
+        connection = sqlite3.connect(self.db_path)
+        now = datetime(2025, 10, 1)
+        with connection:
+            connection.executemany(
+                "INSERT INTO system_data (timestamp, cpu_percent) VALUES (?, ?)",
+                [(format_timestamp(now - timedelta(days=days)), 1.0) for days in (40, 35, 1)]
+            )
+        connection.close()
+
+        stats = RetentionCompactor(self.db_path, retention_days=30, chunk_pause=0).run_once(now)
+        self.assertEqual(stats['system_rows_deleted'], 2)
+
+
+@unittest.skipUnless(os.path.exists('/proc/stat'), "Vyžaduje Linux")
+class TestSystemSamplerLinux(unittest.TestCase):
+    """Test na skutečném /proc"""
+
+    def test_real_proc(self):
+        """Test měření na tomto počítači"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            sampler = SystemSampler(os.path.join(temp_dir, 'weather.db'))
+            sampler.sample()
+            record = sampler.sample()
+            sampler.close()
+        self.assertIsNotNone(record['cpu_percent'])
+        self.assertGreater(record['mem_available_kb'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
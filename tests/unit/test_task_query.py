@@ -0,0 +1,114 @@
+"""
+Unit testy pro dotazy nad úkoly
+
+Testuje kompilaci filtru, výběr sekundárního indexu podle selektivity,
+stránkování, řazení a údržbu indexů při změnách a obnovení stavu.
+"""
+
+import os
+import tempfile
+import unittest
+
+from src.python.project_manager import ProjectManager
+from src.python.task_query import TaskQuery
+
+PRIORITIES = ('low', 'normal', 'high', 'critical')
+
+
+class TestTaskQuery(unittest.TestCase):
+    """Testy pro TaskQuery a ProjectManager.query_tasks"""
+
+    def setUp(self):
+        """Příprava - dva projekty se 100 úkoly"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.pm = ProjectManager(os.path.join(self.temp_dir.name, 'pm.log'))
+        for name in ('A', 'B'):
+            self.pm.create_project(name, "Popis", [], "4 týdny")
+        for i in range(100):
+            self.pm.add_task('A' if i < 60 else 'B', f"Úkol {i}", f"student{i % 10}",
+                             f"2025-10-{1 + i % 28:02d}", priority=PRIORITIES[i % 4])
+
+    def tearDown(self):
+        """Čistka"""
+        self.temp_dir.cleanup()
+
+    def test_compiled_predicate(self):
+        """Test kompilace podmínek do jednoho výrazu s hodnotami mimo zdrojový text"""
+        query = TaskQuery(status='blocked', assignee=['a', "x') or True or ('"],
+                          deadline_to='2025-10-05')
+        predicate, source = query.compile({})
+        self.assertEqual(source, "t['status'] == status and t['assignee'] in assignee "
+                                 "and t['deadline'] <= deadline_to")
+        task = {'id': 1, 'status': 'blocked', 'assignee': 'b', 'deadline': '2025-10-01'}
+        self.assertFalse(predicate(task))
+        self.assertTrue(predicate(dict(task, assignee='a')))
+        self.assertEqual(TaskQuery().compile({})[1], 'True')
+
+        for invalid in ({'deadline_from': '1.10.2025'}, {'order_by': 'name'},
+                        {'deadline_from': '2025-10-05', 'deadline_to': '2025-10-01'}):
+            with self.assertRaises(ValueError):
+                TaskQuery(**invalid)
+        query = TaskQuery.from_params({'status': ['blocked', 'assigned'], 'limit': ['5']})
+        self.assertEqual(query.to_dict(), {'status': ['blocked', 'assigned'], 'order_by': 'id'})
+
+    def test_index_selection(self):
+        """Test použití indexu jen při dostatečné selektivitě"""
+        self.pm.update_task_status(7, 'blocked')
+        self.pm.update_task_status(70, 'blocked')
+        result = self.pm.query_tasks(status='blocked', explain=True)
+        self.assertEqual([t['id'] for t in result['tasks']], [7, 70])
+        self.assertEqual(result['explain']['source'], 'index:status')
+        self.assertEqual(result['explain']['candidates'], 2)
+
+        result = self.pm.query_tasks(status='assigned', assignee='student3', explain=True)
+        self.assertEqual(result['explain']['source'], 'index:assignee')
+        self.assertEqual(result['explain']['estimates'], {'status': 98, 'assignee': 10})
+        self.assertEqual(result['total'], 10)
+
+        result = self.pm.query_tasks(status='assigned', project='B', explain=True)
+        self.assertEqual(result['explain']['source'], 'project')
+        self.assertEqual(result['total'], 39)
+        self.assertNotIn('project_of', result['explain']['predicate'])
+
+        result = self.pm.query_tasks(priority='high,critical', explain=True)
+        self.assertEqual(result['explain']['source'], 'scan')
+        self.assertEqual(result['total'], 50)
+
+    def test_pagination_and_order(self):
+        """Test stránkování a řazení podle deadlinu a priority"""
+        first = self.pm.query_tasks(project='A', order_by='deadline', limit=25)
+        self.assertEqual((first['total'], first['next_offset']), (60, 25))
+        deadlines = [t['deadline'] for t in first['tasks']]
+        self.assertEqual(deadlines, sorted(deadlines))
+        last = self.pm.query_tasks(project='A', order_by='deadline', offset=50, limit=25)
+        self.assertEqual((len(last['tasks']), last['next_offset']), (10, None))
+
+        result = self.pm.query_tasks(order_by='priority', limit=3)
+        self.assertEqual([t['id'] for t in result['tasks']], [4, 8, 12])
+        result = self.pm.query_tasks(deadline_from='2025-10-27', deadline_to='2025-10-28')
+        self.assertEqual([t['id'] for t in result['tasks']], [27, 28, 55, 56, 83, 84])
+
+        # Výsledek je kopie, změna neovlivní správce
+        result['tasks'][0]['status'] = 'completed'
+        self.assertEqual(self.pm.query_tasks(status='completed')['total'], 0)
+        for invalid in ({'limit': 0}, {'offset': -1}, {'project': 'C'}):
+            with self.assertRaises(ValueError):
+                self.pm.query_tasks(**invalid)
+
+    def test_indexes_follow_changes_and_restore(self):
+        """Test přesunu v indexu stavu a přestavby indexů po obnovení"""
+        self.pm.add_tasks('B', [{'name': 'Nový', 'assignee': 'eva', 'deadline': '2025-11-01'}])
+        self.assertEqual(self.pm.query_tasks(assignee='eva')['tasks'][0]['id'], 101)
+        self.pm.update_task_status(101, 'completed')
+        self.assertEqual(self.pm.query_tasks(status='completed', assignee='eva')['total'], 1)
+        self.assertEqual(self.pm.query_tasks(status='assigned', assignee='eva')['total'], 0)
+
+        restored = ProjectManager(os.path.join(self.temp_dir.name, 'pm2.log'))
+        restored.restore(self.pm.to_dict())
+        result = restored.query_tasks(status='completed', explain=True)
+        self.assertEqual(result['explain']['source'], 'index:status')
+        self.assertEqual([t['id'] for t in result['tasks']], [101])
+
+
+if __name__ == '__main__':
+    unittest.main()
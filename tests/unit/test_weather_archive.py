@@ -0,0 +1,156 @@
+"""
+Unit testy pro sloupcový archiv měření
+
+Testuje připisování do segmentů, čtení přes mmap bez kopírování,
+výběr časového intervalu, opravu po neúplném zápisu a převody
+z a do tabulky weather_data.
+"""
+
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+
+from src.python.weather_archive import (
+    HEADER_SIZE, WeatherArchive, export_sqlite, import_sqlite, main, to_micros
+)
+from src.python.weather_store import WeatherStore
+
+
+class TestWeatherArchive(unittest.TestCase):
+    """Testy pro WeatherArchive třídu"""
+
+    def setUp(self):
+        """Příprava - archiv s malými segmenty"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.temp_dir.name, 'archive')
+        self.archive = WeatherArchive(self.directory, segment_rows=100)
+        self.start = datetime(2025, 9, 1, 8, 0)
+
+    def tearDown(self):
+        """Čistka"""
+        self.archive.close()
+        self.temp_dir.cleanup()
+
+    def _readings(self, count, offset=0):
+        return [(self.start + timedelta(seconds=offset + i), 20.0 + (offset + i) / 100,
+                 None if i % 10 == 0 else 50.0, 1013.25) for i in range(count)]
+
+    def test_append_segments_and_zero_copy(self):
+        """Test rozdělení do segmentů a čtení memoryview nad mmap"""
+        self.assertEqual(self.archive.append(self._readings(150)), 150)
+        self.assertEqual(self.archive.append(self._readings(100, offset=150)), 100)
+        self.assertEqual([segment.rows for segment in self.archive.segments], [100, 100, 50])
+        self.assertEqual(len(self.archive), 250)
+        self.assertEqual(self.archive.first, self.start)
+        self.assertEqual(self.archive.last, self.start + timedelta(seconds=249))
+
+        columns = self.archive.column('temperature')
+        self.assertEqual([len(column) for column in columns], [100, 100, 50])
+        self.assertEqual(columns[1][0], 21.0)
+        self.assertEqual(columns[0].obj.__class__.__name__, 'mmap')
+        self.assertEqual(columns[0].format, 'd')
+        # Soubor sloupce = hlavička + pevná šířka
+        path = self.archive.segments[0].file('pressure')
+        self.assertEqual(os.path.getsize(path), HEADER_SIZE + 100 * 8)
+        del columns
+
+        # Starší měření se přeskočí, nový čtenář vidí zápisy jiné instance
+        with self.assertLogs('WeatherArchive', 'WARNING'):
+            self.assertEqual(self.archive.append(self._readings(5)), 0)
+        reader = WeatherArchive(self.directory)
+        self.assertEqual(reader.segment_rows, 100)
+        self.archive.append(self._readings(10, offset=250))
+        self.assertEqual(len(reader), 250)
+        reader.refresh()
+        self.assertEqual(len(reader), 260)
+        reader.close()
+
+    def test_select_and_read(self):
+        """Test výběru intervalu binárním vyhledáváním v časovém sloupci"""
+        self.archive.append(self._readings(250))
+        begin, end = self.start + timedelta(seconds=95), self.start + timedelta(seconds=105)
+        slices = self.archive.select('temperature', begin, end)
+        self.assertEqual([len(values) for values in slices], [5, 5])
+        self.assertEqual(slices[0][0], 20.95)
+        times = self.archive.select('time', begin, end)
+        self.assertEqual(times[1][0], to_micros(self.start + timedelta(seconds=100)))
+        rows = list(self.archive.read(begin, end))
+        self.assertEqual(len(rows), 10)
+        self.assertEqual(rows[5], (self.start + timedelta(seconds=100), 21.0, None, 1013.25))
+        self.assertEqual(list(self.archive.read(self.start - timedelta(days=1), self.start)), [])
+
+        with self.assertRaises(ValueError):
+            self.archive.column('wind')
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            with self.assertRaises(ImportError):
+                self.archive.memmap('temperature')
+        else:
+            arrays = self.archive.memmap('temperature')
+            self.assertEqual(float(arrays[2][0]), 22.0)
+
+    def test_repair_after_torn_write(self):
+        """Test, že neúplný zápis po pádu čtenář ignoruje a zapisovatel zkrátí"""
+        self.archive.append(self._readings(30))
+        segment = self.archive.segments[-1]
+        with open(segment.file('temperature'), 'ab') as f:
+            f.write(b'\x00' * 12)
+        reader = WeatherArchive(self.directory)
+        self.assertEqual(len(reader), 30)
+        reader.close()
+        with self.assertLogs('WeatherArchive', 'WARNING'):
+            self.archive.append(self._readings(5, offset=30))
+        self.assertEqual(len(self.archive), 35)
+        self.assertEqual(self.archive.segments[-1].column('temperature')[30], 20.30)
+
+    def test_sqlite_round_trip(self):
+        """Test převodu z weather_data do archivu a zpět"""
+        source = os.path.join(self.temp_dir.name, 'weather.db')
+        store = WeatherStore(source)
+        store.insert_many(self._readings(120))
+        self.assertEqual(export_sqlite(source, self.archive), 120)
+        # Opakovaný export převede jen nová měření
+        store.insert_many(self._readings(30, offset=120))
+        self.assertEqual(export_sqlite(source, self.archive), 30)
+        self.assertEqual(export_sqlite(source, self.archive), 0)
+        expected = store.query_range(self.start, self.start + timedelta(days=1))
+        store.close()
+
+        target = os.path.join(self.temp_dir.name, 'restored.db')
+        restored = WeatherStore(target)
+        restored.insert_many(self._readings(10, offset=140))
+        self.assertEqual(import_sqlite(self.archive, target), 140)
+        rows = restored.query_range(self.start, self.start + timedelta(days=1))
+        restored.close()
+        strip = [{key: row[key] for key in row if key != 'id'} for row in rows]
+        self.assertEqual(strip, [{key: row[key] for key in row if key != 'id'}
+                                 for row in expected])
+
+        end = (self.start + timedelta(seconds=10)).isoformat()
+        self.assertEqual(import_sqlite(self.archive, os.path.join(self.temp_dir.name, 'x.db'),
+                                       end=datetime.fromisoformat(end)), 10)
+
+    def test_command_line(self):
+        """Test příkazu kiosk-archive"""
+        source = os.path.join(self.temp_dir.name, 'weather.db')
+        store = WeatherStore(source)
+        store.insert_many(self._readings(20))
+        store.close()
+        out = io.StringIO()
+        with redirect_stdout(out):
+            self.assertEqual(main(['--archive', self.directory, 'export', '--db', source,
+                                   '--from', '2025-09-01T08:00:05']), 0)
+            self.assertEqual(main(['--archive', self.directory, 'info']), 0)
+        lines = out.getvalue().split('\n', 1)
+        self.assertEqual(lines[0], '15')
+        info = json.loads(lines[1])
+        self.assertEqual((info['rows'], info['first']), (15, '2025-09-01T08:00:05'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+"""
+Unit testy pro generátor syntetické zátěže
+
+Testuje determinismus scénářů, nahrání do ProjectManageru, průběh
+plnění úkolů se závislostmi a přehrání měření do WeatherStore.
+"""
+
+import os
+import tempfile
+import unittest
+
+from src.python.project_evaluator import ProjectEvaluator
+from src.python.project_manager import ProjectManager
+from src.python.student_registry import StudentRegistry
+from src.python.weather_store import WeatherStore
+from src.python.workload import WorkloadGenerator, latency_summary, populate, replay
+
+
+class TestWorkloadGenerator(unittest.TestCase):
+    """Testy pro WorkloadGenerator a přehrání zátěže"""
+
+    def setUp(self):
+        """Příprava - dočasný adresář a malý scénář"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.generator = WorkloadGenerator(seed=3)
+        self.scenario = self.generator.school(classes=2, students_per_class=4,
+                                              projects_per_class=2, tasks_per_student=5)
+
+    def tearDown(self):
+        """Čistka"""
+        self.temp_dir.cleanup()
+
+    def test_deterministic_scenario(self):
+        """Test že stejné semínko dá stejný scénář a jiné jiný"""
+        self.assertEqual(self.scenario, WorkloadGenerator(seed=3).school(2, 4, 2, 5))
+        self.assertNotEqual(self.scenario, WorkloadGenerator(seed=4).school(2, 4, 2, 5))
+        self.assertEqual(self.scenario['classes'], ['6.A', '7.A'])
+        self.assertEqual(len(self.scenario['students']), 8)
+        self.assertEqual(len(self.scenario['projects']), 4)
+        usernames = [s['username'] for s in self.scenario['students']]
+        self.assertEqual(len(set(usernames)), 8)
+        self.assertTrue(all(name.isascii() for name in usernames))
+
+    def test_populate_and_progress_respect_dependencies(self):
+        """Test nahrání scénáře a průběhu, který nezačne úkol před závislostmi"""
+        registry = StudentRegistry(max_projects_per_student=2)
+        pm = ProjectManager(os.path.join(self.temp_dir.name, 'pm.log'), registry=registry)
+        latencies = []
+        tasks = populate(self.scenario, pm, registry, latencies)
+
+        self.assertEqual(len(tasks), 4 * 4 * 5)
+        self.assertEqual(len(latencies), len(tasks))
+        by_id = {task['id']: task for task in tasks}
+        for task in tasks:
+            for dependency in task['dependencies']:
+                self.assertLessEqual(by_id[dependency]['deadline'], task['deadline'])
+        self.assertEqual(registry.get(self.scenario['students'][0]['username'])['projects'],
+                         [p['name'] for p in self.scenario['projects'][:2]])
+
+        events = self.generator.progress_events(tasks, 10 * len(tasks))
+        self.assertEqual(events, self.generator.progress_events(tasks, 10 * len(tasks)))
+        for task_id, status in events:
+            if status == 'in_progress':
+                self.assertTrue(all(by_id[d]['status'] == 'completed'
+                                    for d in by_id[task_id]['dependencies']))
+            self.assertTrue(pm.update_task_status(task_id, status))
+        self.assertEqual(pm.track_progress(self.scenario['projects'][0]['name']), 100.0)
+
+    def test_submissions_evaluate_without_sandbox(self):
+        """Test odevzdaných prací s hotovými výsledky testů"""
+        project = self.scenario['projects'][0]
+        submissions = self.generator.submissions(project, 3)
+        self.assertEqual(submissions, self.generator.submissions(project, 3))
+        result = ProjectEvaluator().evaluate_project(project, submissions[0])
+        results = submissions[0]['test_results']
+        self.assertAlmostEqual(result['scores']['functionality'],
+                               100.0 * results['passed'] / results['total'])
+
+    def test_replay_rate_and_batches(self):
+        """Test přehrání měření zadanou rychlostí a po dávkách"""
+        now = [0.0]
+        slept = []
+
+        def sleep(seconds):
+            slept.append(seconds)
+            now[0] += seconds
+
+        store = WeatherStore(os.path.join(self.temp_dir.name, 'weather.db'))
+        stats = replay(store, self.generator.sensor_stream(10), rate=5.0,
+                       clock=lambda: now[0], sleep=sleep)
+        self.assertEqual(stats['readings'], 10)
+        self.assertAlmostEqual(stats['seconds'], 2.0)
+        self.assertEqual(len(slept), 10)
+
+        stats = replay(store, self.generator.sensor_stream(25, interval=60), batch=10)
+        self.assertEqual(stats['latency']['count'], 3)
+        self.assertEqual(store.count(), 35)
+        store.close()
+
+    def test_latency_summary(self):
+        """Test percentilů latence"""
+        summary = latency_summary([i / 1000 for i in range(1, 101)])
+        self.assertEqual(summary['count'], 100)
+        self.assertAlmostEqual(summary['p50_ms'], 50.5)
+        self.assertAlmostEqual(summary['p99_ms'], 99.01)
+        self.assertEqual(summary['max_ms'], 100.0)
+        self.assertIsNone(latency_summary([])['p50_ms'])
+
+
+if __name__ == '__main__':
+    unittest.main()